@@ -0,0 +1,56 @@
+# Times importing the headless core in fresh interpreters and fails if any import is over its
+# budget or pulls in Qt. Run from the repository root:
+#     python benchmarks/check_import_time.py
+import os
+import subprocess
+import sys
+
+# Best-of-N wall time, in milliseconds
+IMPORT_BUDGETS_MS = {
+    "import scheduler_core": 50,
+    "from scheduler_core import EventManager, EventFileTransfer": 100,
+}
+RUNS_PER_IMPORT = 5
+
+TIMING_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(elapsed_ms, *(name for name in sys.modules if name.split(".")[0] == "PyQt5"))
+"""
+
+
+def time_import(statement, repository_root):
+    script = TIMING_SCRIPT.format(statement=statement)
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=repository_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    return float(output[0]), output[1:]
+
+
+def main():
+    repository_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    failures = []
+    for statement, budget_ms in IMPORT_BUDGETS_MS.items():
+        timings = [time_import(statement, repository_root) for _ in range(RUNS_PER_IMPORT)]
+        best_ms = min(elapsed_ms for elapsed_ms, _ in timings)
+        qt_modules = sorted(set(module for _, modules in timings for module in modules))
+        status = "ok" if best_ms <= budget_ms and not qt_modules else "FAIL"
+        print(f"{status:4}  {best_ms:7.1f} ms  (budget {budget_ms} ms)  {statement}")
+        if best_ms > budget_ms:
+            failures.append(f"'{statement}' took {best_ms:.1f} ms, over its {budget_ms} ms budget")
+        if qt_modules:
+            failures.append(f"'{statement}' imported Qt modules: {', '.join(qt_modules)}")
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# Builds synthetic events.db files for benchmarking. The same (count, seed) always produces
+# the same database. Run from the repository root:
+#     python benchmarks/generate_calendar.py 100000 benchmarks/data/events_100k.db
+import argparse
+import datetime
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler_core import EventManager
+
+# Events are spread over three years around a fixed anchor so generated files never depend
+# on the day they were built
+FIRST_DATE = datetime.date(2024, 1, 1)
+DAY_COUNT = 3 * 365
+# Relative busyness of Monday..Sunday
+WEEKDAY_WEIGHTS = [1.0, 1.0, 0.95, 0.95, 0.8, 0.3, 0.25]
+# Share of events without a time (all-day events)
+ALL_DAY_SHARE = 0.15
+# Start times cluster around the working day, in 15 minute steps
+MEAN_START_HOUR = 12.5
+START_HOUR_SPREAD = 3.0
+# A few colors carry most events, as they do when people colour-code by category
+COLOR_WEIGHTS = {
+    "#4caf50": 30, "#2196f3": 22, "#f44336": 14, "#ff9800": 10,
+    "#9c27b0": 8, "#009688": 6, "#795548": 5, "#607d8b": 5,
+}
+TITLE_SUBJECTS = ["Team", "Project", "Client", "Design", "Budget", "Dentist", "Gym", "Family", "Release", "Planning"]
+TITLE_KINDS = ["sync", "review", "call", "lunch", "appointment", "deadline", "workshop", "check-in", "demo", "retro"]
+DESCRIPTION_WORDS = ["agenda", "notes", "bring", "laptop", "room", "budget", "draft", "follow", "up", "slides", "invoice", "feedback", "quarterly", "goals", "remote", "office"]
+# Share of events with a description
+DESCRIBED_SHARE = 0.4
+
+
+def generate_event_rows(count, seed=0):
+    # Yields EVENT_ROW_FIELDS tuples ready for EventManager.importEventRows; durations and
+    # reminders are left unset
+    rng = random.Random(seed)
+    days = [FIRST_DATE + datetime.timedelta(days=offset) for offset in range(DAY_COUNT)]
+    # Some days are simply busier than others; scale each weekday weight by a random factor
+    day_weights = [WEEKDAY_WEIGHTS[day.weekday()] * rng.lognormvariate(0, 0.5) for day in days]
+    colors = list(COLOR_WEIGHTS)
+    color_weights = list(COLOR_WEIGHTS.values())
+
+    for day in rng.choices(days, weights=day_weights, k=count):
+        if rng.random() < ALL_DAY_SHARE:
+            event_time = None
+        else:
+            quarter_hours = round(rng.gauss(MEAN_START_HOUR, START_HOUR_SPREAD) * 4)
+            quarter_hours = min(max(quarter_hours, 6 * 4), 22 * 4)
+            event_time = f"{quarter_hours // 4:02d}:{quarter_hours % 4 * 15:02d}:00"
+        description = None
+        if rng.random() < DESCRIBED_SHARE:
+            description = " ".join(rng.choices(DESCRIPTION_WORDS, k=rng.randint(3, 12)))
+        yield (
+            day.isoformat(),
+            f"{rng.choice(TITLE_SUBJECTS)} {rng.choice(TITLE_KINDS)}",
+            description,
+            event_time,
+            rng.choices(colors, weights=color_weights)[0],
+            None,
+            None,
+        )
+
+
+def create_calendar_database(db_filename, count, seed=0):
+    # Writes a fresh database with `count` generated events, replacing any existing file
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_filename + suffix):
+            os.remove(db_filename + suffix)
+    event_manager = EventManager(db_filename=db_filename)
+    imported_count = event_manager.importEventRows(generate_event_rows(count, seed), batch_size=20000)
+    event_manager.execQuery("PRAGMA optimize")
+    event_manager.closeConnection()
+    if imported_count != count:
+        raise RuntimeError(f"Generated {imported_count} of {count} events into {db_filename}")
+    return db_filename
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic events database.")
+    parser.add_argument("count", type=int, help="number of events to generate")
+    parser.add_argument("db_filename", help="database file to create (overwritten)")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+    create_calendar_database(arguments.db_filename, arguments.count, arguments.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
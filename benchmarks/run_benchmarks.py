@@ -0,0 +1,306 @@
+# Times the month calendar, the week timeline, the event list and EventManager against synthetic databases of
+# 10k, 100k and 1M events, writes the timings to JSON and fails when a scenario is slower than
+# its stored baseline. Runs headless under the offscreen Qt platform. From the repository root:
+#     python benchmarks/run_benchmarks.py                    # every size
+#     python benchmarks/run_benchmarks.py --sizes 10k 100k
+#     python benchmarks/run_benchmarks.py --update-baseline  # accept the current timings
+# Baselines are only comparable on the machine that recorded them; re-record after changing
+# hardware. Generated databases are cached in benchmarks/data and reused between runs.
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import logging
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPOSITORY_ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, REPOSITORY_ROOT)
+
+from PyQt5.QtCore import PYQT_VERSION_STR, QT_VERSION_STR, QDate, Qt
+from PyQt5.QtWidgets import QApplication
+
+import scheduler
+from scheduler_core import EventManager
+from generate_calendar import create_calendar_database, generate_event_rows
+
+DATABASE_SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+GENERATOR_SEED = 0
+DATA_DIR = os.path.join(BENCHMARK_DIR, "data")
+DEFAULT_RESULTS_FILE = os.path.join(BENCHMARK_DIR, "results.json")
+DEFAULT_BASELINE_FILE = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_REPEAT = 7
+# A scenario regresses when its median is more than this fraction slower than the baseline
+# median, and slower by at least MIN_REGRESSION_MS so sub-millisecond jitter never fails a run
+DEFAULT_TOLERANCE = 0.5
+MIN_REGRESSION_MS = 5.0
+# Single-event add/update/delete calls timed together per run
+CRUD_OPERATIONS = 50
+# Month the calendar opens on and the event list filters from; inside the generated range
+BENCHMARK_YEAR, BENCHMARK_MONTH = 2025, 6
+CALENDAR_SIZE = (800, 600)
+EVENT_VIEWER_SIZE = (1000, 700)
+TIMELINE_SIZE = (1200, 800)
+# Monday of the week the timeline shows, and the scroll distance between timed frames
+TIMELINE_WEEK_START = (BENCHMARK_YEAR, BENCHMARK_MONTH, 2)
+TIMELINE_SCROLL_STEP = 12
+
+
+def time_call(function):
+    # Wall time of one call in milliseconds, with anything it prints captured rather than
+    # timing the terminal
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        function()
+        return (time.perf_counter() - start) * 1000
+
+
+def summarize(timings_ms, **details):
+    return {
+        "median_ms": round(statistics.median(timings_ms), 3),
+        "min_ms": round(min(timings_ms), 3),
+        "max_ms": round(max(timings_ms), 3),
+        "runs": len(timings_ms),
+        **details,
+    }
+
+
+def measure(function, repeat, setup=None):
+    timings_ms = []
+    for _ in range(repeat):
+        if setup:
+            with contextlib.redirect_stdout(io.StringIO()):
+                setup()
+        timings_ms.append(time_call(function))
+    return summarize(timings_ms)
+
+
+def benchmark_calendar(event_manager, repeat):
+    # Reads run synchronously (no DatabaseExecutor) so the timings include the queries
+    calendar = scheduler.MainSchedulingCalendar(event_manager)
+    calendar.resize(*CALENDAR_SIZE)
+    calendar.setCurrentPage(BENCHMARK_YEAR, BENCHMARK_MONTH)
+    results = {
+        # grab() paints every cell of the visible month, as a full repaint would
+        "calendar.month_repaint": measure(calendar.grab, repeat),
+        "calendar.month_change": measure(
+            lambda: (calendar.showNextMonth(), calendar.grab()),
+            repeat,
+            setup=lambda: calendar.setCurrentPage(BENCHMARK_YEAR, BENCHMARK_MONTH),
+        ),
+    }
+    calendar.deleteLater()
+    return results
+
+
+def benchmark_timeline(event_manager, repeat):
+    timeline = scheduler.TimelineView(event_manager)
+    timeline.resize(*TIMELINE_SIZE)
+    week_start = QDate(*TIMELINE_WEEK_START)
+
+    def load_week():
+        timeline.invalidate()
+        timeline.set_range(week_start, 7)
+        timeline.grab()
+
+    results = {"timeline.week_load": measure(load_week, repeat)}
+    # One full sweep from midnight to midnight; reported per frame
+    scroll_bar = timeline.verticalScrollBar()
+    scroll_values = range(0, scroll_bar.maximum() + 1, TIMELINE_SCROLL_STEP)
+    frame_timings_ms = []
+    for _ in range(repeat):
+        for scroll_value in scroll_values:
+            scroll_bar.setValue(scroll_value)
+            frame_timings_ms.append(time_call(timeline.grab))
+    results["timeline.week_scroll_frame"] = summarize(frame_timings_ms)
+    timeline.deleteLater()
+    return results
+
+
+def benchmark_event_viewer(event_manager, repeat):
+    pages = []
+
+    def load():
+        page = scheduler.EventViewerPage(event_manager)
+        page.resize(*EVENT_VIEWER_SIZE)
+        page.grab()
+        pages.append(page)
+
+    results = {"event_viewer.load": measure(load, repeat)}
+    page = pages.pop()
+    for stale_page in pages:
+        stale_page.deleteLater()
+
+    # Alternate the order so every run really re-sorts
+    sort_orders = []
+
+    def sort_by_title():
+        sort_orders.append(Qt.DescendingOrder if len(sort_orders) % 2 == 0 else Qt.AscendingOrder)
+        page.model.sort(2, sort_orders[-1])
+        page.grab()
+
+    results["event_viewer.sort"] = measure(sort_by_title, repeat)
+
+    def set_filter_fields():
+        page.date_comparison_selector.setCurrentText(">")
+        page.date_selector_filter.setDate(QDate(BENCHMARK_YEAR, BENCHMARK_MONTH, 1))
+        page.title_filter_box.setText("review")
+
+    results["event_viewer.filter"] = measure(lambda: (page.apply_filters(), page.grab()), repeat, setup=set_filter_fields)
+    page.deleteLater()
+    return results
+
+
+def benchmark_event_manager(event_manager, repeat):
+    # Each run adds CRUD_OPERATIONS events one call at a time, edits them, then deletes them,
+    # so the database is left as it was generated
+    new_event_rows = list(generate_event_rows(CRUD_OPERATIONS, seed=GENERATOR_SEED + 1))
+    add_timings_ms, update_timings_ms, delete_timings_ms = [], [], []
+    for _ in range(repeat):
+        add_timings_ms.append(time_call(lambda: [event_manager.addEvent(*event_row) for event_row in new_event_rows]))
+        added_ids = [row[0] for row in event_manager.execQuery("SELECT id FROM events ORDER BY id DESC LIMIT ?", (CRUD_OPERATIONS,))]
+        edited_events = [
+            {"event_id": event_id, "event_date": event_row[0], "title": event_row[1] + " (moved)", "description": event_row[2], "event_time": event_row[3], "event_color": event_row[4]}
+            for event_id, event_row in zip(added_ids, reversed(new_event_rows))
+        ]
+        update_timings_ms.append(time_call(lambda: [event_manager.updateEvent(edited_event) for edited_event in edited_events]))
+        delete_timings_ms.append(time_call(lambda: [event_manager.deleteEvent(event_id) for event_id in added_ids]))
+
+    return {
+        "event_manager.add": summarize(add_timings_ms, operations=CRUD_OPERATIONS),
+        "event_manager.update": summarize(update_timings_ms, operations=CRUD_OPERATIONS),
+        "event_manager.delete": summarize(delete_timings_ms, operations=CRUD_OPERATIONS),
+        "event_manager.get_all_events": measure(event_manager.getAllEvents, repeat),
+    }
+
+
+def prepare_database(size_label, regenerate=False):
+    # Reuses the cached database for this size unless it is missing or has the wrong row count
+    db_filename = os.path.join(DATA_DIR, f"events_{size_label}_seed{GENERATOR_SEED}.db")
+    expected_count = DATABASE_SIZES[size_label]
+    if not regenerate and os.path.exists(db_filename):
+        with contextlib.closing(sqlite3.connect(db_filename)) as connection:
+            if connection.execute("SELECT COUNT(*) FROM events").fetchone()[0] == expected_count:
+                return db_filename
+    os.makedirs(DATA_DIR, exist_ok=True)
+    print(f"Generating {expected_count} events into {db_filename}...")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_calendar_database(db_filename, expected_count, GENERATOR_SEED)
+    print(f"  done in {time.perf_counter() - start:.1f} s")
+    return db_filename
+
+
+def run_size(size_label, repeat, regenerate=False):
+    db_filename = prepare_database(size_label, regenerate)
+    with contextlib.redirect_stdout(io.StringIO()):
+        event_manager = EventManager(db_filename=db_filename)
+    results = {}
+    for benchmark in (benchmark_calendar, benchmark_timeline, benchmark_event_viewer, benchmark_event_manager):
+        results.update(benchmark(event_manager, repeat))
+    QApplication.processEvents()
+    with contextlib.redirect_stdout(io.StringIO()):
+        event_manager.closeConnection()
+    return results
+
+
+def find_regressions(results, baseline, tolerance):
+    regressions = []
+    for size_label, scenarios in results["sizes"].items():
+        baseline_scenarios = baseline.get("sizes", {}).get(size_label, {})
+        for name, timing in scenarios.items():
+            baseline_timing = baseline_scenarios.get(name)
+            if baseline_timing is None:
+                continue
+            baseline_ms = baseline_timing["median_ms"]
+            if timing["median_ms"] > baseline_ms * (1 + tolerance) and timing["median_ms"] - baseline_ms >= MIN_REGRESSION_MS:
+                regressions.append(f"{size_label} {name}: {timing['median_ms']:.1f} ms vs baseline {baseline_ms:.1f} ms")
+    return regressions
+
+
+def print_results(results, baseline):
+    for size_label, scenarios in results["sizes"].items():
+        baseline_scenarios = baseline.get("sizes", {}).get(size_label, {})
+        print(f"\n{size_label} events")
+        for name, timing in scenarios.items():
+            line = f"  {name:32} {timing['median_ms']:10.2f} ms"
+            baseline_timing = baseline_scenarios.get(name)
+            if baseline_timing:
+                line += f"   baseline {baseline_timing['median_ms']:10.2f} ms  ({timing['median_ms'] / max(baseline_timing['median_ms'], 1e-9):.2f}x)"
+            print(line)
+
+
+def load_json(filename):
+    if not os.path.exists(filename):
+        return {}
+    with open(filename, encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+
+def write_json(filename, data):
+    with open(filename, "w", encoding="utf-8") as json_file:
+        json.dump(data, json_file, indent=2)
+        json_file.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scheduler performance benchmarks.")
+    parser.add_argument("--sizes", nargs="+", choices=list(DATABASE_SIZES), default=list(DATABASE_SIZES))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per scenario")
+    parser.add_argument("--output", default=DEFAULT_RESULTS_FILE, help="where to write the results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown over the baseline median, as a fraction")
+    parser.add_argument("--update-baseline", action="store_true", help="store these timings as the baseline instead of comparing")
+    parser.add_argument("--regenerate", action="store_true", help="rebuild the synthetic databases")
+    arguments = parser.parse_args()
+
+    # Slow-query warnings would interleave with the report; the timings already show them
+    logging.getLogger("scheduler_core").setLevel(logging.ERROR)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "sqlite": sqlite3.sqlite_version,
+            "qt_platform": app.platformName(),
+        },
+        "repeat": arguments.repeat,
+        "sizes": {},
+    }
+    for size_label in arguments.sizes:
+        print(f"Running {size_label}...")
+        results["sizes"][size_label] = run_size(size_label, arguments.repeat, arguments.regenerate)
+    write_json(arguments.output, results)
+
+    baseline = load_json(arguments.baseline)
+    print_results(results, baseline)
+    print(f"\nResults written to {arguments.output}")
+
+    if arguments.update_baseline:
+        # Sizes that were not run keep their previous baseline
+        baseline.setdefault("sizes", {}).update(results["sizes"])
+        baseline["created"] = results["created"]
+        baseline["environment"] = results["environment"]
+        write_json(arguments.baseline, baseline)
+        print(f"Baseline updated in {arguments.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baseline, arguments.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
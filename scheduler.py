@@ -1,249 +1,650 @@
+import bisect
+import datetime
+import http.client
+import logging
+import math
+import os
 import sys
-from PyQt5.QtWidgets import QColorDialog, QAbstractItemView, QApplication, QMainWindow, QAction, QMenu, QMessageBox, QToolBar, QStatusBar, QWidget, QVBoxLayout, QLabel, QStackedWidget, QPushButton, QLineEdit, QDateEdit, QHBoxLayout, QFormLayout, QCalendarWidget, QTableView, QTextEdit, QTimeEdit, QDialog, QDialogButtonBox, QDesktopWidget, QStyledItemDelegate, QComboBox, QSpacerItem, QSizePolicy, QFrame
+import threading
+from PyQt5.QtWidgets import QSystemTrayIcon, QColorDialog, QAbstractItemView, QApplication, QMainWindow, QAction, QMenu, QMessageBox, QToolBar, QStatusBar, QWidget, QVBoxLayout, QLabel, QStackedWidget, QPushButton, QLineEdit, QDateEdit, QHBoxLayout, QFormLayout, QCalendarWidget, QTableView, QTextEdit, QTimeEdit, QDialog, QDialogButtonBox, QDesktopWidget, QStyledItemDelegate, QComboBox, QSpacerItem, QSizePolicy, QFrame, QFileDialog, QProgressDialog, QInputDialog, QCheckBox, QListWidget, QListWidgetItem, QTableWidget, QTableWidgetItem, QHeaderView, QSpinBox, QAbstractScrollArea
 from PyQt5.QtGui import QIcon, QPainter, QColor, QTextCharFormat, QStandardItemModel, QStandardItem, QBrush, QPen, QPixmap, QFont
-from PyQt5.QtCore import QDate, Qt, QEvent, QTime, pyqtSignal, QRect, QVariant, QSize
-from PyQt5.QtSql import QSqlDatabase, QSqlTableModel, QSqlQuery
-import os
+from PyQt5.QtCore import QDate, Qt, QEvent, QTime, pyqtSignal, QRect, QSize, QAbstractTableModel, QModelIndex, QTimer, QObject, QThread, pyqtSlot, QRectF, QPointF
+from collections import OrderedDict
+from concurrent.futures import Future
 
-class EventManager:
-    def __init__(self, db_filename="events.db"):
-        self.db_filename = db_filename
-        self.db = None
-        self.connection_name = f"event_db_conn_{id(self)}"
-        self.connectToDatabase()
-
-    def connectToDatabase(self):
-        self.db = QSqlDatabase.database(self.connection_name, open=False)
-        if self.db.isValid():
-            print(f"EventManager: Reusing existing database connection '{self.connection_name}'.")
-            if not self.db.isOpen():
-                if not self.db.open():
-                    print(f"EventManager: Failed to re-open existing connection: {self.db.lastError().text()}")
-                    return False
-            self.createTable()
-            return True
-
-        # If no existing valid connection, add a new one with a specific name
-        self.db = QSqlDatabase.addDatabase("QSQLITE", self.connection_name)
-        self.db.setDatabaseName(self.db_filename)
-
-
-        if not self.db.open():
-            QMessageBox.critical(None, "Database Connection Error", f"Failed to open database: {self.db.lastError().text()}")
-            self.db = None
-            return False
-
-        print(f"EventManager: Database connection opened for {self.db_filename} (Name: '{self.connection_name}')")
-        self.createTable()
-        return True
+from scheduler_core import EventChange, EventManager, EventFileTransfer, FreeSlotFinder, DayTimelineLayout, ReminderQueue, RELEVANCE_SORT_COLUMN, RemoteEventManager
+from scheduler_core.reminders import currentMinute, secondsUntilMinute
 
-    def createTable(self):
-        if self.db and self.db.isOpen():
-            query = QSqlQuery(self.db)
-            query.exec_('''
-                CREATE TABLE IF NOT EXISTS events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    event_date TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    event_time TEXT,
-                    event_color TEXT
-                )
-            ''')
-            if query.lastError().isValid():
-                print(f"EventManager: Error creating table: {query.lastError().text()}")
-            else:
-                print("EventManager: Table 'events' checked/created.")
-        else:
-            print("EventManager: Database not connected. Cannot create table")
-    
-    def addEvent(self, eventDate, eventTitle, eventDescription, eventTime, eventColor):
-        if self.db and self.db.isOpen():
-            query = QSqlQuery(self.db)
-            query.prepare('''
-                INSERT INTO events (event_date, title, description, event_time, event_color)
-                VALUES (:event_date, :title, :description, :event_time, :event_color)
-            ''')
-            query.bindValue(":event_date", eventDate)
-            query.bindValue(":title", eventTitle)
-            query.bindValue(":description", eventDescription)
-            query.bindValue(":event_time", eventTime)
-            query.bindValue(":event_color", eventColor)
-
-            if not query.exec_():
-                print(f"EventManager: Error adding event: {query.lastError().text()}")
-            else:
-                print(f"EventManager: Event added for {eventDate}: {eventTitle}")
-                return True #success
-        return False #failure
-    
-    def updateEvent(self, edited_event_data):
-        if self.db and self.db.isOpen():
-            query = QSqlQuery(self.db)
-            query.prepare('''
-                UPDATE events
-                SET
-                    event_date = :event_date,
-                    title = :title,
-                    description = :description,
-                    event_time = :event_time,
-                    event_color = :event_color
-                WHERE id = :event_id
-            ''')
-
-            val_event_date = edited_event_data.get("event_date")
-            print(f"Binding :event_date -> Value: {val_event_date}, Type: {type(val_event_date)}")
-            query.bindValue(":event_date", edited_event_data["event_date"])
-
-            val_title = edited_event_data.get("title")
-            print(f"Binding :title -> Value: '{val_title}', Type: {type(val_title)}")
-            query.bindValue(":title", edited_event_data["title"])
-
-            val_description = edited_event_data.get("description")
-            print(f"Binding :description -> Value: '{val_description}', Type: {type(val_description)}")
-            query.bindValue(":description", edited_event_data["description"])
-
-            val_event_time = edited_event_data.get("event_time")
-            print(f"Binding :event_time -> Value: {val_event_time}, Type: {type(val_event_time)}")
-            query.bindValue(":event_time", edited_event_data["event_time"])
-
-            val_event_color = edited_event_data.get("event_color")
-            print(f"Binding :event_color -> Value: '{val_event_color}', Type: {type(val_event_color)}")
-            query.bindValue(":event_color", edited_event_data["event_color"])
-
-            val_event_id = edited_event_data.get("event_id")
-            print(f"Binding :event_id -> Value: {val_event_id}, Type: {type(val_event_id)}")
-            query.bindValue(":event_id", edited_event_data["event_id"])
-
-            if not query.exec_():
-                print(f"EventManager: Error Updating event: {query.lastError().text()}")
-                print(f"Prepared Query: {query.lastQuery()}")
-                print(edited_event_data)
-            else:
-                print(f"EventManager: Event Updated for {edited_event_data["event_id"]}: {edited_event_data["event_date"]}: {edited_event_data["title"]}")
-                return True #success
-        return False #failure
-
-
-    def getEventsForDate(self, date:QDate):
-        if not self.db or not self.db.isOpen(): return []
-        query = QSqlQuery(self.db)
-        query.prepare("SELECT title, description, event_time, event_color FROM events WHERE event_date = :date")
-        date_string_for_query = date.toString(Qt.ISODate)
-        query.bindValue(":date", QVariant(date_string_for_query))
-        events = []
-        if query.exec_():
-            while query.next():
-                events.append({
-                    'title': query.value(0),
-                    'description': query.value(1),
-                    'time': query.value(2),
-                    'color':query.value(3)
-                })
-        else:
-            print(f"EventManager: Error getting events for date: {query.lastError().text()}")
-        return events
-    
-    def getAllEvents(self):
-        if not self.db or not self.db.isOpen(): return []
-        query = QSqlQuery(self.db)
-        query.prepare("SELECT id, event_date, title, description, event_time, event_color FROM events")
-        events = []
-        if query.exec_():
-            while query.next():
-                event_date_raw = query.value(1)
-                q_date = QDate()
-                if isinstance(event_date_raw, str):
-                    q_date = QDate.fromString(event_date_raw, "yyyy-MM-dd")
-
-                events.append({
-                    'id': query.value(0),
-                    'event_date': q_date,
-                    'title': query.value(2),
-                    'description': query.value(3),
-                    'event_time': query.value(4),
-                    'event_color': query.value(5)
-                })
+logger = logging.getLogger("scheduler")
+
+class DatabaseWorker(QObject):
+    # Runs EventManager calls on a background QThread. The manager hands this thread its own
+    # pooled connection on first use, because connections cannot be shared between threads.
+    call_finished = pyqtSignal(object, object)
+    call_failed = pyqtSignal(object, object)
+    import_progress = pyqtSignal(object, object)
+    export_progress = pyqtSignal(object)
+
+    def __init__(self, event_manager:EventManager):
+        super().__init__()
+        self.event_manager = event_manager
+
+    @pyqtSlot(object, object, tuple, dict)
+    def run(self, future, method, args, kwargs):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            function = getattr(self.event_manager, method) if isinstance(method, str) else method
+            result = function(*args, **kwargs)
+        except Exception as error:
+            self.call_failed.emit(future, error)
         else:
-            print(f"EventManager: Error getting all events: {query.lastError().text()}")
-        return events
-    
-    def getAllEventDates(self):
-        all_events = self.getAllEvents()
-        all_event_dates = []
-        for event in all_events:
-            if 'event_date' in event and isinstance(event['event_date'], QDate):
-                all_event_dates.append(event['event_date'])
-        return all_event_dates
-    
-    def getEventDetailsbyId(self, id):
-        if not self.db or not self.db.isOpen(): return []
-        query = QSqlQuery(self.db)
-        query.prepare(f"SELECT id, event_date, title, description, event_time, event_color FROM events WHERE id = {id}")
-        id_specific_event_details = []
-        if query.exec_():
-            while query.next():
-                id_specific_event_details.append({
-                    'id': query.value(0),
-                    'event_date': query.value(1),
-                    'title': query.value(2),
-                    'description': query.value(3),
-                    'event_time': query.value(4),
-                    'event_color': query.value(5)
-                })
+            self.call_finished.emit(future, result)
+
+    @pyqtSlot(object, str, object)
+    def import_file(self, future, file_path, cancel_event):
+        # Progress goes out as a signal; setting cancel_event rolls the import back at the next batch
+        if not future.set_running_or_notify_cancel():
+            return
+
+        def on_progress(bytes_read, total_bytes):
+            self.import_progress.emit(bytes_read, total_bytes)
+            return not cancel_event.is_set()
+
+        try:
+            result = EventFileTransfer(self.event_manager).importFile(file_path, on_progress)
+        except Exception as error:
+            self.call_failed.emit(future, error)
         else:
-            print("The query did not execute!")
-        return id_specific_event_details
-    
-    def deleteEvent(self, eventId):
-        if not self.db or not self.db.isOpen(): return []
-        query = QSqlQuery(self.db)
-        query.prepare(f"DELETE FROM events WHERE id = {eventId}")
-        if not query.exec_():
-            print(f"EventManager: Error deleting event with ID {eventId}: {query.lastError().text()}")
-            return False
+            self.call_finished.emit(future, result)
+
+    @pyqtSlot(object, str, object)
+    def export_file(self, future, file_path, cancel_event):
+        # Progress goes out as a signal; setting cancel_event stops the export at the next batch
+        if not future.set_running_or_notify_cancel():
+            return
+
+        def on_progress(exported_count):
+            self.export_progress.emit(exported_count)
+            return not cancel_event.is_set()
+
+        try:
+            result = EventFileTransfer(self.event_manager).exportFile(file_path, on_progress)
+        except Exception as error:
+            self.call_failed.emit(future, error)
         else:
-            print(f"EventManager: Event with ID {eventId} deleted.")
-            return True
+            self.call_finished.emit(future, result)
+
+    @pyqtSlot()
+    def close(self):
+        self.event_manager.closeConnection()
+
+class DatabaseExecutor(QObject):
+    # submit("getEventPage", ...) queues an EventManager call on the worker thread and returns a
+    # concurrent.futures.Future; submit(function, ...) runs anything else that reads through the
+    # manager there (a FreeSlotFinder search, the reminder queue). Futures are resolved on the
+    # GUI thread, so done callbacks can touch widgets directly. Pending calls can be dropped
+    # with future.cancel().
+    call_submitted = pyqtSignal(object, object, tuple, dict)
+    import_submitted = pyqtSignal(object, str, object)
+    export_submitted = pyqtSignal(object, str, object)
+    close_requested = pyqtSignal()
+
+    def __init__(self, event_manager:EventManager, parent=None):
+        super().__init__(parent)
+        self.worker_thread = QThread(self)
+        self.worker = DatabaseWorker(event_manager)
+        self.worker.moveToThread(self.worker_thread)
+        self.call_submitted.connect(self.worker.run)
+        self.import_submitted.connect(self.worker.import_file)
+        self.export_submitted.connect(self.worker.export_file)
+        self.close_requested.connect(self.worker.close, Qt.BlockingQueuedConnection)
+        self.worker.call_finished.connect(self.on_call_finished)
+        self.worker.call_failed.connect(self.on_call_failed)
+        self.worker_thread.start()
+
+    def submit(self, method, *args, **kwargs):
+        future = Future()
+        self.call_submitted.emit(future, method, args, kwargs)
+        return future
+
+    def submit_action(self, busy_widgets, on_result, method, *args, **kwargs):
+        # submit() for a user action: busy_widgets (buttons, actions) are disabled until it
+        # finishes, so it cannot be started twice, then on_result(result) runs on the GUI thread,
+        # with None if the call raised (the error is logged by on_call_failed)
+        for widget in busy_widgets:
+            widget.setEnabled(False)
+
+        def on_done(future):
+            for widget in busy_widgets:
+                widget.setEnabled(True)
+            if not future.cancelled():
+                on_result(future.result() if future.exception() is None else None)
+        future = self.submit(method, *args, **kwargs)
+        future.add_done_callback(on_done)
+        return future
+
+    def submit_import(self, file_path, cancel_event):
+        # Imports a file on the worker thread, so the write transaction never shares the GUI
+        # thread with re-entrant UI actions. Progress arrives through worker.import_progress.
+        future = Future()
+        self.import_submitted.emit(future, file_path, cancel_event)
+        return future
+
+    def submit_export(self, file_path, cancel_event):
+        # Exports to a file on the worker thread, reading through its own connection. Progress
+        # arrives through worker.export_progress.
+        future = Future()
+        self.export_submitted.emit(future, file_path, cancel_event)
+        return future
+
+    def on_call_finished(self, future, result):
+        future.set_result(result)
+
+    def on_call_failed(self, future, error):
+        logger.error("Background query failed: %s", error)
+        future.set_exception(error)
+
+    def shutdown(self):
+        if self.worker_thread.isRunning():
+            self.close_requested.emit()
+            self.worker_thread.quit()
+            self.worker_thread.wait()
+
+class EventChangeNotifier(QObject):
+    # Re-emits EventManager change notifications as a Qt signal. Writes made on another thread
+    # arrive queued on the GUI thread, so slots can patch widgets directly.
+    events_changed = pyqtSignal(list)
+
+    def __init__(self, event_manager:EventManager, parent=None):
+        super().__init__(parent)
+        self.event_manager = event_manager
+        self.event_manager.addChangeListener(self.events_changed.emit)
 
-    def closeConnection(self):
-        if self.db and self.db.isOpen():
-            self.db.close()
-            print("EventManager: Database connection closed.")
+    def close(self):
+        self.event_manager.removeChangeListener(self.events_changed.emit)
+
+class ReminderScheduler(QObject):
+    # Delivers reminders from a ReminderQueue with one single-shot timer armed for the earliest
+    # pending reminder (or the end of the loaded horizon). Nothing polls: the timer is only
+    # re-armed when it fires or when events change. The queue reads the database, so it is only
+    # ever touched on the executor's worker thread; the timer is armed from what it answers.
+    reminders_due = pyqtSignal(list)
+
+    def __init__(self, event_manager:EventManager, executor:DatabaseExecutor, parent=None):
+        super().__init__(parent)
+        self.queue = ReminderQueue(event_manager)
+        self.executor = executor
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        # Coarse timers may be late by 5% of the interval, which is minutes for a reminder hours away
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.deliver_due_reminders)
+        self.update_queue(self.queue.rebuild)
+
+    def update_queue(self, operation, *args):
+        # Runs operation(*args, now_minute) on the worker, then emits whatever reminders it
+        # returned and re-arms the timer. The worker runs calls in order and their futures
+        # resolve in order, so the last answer always reflects every earlier operation.
+        def run():
+            due_reminders = operation(*args, currentMinute())
+            return due_reminders or [], self.queue.nextWakeMinute()
+        self.executor.submit(run).add_done_callback(self.on_queue_updated)
+
+    def on_queue_updated(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        due_reminders, wake_minute = future.result()
+        if due_reminders:
+            self.reminders_due.emit(due_reminders)
+        self.timer.start(max(0, math.ceil(secondsUntilMinute(wake_minute) * 1000)))
+
+    def apply_changes(self, changes):
+        self.update_queue(self.queue.applyChanges, changes)
+
+    def deliver_due_reminders(self):
+        self.update_queue(self.queue.popDue)
+
+    def close(self):
+        # Saves how far reminders were handed out, so the next start catches up from there;
+        # queued ahead of the executor's shutdown, so it runs before the worker closes
+        self.timer.stop()
+        self.executor.submit(self.queue.saveProgress)
+
+class RenderCache:
+    # Size-bounded LRU of pre-rendered pixmaps, shared by every view that paints color swatches
+    # or calendar dots, so a repaint is a blit. Keys include the logical size and the device
+    # pixel ratio, and pixmaps are drawn at device resolution, so screens with different
+    # scaling get their own entries.
+    dot_radius = 3
+    dot_spacing = 7
+    # Space kept for a "+N" badge at the start of a dot strip
+    overflow_badge_width = 26
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.pixmaps = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.pixmaps),
+            'bytes': self.total_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else None
+        }
 
-        if QSqlDatabase.contains(self.connection_name):
-            QSqlDatabase.removeDatabase(self.connection_name)
-            print(f"EventManager: Connection '{self.connection_name}' removed from pool.")
+    def clear(self):
+        self.pixmaps.clear()
+        self.total_bytes = 0
+
+    def cachedPixmap(self, key, width, height, device_pixel_ratio, render):
+        # render(painter) draws in logical coordinates onto a transparent width x height pixmap
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            self.pixmaps.move_to_end(key)
+            return pixmap
+        self.misses += 1
+        pixmap = QPixmap(max(1, math.ceil(width * device_pixel_ratio)), max(1, math.ceil(height * device_pixel_ratio)))
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        render(painter)
+        painter.end()
+        self.pixmaps[key] = pixmap
+        self.total_bytes += pixmap.width() * pixmap.height() * 4
+        while self.total_bytes > self.max_bytes and len(self.pixmaps) > 1:
+            _, evicted = self.pixmaps.popitem(last=False)
+            self.total_bytes -= evicted.width() * evicted.height() * 4
+        return pixmap
+
+    def swatch(self, color_code, side, device_pixel_ratio):
+        # A side x side square of the color, or None when color_code is not a valid color
+        if side <= 0:
+            return None
+        color = QColor(color_code)
+        if not color.isValid():
+            return None
+
+        def render(painter):
+            painter.fillRect(0, 0, side, side, color)
+        return self.cachedPixmap(("swatch", color_code, side, device_pixel_ratio), side, side, device_pixel_ratio, render)
+
+    def dotStrip(self, colors, overflow_count, device_pixel_ratio):
+        # A row of event dots, the first color rightmost, preceded by a "+N" badge when
+        # overflow_count events are left out. colors must be a tuple.
+        badge_width = self.overflow_badge_width if overflow_count else 0
+        width = badge_width + len(colors) * self.dot_spacing
+        height = self.dot_radius * 2 + 2
+
+        def render(painter):
+            painter.setPen(Qt.NoPen)
+            for position, color in enumerate(colors):
+                painter.setBrush(QColor(color))
+                center_x = width - position * self.dot_spacing - self.dot_spacing / 2
+                painter.drawEllipse(QPointF(center_x, height / 2), self.dot_radius, self.dot_radius)
+            if overflow_count:
+                font = painter.font()
+                font.setPixelSize(height)
+                font.setBold(True)
+                painter.setFont(font)
+                painter.setPen(QColor("#555555"))
+                painter.drawText(QRectF(0, -1, badge_width - 1, height + 2), Qt.AlignRight | Qt.AlignVCenter, f"+{overflow_count}")
+        return self.cachedPixmap(("dots", colors, overflow_count, device_pixel_ratio), width, height, device_pixel_ratio, render)
+
+# Shared by the event list's color column and the month calendar
+render_cache = RenderCache()
 
 class ColorDelegate(QStyledItemDelegate):
+    # Color cells are drawn as a cached swatch centred in the cell, 8px smaller than it
+    def __init__(self, parent=None, cache=None):
+        super().__init__(parent)
+        self.cache = cache if cache is not None else render_cache
+
     def paint(self, painter, option, index):
         if index.column() == 5: # "Event Color" Column
             color_code = index.data(Qt.DisplayRole)
             if color_code:
-                color = QColor(color_code)
-                if color.isValid():
-                    painter.save()
-                    painter.setRenderHint(QPainter.Antialiasing)
-
-                    # Calculate the size of the square
-                    side = min(option.rect.height(), option.rect.width()) - 8 # Subtract 8px for padding
-                    
-                    # Calculate the position to center the square
-                    x = option.rect.x() + (option.rect.width() - side) / 2
-                    y = option.rect.y() + (option.rect.height() - side) / 2
-                    
-                    # Create the new, smaller rectangle
-                    color_rect = QRect(int(x), int(y), int(side), int(side))
-
-                    painter.setBrush(color)
-                    painter.setPen(Qt.NoPen)
-                    painter.drawRect(color_rect)
-                    painter.restore()
+                side = min(option.rect.height(), option.rect.width()) - 8 # Subtract 8px for padding
+                swatch = self.cache.swatch(color_code, side, painter.device().devicePixelRatioF())
+                if swatch is not None:
+                    painter.drawPixmap(option.rect.x() + (option.rect.width() - side) // 2, option.rect.y() + (option.rect.height() - side) // 2, swatch)
         else:
             super().paint(painter, option, index)
 
+class EventTableModel(QAbstractTableModel):
+    # Rows are fetched a page at a time (canFetchMore/fetchMore) using keyset pagination on the
+    # current sort column. Only the most recently used pages are kept; the (sort key, id) that
+    # ends each page and its row count are remembered, so an evicted page can be re-read with one
+    # indexed query. Pages shrink and grow as applyChanges patches single rows in and out.
+    # With a DatabaseExecutor, pages load on the worker thread and rows appear as they arrive;
+    # the GUI thread never waits on a read.
+    page_size = 256
+    max_cached_pages = 40
+    # Change batches larger than this reload the model instead of patching row by row
+    max_patched_changes = 200
+
+    headers = ["ID", "Date", "Title", "Description", "Time", "Event Color", "Duration (min)"]
+
+    def __init__(self, event_manager:EventManager, executor=None, parent=None):
+        super().__init__(parent)
+        self.event_manager = event_manager
+        self.executor = executor
+        self.filter_clause = ""
+        self.filter_values = {}
+        self.match_expression = None
+        self.sort_column = 0
+        self.sort_order = Qt.AscendingOrder
+        # Bumped on every reset so results of page requests made before it are dropped
+        self.generation = 0
+        self.resetPages()
+
+    def resetPages(self):
+        self.generation += 1
+        # Cached rows keep the sort key as a trailing column, past the displayed columns
+        self.pages = OrderedDict()
+        # page number -> Future of the worker's read
+        self.pending_pages = {}
+        # Future of the rows applyChanges is putting back, while the worker reads them
+        self.pending_patch = None
+        self.page_end_keys = []
+        self.page_row_counts = []
+        # First row of each page
+        self.page_offsets = []
+        self.loaded_row_count = 0
+        self.reached_end = False
+        # Page of the last cell read; cells from the same page count as one cache lookup
+        self.last_read_page = None
+
+    def setFilter(self, filter_clause, filter_values=None):
+        self.filter_clause = filter_clause
+        self.filter_values = filter_values or {}
+
+    def setMatchExpression(self, match_expression):
+        self.match_expression = match_expression
+
+    def select(self):
+        self.beginResetModel()
+        self.resetPages()
+        self.endResetModel()
+        if self.canFetchMore():
+            self.fetchMore()
+        return self.executor is not None or self.loaded_row_count > 0 or self.reached_end
+
+    def clear(self):
+        self.beginResetModel()
+        self.resetPages()
+        self.reached_end = True
+        self.endResetModel()
+
+    def pageQueryArguments(self, page_number, event_ids=None):
+        after_key = self.page_end_keys[page_number - 1] if page_number > 0 else None
+        limit = self.page_row_counts[page_number] if page_number < len(self.page_row_counts) else self.page_size
+        return (
+            self.sort_column,
+            self.sort_order == Qt.DescendingOrder,
+            after_key,
+            len(event_ids) if event_ids is not None else limit,
+            self.filter_clause,
+            self.filter_values,
+            self.match_expression,
+            event_ids
+        )
+
+    def storePage(self, page_number, rows):
+        self.pages[page_number] = list(rows)
+        self.pages.move_to_end(page_number)
+        while len(self.pages) > self.max_cached_pages:
+            self.pages.popitem(last=False)
+
+        if page_number == len(self.page_end_keys) and rows:
+            self.page_end_keys.append(self.rowKey(rows[-1]))
+            self.page_offsets.append(self.loaded_row_count)
+            self.page_row_counts.append(len(rows))
+        return self.pages[page_number]
+
+    def readPage(self, page_number):
+        rows = self.event_manager.getEventPage(*self.pageQueryArguments(page_number))
+        if rows is None:
+            return None
+        return self.storePage(page_number, rows)
+
+    def requestPage(self, page_number):
+        # Returns the Future of the page's read; a page already being read is not read twice
+        future = self.pending_pages.get(page_number)
+        if future is None:
+            generation = self.generation
+            future = self.pending_pages[page_number] = self.executor.submit("getEventPage", *self.pageQueryArguments(page_number))
+            future.add_done_callback(lambda future: self.on_page_loaded(generation, page_number, future))
+        return future
+
+    def on_page_loaded(self, generation, page_number, future):
+        if generation != self.generation or future.cancelled():
+            return
+        self.pending_pages.pop(page_number, None)
+        rows = future.result() if future.exception() is None else None
+
+        if page_number == len(self.page_end_keys):
+            self.appendPage(page_number, rows)
+        elif rows is not None:
+            self.storePage(page_number, rows)
+            first_row = self.page_offsets[page_number]
+            last_row = first_row + self.page_row_counts[page_number] - 1
+            if last_row >= first_row:
+                self.dataChanged.emit(self.index(first_row, 0), self.index(last_row, len(self.headers) - 1))
+
+    def appendPage(self, page_number, rows):
+        if rows is None:
+            self.reached_end = True
+            return
+        if len(rows) < self.page_size:
+            self.reached_end = True
+        if rows:
+            self.beginInsertRows(QModelIndex(), self.loaded_row_count, self.loaded_row_count + len(rows) - 1)
+            self.storePage(page_number, rows)
+            self.loaded_row_count += len(rows)
+            self.endInsertRows()
+
+    def locateRow(self, row):
+        # (page number, row within the page); pages emptied by deletions share their offset with
+        # the next page, so the last page starting at or before the row is the one holding it
+        page_number = bisect.bisect_right(self.page_offsets, row) - 1
+        return page_number, row - self.page_offsets[page_number]
+
+    def pageForRow(self, row):
+        # (page holding the row, row within it); the page is empty while it is being loaded
+        page_number, row_in_page = self.locateRow(row)
+        page = self.pages.get(page_number)
+        if page_number != self.last_read_page:
+            self.last_read_page = page_number
+            self.event_manager.instrumentation.recordCacheLookup("event_page_cache", page is not None)
+        if page is not None:
+            self.pages.move_to_end(page_number)
+        elif self.executor is None:
+            page = self.readPage(page_number) or []
+        else:
+            # Paint blank cells now and fill them in when the worker returns the page
+            self.requestPage(page_number)
+            page = []
+        return page, row_in_page
+
+    def requestEventIds(self, rows, callback):
+        # Calls callback with the event ids of rows. Rows in evicted pages are read again first,
+        # on the worker when there is one; if the model is reset meanwhile the rows no longer
+        # mean the same events and callback is never called.
+        locations = [self.locateRow(row) for row in rows if row < self.loaded_row_count]
+        page_numbers = {page_number for page_number, _ in locations}
+        pages = {page_number: self.pages[page_number] for page_number in page_numbers if page_number in self.pages}
+        missing_pages = page_numbers - pages.keys()
+
+        def finish():
+            callback([pages[page_number][row_in_page][0] for page_number, row_in_page in locations if row_in_page < len(pages[page_number])])
+
+        if self.executor is None:
+            for page_number in missing_pages:
+                pages[page_number] = self.readPage(page_number) or []
+            finish()
+            return
+        if not missing_pages:
+            finish()
+            return
+        generation = self.generation
+
+        def on_page_read(page_number, future):
+            if generation != self.generation or future.cancelled():
+                return
+            pages[page_number] = (future.result() if future.exception() is None else None) or []
+            if len(pages) == len(page_numbers):
+                finish()
+
+        for page_number in missing_pages:
+            self.requestPage(page_number).add_done_callback(lambda future, page_number=page_number: on_page_read(page_number, future))
+
+    def rowKey(self, row):
+        return (row[-1], row[0])
+
+    def sortsBefore(self, key, other_key):
+        return key > other_key if self.sort_order == Qt.DescendingOrder else key < other_key
+
+    def applyChanges(self, changes):
+        # Patches the loaded rows for added, updated and deleted events: changed rows are taken
+        # out where they were and the rows that still match the filter are put back at their sort
+        # position, so one edit touches one or two rows. Falls back to select() for imports, large
+        # batches and rows it cannot place (they sit in evicted pages, or pages are loading).
+        event_changes = [change for change in changes if change.event_id is not None]
+        if any(change.kind == EventChange.RELOADED for change in changes) or len(event_changes) > self.max_patched_changes:
+            self.select()
+            return
+        if not event_changes:
+            return
+        if self.pending_pages or self.pending_patch is not None:
+            self.select()
+            return
+
+        changed_ids = {change.event_id for change in event_changes}
+        old_locations = {}
+        for page_number, page in self.pages.items():
+            for row_in_page, row in enumerate(page):
+                if row[0] in changed_ids:
+                    old_locations[row[0]] = (page_number, row_in_page)
+        all_pages_cached = len(self.pages) == len(self.page_end_keys)
+        if not all_pages_cached and any(change.kind != EventChange.ADDED and change.event_id not in old_locations for change in event_changes):
+            self.select()
+            return
+
+        for page_number, row_in_page in sorted(old_locations.values(), reverse=True):
+            self.removeRowAt(page_number, row_in_page)
+        current_ids = [change.event_id for change in event_changes if change.kind != EventChange.DELETED]
+        if not current_ids:
+            return
+        if self.executor is None:
+            for row in self.event_manager.getEventPage(*self.pageQueryArguments(0, current_ids)) or []:
+                self.insertRowSorted(row)
+            return
+        generation = self.generation
+        self.pending_patch = self.executor.submit("getEventPage", *self.pageQueryArguments(0, current_ids))
+        self.pending_patch.add_done_callback(lambda future: self.on_patch_loaded(generation, future))
+
+    def on_patch_loaded(self, generation, future):
+        if generation != self.generation or future.cancelled():
+            return
+        self.pending_patch = None
+        rows = future.result() if future.exception() is None else None
+        if rows is None:
+            # The changed rows are out and cannot be put back
+            self.select()
+            return
+        for row in rows:
+            self.insertRowSorted(row)
+
+    def removeRowAt(self, page_number, row_in_page):
+        row = self.page_offsets[page_number] + row_in_page
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.pages[page_number][row_in_page]
+        self.page_row_counts[page_number] -= 1
+        for later_page in range(page_number + 1, len(self.page_offsets)):
+            self.page_offsets[later_page] -= 1
+        self.loaded_row_count -= 1
+        self.endRemoveRows()
+
+    def insertRowSorted(self, row):
+        key = self.rowKey(row)
+        # The first page ending at or after the row holds it; past the last loaded page only the
+        # final page of a fully loaded model can take it, otherwise fetchMore will bring it in
+        page_number = next((number for number, end_key in enumerate(self.page_end_keys) if not self.sortsBefore(end_key, key)), None)
+        if page_number is None:
+            if not self.reached_end:
+                return
+            if not self.page_end_keys:
+                self.page_end_keys.append(key)
+                self.page_offsets.append(0)
+                self.page_row_counts.append(0)
+                self.pages[0] = []
+            page_number = len(self.page_end_keys) - 1
+            self.page_end_keys[page_number] = key
+
+        page = self.pages.get(page_number)
+        if page is None:
+            # Not cached: the row will be part of the page when it is next read
+            row_in_page = self.page_row_counts[page_number]
+        else:
+            row_in_page = next((index for index, page_row in enumerate(page) if self.sortsBefore(key, self.rowKey(page_row))), len(page))
+        first_row = self.page_offsets[page_number] + row_in_page
+        self.beginInsertRows(QModelIndex(), first_row, first_row)
+        if page is not None:
+            page.insert(row_in_page, row)
+        self.page_row_counts[page_number] += 1
+        for later_page in range(page_number + 1, len(self.page_offsets)):
+            self.page_offsets[later_page] += 1
+        self.loaded_row_count += 1
+        self.endInsertRows()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        # Not while a patch is in flight: the next page could already hold the rows it puts back
+        return not parent.isValid() and not self.reached_end and len(self.page_end_keys) not in self.pending_pages and self.pending_patch is None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        page_number = len(self.page_end_keys)
+        if self.executor is None:
+            self.appendPage(page_number, self.event_manager.getEventPage(*self.pageQueryArguments(page_number)))
+        else:
+            self.requestPage(page_number)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded_row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        page, row_in_page = self.pageForRow(index.row())
+        if row_in_page >= len(page):
+            return None
+        return page[row_in_page][index.column()]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # A cleared sort indicator arrives as column -1, which means relevance order when searching
+        self.sort_column = column if column >= 0 else RELEVANCE_SORT_COLUMN
+        self.sort_order = order
+        self.select()
+
 class EventViewerPage(QWidget):
-    def __init__(self, event_manager):
+    def __init__(self, event_manager, executor=None):
         super().__init__()
         layout = QVBoxLayout()
         headerLabel = QLabel("Event List")
@@ -253,8 +654,16 @@ class EventViewerPage(QWidget):
 
         filter_layout = QHBoxLayout()
         self.title_filter_box = QLineEdit()
-        self.title_filter_box.setPlaceholderText("Enter Event Title to Filter")
+        self.title_filter_box.setPlaceholderText("Search Titles and Descriptions")
         self.title_filter_box.setFixedWidth(200)
+        self.title_filter_box.setClearButtonEnabled(True)
+        self.title_filter_box.textEdited.connect(self.on_search_text_edited)
+
+        # Search as you type, but only once typing pauses
+        self.search_debounce_timer = QTimer(self)
+        self.search_debounce_timer.setSingleShot(True)
+        self.search_debounce_timer.setInterval(250)
+        self.search_debounce_timer.timeout.connect(self.apply_filters)
 
         self.date_filter_label = QLabel("Event Date is")
         self.date_comparison_selector = QComboBox()
@@ -288,30 +697,22 @@ class EventViewerPage(QWidget):
         filter_layout.addWidget(separator2)
         filter_layout.addWidget(apply_filter_button)
         filter_layout.addWidget(clear_filter_button)
-        
-        filter_layout.addItem(spacer)
+
+        # The layout owns its items, so each side needs a spacer of its own
+        filter_layout.addItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
         layout.addLayout(filter_layout)
 
         self.event_manager = event_manager
-        if not (self.event_manager.db and self.event_manager.db.isOpen()):
+        if not self.event_manager.isConnected():
             QMessageBox.critical(self, "Application Error", "Database connection failed to open via EventManager.")
             sys.exit(1) # Critical error, cannot proceed
 
-        print("Main App: EventManager database connection is ready.")
-
-        self.model = QSqlTableModel(self, self.event_manager.db)
-        self.model.setTable("events")
-        self.model.setEditStrategy(QSqlTableModel.OnFieldChange)
+        logger.info("EventManager database connection is ready.")
 
-        self.model.setHeaderData(0, Qt.Horizontal, "ID")
-        self.model.setHeaderData(1, Qt.Horizontal, "Date")
-        self.model.setHeaderData(2, Qt.Horizontal, "Title")
-        self.model.setHeaderData(3, Qt.Horizontal, "Description")
-        self.model.setHeaderData(4, Qt.Horizontal, "Time")
-        self.model.setHeaderData(5, Qt.Horizontal, "Event Color")
+        self.model = EventTableModel(self.event_manager, executor, self)
 
         if not self.model.select():
-            QMessageBox.critical(self, "Model Select Error", f"Failed to select data: {self.model.lastError().text()}")
+            QMessageBox.critical(self, "Model Select Error", "Failed to select data from the events table.")
             self.event_manager.closeConnection()
             sys.exit(1)
         
@@ -324,7 +725,6 @@ class EventViewerPage(QWidget):
         self.table_view.setAlternatingRowColors(True)
         self.table_view.setSelectionBehavior(QTableView.SelectRows)
         self.table_view.hideColumn(0) #Hides ID column
-        #self.table_view.selectionModel().selectionChanged.connect(self.on_selection_changed) # if you want on_selection changed run every time you select a different row
 
         self.color_delegate = ColorDelegate(self.table_view)
         self.table_view.setItemDelegateForColumn(5, self.color_delegate)
@@ -334,52 +734,68 @@ class EventViewerPage(QWidget):
         self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.setLayout(layout)
 
-    def on_selection_changed(self):
-        self.get_selected_row_and_return_event_id()
+    def request_selected_event_ids(self, callback):
+        # callback gets the ids of the selected rows, once any evicted pages holding them are read
+        selected_row_indexes = self.table_view.selectionModel().selectedRows()
+        self.model.requestEventIds([index.row() for index in selected_row_indexes], callback)
 
-    def get_selected_row_and_return_event_id(self):
-        selection_model = self.table_view.selectionModel()
-        selected_row_indexes = selection_model.selectedRows()
-
-        if selected_row_indexes and len(selected_row_indexes) == 1:
-            row_number = (selected_row_indexes[0]).row()
-            id = self.model.data(self.model.index(row_number, 0))
-            return id
-        
     def refresh_events_data(self):
         if not self.model.select():
-            print(f"EventViewerPage: Error refreshing data: {self.model.lastError().text()}")
-
-    def on_apply_filter_button_clicked(self):
-        selected_date = (self.date_selector_filter.date()).toString("yyyy-MM-dd")
-        if self.title_filter_box.text() != "":
-            if self.date_comparison_selector.currentText() != "None":
-                self.model.setFilter(f"LOWER(title) LIKE '%{self.title_filter_box.text()}%' AND event_date {self.date_comparison_selector.currentText()} '{selected_date}'")
-            else:
-                self.model.setFilter(f"LOWER(title) LIKE '%{self.title_filter_box.text()}%'")
+            logger.error("Error refreshing event list data.")
+
+    def on_search_text_edited(self, text):
+        self.search_debounce_timer.start()
+
+    def apply_filters(self):
+        self.search_debounce_timer.stop()
+        filter_clause = ""
+        filter_values = {}
+        date_comparison = self.date_comparison_selector.currentText()
+        if date_comparison != "None":
+            filter_clause, filter_values = self.event_manager.dateFilter(date_comparison, self.date_selector_filter.date().toPyDate())
+
+        match_expression = self.event_manager.ftsMatchExpression(self.title_filter_box.text())
+        self.model.setFilter(filter_clause, filter_values)
+        self.model.setMatchExpression(match_expression)
+        header = self.table_view.horizontalHeader()
+        if match_expression and header.sortIndicatorSection() != -1:
+            # Clearing the sort indicator re-sorts the model by relevance
+            header.setSortIndicator(-1, Qt.AscendingOrder)
         else:
-            if self.date_comparison_selector.currentText() != "None":
-                self.model.setFilter(f"event_date {self.date_comparison_selector.currentText()} '{selected_date}'")
-            else:
-                QMessageBox.warning(self, "Invalid Filter Details", "Please edit the filter details to have valid filters and then re-apply the filter.")
+            self.model.select()
+        return bool(filter_clause or match_expression)
 
-        self.model.select()
+    def on_apply_filter_button_clicked(self):
+        if not self.apply_filters():
+            QMessageBox.warning(self, "Invalid Filter Details", "Please edit the filter details to have valid filters and then re-apply the filter.")
 
-            
     def on_clear_filter_button_clicked(self):
+        self.search_debounce_timer.stop()
+        self.title_filter_box.clear()
+        self.date_comparison_selector.setCurrentText("None")
         self.model.setFilter("")
+        self.model.setMatchExpression(None)
         self.model.select()
 
 
 
 class MainSchedulingCalendar(QCalendarWidget):
-    def __init__(self, event_manager:EventManager):
+    max_event_dots = 12
+
+    def __init__(self, event_manager:EventManager, executor=None, cache=None):
         super().__init__()
         self.event_manager = event_manager
-
-
-        self.cached_event_dates = set()
+        self.executor = executor
+        self.cache = cache if cache is not None else render_cache
+        self.pending_summaries_future = None
+        # Bumped by every full load so partial refreshes requested before it are dropped
+        self.summaries_generation = 0
+
+        # Maps ISO date strings to {'count', 'colors'} for that day. Covers the visible month
+        # plus one month either side so paintCell never has to query the database.
+        self.event_summaries_by_date = {}
         self.load_event_dates()
+        self.currentPageChanged.connect(self.on_current_page_changed)
 
         self.apply_stylesheet()
 
@@ -391,32 +807,94 @@ class MainSchedulingCalendar(QCalendarWidget):
         self.setDateTextFormat(QDate.currentDate(), today_format)
 
     def load_event_dates(self):
-        self.cached_event_dates = self.event_manager.getAllEventDates()
-        self.update()
+        self.event_manager.instrumentation.increment("calendar.summary_loads")
+        first_of_month = QDate(self.yearShown(), self.monthShown(), 1)
+        range_start = first_of_month.addMonths(-1)
+        range_end = first_of_month.addMonths(2).addDays(-1)
+        self.summary_range = (range_start, range_end)
+        self.summaries_generation += 1
+        if self.executor is None:
+            self.event_summaries_by_date = self.event_manager.getEventDateSummaries(range_start.toPyDate(), range_end.toPyDate(), self.max_event_dots)
+            self.updateCells()
+            return
+
+        # Keep painting the current cache until the worker answers; a newer request supersedes this one
+        if self.pending_summaries_future:
+            self.pending_summaries_future.cancel()
+        self.pending_summaries_future = self.executor.submit("getEventDateSummaries", range_start.toPyDate(), range_end.toPyDate(), self.max_event_dots)
+        self.pending_summaries_future.add_done_callback(self.on_event_summaries_loaded)
+
+    def on_event_summaries_loaded(self, future):
+        if future is not self.pending_summaries_future or future.cancelled() or future.exception():
+            return
+        self.pending_summaries_future = None
+        self.event_summaries_by_date = future.result()
+        self.updateCells()
+
+    def on_current_page_changed(self, year, month):
+        self.load_event_dates()
+
+    def apply_changes(self, changes):
+        # Re-reads the summaries of just the cached days the changes touch, plus the day after
+        # each (an event running past midnight can change its conflict outline), and repaints
+        # only those cells. Recurring-series changes and imports reload the whole range.
+        if self.pending_summaries_future or any(change.kind in (EventChange.SERIES_CHANGED, EventChange.RELOADED) for change in changes):
+            self.load_event_dates()
+            return
+        range_start, range_end = self.summary_range
+        affected_dates = set()
+        for change in changes:
+            for iso_date in change.affectedDates():
+                date = QDate.fromString(iso_date, Qt.ISODate)
+                affected_dates.update(day for day in (date, date.addDays(1)) if range_start <= day <= range_end)
+        if not affected_dates:
+            return
+        first_date, last_date = min(affected_dates).toPyDate(), max(affected_dates).toPyDate()
+        if self.executor is None:
+            self.patch_event_summaries(affected_dates, self.event_manager.getEventDateSummaries(first_date, last_date, self.max_event_dots))
+            return
+        generation = self.summaries_generation
+        future = self.executor.submit("getEventDateSummaries", first_date, last_date, self.max_event_dots)
+        future.add_done_callback(lambda future: self.on_changed_summaries_loaded(generation, affected_dates, future))
+
+    def on_changed_summaries_loaded(self, generation, affected_dates, future):
+        if generation != self.summaries_generation or future.cancelled() or future.exception():
+            return
+        self.patch_event_summaries(affected_dates, future.result())
+
+    def patch_event_summaries(self, dates, summaries):
+        for date in dates:
+            iso_date = date.toString(Qt.ISODate)
+            if iso_date in summaries:
+                self.event_summaries_by_date[iso_date] = summaries[iso_date]
+            else:
+                self.event_summaries_by_date.pop(iso_date, None)
+            self.updateCell(date)
 
     def paintCell(self, painter:QPainter, rect:QRect, date:QDate):
         
         super().paintCell(painter, rect, date)
 
-        if date in self.cached_event_dates:
-
-            events_for_this_date = self.event_manager.getEventsForDate(date)
-            events_painted_number_padding = 0
-            for event in events_for_this_date:
+        self.event_manager.instrumentation.increment("calendar.paint_cell")
+        summary_for_this_date = self.event_summaries_by_date.get(date.toString(Qt.ISODate))
+        if summary_for_this_date:
+            if summary_for_this_date.get('conflict'):
+                # Days with overlapping events get a red outline
                 painter.save()
-                color = event['color']
-
-                painter.setBrush(QBrush(QColor(color)))
-                painter.setPen(Qt.NoPen)
-
-                radius = 3
-                center_x = rect.bottomRight().x() - events_painted_number_padding - 5
-                center_y = rect.bottom() - radius - 2
-                
-                painter.drawEllipse(center_x - radius, center_y - radius, radius * 2, radius * 2)
-
+                painter.setPen(QPen(QColor("#E53935"), 2))
+                painter.setBrush(Qt.NoBrush)
+                painter.drawRect(rect.adjusted(1, 1, -2, -2))
                 painter.restore()
-                events_painted_number_padding+=7
+
+            # Dots are drawn from the right edge for as many events as fit; a day with more events
+            # than that shows a "+N" badge for the rest instead, so busy days cost no more to paint
+            colors = summary_for_this_date['colors']
+            dot_room = rect.width() - 4
+            shown_count = min(len(colors), dot_room // RenderCache.dot_spacing)
+            if summary_for_this_date['count'] > shown_count:
+                shown_count = min(shown_count, max(0, dot_room - RenderCache.overflow_badge_width) // RenderCache.dot_spacing)
+            dot_strip = self.cache.dotStrip(tuple(colors[:shown_count]), summary_for_this_date['count'] - shown_count, painter.device().devicePixelRatioF())
+            painter.drawPixmap(rect.right() - 1 - round(dot_strip.width() / dot_strip.devicePixelRatio()), rect.bottom() - RenderCache.dot_radius * 2 - 3, dot_strip)
 
     def apply_stylesheet(self):
         stylesheet = '''
@@ -447,7 +925,7 @@ class MainSchedulingCalendar(QCalendarWidget):
             
 
 class ScreenHome(QWidget):
-    def __init__(self, event_manager:EventManager):
+    def __init__(self, event_manager:EventManager, executor=None):
         super().__init__()
         layout = QVBoxLayout()
         headerLabel = QLabel("Scheduling Calendar")
@@ -471,7 +949,7 @@ class ScreenHome(QWidget):
         self.event_manager = event_manager
 
 
-        self.calendar = MainSchedulingCalendar(self.event_manager)
+        self.calendar = MainSchedulingCalendar(self.event_manager, executor)
         self.calendar.setGridVisible(True)
         self.calendar.selectionChanged.connect(self.on_calendar_selection_changed)
         layout.addWidget(self.calendar)
@@ -487,12 +965,350 @@ class ScreenHome(QWidget):
 
     def on_calendar_selection_changed(self):
         self.date_lookup_field.setDate(self.calendar.selectedDate())
-        
+
+class TimelineView(QAbstractScrollArea):
+    # Day or week timeline painted straight onto the viewport. Only the hours on screen are
+    # drawn: each day's column layout is cached and bisected for the items inside a tile, tiles
+    # are rendered once and reused while scrolling, so a frame costs the same however many events
+    # a day or the database holds. Changing range only fetches and lays out uncached days.
+    hour_height = 48
+    time_gutter_width = 56
+    header_height = 36
+    minimum_item_height = 4
+    tile_hours = 4
+    max_cached_days = 62
+
+    def __init__(self, event_manager:EventManager, executor=None, parent=None):
+        super().__init__(parent)
+        self.event_manager = event_manager
+        self.executor = executor
+        self.first_date = QDate.currentDate()
+        self.day_count = 1
+        self.pending_events_future = None
+
+        # ISO date -> DayTimelineLayout of that day's timed events, least recently shown first
+        self.day_layouts = OrderedDict()
+        self.all_day_events_by_date = {}
+        # (ISO date, tile index) -> QPixmap of that day's events for tile_hours of the day, all
+        # rendered tile_day_width pixels wide
+        self.tile_pixmaps = {}
+        self.tile_day_width = None
+
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.verticalScrollBar().setSingleStep(self.hour_height // 4)
+        self.update_scroll_range()
+        self.verticalScrollBar().setValue(8 * self.hour_height)
+        self.load_visible_days()
+
+    def visible_dates(self):
+        return [self.first_date.addDays(day_index) for day_index in range(self.day_count)]
+
+    def set_range(self, first_date:QDate, day_count):
+        self.first_date = first_date
+        self.day_count = day_count
+        self.load_visible_days()
+        self.viewport().update()
+
+    def invalidate(self):
+        self.day_layouts.clear()
+        self.all_day_events_by_date.clear()
+        self.tile_pixmaps.clear()
+        if self.pending_events_future:
+            self.pending_events_future.cancel()
+            self.pending_events_future = None
+        self.load_visible_days()
+        self.viewport().update()
+
+    def apply_changes(self, changes):
+        # Drops only the cached days the changes touch (and the day after each, for events
+        # running past midnight) and re-fetches those that are visible
+        if any(change.kind in (EventChange.SERIES_CHANGED, EventChange.RELOADED) for change in changes):
+            self.invalidate()
+            return
+        stale_dates = set()
+        for change in changes:
+            for iso_date in change.affectedDates():
+                stale_dates.update((iso_date, (datetime.date.fromisoformat(iso_date) + datetime.timedelta(days=1)).isoformat()))
+        stale_dates &= self.day_layouts.keys()
+        if not stale_dates:
+            return
+        for iso_date in stale_dates:
+            del self.day_layouts[iso_date]
+            self.all_day_events_by_date.pop(iso_date, None)
+        self.tile_pixmaps = {key: tile for key, tile in self.tile_pixmaps.items() if key[0] not in stale_dates}
+        if self.pending_events_future:
+            self.pending_events_future.cancel()
+            self.pending_events_future = None
+        self.load_visible_days()
+        self.viewport().update()
+
+    def load_visible_days(self):
+        missing_dates = []
+        for date in self.visible_dates():
+            iso_date = date.toString(Qt.ISODate)
+            cached = iso_date in self.day_layouts
+            self.event_manager.instrumentation.recordCacheLookup("timeline_day_cache", cached)
+            if cached:
+                self.day_layouts.move_to_end(iso_date)
+            else:
+                missing_dates.append(date)
+        if not missing_dates:
+            return
+        range_start, range_end = missing_dates[0].toPyDate(), missing_dates[-1].toPyDate()
+        if self.executor is None:
+            self.store_timeline_events(range_start, range_end, self.event_manager.getTimelineEvents(range_start, range_end))
+            return
+
+        if self.pending_events_future:
+            self.pending_events_future.cancel()
+        self.pending_events_future = self.executor.submit("getTimelineEvents", range_start, range_end)
+        self.pending_events_future.add_done_callback(lambda future: self.on_timeline_events_loaded(future, range_start, range_end))
+
+    def on_timeline_events_loaded(self, future, range_start, range_end):
+        if future is not self.pending_events_future or future.cancelled() or future.exception():
+            return
+        self.pending_events_future = None
+        self.store_timeline_events(range_start, range_end, future.result())
+        self.viewport().update()
+
+    def store_timeline_events(self, range_start:datetime.date, range_end:datetime.date, timeline_events):
+        day_count = (range_end - range_start).days + 1
+        iso_dates = [(range_start + datetime.timedelta(days=day_index)).isoformat() for day_index in range(day_count)]
+        timed_events_by_date = {iso_date: [] for iso_date in iso_dates}
+        all_day_events_by_date = {iso_date: [] for iso_date in iso_dates}
+        range_start_minute = (range_start - datetime.date(1970, 1, 1)).days * 24 * 60
+        for timeline_event in timeline_events:
+            if timeline_event['start_minute'] is None:
+                if timeline_event['event_date'] in all_day_events_by_date:
+                    all_day_events_by_date[timeline_event['event_date']].append(timeline_event)
+                continue
+            # Events running past midnight are drawn as one piece on each day they cover
+            day_index = max((timeline_event['start_minute'] - range_start_minute) // (24 * 60), 0)
+            while day_index < day_count:
+                day_start_minute = range_start_minute + day_index * 24 * 60
+                if timeline_event['end_minute'] <= day_start_minute:
+                    break
+                timed_events_by_date[iso_dates[day_index]].append(dict(
+                    timeline_event,
+                    start_minute=max(timeline_event['start_minute'] - day_start_minute, 0),
+                    end_minute=min(timeline_event['end_minute'] - day_start_minute, 24 * 60)
+                ))
+                day_index += 1
+
+        for iso_date in iso_dates:
+            self.day_layouts[iso_date] = DayTimelineLayout(timed_events_by_date[iso_date])
+            self.day_layouts.move_to_end(iso_date)
+            self.all_day_events_by_date[iso_date] = all_day_events_by_date[iso_date]
+        self.tile_pixmaps = {key: tile for key, tile in self.tile_pixmaps.items() if key[0] in self.day_layouts and key[0] not in timed_events_by_date}
+        self.event_manager.instrumentation.increment("timeline.day_layouts", day_count)
+        while len(self.day_layouts) > max(self.max_cached_days, self.day_count):
+            evicted_date, _ = self.day_layouts.popitem(last=False)
+            self.all_day_events_by_date.pop(evicted_date, None)
+        self.tile_pixmaps = {key: tile for key, tile in self.tile_pixmaps.items() if key[0] in self.day_layouts}
+        self.viewport().update()
+
+    def render_tile(self, day_layout:DayTimelineLayout, tile_index, day_width):
+        # Paints the items of one day overlapping one tile's hours; items crossing the tile edges
+        # are clipped, and the neighbouring tile draws the rest
+        self.event_manager.instrumentation.increment("timeline.tiles_rendered")
+        pixel_ratio = self.devicePixelRatioF()
+        tile_height = self.tile_hours * self.hour_height
+        tile = QPixmap(max(int(day_width * pixel_ratio), 1), int(tile_height * pixel_ratio))
+        tile.setDevicePixelRatio(pixel_ratio)
+        tile.fill(Qt.transparent)
+        tile_start_minute = tile_index * self.tile_hours * 60
+        painter = QPainter(tile)
+        font_metrics = painter.fontMetrics()
+        items_painted = 0
+        for item in day_layout.visibleItems(tile_start_minute, tile_start_minute + self.tile_hours * 60):
+            column_width = day_width / item['column_count']
+            item_top = (item['start_minute'] - tile_start_minute) * self.hour_height / 60
+            item_height = max((item['end_minute'] - item['start_minute']) * self.hour_height / 60, self.minimum_item_height)
+            item_rect = QRectF(item['column'] * column_width + 1, item_top + 1, column_width - 2, item_height - 2)
+            color = QColor(item['event_color'] or "#9E9E9E")
+            painter.setPen(color.darker(130))
+            painter.setBrush(color.lighter(150))
+            painter.drawRect(item_rect)
+            if item_rect.height() >= font_metrics.height() and item_rect.width() >= 16:
+                painter.setPen(QColor("#212121"))
+                text_rect = item_rect.adjusted(3, 1, -2, 0)
+                painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignTop, font_metrics.elidedText(item['title'] or "", Qt.ElideRight, int(text_rect.width())))
+            items_painted += 1
+        painter.end()
+        self.event_manager.instrumentation.increment("timeline.items_painted", items_painted)
+        return tile
+
+    def update_scroll_range(self):
+        visible_height = max(self.viewport().height() - self.header_height, 0)
+        self.verticalScrollBar().setRange(0, max(24 * self.hour_height - visible_height, 0))
+        self.verticalScrollBar().setPageStep(visible_height)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scroll_range()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        self.event_manager.instrumentation.increment("timeline.paint")
+        painter = QPainter(self.viewport())
+        width, height = self.viewport().width(), self.viewport().height()
+        scroll_y = self.verticalScrollBar().value()
+        day_width = (width - self.time_gutter_width) / self.day_count
+        painter.fillRect(self.viewport().rect(), QColor("#FFFFFF"))
+
+        # Minutes of the day between the header and the bottom edge; nothing outside is touched
+        visible_start_minute = scroll_y * 60 / self.hour_height
+        visible_end_minute = (scroll_y + height - self.header_height) * 60 / self.hour_height
+        painter.setClipRect(0, self.header_height, width, height - self.header_height)
+        for hour in range(int(visible_start_minute // 60), min(24, int(visible_end_minute // 60) + 1)):
+            y = self.header_height + hour * self.hour_height - scroll_y
+            painter.setPen(QColor("#E0E0E0"))
+            painter.drawLine(self.time_gutter_width, y, width, y)
+            painter.setPen(QColor("#757575"))
+            painter.drawText(QRect(0, y + 2, self.time_gutter_width - 6, 16), Qt.AlignRight | Qt.AlignTop, f"{hour:02d}:00")
+        painter.setPen(QColor("#E0E0E0"))
+        for day_index in range(self.day_count):
+            x = round(self.time_gutter_width + day_index * day_width)
+            painter.drawLine(x, self.header_height, x, height)
+
+        # Events come from cached pixmap tiles of tile_hours each, so a scroll frame blits a
+        # handful of tiles however densely packed the visible days are
+        tile_minutes = self.tile_hours * 60
+        if day_width != self.tile_day_width:
+            self.tile_pixmaps.clear()
+            self.tile_day_width = day_width
+        first_tile = int(visible_start_minute // tile_minutes)
+        last_tile = min(int(visible_end_minute // tile_minutes), 24 // self.tile_hours - 1)
+        for day_index, date in enumerate(self.visible_dates()):
+            iso_date = date.toString(Qt.ISODate)
+            day_layout = self.day_layouts.get(iso_date)
+            if day_layout is None:
+                continue
+            day_left = self.time_gutter_width + day_index * day_width
+            for tile_index in range(first_tile, last_tile + 1):
+                tile = self.tile_pixmaps.get((iso_date, tile_index))
+                if tile is None:
+                    tile = self.tile_pixmaps[(iso_date, tile_index)] = self.render_tile(day_layout, tile_index, day_width)
+                painter.drawPixmap(QPointF(day_left, self.header_height + tile_index * self.tile_hours * self.hour_height - scroll_y), tile)
+
+        # The day headers, with a count of untimed events, stay put while the hours scroll
+        painter.setClipping(False)
+        painter.fillRect(0, 0, width, self.header_height, QColor("#F5F5F5"))
+        for day_index, date in enumerate(self.visible_dates()):
+            header_text = date.toString("ddd d MMM")
+            all_day_events = self.all_day_events_by_date.get(date.toString(Qt.ISODate))
+            if all_day_events:
+                header_text += f"\n{len(all_day_events)} all-day"
+            painter.setPen(QColor("dark green") if date == QDate.currentDate() else QColor("#212121"))
+            painter.drawText(QRectF(self.time_gutter_width + day_index * day_width, 0, day_width, self.header_height), Qt.AlignCenter, header_text)
+        painter.setPen(QColor("#BDBDBD"))
+        painter.drawLine(0, self.header_height, width, self.header_height)
+
+class TimelinePage(QWidget):
+    day_counts = {"Day": 1, "Week": 7}
+
+    def __init__(self, event_manager:EventManager, executor=None):
+        super().__init__()
+        self.anchor_date = QDate.currentDate()
+        layout = QVBoxLayout()
+
+        navigation_layout = QHBoxLayout()
+        previous_button = QPushButton("<")
+        previous_button.clicked.connect(lambda: self.step(-1))
+        today_button = QPushButton("Today")
+        today_button.clicked.connect(lambda: self.show_date(QDate.currentDate()))
+        next_button = QPushButton(">")
+        next_button.clicked.connect(lambda: self.step(1))
+        self.range_label = QLabel()
+        self.range_label.setStyleSheet("font-size: 18px;")
+        self.view_selector = QComboBox()
+        self.view_selector.addItems(list(self.day_counts))
+        self.view_selector.currentTextChanged.connect(lambda: self.show_date(self.anchor_date))
+        navigation_layout.addWidget(previous_button)
+        navigation_layout.addWidget(today_button)
+        navigation_layout.addWidget(next_button)
+        navigation_layout.addWidget(self.range_label)
+        navigation_layout.addStretch()
+        navigation_layout.addWidget(self.view_selector)
+        layout.addLayout(navigation_layout)
+
+        self.timeline = TimelineView(event_manager, executor)
+        layout.addWidget(self.timeline)
+        self.setLayout(layout)
+        self.show_date(self.anchor_date)
+
+    def day_count(self):
+        return self.day_counts[self.view_selector.currentText()]
+
+    def set_day_count(self, day_count):
+        self.view_selector.setCurrentIndex(list(self.day_counts.values()).index(day_count))
+
+    def show_date(self, date:QDate):
+        self.anchor_date = date
+        day_count = self.day_count()
+        # Weeks start on Monday
+        first_date = date.addDays(1 - date.dayOfWeek()) if day_count == 7 else date
+        self.timeline.set_range(first_date, day_count)
+        if day_count == 1:
+            self.range_label.setText(first_date.toString("dddd d MMMM yyyy"))
+        else:
+            self.range_label.setText(f"{first_date.toString('d MMM')} - {first_date.addDays(day_count - 1).toString('d MMM yyyy')}")
+
+    def step(self, direction):
+        self.show_date(self.anchor_date.addDays(direction * self.day_count()))
+
+
+def create_duration_field():
+    duration_field = QSpinBox()
+    duration_field.setRange(5, 24 * 60)
+    duration_field.setSingleStep(15)
+    duration_field.setSuffix(" min")
+    duration_field.setValue(EventManager.DEFAULT_EVENT_DURATION_MINUTES)
+    return duration_field
+
+def create_reminder_field(reminder_minutes=None):
+    # Reminder offsets in minutes before the event starts, kept as each item's data
+    reminder_field = QComboBox()
+    for label, minutes in (("None", None), ("At start time", 0), ("5 minutes before", 5), ("10 minutes before", 10), ("15 minutes before", 15), ("30 minutes before", 30), ("1 hour before", 60), ("1 day before", 24 * 60)):
+        reminder_field.addItem(label, minutes)
+    if reminder_minutes is not None and reminder_field.findData(reminder_minutes) < 0:
+        reminder_field.addItem(f"{reminder_minutes} minutes before", reminder_minutes)
+    reminder_field.setCurrentIndex(max(0, reminder_field.findData(reminder_minutes)))
+    return reminder_field
+
+def confirm_saving_with_conflicts(parent, conflicts):
+    # Returns True when there is nothing to warn about or the user chooses to save anyway
+    if not conflicts:
+        return True
+    conflict_lines = []
+    for conflict in conflicts[:10]:
+        start_time = conflict['event_time'].strftime("%H:%M") if conflict['event_time'] else ""
+        duration = conflict['duration_minutes'] if conflict['duration_minutes'] is not None else EventManager.DEFAULT_EVENT_DURATION_MINUTES
+        conflict_lines.append(f"{conflict['event_date']} {start_time} ({duration} min): {conflict['title']}")
+    if len(conflicts) > 10:
+        conflict_lines.append(f"...and {len(conflicts) - 10} more")
+    answer = QMessageBox.warning(
+        parent,
+        "Scheduling Conflict",
+        "This event overlaps with:\n\n" + "\n".join(conflict_lines) + "\n\nSave it anyway?",
+        QMessageBox.Yes | QMessageBox.No
+    )
+    return answer == QMessageBox.Yes
 
 class AddEventScreen(QWidget):
     event_added_signal = pyqtSignal()
 
-    def __init__(self, event_manager: EventManager):
+    repeat_options = {
+        "Does not repeat": None,
+        "Daily": "FREQ=DAILY",
+        "Weekly": "FREQ=WEEKLY",
+        "Every 2 Weeks": "FREQ=WEEKLY;INTERVAL=2",
+        "Monthly": "FREQ=MONTHLY",
+    }
+
+    def __init__(self, event_manager: EventManager, executor:DatabaseExecutor):
         super().__init__()
         layout = QVBoxLayout()
         headerLabel = QLabel("This is the Adding an Event Screen")
@@ -500,11 +1316,14 @@ class AddEventScreen(QWidget):
         layout.addWidget(headerLabel)
 
         self.event_manager = event_manager
+        self.executor = executor
 
         self.form_layout = QFormLayout()
         self.eventNameField = QLineEdit()
         self.eventNameField.setPlaceholderText("Enter a name for your Event")
         self.form_layout.addRow(QLabel("Event Name: "), self.eventNameField)
+        self.eventCalendarField = QComboBox()
+        self.form_layout.addRow(QLabel("Calendar: "), self.eventCalendarField)
         self.eventDateField = QDateEdit()
         self.eventDateField.setCalendarPopup(True)
         self.eventDateField.setDate(QDate.currentDate())
@@ -515,27 +1334,86 @@ class AddEventScreen(QWidget):
         self.form_layout.addRow(QLabel("Event Description: "), self.eventDescriptionField)
         self.eventTimeField = QTimeEdit()
         self.eventTimeField.setTime(QTime.currentTime())
-        self.form_layout.addRow(QLabel("Start Time: "), self.eventTimeField)
+        start_time_layout = QHBoxLayout()
+        start_time_layout.addWidget(self.eventTimeField)
+        find_time_button = QPushButton("Find a time...")
+        find_time_button.setToolTip("Find the next free slot for this event")
+        find_time_button.clicked.connect(self.find_a_time)
+        start_time_layout.addWidget(find_time_button)
+        self.form_layout.addRow(QLabel("Start Time: "), start_time_layout)
+        self.eventDurationField = create_duration_field()
+        self.form_layout.addRow(QLabel("Duration: "), self.eventDurationField)
+        self.eventReminderField = create_reminder_field()
+        self.form_layout.addRow(QLabel("Reminder: "), self.eventReminderField)
 
         self.color_picker = CustomColorPicker()
         self.form_layout.addRow(None, self.color_picker)
 
+        # Repeating events are stored as a single series with a recurrence rule
+        repeat_layout = QHBoxLayout()
+        self.repeatSelector = QComboBox()
+        self.repeatSelector.addItems(self.repeat_options.keys())
+        self.repeatSelector.currentTextChanged.connect(self.on_repeat_option_changed)
+        self.repeatUntilCheckBox = QCheckBox("Until")
+        self.repeatUntilField = QDateEdit()
+        self.repeatUntilField.setCalendarPopup(True)
+        self.repeatUntilField.setDisplayFormat("MM/dd/yyyy")
+        self.repeatUntilCheckBox.toggled.connect(self.repeatUntilField.setEnabled)
+        repeat_layout.addWidget(self.repeatSelector)
+        repeat_layout.addWidget(self.repeatUntilCheckBox)
+        repeat_layout.addWidget(self.repeatUntilField)
+        repeat_layout.addStretch()
+        self.form_layout.addRow(QLabel("Repeats: "), repeat_layout)
+
         layout.addLayout(self.form_layout)
 
-        add_event_button = QPushButton("Add Event")
-        add_event_button.clicked.connect(self.add_event_to_database)
-        layout.addWidget(add_event_button)
+        self.add_event_button = QPushButton("Add Event")
+        self.add_event_button.clicked.connect(self.add_event_to_database)
+        layout.addWidget(self.add_event_button)
 
         layout.addStretch()
         self.setLayout(layout)
+        self.resetEventFields()
     
     def resetEventFields(self):
         self.eventNameField.clear()
+        self.refresh_calendar_field()
         self.eventDateField.setDate(QDate.currentDate())
         self.eventDescriptionField.clear()
         self.eventTimeField.setTime(QTime.currentTime())
+        self.eventDurationField.setValue(EventManager.DEFAULT_EVENT_DURATION_MINUTES)
+        self.eventReminderField.setCurrentIndex(0)
+        self.repeatSelector.setCurrentIndex(0)
+        self.repeatUntilCheckBox.setChecked(False)
+        self.repeatUntilField.setDate(QDate.currentDate().addMonths(3))
+        self.on_repeat_option_changed(self.repeatSelector.currentText())
+
+    def refresh_calendar_field(self):
+        # Events can only be added to the calendars currently shown
+        self.eventCalendarField.clear()
+        for calendar in self.event_manager.getCalendars():
+            if calendar['visible']:
+                self.eventCalendarField.addItem(calendar['name'], calendar['id'])
+        default_index = self.eventCalendarField.findData(self.event_manager.default_calendar_id)
+        self.eventCalendarField.setCurrentIndex(max(default_index, 0))
+
+    def on_repeat_option_changed(self, repeat_option):
+        repeats = self.repeat_options[repeat_option] is not None
+        self.repeatUntilCheckBox.setEnabled(repeats)
+        self.repeatUntilField.setEnabled(repeats and self.repeatUntilCheckBox.isChecked())
+
+    def find_a_time(self):
+        search_from = max(self.eventDateField.date(), QDate.currentDate())
+        find_time_dialog = FindTimeDialog(self.event_manager, self.executor, self.eventDurationField.value(), search_from, self)
+        if find_time_dialog.exec() == QDialog.DialogCode.Accepted:
+            slot_start = find_time_dialog.selected_slot
+            self.eventDateField.setDate(QDate(slot_start.date()))
+            self.eventTimeField.setTime(QTime(slot_start.hour, slot_start.minute))
+            self.eventDurationField.setValue(find_time_dialog.durationField.value())
 
     def add_event_to_database(self):
+        # The conflict check and the insert run on the database worker, one after the other,
+        # with the button disabled until both are done
         event_date = self.eventDateField.date()
         event_title = self.eventNameField.text()
 
@@ -543,10 +1421,33 @@ class AddEventScreen(QWidget):
             event_description = self.eventDescriptionField.toPlainText()
             event_time = self.eventTimeField.time()
             event_color = self.color_picker.current_color
-            if self.event_manager.addEvent(event_date, event_title, event_description, event_time, event_color):
-                QMessageBox.information(self, "Success", f"Event '{event_title}' added for '{event_date}'")
-                self.resetEventFields()
-                self.event_added_signal.emit()
+            event_duration = self.eventDurationField.value()
+            event_reminder = self.eventReminderField.currentData()
+            event_calendar = self.eventCalendarField.currentData()
+            if event_calendar is None:
+                QMessageBox.warning(self, "No Calendar Shown", "Show a calendar from View > Calendars to add events to it.", QMessageBox.Ok)
+                return
+            rrule_text = self.repeat_options[self.repeatSelector.currentText()]
+            if rrule_text and self.repeatUntilCheckBox.isChecked():
+                rrule_text += f";UNTIL={self.repeatUntilField.date().toString('yyyyMMdd')}"
+            event_fields = (event_date.toPyDate(), event_title, event_description, event_time.toPyTime(), event_color.name(QColor.NameFormat.HexRgb))
+
+            def on_added(added):
+                if added:
+                    QMessageBox.information(self, "Success", f"Event '{event_title}' added for '{event_date}'")
+                    self.resetEventFields()
+                    self.event_added_signal.emit()
+                else:
+                    QMessageBox.warning(self, "Event Error", "Error: The event could not be added!")
+
+            def on_conflicts(conflicts):
+                if not confirm_saving_with_conflicts(self, conflicts or []):
+                    return
+                if rrule_text:
+                    self.executor.submit_action([self.add_event_button], on_added, "addEventSeries", *event_fields, rrule_text, event_duration, event_reminder, event_calendar)
+                else:
+                    self.executor.submit_action([self.add_event_button], on_added, "addEvent", *event_fields, event_duration, event_reminder, event_calendar)
+            self.executor.submit_action([self.add_event_button], on_conflicts, "findConflicts", event_date.toPyDate(), event_time.toPyTime(), event_duration)
 
         else:
             QMessageBox.warning(self, "Missing Fields", "You are missing one or more of the required fields",QMessageBox.Ok)
@@ -630,30 +1531,37 @@ class CustomColorPicker(QWidget):
 
 
 class EditEventMessageBox(QDialog):
-    def __init__(self, event_manager:EventManager, selectedEventID):
+    # Edits the event read by getEventDetailsbyId; OK checks for conflicts and saves on the
+    # database worker, and the dialog only closes once the update has been written
+    def __init__(self, executor:DatabaseExecutor, selected_event_details):
         super().__init__()
         self.setWindowTitle("Editing Selected Event")
 
-        self.selectedEventID = selectedEventID
+        self.selectedEventID = selected_event_details[0].id
 
-        self.event_manager = event_manager
+        self.executor = executor
 
-        self.selected_event_details = self.event_manager.getEventDetailsbyId(selectedEventID)
+        self.selected_event_details = selected_event_details
         
         # widgets to add to QMessageBox
         self.eventDate = QDateEdit()
-        date_to_set = QDate.fromString(self.selected_event_details[0]["event_date"], "yyyy-MM-dd")
+        date_to_set = QDate(self.selected_event_details[0].event_date)
         self.eventDate.setDate(date_to_set)
         self.eventDate.setCalendarPopup(True)
         self.eventTitle = QLineEdit()
-        self.eventTitle.setText(self.selected_event_details[0]["title"])
+        self.eventTitle.setText(self.selected_event_details[0].title)
         self.eventDescription = QTextEdit()
-        self.eventDescription.setText(self.selected_event_details[0]["description"])
+        self.eventDescription.setText(self.selected_event_details[0].description)
         self.eventTime = QTimeEdit()
-        time_to_set = QTime.fromString(self.selected_event_details[0]["event_time"], "HH:mm:ss.zzz")
+        event_time = self.selected_event_details[0].event_time
+        time_to_set = QTime(event_time) if event_time else QTime()
         self.eventTime.setTime(time_to_set)
+        self.eventDuration = create_duration_field()
+        event_duration = self.selected_event_details[0].duration_minutes
+        self.eventDuration.setValue(event_duration if event_duration is not None else EventManager.DEFAULT_EVENT_DURATION_MINUTES)
+        self.eventReminder = create_reminder_field(self.selected_event_details[0].reminder_minutes)
         self.eventColor = CustomColorPicker()
-        color_to_set = QColor(self.selected_event_details[0]["event_color"])
+        color_to_set = QColor(self.selected_event_details[0].event_color)
         self.eventColor.set_color(color_to_set)
 
         form_layout = QFormLayout()
@@ -661,6 +1569,8 @@ class EditEventMessageBox(QDialog):
         form_layout.addRow("Title:", self.eventTitle)
         form_layout.addRow("Description:", self.eventDescription)
         form_layout.addRow("Time:", self.eventTime)
+        form_layout.addRow("Duration:", self.eventDuration)
+        form_layout.addRow("Reminder:", self.eventReminder)
         form_layout.addRow("Color:", self.eventColor)
 
         # widget layout
@@ -682,12 +1592,271 @@ class EditEventMessageBox(QDialog):
             "description": self.eventDescription.toPlainText(),
             "event_time": self.eventTime.time().toString("HH:mm:ss"),
             "event_color": self.eventColor.get_color().name(QColor.NameFormat.HexRgb),
+            "duration_minutes": self.eventDuration.value(),
+            "reminder_minutes": self.eventReminder.currentData(),
             "event_id": self.selectedEventID
         }
 
+    def accept(self):
+        ok_button = self.button_box.button(QDialogButtonBox.StandardButton.Ok)
+        edited_event_data = self.get_edited_event_data()
+
+        def on_updated(updated):
+            if updated:
+                QDialog.accept(self)
+            else:
+                QMessageBox.warning(self, "Event Update Error", "Error: The event could not be updated!")
+
+        def on_conflicts(conflicts):
+            if confirm_saving_with_conflicts(self, conflicts or []):
+                self.executor.submit_action([ok_button], on_updated, "updateEvent", edited_event_data)
+        self.executor.submit_action(
+            [ok_button], on_conflicts, "findConflicts",
+            self.eventDate.date().toPyDate(),
+            self.eventTime.time().toPyTime(),
+            self.eventDuration.value(),
+            exclude_event_id=self.selectedEventID
+        )
+
+
+class FindTimeDialog(QDialog):
+    # Searches for free slots with FreeSlotFinder on the database worker; the chosen slot is
+    # read back from selected_slot
+    weekday_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+    def __init__(self, event_manager:EventManager, executor:DatabaseExecutor, duration_minutes, search_from:QDate, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Find a Time")
+        self.resize(420, 420)
+        self.slot_finder = FreeSlotFinder(event_manager)
+        self.executor = executor
+        self.selected_slot = None
+
+        form_layout = QFormLayout()
+        self.durationField = create_duration_field()
+        self.durationField.setValue(duration_minutes)
+        form_layout.addRow("Duration:", self.durationField)
+        self.searchFromField = QDateEdit()
+        self.searchFromField.setCalendarPopup(True)
+        self.searchFromField.setDate(search_from)
+        form_layout.addRow("Starting:", self.searchFromField)
+        self.searchDaysField = QSpinBox()
+        self.searchDaysField.setRange(1, 366)
+        self.searchDaysField.setValue(14)
+        self.searchDaysField.setSuffix(" days")
+        form_layout.addRow("Search within:", self.searchDaysField)
+
+        hours_layout = QHBoxLayout()
+        self.workStartField = QTimeEdit(QTime(9, 0))
+        self.workEndField = QTimeEdit(QTime(17, 0))
+        hours_layout.addWidget(self.workStartField)
+        hours_layout.addWidget(QLabel("to"))
+        hours_layout.addWidget(self.workEndField)
+        form_layout.addRow("Working hours:", hours_layout)
+
+        weekday_layout = QHBoxLayout()
+        self.weekdayCheckBoxes = []
+        for weekday, weekday_name in enumerate(self.weekday_names):
+            weekday_check_box = QCheckBox(weekday_name)
+            weekday_check_box.setChecked(weekday < 5)
+            weekday_layout.addWidget(weekday_check_box)
+            self.weekdayCheckBoxes.append(weekday_check_box)
+        form_layout.addRow("Days:", weekday_layout)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(form_layout)
+        self.search_button = QPushButton("Search")
+        self.search_button.clicked.connect(self.search)
+        layout.addWidget(self.search_button)
+        self.slot_list = QListWidget()
+        self.slot_list.itemDoubleClicked.connect(self.accept)
+        layout.addWidget(self.slot_list)
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+        layout.addWidget(self.button_box)
+
+        self.search()
+
+    def search(self):
+        search_from = self.searchFromField.date().toPyDate()
+        search_until = search_from + datetime.timedelta(days=self.searchDaysField.value())
+        # Never offer a slot that has already started
+        search_start = max(datetime.datetime.combine(search_from, datetime.time(0, 0)), datetime.datetime.now())
+        weekday_hours = {weekday: None for weekday, check_box in enumerate(self.weekdayCheckBoxes) if not check_box.isChecked()}
+        self.slot_list.clear()
+        self.slot_list.addItem("Searching...")
+        self.executor.submit_action(
+            [self.search_button, self.button_box.button(QDialogButtonBox.StandardButton.Ok)], self.show_slots,
+            self.slot_finder.findFreeSlots,
+            self.durationField.value(),
+            search_start,
+            search_until,
+            working_hours=(self.workStartField.time().toPyTime(), self.workEndField.time().toPyTime()),
+            weekday_hours=weekday_hours,
+            count=10
+        )
+
+    def show_slots(self, slots):
+        slots = slots or []
+        self.slot_list.clear()
+        for slot_start, slot_end in slots:
+            item = QListWidgetItem(f"{slot_start:%a %m/%d/%Y}  {slot_start:%H:%M} - {slot_end:%H:%M}")
+            item.setData(Qt.UserRole, slot_start)
+            self.slot_list.addItem(item)
+        if slots:
+            self.slot_list.setCurrentRow(0)
+        else:
+            self.slot_list.addItem("No free time found in this range")
+
+    def accept(self):
+        item = self.slot_list.currentItem()
+        self.selected_slot = item.data(Qt.UserRole) if item else None
+        if self.selected_slot is None:
+            return
+        super().accept()
+
+
+class RecurringEventsDialog(QDialog):
+    def __init__(self, executor:DatabaseExecutor):
+        super().__init__()
+        self.setWindowTitle("Recurring Events")
+        self.resize(500, 300)
+        self.executor = executor
+
+        layout = QVBoxLayout(self)
+        self.series_list = QListWidget()
+        layout.addWidget(self.series_list)
+
+        button_layout = QHBoxLayout()
+        self.delete_series_button = QPushButton("Delete Series")
+        self.delete_series_button.clicked.connect(self.delete_selected_series)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(self.delete_series_button)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.load_series()
+
+    def load_series(self):
+        self.executor.submit_action([self.delete_series_button], self.show_series, "getEventSeries")
+
+    def show_series(self, series_list):
+        self.series_list.clear()
+        for series in series_list or []:
+            item = QListWidgetItem(f"{series['title']}  |  from {series['start_date']}  |  {series['rrule']}")
+            item.setData(Qt.UserRole, series['id'])
+            item.setForeground(QColor(series['event_color'] or "black"))
+            self.series_list.addItem(item)
+
+    def delete_selected_series(self):
+        item = self.series_list.currentItem()
+        if item is None:
+            return
+        confirm_series_deletion_message = QMessageBox.warning(
+            self,
+            "Warning: Deleting Recurring Event",
+            f"Are you sure you want to delete every occurrence of this event?\n\n{item.text()}\n\nThis action cannot be undone!",
+            QMessageBox.Yes | QMessageBox.Cancel
+        )
+        if confirm_series_deletion_message == QMessageBox.Yes:
+            self.executor.submit_action([self.delete_series_button], self.on_series_deleted, "deleteEventSeries", item.data(Qt.UserRole))
+
+    def on_series_deleted(self, deleted):
+        if deleted:
+            self.load_series()
+        else:
+            QMessageBox.warning(self, "Event Deletion Error", "Error: The recurring event could not be Deleted!")
+
+
+class DiagnosticsDialog(QDialog):
+    # Live view of EventManager's instrumentation: per-statement timings, counters and the
+    # slow-query log with each query's plan. Refreshes itself while open.
+    refresh_interval_ms = 1000
+    query_headers = ["Statement", "Calls", "Mean ms", "p50 ms", "p95 ms", "Max ms", "Total ms", "Rows"]
+
+    def __init__(self, event_manager:EventManager, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.resize(900, 600)
+        self.event_manager = event_manager
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.query_table = QTableWidget(0, len(self.query_headers))
+        self.query_table.setHorizontalHeaderLabels(self.query_headers)
+        self.query_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.query_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.query_table.verticalHeader().setVisible(False)
+        layout.addWidget(self.query_table, 3)
+
+        self.counters_label = QLabel()
+        self.counters_label.setWordWrap(True)
+        layout.addWidget(self.counters_label)
+
+        layout.addWidget(QLabel("Slow queries"))
+        self.slow_query_view = QTextEdit()
+        self.slow_query_view.setReadOnly(True)
+        layout.addWidget(self.slow_query_view, 2)
+
+        button_layout = QHBoxLayout()
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset_statistics)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(reset_button)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.refresh_interval_ms)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start()
+        self.refresh()
+
+    def refresh(self):
+        snapshot = self.event_manager.instrumentation.snapshot()
+        all_queries = snapshot['all_queries']
+        self.summary_label.setText(
+            f"{all_queries['count']} queries in {all_queries['total_ms']:.1f} ms over {snapshot['uptime_s']:.0f} s  |  "
+            f"p50 {all_queries['p50_ms']:.2f} ms  p95 {all_queries['p95_ms']:.2f} ms  max {all_queries['max_ms']:.2f} ms  |  "
+            f"{len(snapshot['slow_queries'])} slow (>= {self.event_manager.instrumentation.slow_query_ms:.0f} ms)"
+        )
+
+        # Most expensive statements first
+        queries = sorted(snapshot['queries'].items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        self.query_table.setRowCount(len(queries))
+        for row, (sql, stats) in enumerate(queries):
+            values = [sql, stats['count'], stats['mean_ms'], stats['p50_ms'], stats['p95_ms'], stats['max_ms'], stats['total_ms'], stats['rows']]
+            for column, value in enumerate(values):
+                text = f"{value:.2f}" if isinstance(value, float) else str(value)
+                item = QTableWidgetItem(text)
+                if column == 0:
+                    item.setToolTip(sql)
+                else:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.query_table.setItem(row, column, item)
+
+        self.counters_label.setText("Counters: " + (", ".join(f"{name} {value}" for name, value in sorted(snapshot['counters'].items())) or "none"))
+
+        slow_query_lines = []
+        for slow_query in reversed(snapshot['slow_queries']):
+            slow_query_lines.append(f"{slow_query['elapsed_ms']:.1f} ms, {slow_query['rows']} rows: {slow_query['sql']}")
+            slow_query_lines.extend(f"    {plan_line}" for plan_line in slow_query['plan'])
+        self.slow_query_view.setPlainText("\n".join(slow_query_lines))
+
+    def reset_statistics(self):
+        self.event_manager.instrumentation.reset()
+        self.refresh()
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, service_url=None):
         super().__init__()
 
         # Main Window Setup
@@ -736,6 +1905,18 @@ class MainWindow(QMainWindow):
         editEventAction.triggered.connect(self.editEvent)
         toolbar.addAction(editEventAction)
 
+        # Bulk Actions for the rows selected on the View All Events Page
+        recolorEventsAction = QAction("Recolor Selected Events...", self)
+        recolorEventsAction.setStatusTip("Change the color of every selected event")
+        recolorEventsAction.triggered.connect(self.recolorSelectedEvents)
+        rescheduleEventsAction = QAction("Reschedule Selected Events...", self)
+        rescheduleEventsAction.setStatusTip("Move every selected event by a number of days")
+        rescheduleEventsAction.triggered.connect(self.rescheduleSelectedEvents)
+
+        manageRecurringEventsAction = QAction("Recurring Events...", self)
+        manageRecurringEventsAction.setStatusTip("View and delete recurring events")
+        manageRecurringEventsAction.triggered.connect(self.manageRecurringEvents)
+
         # View All Events Screen Action
         viewAllEventsAction = QAction(QIcon("table.png"), "View All Events", self)
         viewAllEventsAction.setStatusTip("View All Events")
@@ -743,6 +1924,38 @@ class MainWindow(QMainWindow):
         viewAllEventsAction.triggered.connect(self.toViewAllEventsPage)
         toolbar.addAction(viewAllEventsAction)
 
+        # Timeline Actions
+        dayTimelineAction = QAction("Day Timeline", self)
+        dayTimelineAction.setStatusTip("Show a day as a timeline")
+        dayTimelineAction.triggered.connect(lambda: self.toTimelinePage(1))
+        weekTimelineAction = QAction("Week Timeline", self)
+        weekTimelineAction.setStatusTip("Show a week as a timeline")
+        weekTimelineAction.triggered.connect(lambda: self.toTimelinePage(7))
+
+        # Import / Export Actions
+        importEventsAction = QAction("Import Events...", self)
+        importEventsAction.setStatusTip("Import events from an ICS or CSV file")
+        importEventsAction.triggered.connect(self.importEvents)
+        exportEventsAction = QAction("Export Events...", self)
+        exportEventsAction.setStatusTip("Export all events to an ICS or CSV file")
+        exportEventsAction.triggered.connect(self.exportEvents)
+
+        # Diagnostics Actions
+        diagnosticsAction = QAction("Diagnostics...", self)
+        diagnosticsAction.setStatusTip("Show query timings, cache counters and slow queries")
+        diagnosticsAction.triggered.connect(self.showDiagnostics)
+        self.queryStatsAction = QAction("Show Query Stats in Status Bar", self)
+        self.queryStatsAction.setCheckable(True)
+        self.queryStatsAction.toggled.connect(self.toggleQueryStatsReadout)
+
+        # Calendar Actions (the View > Calendars menu lists one checkable action per calendar)
+        self.newCalendarAction = QAction("New Calendar...", self)
+        self.newCalendarAction.setStatusTip("Create a calendar stored in its own file")
+        self.newCalendarAction.triggered.connect(self.newCalendar)
+        self.openCalendarAction = QAction("Open Calendar File...", self)
+        self.openCalendarAction.setStatusTip("Add an existing calendar file")
+        self.openCalendarAction.triggered.connect(self.openCalendarFile)
+
         about_page_action = QAction("About",self)
         about_page_action.setStatusTip("About The Program Developer")
         about_page_action.setToolTip("About The Program Developer")
@@ -750,18 +1963,40 @@ class MainWindow(QMainWindow):
 
         # Setting the Status Bar
         self.setStatusBar(QStatusBar(self))
+        self.queryStatsLabel = QLabel()
+        self.queryStatsLabel.setVisible(False)
+        self.statusBar().addPermanentWidget(self.queryStatsLabel)
+        self.queryStatsTimer = QTimer(self)
+        self.queryStatsTimer.setInterval(1000)
+        self.queryStatsTimer.timeout.connect(self.updateQueryStatsReadout)
+        self.diagnosticsDialog = None
 
         # Menu Creation
         menu = self.menuBar()
 
         file_menu = menu.addMenu("&File")
         file_menu.addAction(toHomeScreenAction)
+        file_menu.addSeparator()
+        file_menu.addAction(importEventsAction)
+        file_menu.addAction(exportEventsAction)
         edit_menu = menu.addMenu("&Edit")
         edit_menu.addAction(addEventAction)
         edit_menu.addAction(deleteEventAction)
         edit_menu.addAction(editEventAction)
+        edit_menu.addSeparator()
+        edit_menu.addAction(recolorEventsAction)
+        edit_menu.addAction(rescheduleEventsAction)
+        edit_menu.addSeparator()
+        edit_menu.addAction(manageRecurringEventsAction)
         view_menu = menu.addMenu("&View")
         view_menu.addAction(viewAllEventsAction)
+        view_menu.addAction(dayTimelineAction)
+        view_menu.addAction(weekTimelineAction)
+        view_menu.addSeparator()
+        self.calendarsMenu = view_menu.addMenu("Calendars")
+        view_menu.addSeparator()
+        view_menu.addAction(diagnosticsAction)
+        view_menu.addAction(self.queryStatsAction)
         menu.addAction(about_page_action)
 
         # Stacked Widget Creation and Adding Widgets
@@ -771,20 +2006,52 @@ class MainWindow(QMainWindow):
         self.previous_page_index = self.stacked_widget.currentIndex()
         self.current_page_widget = self.stacked_widget.currentWidget()
 
-        self.event_manager = EventManager(db_filename="events.db")
+        # With a service URL, the calendar is read and written through that event service (see
+        # scheduler_core.service), on this machine or another, so this window can share it with
+        # kiosks and scripts
+        self.event_manager = None
+        if service_url:
+            try:
+                self.event_manager = RemoteEventManager(service_url)
+                self.setWindowTitle(f"Scheduler App ({service_url})")
+            except (OSError, http.client.HTTPException, ValueError) as error:
+                logger.error("Could not reach the event service at %s (%s); opening events.db directly.", service_url, error)
+        if self.event_manager is None:
+            self.event_manager = EventManager(db_filename="events.db")
+        self.rebuildCalendarsMenu()
+        # Reads for the calendar and event list run here, off the GUI thread
+        self.database_executor = DatabaseExecutor(self.event_manager, self)
         ## Instantiating screen widgets/pages
-        self.homeScreen = ScreenHome(self.event_manager)
-        self.addEventScreen = AddEventScreen(self.event_manager)
-        self.viewAllEventsScreen = EventViewerPage(self.event_manager)
+        self.homeScreen = ScreenHome(self.event_manager, self.database_executor)
+        self.addEventScreen = AddEventScreen(self.event_manager, self.database_executor)
+        self.viewAllEventsScreen = EventViewerPage(self.event_manager, self.database_executor)
+        self.timelineScreen = TimelinePage(self.event_manager, self.database_executor)
         self.aboutScreen = AboutScreen()
         ## Adding screen widgets to stacked widget
         self.homeScreen_index = self.stacked_widget.addWidget(self.homeScreen)
         self.addEventScreen_index = self.stacked_widget.addWidget(self.addEventScreen)
         self.eventViewScreen_index = self.stacked_widget.addWidget(self.viewAllEventsScreen)
+        self.timelineScreen_index = self.stacked_widget.addWidget(self.timelineScreen)
         self.aboutScreen_index = self.stacked_widget.addWidget(self.aboutScreen)
 
         # Connecting functions to specific events
         self.addEventScreen.event_added_signal.connect(self.handleEventAdded)
+        # Every view patches itself from the change notifications of whatever write happened
+        self.event_change_notifier = EventChangeNotifier(self.event_manager, self)
+        self.event_change_notifier.events_changed.connect(self.viewAllEventsScreen.model.applyChanges)
+        self.event_change_notifier.events_changed.connect(self.homeScreen.calendar.apply_changes)
+        self.event_change_notifier.events_changed.connect(self.timelineScreen.timeline.apply_changes)
+        # Reminders are re-armed from the same notifications and shown in the system tray when there is one
+        self.reminder_scheduler = ReminderScheduler(self.event_manager, self.database_executor, self)
+        self.reminder_scheduler.reminders_due.connect(self.showReminders)
+        self.event_change_notifier.events_changed.connect(self.reminder_scheduler.apply_changes)
+        self.tray_icon = None
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            self.tray_icon = QSystemTrayIcon(QIcon("userIcon1.png"), self)
+            self.tray_icon.setToolTip("Scheduler App")
+            self.tray_icon.show()
+        # Double-clicking a day on the calendar opens it as a timeline
+        self.homeScreen.calendar.activated.connect(lambda date: self.toTimelinePage(1, date))
 
         self.stacked_widget.currentChanged.connect(self.handle_page_change)
 
@@ -798,7 +2065,7 @@ class MainWindow(QMainWindow):
         self.current_page_widget = self.stacked_widget.widget(new_index)
 
         if self.previous_index_for_this_call == self.addEventScreen_index:
-            print("Leaving Editing Page. Clearing Edits...")
+            logger.debug("Leaving Editing Page. Clearing Edits...")
             self.addEventScreen.resetEventFields()
 
         
@@ -812,76 +2079,305 @@ class MainWindow(QMainWindow):
     def toViewAllEventsPage(self):
         self.stacked_widget.setCurrentWidget(self.viewAllEventsScreen)
 
+    def toTimelinePage(self, day_count, date=None):
+        self.timelineScreen.set_day_count(day_count)
+        self.timelineScreen.show_date(date or self.homeScreen.calendar.selectedDate())
+        self.stacked_widget.setCurrentWidget(self.timelineScreen)
+
     def toAboutDeveloperPage(self):
         self.stacked_widget.setCurrentWidget(self.aboutScreen)
 
     def handleEventAdded(self):
         self.stacked_widget.setCurrentWidget(self.homeScreen)
 
-        self.viewAllEventsScreen.model.select()
-        self.homeScreen.calendar.load_event_dates()
-
     def editEvent(self):
         if isinstance(self.current_page_widget, EventViewerPage):
-            selected_event_id = self.viewAllEventsScreen.get_selected_row_and_return_event_id()
-            if selected_event_id:
-                editing_event_messagebox = EditEventMessageBox(self.event_manager, selected_event_id)
-                
-                if editing_event_messagebox.exec() == QDialog.DialogCode.Accepted:
-                    edited_event_data = editing_event_messagebox.get_edited_event_data()
-                    if self.event_manager.updateEvent(edited_event_data):
-                        edited_event_success_box = QMessageBox(
-                                                    QMessageBox.Information,
-                                                    "Event Updated!",
-                                                    f"The event with ID: {edited_event_data["event_id"]}, has been updated with the entered information!",
-                                                    QMessageBox.Ok
-                        )
-                        edited_event_success_box.exec_()
-                        self.viewAllEventsScreen.refresh_events_data()
+            self.viewAllEventsScreen.request_selected_event_ids(self.editSelectedEvent)
+
+    def editSelectedEvent(self, selected_event_ids):
+        if len(selected_event_ids) == 1:
+            self.database_executor.submit_action([], self.editEventWithDetails, "getEventDetailsbyId", selected_event_ids[0])
+
+    def editEventWithDetails(self, selected_event_details):
+        if not selected_event_details:
+            QMessageBox.warning(None, "Event Not Found", "Error: The Event that you selected could not be read!")
+            return
+        editing_event_messagebox = EditEventMessageBox(self.database_executor, selected_event_details)
+        # The dialog saves the edit itself before it closes
+        if editing_event_messagebox.exec() == QDialog.DialogCode.Accepted:
+            edited_event_success_box = QMessageBox(
+                                        QMessageBox.Information,
+                                        "Event Updated!",
+                                        f"The event with ID: {editing_event_messagebox.selectedEventID}, has been updated with the entered information!",
+                                        QMessageBox.Ok
+            )
+            edited_event_success_box.exec_()
 
 
 
     def deleteEvent(self):
         if isinstance(self.current_page_widget, EventViewerPage):
-            selected_event_id = self.viewAllEventsScreen.get_selected_row_and_return_event_id()
-            if selected_event_id:
-                id_event_details = self.event_manager.getEventDetailsbyId(selected_event_id)
-                event_name = id_event_details[0]["title"]
-                event_date = id_event_details[0]["event_date"]
-                confirm_event_deletion_message = QMessageBox.warning(
-                    None,
-                    "Warning: Deleting Event",
-                    f"Are you sure you want to delete this event?\n\nEvent Name: {event_name}\nEvent Date: {event_date}\n\nThis action cannot be undone!",
-                    QMessageBox.Yes | QMessageBox.Cancel
-                )
-                if confirm_event_deletion_message == QMessageBox.Yes:
-                    if self.event_manager.deleteEvent(selected_event_id):
-                        self.viewAllEventsScreen.refresh_events_data()
-                        QMessageBox.information(
-                            None,
-                            "Event Deleted",
-                            f"The following event has been permanently deleted:\n\nEvent Name: {event_name}\nEvent Date: {event_date}",
-                            QMessageBox.Ok
-                        )
-                    else:
-                        QMessageBox.warning(None, "Event Deletion Error", "Error: The Event that you selected was not able to be Deleted!")
+            self.viewAllEventsScreen.request_selected_event_ids(self.deleteEventsWithIds)
         else:
             QMessageBox.warning(None, "Wrong Page for Deleting Events", "You are on the wrong page for using this action!\nPlease use the Event Viewer page for Deleting Events!")
 
+    def deleteEventsWithIds(self, selected_event_ids):
+        if len(selected_event_ids) > 1:
+            self.deleteSelectedEvents(selected_event_ids)
+        elif selected_event_ids:
+            self.database_executor.submit_action([], self.confirmEventDeletion, "getEventDetailsbyId", selected_event_ids[0])
+
+    def confirmEventDeletion(self, id_event_details):
+        if not id_event_details:
+            QMessageBox.warning(None, "Event Deletion Error", "Error: The Event that you selected could not be read!")
+            return
+        event_name = id_event_details[0].title
+        event_date = id_event_details[0].event_date
+        confirm_event_deletion_message = QMessageBox.warning(
+            None,
+            "Warning: Deleting Event",
+            f"Are you sure you want to delete this event?\n\nEvent Name: {event_name}\nEvent Date: {event_date}\n\nThis action cannot be undone!",
+            QMessageBox.Yes | QMessageBox.Cancel
+        )
+        if confirm_event_deletion_message == QMessageBox.Yes:
+            def on_deleted(deleted):
+                if deleted:
+                    QMessageBox.information(
+                        None,
+                        "Event Deleted",
+                        f"The following event has been permanently deleted:\n\nEvent Name: {event_name}\nEvent Date: {event_date}",
+                        QMessageBox.Ok
+                    )
+                else:
+                    QMessageBox.warning(None, "Event Deletion Error", "Error: The Event that you selected was not able to be Deleted!")
+            self.database_executor.submit_action([], on_deleted, "deleteEvent", id_event_details[0].id)
+
+    def deleteSelectedEvents(self, selected_event_ids):
+        confirm_event_deletion_message = QMessageBox.warning(
+            None,
+            "Warning: Deleting Events",
+            f"Are you sure you want to delete the {len(selected_event_ids)} selected events?\n\nThis action cannot be undone!",
+            QMessageBox.Yes | QMessageBox.Cancel
+        )
+        if confirm_event_deletion_message == QMessageBox.Yes:
+            def on_deleted(deleted):
+                if deleted:
+                    QMessageBox.information(None, "Events Deleted", f"{len(selected_event_ids)} events have been permanently deleted.", QMessageBox.Ok)
+                else:
+                    QMessageBox.warning(None, "Event Deletion Error", "Error: The Events that you selected were not able to be Deleted!")
+            self.database_executor.submit_action([], on_deleted, "deleteEvents", selected_event_ids)
+
+    def recolorSelectedEvents(self):
+        if not isinstance(self.current_page_widget, EventViewerPage):
+            QMessageBox.warning(None, "Wrong Page for Editing Events", "You are on the wrong page for using this action!\nPlease use the Event Viewer page for Editing Events!")
+            return
+        self.viewAllEventsScreen.request_selected_event_ids(self.recolorEvents)
+
+    def recolorEvents(self, selected_event_ids):
+        if not selected_event_ids:
+            return
+        new_color = QColorDialog.getColor(Qt.blue, self, f"Choose a Color for {len(selected_event_ids)} Events")
+        if new_color.isValid():
+            color_code = new_color.name(QColor.NameFormat.HexRgb)
+            self.database_executor.submit_action(
+                [], lambda updated: updated or QMessageBox.warning(None, "Event Update Error", "Error: The Events that you selected were not able to be Recolored!"),
+                "updateEvents", [{"event_id": event_id, "event_color": color_code} for event_id in selected_event_ids]
+            )
+
+    def rescheduleSelectedEvents(self):
+        if not isinstance(self.current_page_widget, EventViewerPage):
+            QMessageBox.warning(None, "Wrong Page for Editing Events", "You are on the wrong page for using this action!\nPlease use the Event Viewer page for Editing Events!")
+            return
+        self.viewAllEventsScreen.request_selected_event_ids(self.rescheduleEvents)
+
+    def rescheduleEvents(self, selected_event_ids):
+        if not selected_event_ids:
+            return
+        day_offset, accepted = QInputDialog.getInt(
+            self,
+            "Reschedule Events",
+            f"Move the {len(selected_event_ids)} selected events by this many days (negative moves them earlier):",
+            7, -3650, 3650
+        )
+        if accepted and day_offset != 0:
+            self.database_executor.submit_action(
+                [], lambda rescheduled: rescheduled or QMessageBox.warning(None, "Event Update Error", "Error: The Events that you selected were not able to be Rescheduled!"),
+                "rescheduleEvents", selected_event_ids, day_offset
+            )
+
+
+
+    def rebuildCalendarsMenu(self):
+        self.calendarsMenu.clear()
+        for calendar in self.event_manager.getCalendars():
+            calendar_action = self.calendarsMenu.addAction(calendar['name'])
+            calendar_action.setCheckable(True)
+            calendar_action.setChecked(calendar['visible'])
+            color_swatch = render_cache.swatch(calendar['color'], 12, self.devicePixelRatioF()) if calendar['color'] else None
+            if color_swatch is not None:
+                calendar_action.setIcon(QIcon(color_swatch))
+            calendar_action.toggled.connect(lambda checked, calendar_id=calendar['id']: self.toggleCalendar(calendar_id, checked))
+        self.calendarsMenu.addSeparator()
+        self.calendarsMenu.addAction(self.newCalendarAction)
+        self.calendarsMenu.addAction(self.openCalendarAction)
+
+    def toggleCalendar(self, calendar_id, visible):
+        # Attaches or detaches just this calendar; the views reload from the RELOADED notification
+        self.database_executor.submit_action([self.calendarsMenu], self.on_calendar_toggled, "setCalendarVisible", calendar_id, visible)
+
+    def on_calendar_toggled(self, toggled):
+        if not toggled:
+            QMessageBox.warning(self, "Calendar Error", "Error: The calendar could not be shown or hidden!\nOnly a limited number of calendars can be shown at once.")
+        self.rebuildCalendarsMenu()
+        self.addEventScreen.refresh_calendar_field()
+
+    def newCalendar(self):
+        calendar_name, accepted = QInputDialog.getText(self, "New Calendar", "Calendar name:")
+        if accepted and calendar_name.strip():
+            self.addCalendar(calendar_name.strip())
+
+    def openCalendarFile(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open Calendar File", "", "Calendar Databases (*.db);;All Files (*)")
+        if file_path:
+            self.addCalendar(os.path.splitext(os.path.basename(file_path))[0], file_path)
+
+    def addCalendar(self, calendar_name, file_path=None):
+        def on_added(calendar_id):
+            if calendar_id is None:
+                QMessageBox.warning(self, "Calendar Error", f"Error: The calendar '{calendar_name}' could not be added!")
+                return
+            self.rebuildCalendarsMenu()
+            self.addEventScreen.refresh_calendar_field()
+        self.database_executor.submit_action([self.newCalendarAction, self.openCalendarAction], on_added, "addCalendar", calendar_name, file_path)
+
+    def manageRecurringEvents(self):
+        recurring_events_dialog = RecurringEventsDialog(self.database_executor)
+        recurring_events_dialog.exec()
+
+    def importEvents(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Import Events", "", "Calendar Files (*.ics *.csv);;iCalendar (*.ics);;CSV (*.csv)")
+        if not file_path:
+            return
+
+        # The import runs on the database thread; the window-modal dialog keeps the window's own
+        # actions out of the way until it finishes
+        progress_dialog = QProgressDialog("Importing events...", "Cancel", 0, 1000, self)
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        cancel_event = threading.Event()
+        progress_dialog.canceled.connect(cancel_event.set)
+
+        def on_progress(bytes_read, total_bytes):
+            progress_dialog.setValue(int(1000 * bytes_read / total_bytes) if total_bytes else 0)
+
+        def on_import_finished(future):
+            self.database_executor.worker.import_progress.disconnect(on_progress)
+            progress_dialog.close()
+            imported_count = None if future.exception() else future.result()
+            if imported_count is None:
+                if cancel_event.is_set():
+                    QMessageBox.information(self, "Import Cancelled", "The import was cancelled. No events were added.")
+                else:
+                    QMessageBox.warning(self, "Import Error", "Error: The selected file could not be imported!")
+                return
+            QMessageBox.information(self, "Import Complete", f"{imported_count} events were imported.")
+
+        self.database_executor.worker.import_progress.connect(on_progress)
+        self.database_executor.submit_import(file_path, cancel_event).add_done_callback(on_import_finished)
+
+    def exportEvents(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Events", "events.ics", "iCalendar (*.ics);;CSV (*.csv)")
+        if not file_path:
+            return
+
+        # Written on the database thread, like imports
+        progress_dialog = QProgressDialog("Exporting events...", "Cancel", 0, 0, self)
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        cancel_event = threading.Event()
+        progress_dialog.canceled.connect(cancel_event.set)
+
+        def on_progress(exported_count):
+            progress_dialog.setLabelText(f"Exported {exported_count} events...")
+
+        def on_export_finished(future):
+            self.database_executor.worker.export_progress.disconnect(on_progress)
+            progress_dialog.close()
+            if future.exception() is not None:
+                QMessageBox.warning(self, "Export Error", f"Error: The events could not be exported to:\n{file_path}")
+            elif cancel_event.is_set():
+                QMessageBox.information(self, "Export Cancelled", f"The export was stopped after {future.result()} events.")
+            else:
+                QMessageBox.information(self, "Export Complete", f"{future.result()} events were exported to:\n{file_path}")
 
+        self.database_executor.worker.export_progress.connect(on_progress)
+        self.database_executor.submit_export(file_path, cancel_event).add_done_callback(on_export_finished)
 
     def closeEvent(self, event):
 
         if self.viewAllEventsScreen and self.viewAllEventsScreen.model:
             self.viewAllEventsScreen.model.clear()
             self.viewAllEventsScreen.table_view.setModel(None) #potentially optional
-            print("MainWindow: QSqlTableModel cleared.")
+            logger.debug("EventTableModel cleared.")
 
-        if self.viewAllEventsScreen.event_manager:
+        self.event_change_notifier.close()
+        self.reminder_scheduler.close()
+        if self.tray_icon is not None:
+            self.tray_icon.hide()
+        self.database_executor.shutdown()
+
+        if isinstance(self.event_manager, RemoteEventManager):
+            self.event_manager.close()
+        elif self.viewAllEventsScreen.event_manager:
             self.viewAllEventsScreen.event_manager.closeConnection()
         
         super().closeEvent(event)
 
+    def showReminders(self, reminders):
+        reminder_lines = []
+        for reminder in reminders[:10]:
+            start_time = reminder['event_time'][:5] if reminder['event_time'] else "All day"
+            reminder_lines.append(f"{reminder['event_date']} {start_time}: {reminder['title']}")
+        if len(reminders) > 10:
+            reminder_lines.append(f"...and {len(reminders) - 10} more")
+        if self.tray_icon is not None and self.tray_icon.supportsMessages():
+            self.tray_icon.showMessage("Reminder", "\n".join(reminder_lines), QSystemTrayIcon.MessageIcon.Information)
+        else:
+            reminder_message = QMessageBox(QMessageBox.Icon.Information, "Reminder", "\n".join(reminder_lines), QMessageBox.Ok, self)
+            reminder_message.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+            reminder_message.setModal(False)
+            reminder_message.show()
+
+    def showDiagnostics(self):
+        if self.diagnosticsDialog is None:
+            self.diagnosticsDialog = DiagnosticsDialog(self.event_manager, self)
+        self.diagnosticsDialog.show()
+        self.diagnosticsDialog.raise_()
+
+    def toggleQueryStatsReadout(self, checked):
+        self.queryStatsLabel.setVisible(checked)
+        if checked:
+            self.updateQueryStatsReadout()
+            self.queryStatsTimer.start()
+        else:
+            self.queryStatsTimer.stop()
+
+    def updateQueryStatsReadout(self):
+        instrumentation = self.event_manager.instrumentation
+        all_queries = instrumentation.snapshot()['all_queries']
+        page_cache_hit_rate = instrumentation.cacheHitRate("event_page_cache")
+        readout = f"Queries {all_queries['count']}  p95 {all_queries['p95_ms']:.1f} ms  max {all_queries['max_ms']:.1f} ms"
+        if page_cache_hit_rate is not None:
+            readout += f"  |  page cache {page_cache_hit_rate:.0%}"
+        render_cache_hit_rate = render_cache.stats()['hit_rate']
+        if render_cache_hit_rate is not None:
+            readout += f"  |  render cache {render_cache_hit_rate:.0%}"
+        self.queryStatsLabel.setText(readout)
+
     def center(self):
         qr = self.frameGeometry()
 
@@ -892,7 +2388,18 @@ class MainWindow(QMainWindow):
         self.move(qr.topLeft())
 
 
-app = QApplication(sys.argv)
-window = MainWindow()
-window.show()
-app.exec()
\ No newline at end of file
+def main():
+    # SCHEDULER_LOG_LEVEL=DEBUG logs every query with its timing; SCHEDULER_SERVICE_URL (e.g.
+    # http://127.0.0.1:8765) makes the app a client of a running event service
+    logging.basicConfig(
+        level=os.environ.get("SCHEDULER_LOG_LEVEL", "WARNING").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    app = QApplication(sys.argv)
+    window = MainWindow(os.environ.get("SCHEDULER_SERVICE_URL"))
+    window.show()
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,39 @@
+# GUI-free scheduling core: the event store, its query API and file import/export.
+#
+# Nothing here imports Qt: the store runs on the standard library's sqlite3 module, and the
+# modules behind EventManager and EventFileTransfer are only imported the first time they are
+# used, so scripts and cron jobs that only need RecurrenceRule or the schema stay cheap to
+# import. Records use datetime.date and datetime.time values.
+import importlib
+
+from .changes import EventChange
+from .instrumentation import Instrumentation, NullInstrumentation
+from .recurrence import RecurrenceRule
+from .schema import SCHEMA_MIGRATIONS
+
+# Public name -> submodule that defines it, imported on first attribute access
+_LAZY_EXPORTS = {
+    "EventManager": ".event_manager",
+    "EVENT_COLUMNS": ".event_manager",
+    "EVENT_SORT_EXPRESSIONS": ".event_manager",
+    "RELEVANCE_SORT_COLUMN": ".event_manager",
+    "EventFileTransfer": ".transfer",
+    "FreeSlotFinder": ".free_slots",
+    "DayTimelineLayout": ".timeline",
+    "ReminderQueue": ".reminders",
+    "EventRecord": ".records",
+    "EventBatch": ".records",
+    "EventService": ".service",
+    "EventServiceClient": ".service_client",
+    "RemoteEventManager": ".service_client",
+}
+
+__all__ = ["EventChange", "Instrumentation", "NullInstrumentation", "RecurrenceRule", "SCHEMA_MIGRATIONS", *_LAZY_EXPORTS]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
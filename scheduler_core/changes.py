@@ -0,0 +1,29 @@
+class EventChange:
+    # One change to the event store, as passed to EventManager change listeners. Dates are ISO
+    # strings: old_date is None for additions and new_date None for deletions. SERIES_CHANGED
+    # means recurring occurrences changed on unknown dates; RELOADED means too many events changed
+    # to describe one by one (large imports), so listeners should reload.
+    ADDED = "added"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    SERIES_CHANGED = "series_changed"
+    RELOADED = "reloaded"
+
+    def __init__(self, kind, event_id=None, old_date=None, new_date=None):
+        self.kind = kind
+        self.event_id = event_id
+        self.old_date = old_date
+        self.new_date = new_date
+
+    def toDict(self):
+        return {'kind': self.kind, 'event_id': self.event_id, 'old_date': self.old_date, 'new_date': self.new_date}
+
+    @classmethod
+    def fromDict(cls, change):
+        return cls(change['kind'], change.get('event_id'), change.get('old_date'), change.get('new_date'))
+
+    def affectedDates(self):
+        return {date for date in (self.old_date, self.new_date) if date is not None}
+
+    def __repr__(self):
+        return f"EventChange({self.kind!r}, event_id={self.event_id!r}, old_date={self.old_date!r}, new_date={self.new_date!r})"
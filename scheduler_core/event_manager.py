@@ -0,0 +1,1509 @@
+from collections import OrderedDict
+import contextlib
+import datetime
+import itertools
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from .changes import EventChange
+from .instrumentation import EXPLAINABLE_STATEMENTS, Instrumentation
+from .records import EVENT_RECORD_FIELDS, EventBatch, EventRecord
+from .recurrence import RecurrenceRule
+from .schema import SCHEMA_MIGRATIONS
+
+logger = logging.getLogger(__name__)
+
+# Sort keys for the event list columns, in table column order. Nullable columns are coalesced
+# so (sort key, id) is always a total order that keyset pagination can resume from. Names are
+# qualified because search joins events against events_fts, which also has title/description.
+EVENT_COLUMNS = ["id", "event_date", "title", "description", "event_time", "event_color", "duration_minutes"]
+EVENT_SORT_EXPRESSIONS = ["events.id", "events.event_date", "events.title", "COALESCE(events.description, '')", "COALESCE(events.event_time, '')", "COALESCE(events.event_color, '')", "COALESCE(events.duration_minutes, -1)"]
+# Fields updateEvents can change
+UPDATABLE_EVENT_FIELDS = ("event_date", "title", "description", "event_time", "event_color", "duration_minutes", "reminder_minutes")
+# Columns of getEventSeries rows
+SERIES_COLUMNS = ("id", "start_date", "last_date", "title", "description", "event_time", "event_color", "rrule", "duration_minutes", "reminder_minutes")
+# Fields of the rows importEventRows takes, and of exportEventRows rows after the id. Series rows
+# add the rule and the removed occurrence dates, with event_date the series' first occurrence.
+EVENT_ROW_FIELDS = ("event_date", "title", "description", "event_time", "event_color", "duration_minutes", "reminder_minutes")
+SERIES_ROW_FIELDS = EVENT_ROW_FIELDS + ("rrule", "exception_dates")
+# Sort column used for search results ordered by relevance
+RELEVANCE_SORT_COLUMN = -1
+# Comparisons the event list's date filter offers (see EventManager.dateFilter)
+DATE_FILTER_COMPARISONS = ("=", ">", "<")
+
+UNIX_EPOCH = datetime.datetime(1970, 1, 1)
+
+# Primary SQLite result codes for SQLITE_BUSY and SQLITE_LOCKED
+SQLITE_BUSY_ERROR_CODES = (5, 6)
+
+# The default calendar lives in the main database file and keeps its stored ids. Every other
+# calendar is a separate database file attached as calendar_<id>, and its events and series are
+# identified as (calendar id << CALENDAR_ID_SHIFT) | stored id, so ids stay unique across files.
+DEFAULT_CALENDAR_ID = 1
+CALENDAR_ID_SHIFT = 32
+# SQLite's compiled-in default for SQLITE_MAX_ATTACHED, used if the connection cannot report its own
+DEFAULT_MAX_ATTACHED = 10
+
+class EventManager:
+    # Length assumed for timed events saved without a duration (matches schema migration 6)
+    DEFAULT_EVENT_DURATION_MINUTES = 60
+    # Imports adding more events than this are announced as one RELOADED change
+    bulk_change_limit = 1000
+
+    # Connections are pooled one per thread: `db` always returns the calling thread's connection
+    # and opens it on first use, so the same EventManager can be used from worker threads.
+    # Every connection runs in WAL mode, so readers and writers do not block each other.
+    # Connections are in autocommit mode; write transactions are opened explicitly with
+    # beginWriteTransaction.
+    # Every statement is timed into `instrumentation` (see scheduler_core.instrumentation).
+    # sqlite3 keeps each connection's recently prepared statements keyed by SQL text and rebinds
+    # them on reuse, so SQL must always bind its values as parameters.
+    # Listeners added with addChangeListener get a list of EventChange after every committed
+    # write, on the thread that made it.
+    # Events are grouped into calendars, listed in the main database's calendars table. Reads
+    # cover the visible calendars only: each is attached to every connection on demand (the
+    # first statement a thread runs after the set changes) and detached again when hidden, so
+    # hidden calendars cost nothing. Reads over several calendars run as one UNION ALL
+    # statement with an arm per calendar; writes go to the calendar an event id belongs to.
+    def __init__(self, db_filename="events.db", busy_timeout_ms=5000, max_busy_retries=5, instrumentation=None):
+        self.db_filename = db_filename
+        self.busy_timeout_ms = busy_timeout_ms
+        self.max_busy_retries = max_busy_retries
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        self.thread_connections = {}
+        self.change_listeners = []
+        # Expanded recurring-event occurrences for recently viewed date windows
+        self.occurrence_cache = OrderedDict()
+        self.occurrence_cache_size = 16
+        self.occurrence_cache_lock = threading.Lock()
+        # calendar id -> {'id', 'name', 'file_name', 'color', 'visible'}. Replaced, never mutated,
+        # so other threads can read it without locking; each change bumps calendars_generation.
+        self.calendars = {DEFAULT_CALENDAR_ID: {'id': DEFAULT_CALENDAR_ID, 'name': "Default", 'file_name': None, 'color': None, 'visible': True}}
+        self.calendars_generation = 0
+        # Calendars hidden in this EventManager. Visibility is each client's own view, so it is
+        # never written to the shared registry.
+        self.hidden_calendar_ids = set()
+        # thread id -> calendar ids its reads are narrowed to (see readingCalendars)
+        self.thread_calendar_limits = {}
+        # thread id -> calendars_generation its connection's attachments match
+        self.attached_generations = {}
+        self.calendar_lock = threading.Lock()
+        # Calendar new events go to when no calendar is given
+        self.default_calendar_id = DEFAULT_CALENDAR_ID
+        # thread id -> changes held back until its runWriteGroup transaction commits
+        self.write_groups = {}
+        if self.connectToDatabase():
+            self.loadCalendars()
+
+    @property
+    def db(self):
+        thread_id = threading.get_ident()
+        if thread_id not in self.thread_connections:
+            self.connectToDatabase()
+        elif self.attached_generations.get(thread_id) != self.calendars_generation:
+            self.attachCalendars()
+        return self.thread_connections.get(thread_id)
+
+    def isConnected(self):
+        return self.db is not None
+
+    def connectToDatabase(self):
+        thread_id = threading.get_ident()
+        try:
+            db = sqlite3.connect(self.db_filename, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+        except sqlite3.Error as error:
+            logger.error("Failed to open database %s: %s", self.db_filename, error)
+            self.thread_connections[thread_id] = None
+            return False
+
+        self.thread_connections[thread_id] = db
+        logger.info("Database connection opened for %s (thread %s)", self.db_filename, thread_id)
+        self.configureConnection()
+        self.migrateSchema()
+        self.attachCalendars()
+        return True
+
+    def configureConnection(self):
+        for pragma in (
+            "PRAGMA journal_mode = WAL",
+            f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}",
+            # NORMAL is durable in WAL mode apart from the last commits before a power loss
+            "PRAGMA synchronous = NORMAL",
+            "PRAGMA cache_size = -16384",
+            "PRAGMA mmap_size = 268435456",
+            "PRAGMA temp_store = MEMORY",
+        ):
+            try:
+                self.execQuery(pragma)
+            except sqlite3.Error as error:
+                logger.error("Error applying '%s': %s", pragma, error)
+
+    def isBusyError(self, error):
+        error_code = getattr(error, "sqlite_errorcode", None)
+        if error_code is not None:
+            return error_code & 0xFF in SQLITE_BUSY_ERROR_CODES
+        return isinstance(error, sqlite3.OperationalError) and ("locked" in str(error) or "busy" in str(error))
+
+    def execQuery(self, sql, parameters=(), batch=False, fetch=False):
+        # Returns the cursor, or with fetch=True the list of result rows; raises sqlite3.Error
+        # once retries are exhausted. With batch=True, parameters is a sequence of parameter sets
+        # run through executemany. Reads should use fetch=True so their timing covers the rows.
+        if not self.instrumentation.enabled:
+            cursor = self.runStatement(sql, parameters, batch)
+            return cursor.fetchall() if fetch else cursor
+
+        start = time.perf_counter()
+        cursor = self.runStatement(sql, parameters, batch)
+        if fetch:
+            rows = cursor.fetchall()
+            row_count = len(rows)
+        else:
+            row_count = cursor.rowcount if cursor.rowcount >= 0 else None
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        query_plan = None
+        if self.instrumentation.isSlow(elapsed_ms) and not batch:
+            query_plan = self.explainQueryPlan(sql, parameters)
+        self.instrumentation.recordQuery(sql, elapsed_ms, row_count, query_plan)
+        return rows if fetch else cursor
+
+    def runStatement(self, sql, parameters, batch):
+        # The busy timeout already waits inside SQLite, but some lock conflicts (e.g. a WAL snapshot
+        # going stale) return SQLITE_BUSY immediately, so retry those with exponential backoff.
+        for attempt in range(self.max_busy_retries + 1):
+            try:
+                if batch:
+                    return self.db.executemany(sql, parameters)
+                return self.db.execute(sql, parameters)
+            except sqlite3.Error as error:
+                if not self.isBusyError(error) or attempt == self.max_busy_retries:
+                    raise
+            time.sleep(0.01 * (2 ** attempt))
+
+    def explainQueryPlan(self, sql, parameters=()):
+        # EXPLAIN QUERY PLAN detail lines for a statement, indented by nesting depth
+        if not sql.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS):
+            return []
+        try:
+            plan_rows = self.db.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        except sqlite3.Error as error:
+            logger.debug("Could not explain query: %s", error)
+            return []
+        depths = {0: -1}
+        plan = []
+        for node_id, parent_id, _, detail in plan_rows:
+            depths[node_id] = depths.get(parent_id, -1) + 1
+            plan.append("  " * depths[node_id] + detail)
+        return plan
+
+    def beginWriteTransaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so a transaction can never fail halfway
+        # through because another connection started writing after it began reading. Inside
+        # runWriteGroup the group's transaction is already open, so this nests a savepoint.
+        try:
+            self.execQuery("SAVEPOINT write" if threading.get_ident() in self.write_groups else "BEGIN IMMEDIATE")
+        except sqlite3.Error as error:
+            logger.error("Error starting write transaction: %s", error)
+            return False
+        return True
+
+    def commitTransaction(self):
+        try:
+            self.execQuery("RELEASE write" if threading.get_ident() in self.write_groups else "COMMIT")
+            return True
+        except sqlite3.Error as error:
+            logger.error("Error committing transaction: %s", error)
+        self.rollbackTransaction()
+        return False
+
+    def rollbackTransaction(self):
+        if threading.get_ident() not in self.write_groups:
+            self.db.rollback()
+            return
+        try:
+            self.db.execute("ROLLBACK TO write")
+            self.db.execute("RELEASE write")
+        except sqlite3.Error as error:
+            logger.error("Error rolling back to savepoint: %s", error)
+
+    def runWriteGroup(self, calls):
+        # Group commit: runs write calls (callables taking this manager, e.g.
+        # lambda manager: manager.addEvent(...)) in one transaction, so they share a single
+        # commit. Each call runs under its own savepoint and is undone alone if it fails
+        # (returns None or False, or raises), so one bad write never sinks the others. Change
+        # listeners hear about the whole group once it has committed. Returns a (result,
+        # changes) pair per call, changes being the EventChange list that call produced; if the
+        # group cannot commit, every result is None and nothing changed.
+        thread_id = threading.get_ident()
+        failed = [(None, [])] * len(calls)
+        if not calls or thread_id in self.write_groups or not self.isConnected() or not self.beginWriteTransaction():
+            return failed
+        pending = self.write_groups[thread_id] = []
+        outcomes = []
+        try:
+            for call in calls:
+                first_change = len(pending)
+                self.execQuery("SAVEPOINT operation")
+                try:
+                    result = call(self)
+                except Exception:
+                    logger.exception("Grouped write %r failed", call)
+                    result = None
+                if result is None or result is False:
+                    self.execQuery("ROLLBACK TO operation")
+                    del pending[first_change:]
+                self.execQuery("RELEASE operation")
+                outcomes.append((result, pending[first_change:]))
+        except sqlite3.Error as error:
+            logger.error("Error running write group: %s", error)
+            del self.write_groups[thread_id]
+            self.db.rollback()
+            self.loadCalendars()
+            return failed
+        del self.write_groups[thread_id]
+        if not self.commitTransaction():
+            self.loadCalendars()
+            return failed
+        self.notifyChanges(pending)
+        return outcomes
+
+    def addChangeListener(self, listener):
+        self.change_listeners.append(listener)
+
+    def removeChangeListener(self, listener):
+        if listener in self.change_listeners:
+            self.change_listeners.remove(listener)
+
+    def notifyChanges(self, changes):
+        # A failing listener is logged and skipped; the write it reports has already committed.
+        # Changes made inside runWriteGroup wait for the group's commit.
+        if not changes:
+            return
+        pending = self.write_groups.get(threading.get_ident())
+        if pending is not None:
+            pending.extend(changes)
+            return
+        for listener in list(self.change_listeners):
+            try:
+                listener(changes)
+            except Exception:
+                logger.exception("Event change listener %r failed", listener)
+
+    def getEventDates(self, event_ids):
+        # {id: ISO event_date} for the ids that exist, in one statement however many ids there are
+        event_ids = [int(event_id) for event_id in event_ids]
+        if not event_ids:
+            return {}
+        return dict(self.execQuery(self.unionAll(lambda schema, id_offset: f"""
+            SELECT {self.shardColumns(id_offset, ("id", "event_date"))} FROM {schema}.events AS events
+            WHERE events.id IN ({self.idsInShard(id_offset)})
+        """), {"event_ids": json.dumps(event_ids)}, fetch=True))
+
+    def schemaVersion(self):
+        return self.db.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrateSchema(self):
+        if not self.isConnected():
+            logger.error("Database not connected. Cannot migrate schema")
+            return False
+
+        latest_version = len(SCHEMA_MIGRATIONS)
+        if self.schemaVersion() > latest_version:
+            logger.error("Database schema version %s is newer than this app supports (%s).", self.schemaVersion(), latest_version)
+            return False
+
+        for version in range(self.schemaVersion() + 1, latest_version + 1):
+            # Each step runs in its own transaction so a failure leaves the file at the last good version.
+            # The version is re-read under the write lock in case another connection migrated first.
+            if not self.beginWriteTransaction():
+                return False
+            if self.schemaVersion() >= version:
+                self.commitTransaction()
+                continue
+            try:
+                for statement in SCHEMA_MIGRATIONS[version - 1]:
+                    self.execQuery(statement)
+                self.execQuery(f"PRAGMA user_version = {version}")
+            except sqlite3.Error as error:
+                logger.error("Error applying schema migration %s: %s", version, error)
+                self.rollbackTransaction()
+                return False
+            if not self.commitTransaction():
+                return False
+            logger.info("Schema migrated to version %s.", version)
+        return True
+
+    @staticmethod
+    def calendarSchema(calendar_id):
+        return "main" if calendar_id == DEFAULT_CALENDAR_ID else f"calendar_{int(calendar_id)}"
+
+    @staticmethod
+    def calendarIdOffset(calendar_id):
+        return 0 if calendar_id == DEFAULT_CALENDAR_ID else calendar_id << CALENDAR_ID_SHIFT
+
+    @staticmethod
+    def calendarOfId(event_id):
+        # Calendar an event or series id belongs to
+        return (event_id >> CALENDAR_ID_SHIFT) or DEFAULT_CALENDAR_ID
+
+    @classmethod
+    def idOffsetOf(cls, event_id):
+        return cls.calendarIdOffset(cls.calendarOfId(event_id))
+
+    def calendarPath(self, file_name):
+        # Calendar files are named relative to the main database's directory
+        return os.path.join(os.path.dirname(os.path.abspath(self.db_filename)), file_name)
+
+    @contextlib.contextmanager
+    def readingCalendars(self, calendar_ids):
+        # Narrows the calling thread's reads to those of the visible calendars in calendar_ids,
+        # e.g. for a service answering a client that hides some calendars itself
+        thread_id = threading.get_ident()
+        self.thread_calendar_limits[thread_id] = frozenset(calendar_ids)
+        try:
+            yield
+        finally:
+            self.thread_calendar_limits.pop(thread_id, None)
+
+    def isReadable(self, calendar_id):
+        calendar = self.calendars.get(calendar_id)
+        limit = self.thread_calendar_limits.get(threading.get_ident())
+        return calendar is not None and calendar['visible'] and (limit is None or calendar_id in limit)
+
+    def visibleShards(self):
+        # (schema, id offset) of every calendar the calling thread reads, in calendar id order
+        return [
+            (self.calendarSchema(calendar_id), self.calendarIdOffset(calendar_id))
+            for calendar_id in sorted(self.calendars) if self.isReadable(calendar_id)
+        ]
+
+    def shardOfId(self, event_id):
+        # (schema, stored id) for an event or series id, or None when its calendar is not read
+        calendar_id = self.calendarOfId(event_id)
+        if not self.isReadable(calendar_id):
+            return None
+        return self.calendarSchema(calendar_id), event_id - self.calendarIdOffset(calendar_id)
+
+    def unionAll(self, shard_select, shards=None):
+        # One statement reading every visible calendar. shard_select(schema, id_offset) returns
+        # that calendar's SELECT with its tables aliased to their plain names (FROM
+        # {schema}.events AS events), so column references and filters are the same in every
+        # arm, and with id_offset added to the ids it returns. With nothing visible the default
+        # calendar's SELECT is wrapped to return no rows, so callers always get a valid statement.
+        # An ORDER BY appended to the result sorts the whole compound, which SQLite runs as a
+        # merge of the arms when each can be read in order.
+        shards = self.visibleShards() if shards is None else shards
+        if not shards:
+            return f"SELECT * FROM ({shard_select('main', 0)}) WHERE 0"
+        if len(shards) == 1:
+            return shard_select(*shards[0])
+        return "\nUNION ALL\n".join(f"SELECT * FROM ({shard_select(schema, id_offset)})" for schema, id_offset in shards)
+
+    @staticmethod
+    def encodedId(id_column, id_offset):
+        # Expression for a stored id as seen outside its calendar
+        return f"{id_column} + {id_offset}" if id_offset else id_column
+
+    @classmethod
+    def shardColumns(cls, id_offset, columns=EVENT_RECORD_FIELDS, table="events"):
+        # Qualified select list, with the id encoded for the calendar at id_offset
+        return ", ".join(f"{cls.encodedId(table + '.id', id_offset)} AS id" if column == "id" else f"{table}.{column}" for column in columns)
+
+    @staticmethod
+    def idsInShard(id_offset, parameter="event_ids"):
+        # Subquery turning the ids in a JSON array parameter that belong to one calendar into its stored ids
+        return f"SELECT value - {id_offset} FROM json_each(:{parameter}) WHERE value >> {CALENDAR_ID_SHIFT} = {id_offset >> CALENDAR_ID_SHIFT}"
+
+    def writableShard(self, calendar_id=None):
+        # (schema, id offset) new rows for calendar_id (default_calendar_id when None) go to, or
+        # None when that calendar is unknown or hidden
+        calendar_id = self.default_calendar_id if calendar_id is None else calendar_id
+        calendar = self.calendars.get(calendar_id)
+        if calendar is None or not calendar['visible']:
+            logger.error("Calendar %s is not visible; nothing can be added to it.", calendar_id)
+            return None
+        return self.calendarSchema(calendar_id), self.calendarIdOffset(calendar_id)
+
+    def maxAttachedCalendars(self):
+        if hasattr(self.db, "getlimit"):
+            return self.db.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        return DEFAULT_MAX_ATTACHED
+
+    def dataVersion(self):
+        # PRAGMA data_version of the main and attached databases on the calling thread's
+        # connection, joined into a string that changes whenever another connection (or
+        # process) commits to any of them. Only comparable between calls on the same thread.
+        try:
+            schemas = [name for _, name, _ in self.db.execute("PRAGMA database_list") if name != "temp"]
+            return ".".join(str(self.db.execute(f"PRAGMA {schema}.data_version").fetchone()[0]) for schema in schemas)
+        except (sqlite3.Error, AttributeError) as error:
+            logger.error("Error reading the data version: %s", error)
+            return None
+
+    def attachCalendars(self):
+        # Attaches the visible calendars to the calling thread's connection and detaches hidden
+        # ones. ATTACH and DETACH cannot run inside a transaction or while a statement on the
+        # calendar is still being read, so a busy connection keeps its current set and tries
+        # again on its next statement. The generation is read before the calendars, so a change
+        # made meanwhile is picked up next time rather than missed.
+        thread_id = threading.get_ident()
+        db = self.thread_connections.get(thread_id)
+        if db is None or db.in_transaction:
+            return
+        generation = self.calendars_generation
+        wanted = {
+            self.calendarSchema(calendar_id): self.calendarPath(calendar['file_name'])
+            for calendar_id, calendar in self.calendars.items() if calendar['visible'] and calendar['file_name']
+        }
+        try:
+            attached = {name for _, name, _ in db.execute("PRAGMA database_list")} - {"main", "temp"}
+            for schema in attached - wanted.keys():
+                db.execute(f"DETACH DATABASE {schema}")
+            for schema in wanted.keys() - attached:
+                db.execute(f"ATTACH DATABASE ? AS {schema}", (wanted[schema],))
+                db.execute(f"PRAGMA {schema}.synchronous = NORMAL")
+        except sqlite3.Error as error:
+            logger.warning("Error attaching calendars: %s", error)
+            return
+        self.attached_generations[thread_id] = generation
+
+    def loadCalendars(self):
+        try:
+            rows = self.execQuery("SELECT id, name, file_name, color FROM main.calendars ORDER BY id", fetch=True)
+        except sqlite3.Error as error:
+            logger.error("Error loading calendars: %s", error)
+            return False
+        calendars = {}
+        attached_count, max_attached = 0, self.maxAttachedCalendars()
+        for calendar_id, name, file_name, color in rows:
+            visible = calendar_id not in self.hidden_calendar_ids
+            if visible and file_name:
+                # A calendar whose file cannot be opened is left out rather than attached empty,
+                # as are those past the attach limit
+                if attached_count >= max_attached or not self.prepareCalendarFile(file_name):
+                    visible = False
+                else:
+                    attached_count += 1
+            calendars[calendar_id] = {'id': calendar_id, 'name': name, 'file_name': file_name, 'color': color, 'visible': visible}
+        with self.calendar_lock:
+            self.calendars = calendars
+            self.calendars_generation += 1
+        self.clearOccurrenceCache()
+        return True
+
+    def prepareCalendarFile(self, file_name):
+        # Creates a calendar's database file if needed and migrates it to the current schema,
+        # using a short-lived EventManager on the file itself. Its copy of the calendars table
+        # is unused: only the main database's registry counts.
+        calendar_manager = EventManager(self.calendarPath(file_name), self.busy_timeout_ms, self.max_busy_retries, self.instrumentation)
+        ready = calendar_manager.isConnected() and calendar_manager.schemaVersion() == len(SCHEMA_MIGRATIONS)
+        calendar_manager.closeConnection()
+        return ready
+
+    def getCalendars(self):
+        return [dict(calendar) for _, calendar in sorted(self.calendars.items())]
+
+    def addCalendar(self, name, file_name=None, color=None):
+        # Registers a calendar stored in file_name (created if missing; by default named after
+        # the calendar), shown if another calendar can still be attached. Returns its id, or
+        # None if it could not be added.
+        file_name = file_name or "calendar_" + re.sub(r"\W+", "_", name.strip().lower()).strip("_") + ".db"
+        if os.path.abspath(self.calendarPath(file_name)) == os.path.abspath(self.db_filename):
+            logger.error("The main database cannot be added as a calendar.")
+            return None
+        if not self.prepareCalendarFile(file_name):
+            logger.error("Could not open calendar file %s.", file_name)
+            return None
+        try:
+            cursor = self.execQuery(
+                "INSERT INTO main.calendars (name, file_name, color) VALUES (:name, :file_name, :color)",
+                {"name": name, "file_name": file_name, "color": color}
+            )
+        except sqlite3.Error as error:
+            logger.error("Error adding calendar %s: %s", name, error)
+            return None
+        self.loadCalendars()
+        logger.info("Calendar %s added (%s).", name, file_name)
+        if self.calendars.get(cursor.lastrowid, {}).get('visible'):
+            self.notifyChanges([EventChange(EventChange.RELOADED)])
+        return cursor.lastrowid
+
+    def setCalendarVisible(self, calendar_id, visible):
+        # Shows or hides one calendar for this EventManager only. Only that calendar's file is
+        # attached or detached; the others stay attached, and views re-read just the visible ones.
+        calendar = self.calendars.get(calendar_id)
+        if calendar is None:
+            return False
+        if calendar['visible'] == bool(visible):
+            return True
+        if visible and calendar['file_name']:
+            attached_count = sum(1 for other in self.calendars.values() if other['visible'] and other['file_name'])
+            if attached_count >= self.maxAttachedCalendars():
+                logger.warning("Cannot show calendar %s: at most %s calendars can be attached at once.", calendar['name'], attached_count)
+                return False
+            if not self.prepareCalendarFile(calendar['file_name']):
+                logger.error("Could not open calendar file %s.", calendar['file_name'])
+                return False
+        if visible:
+            self.hidden_calendar_ids.discard(calendar_id)
+        else:
+            self.hidden_calendar_ids.add(calendar_id)
+        self.loadCalendars()
+        self.notifyChanges([EventChange(EventChange.RELOADED)])
+        return True
+
+    def removeCalendar(self, calendar_id):
+        # Unregisters a calendar; its file is left on disk and can be added again later
+        if calendar_id == DEFAULT_CALENDAR_ID or calendar_id not in self.calendars:
+            return False
+        try:
+            self.execQuery("DELETE FROM main.calendars WHERE id = ?", (calendar_id,))
+        except sqlite3.Error as error:
+            logger.error("Error removing calendar %s: %s", calendar_id, error)
+            return False
+        was_visible = self.calendars[calendar_id]['visible']
+        self.hidden_calendar_ids.discard(calendar_id)
+        if self.default_calendar_id == calendar_id:
+            self.default_calendar_id = DEFAULT_CALENDAR_ID
+        self.loadCalendars()
+        if was_visible:
+            self.notifyChanges([EventChange(EventChange.RELOADED)])
+        return True
+
+    def addEvent(self, eventDate, eventTitle, eventDescription, eventTime, eventColor, eventDuration=None, eventReminder=None, calendar_id=None):
+        # eventReminder is how many minutes before the event's start to remind about it (None for no reminder)
+        shard = self.writableShard(calendar_id)
+        if shard is not None and self.isConnected():
+            try:
+                cursor = self.execQuery(f'''
+                    INSERT INTO {shard[0]}.events (event_date, title, description, event_time, event_color, duration_minutes, reminder_minutes)
+                    VALUES (:event_date, :title, :description, :event_time, :event_color, :duration_minutes, :reminder_minutes)
+                ''', {
+                    "event_date": self.isoDate(eventDate),
+                    "title": eventTitle,
+                    "description": eventDescription,
+                    "event_time": self.isoTime(eventTime),
+                    "event_color": eventColor,
+                    "duration_minutes": eventDuration,
+                    "reminder_minutes": eventReminder
+                })
+            except sqlite3.Error as error:
+                logger.error("Error adding event: %s", error)
+            else:
+                logger.debug("Event added for %s: %s", eventDate, eventTitle)
+                self.notifyChanges([EventChange(EventChange.ADDED, cursor.lastrowid + shard[1], new_date=self.isoDate(eventDate))])
+                return True #success
+        return False #failure
+    
+    def updateEvent(self, edited_event_data):
+        # The old date is read in the same write transaction so listeners learn where the event was
+        shard = self.shardOfId(edited_event_data["event_id"])
+        if shard is None:
+            logger.error("Event %s is not in a visible calendar.", edited_event_data["event_id"])
+            return False
+        if self.isConnected() and self.beginWriteTransaction():
+            try:
+                old_dates = self.getEventDates([edited_event_data["event_id"]])
+                self.execQuery(f'''
+                    UPDATE {shard[0]}.events
+                    SET
+                        event_date = :event_date,
+                        title = :title,
+                        description = :description,
+                        event_time = :event_time,
+                        event_color = :event_color,
+                        duration_minutes = :duration_minutes,
+                        reminder_minutes = :reminder_minutes
+                    WHERE id = :event_id
+                ''', {
+                    "event_date": self.isoDate(edited_event_data["event_date"]),
+                    "title": edited_event_data["title"],
+                    "description": edited_event_data["description"],
+                    "event_time": self.isoTime(edited_event_data["event_time"]),
+                    "event_color": edited_event_data["event_color"],
+                    "duration_minutes": edited_event_data.get("duration_minutes"),
+                    "reminder_minutes": edited_event_data.get("reminder_minutes"),
+                    "event_id": shard[1]
+                })
+            except sqlite3.Error as error:
+                logger.error("Error updating event %s: %s", edited_event_data, error)
+                self.rollbackTransaction()
+            else:
+                if not self.commitTransaction():
+                    return False
+                logger.debug("Event updated for %s: %s: %s", edited_event_data["event_id"], edited_event_data["event_date"], edited_event_data["title"])
+                self.notifyChanges([
+                    EventChange(EventChange.UPDATED, event_id, old_date, self.isoDate(edited_event_data["event_date"]))
+                    for event_id, old_date in old_dates.items()
+                ])
+                return True #success
+        return False #failure
+
+
+    # Single events come back as EventRecord, bulk reads as a columnar EventBatch (see
+    # scheduler_core.records); both use the field names of EVENT_RECORD_FIELDS
+    def eventRecord(self, row):
+        event_id, event_date, title, description, event_time, event_color, duration_minutes, reminder_minutes = row
+        return EventRecord(event_id, self.parseDate(event_date), title, description, self.parseTime(event_time), event_color, duration_minutes, reminder_minutes)
+
+    def getEventsForDate(self, date:datetime.date):
+        if not self.isConnected(): return []
+        try:
+            rows = self.execQuery(self.unionAll(lambda schema, id_offset: f"""
+                SELECT {self.shardColumns(id_offset)} FROM {schema}.events AS events WHERE events.event_date = :date
+            """), {"date": self.isoDate(date)}, fetch=True)
+        except sqlite3.Error as error:
+            logger.error("Error getting events for date: %s", error)
+            return []
+        return [self.eventRecord(row) for row in rows]
+
+    def getAllEvents(self):
+        # Read straight from the cursor into the batch, so the rows are never all held as tuples
+        if not self.isConnected(): return EventBatch()
+        try:
+            cursor = self.execQuery(self.unionAll(lambda schema, id_offset: f"SELECT {self.shardColumns(id_offset)} FROM {schema}.events AS events"))
+            events = EventBatch.fromRows(cursor)
+            cursor.close()
+        except sqlite3.Error as error:
+            logger.error("Error getting all events: %s", error)
+            return EventBatch()
+        return events
+    
+    def getAllEventDates(self):
+        if not self.isConnected(): return []
+        all_event_dates = []
+        try:
+            for (event_date,) in self.execQuery(f"""
+                SELECT DISTINCT event_date FROM ({self.unionAll(lambda schema, id_offset: f"SELECT event_date FROM {schema}.events AS events")})
+                ORDER BY event_date
+            """, fetch=True):
+                all_event_dates.append(self.parseDate(event_date))
+        except sqlite3.Error as error:
+            logger.error("Error getting all event dates: %s", error)
+        return all_event_dates
+
+    def getEventDateSummaries(self, start_date:datetime.date, end_date:datetime.date, max_colors=12):
+        # One row per day in the range: how many events it has, the colors of the first
+        # max_colors of them (in insertion order, at most DAY_SUMMARY_MAX_COLORS) and, as
+        # 'conflict', whether two of its stored events overlap. All three come from the
+        # trigger-maintained day_summary table alone, one row per day with events, however many
+        # events the days hold. Days in several calendars add up, colors in calendar order;
+        # overlaps are flagged within each calendar.
+        if not self.isConnected(): return {}
+        summaries = {}
+        try:
+            for event_date, count, colors, conflict in self.execQuery(self.unionAll(lambda schema, id_offset: f"""
+                SELECT event_date, event_count, colors, conflict FROM {schema}.day_summary AS day_summary
+                WHERE event_date BETWEEN :start_date AND :end_date
+            """), {"start_date": self.isoDate(start_date), "end_date": self.isoDate(end_date)}, fetch=True):
+                summary = summaries.get(event_date)
+                if summary is None:
+                    summaries[event_date] = {
+                        'count': count,
+                        'colors': colors.split(',')[:max_colors] if colors else []
+                    }
+                    if conflict:
+                        summaries[event_date]['conflict'] = True
+                else:
+                    summary['count'] += count
+                    if colors:
+                        summary['colors'] = (summary['colors'] + colors.split(','))[:max_colors]
+                    if conflict:
+                        summary['conflict'] = True
+        except sqlite3.Error as error:
+            logger.error("Error getting event date summaries: %s", error)
+
+        for occurrence in self.getSeriesOccurrences(start_date, end_date):
+            summary = summaries.setdefault(occurrence['event_date'], {'count': 0, 'colors': []})
+            summary['count'] += 1
+            if len(summary['colors']) < max_colors:
+                summary['colors'].append(occurrence['event_color'])
+        return summaries
+
+    @classmethod
+    def seriesParameters(cls, startDate, eventTitle, eventDescription, eventTime, eventColor, rrule_text, eventDuration=None, eventReminder=None):
+        # Named parameters of insertSeriesSql; raises ValueError for an unsupported rule
+        start_date = datetime.date.fromisoformat(cls.isoDate(startDate))
+        rule = RecurrenceRule.parse(rrule_text)
+        last_date = rule.lastOccurrence(start_date)
+        return {
+            "start_date": start_date.isoformat(),
+            "last_date": last_date.isoformat() if last_date else None,
+            "title": eventTitle,
+            "description": eventDescription,
+            "event_time": cls.isoTime(eventTime),
+            "event_color": eventColor,
+            "rrule": rule.toString(),
+            "duration_minutes": eventDuration,
+            "reminder_minutes": eventReminder
+        }
+
+    @staticmethod
+    def insertSeriesSql(schema):
+        return f'''
+            INSERT INTO {schema}.event_series (start_date, last_date, title, description, event_time, event_color, rrule, duration_minutes, reminder_minutes)
+            VALUES (:start_date, :last_date, :title, :description, :event_time, :event_color, :rrule, :duration_minutes, :reminder_minutes)
+        '''
+
+    def addEventSeries(self, startDate, eventTitle, eventDescription, eventTime, eventColor, rrule_text, eventDuration=None, eventReminder=None, calendar_id=None):
+        parameters = self.seriesParameters(startDate, eventTitle, eventDescription, eventTime, eventColor, rrule_text, eventDuration, eventReminder)
+        shard = self.writableShard(calendar_id)
+        if shard is None:
+            return False
+        try:
+            self.execQuery(self.insertSeriesSql(shard[0]), parameters)
+        except sqlite3.Error as error:
+            logger.error("Error adding event series: %s", error)
+            return False
+        self.clearOccurrenceCache()
+        logger.debug("Event series added from %s: %s (%s)", parameters["start_date"], eventTitle, parameters["rrule"])
+        self.notifyChanges([EventChange(EventChange.SERIES_CHANGED)])
+        return True
+
+    def addSeriesException(self, series_id, occurrence_date):
+        # Removes a single occurrence from a series without touching the rest of it
+        shard = self.shardOfId(series_id)
+        if shard is None:
+            logger.error("Series %s is not in a visible calendar.", series_id)
+            return False
+        try:
+            self.execQuery(
+                f"INSERT OR IGNORE INTO {shard[0]}.event_series_exceptions (series_id, occurrence_date) VALUES (:series_id, :occurrence_date)",
+                {"series_id": shard[1], "occurrence_date": self.isoDate(occurrence_date)}
+            )
+        except sqlite3.Error as error:
+            logger.error("Error adding series exception: %s", error)
+            return False
+        self.clearOccurrenceCache()
+        self.notifyChanges([EventChange(EventChange.SERIES_CHANGED)])
+        return True
+
+    def deleteEventSeries(self, series_id):
+        shard = self.shardOfId(series_id)
+        if shard is None:
+            logger.error("Series %s is not in a visible calendar.", series_id)
+            return False
+        schema, stored_id = shard
+        if not self.beginWriteTransaction():
+            return False
+        try:
+            for sql in (f"DELETE FROM {schema}.event_series_exceptions WHERE series_id = ?", f"DELETE FROM {schema}.event_series WHERE id = ?"):
+                self.execQuery(sql, (stored_id,))
+        except sqlite3.Error as error:
+            logger.error("Error deleting event series %s: %s", series_id, error)
+            self.rollbackTransaction()
+            return False
+        if not self.commitTransaction():
+            return False
+        self.clearOccurrenceCache()
+        logger.debug("Event series with ID %s deleted.", series_id)
+        self.notifyChanges([EventChange(EventChange.SERIES_CHANGED)])
+        return True
+
+    def getEventSeries(self):
+        # Every series of the visible calendars, with the dates of its removed occurrences
+        all_series = []
+        try:
+            for row in self.execQuery(f"""
+                {self.unionAll(lambda schema, id_offset: f'''
+                    SELECT {self.shardColumns(id_offset, SERIES_COLUMNS, 'event_series')},
+                           (SELECT group_concat(occurrence_date, ' ') FROM {schema}.event_series_exceptions WHERE series_id = event_series.id) AS exception_dates
+                    FROM {schema}.event_series AS event_series
+                ''')}
+                ORDER BY start_date, id
+            """, fetch=True):
+                all_series.append({
+                    'id': row[0],
+                    'start_date': row[1],
+                    'last_date': row[2],
+                    'title': row[3],
+                    'description': row[4],
+                    'event_time': row[5],
+                    'event_color': row[6],
+                    'rrule': row[7],
+                    'duration_minutes': row[8],
+                    'reminder_minutes': row[9],
+                    'exception_dates': sorted(row[10].split()) if row[10] else []
+                })
+        except sqlite3.Error as error:
+            logger.error("Error getting event series: %s", error)
+        return all_series
+
+    def getSeriesOccurrences(self, start_date, end_date):
+        # Expands only the series that overlap [start_date, end_date], and only inside that window.
+        # Cached per window and per set of calendars read.
+        window = (self.isoDate(start_date), self.isoDate(end_date))
+        cache_key = (window, self.thread_calendar_limits.get(threading.get_ident()))
+        with self.occurrence_cache_lock:
+            cached_occurrences = self.occurrence_cache.get(cache_key)
+            if cached_occurrences is not None:
+                self.occurrence_cache.move_to_end(cache_key)
+        self.instrumentation.recordCacheLookup("occurrence_cache", cached_occurrences is not None)
+        if cached_occurrences is not None:
+            return cached_occurrences
+
+        window_parameters = {"start_date": window[0], "end_date": window[1]}
+        window_start, window_end = (datetime.date.fromisoformat(date) for date in window)
+        exceptions = {}
+        occurrences = []
+        try:
+            for series_id, occurrence_date in self.execQuery(self.unionAll(lambda schema, id_offset: f"""
+                SELECT {self.encodedId("series_id", id_offset)}, occurrence_date FROM {schema}.event_series_exceptions
+                WHERE occurrence_date BETWEEN :start_date AND :end_date
+            """), window_parameters, fetch=True):
+                exceptions.setdefault(series_id, set()).add(datetime.date.fromisoformat(occurrence_date))
+
+            for series_id, series_start, title, description, event_time, event_color, rrule, duration_minutes, reminder_minutes in self.execQuery(self.unionAll(lambda schema, id_offset: f"""
+                SELECT {self.shardColumns(id_offset, ("id", "start_date", "title", "description", "event_time", "event_color", "rrule", "duration_minutes", "reminder_minutes"), "event_series")}
+                FROM {schema}.event_series AS event_series
+                WHERE start_date <= :end_date AND (last_date IS NULL OR last_date >= :start_date)
+            """), window_parameters, fetch=True):
+                rule = RecurrenceRule.parse(rrule)
+                for occurrence_date in rule.occurrences(datetime.date.fromisoformat(series_start), window_start, window_end, exceptions.get(series_id, ())):
+                    occurrences.append({
+                        'series_id': series_id,
+                        'event_date': occurrence_date.isoformat(),
+                        'title': title,
+                        'description': description,
+                        'event_time': event_time,
+                        'event_color': event_color,
+                        'duration_minutes': duration_minutes,
+                        'reminder_minutes': reminder_minutes
+                    })
+        except sqlite3.Error as error:
+            logger.error("Error getting series occurrences: %s", error)
+            return occurrences
+
+        with self.occurrence_cache_lock:
+            self.occurrence_cache[cache_key] = occurrences
+            while len(self.occurrence_cache) > self.occurrence_cache_size:
+                self.occurrence_cache.popitem(last=False)
+        return occurrences
+
+    def clearOccurrenceCache(self):
+        with self.occurrence_cache_lock:
+            self.occurrence_cache.clear()
+
+    @classmethod
+    def eventInterval(cls, event_date, event_time, duration_minutes=None):
+        # (start_minute, end_minute) since the Unix epoch, computed the same way as the
+        # events_rtree triggers; None for untimed events
+        start_date = cls.parseDate(cls.isoDate(event_date))
+        start_time = cls.parseTime(cls.isoTime(event_time))
+        if start_date is None or start_time is None:
+            return None
+        start_minute = int((datetime.datetime.combine(start_date, start_time) - UNIX_EPOCH).total_seconds() / 60)
+        if duration_minutes is None:
+            duration_minutes = cls.DEFAULT_EVENT_DURATION_MINUTES
+        return start_minute, start_minute + duration_minutes
+
+    def findConflicts(self, eventDate, eventTime, eventDuration=None, exclude_event_id=None):
+        # Events and recurring occurrences whose time overlaps the given one. Stored events come
+        # from an R*Tree range query, O(log n + k); occurrences are expanded for the day before
+        # (for ones running past midnight) and the day itself. Touching intervals do not conflict.
+        interval = self.eventInterval(eventDate, eventTime, eventDuration)
+        if interval is None or not self.isConnected():
+            return []
+        start_minute, end_minute = interval
+        conflicts = []
+        try:
+            for row in self.execQuery(f"""
+                {self.unionAll(lambda schema, id_offset: f'''
+                    SELECT {self.shardColumns(id_offset, ("id", "event_date", "title", "event_time", "event_color", "duration_minutes"))}, events_rtree.start_minute
+                    FROM {schema}.events_rtree AS events_rtree
+                    JOIN {schema}.events AS events ON events.id = events_rtree.id
+                    WHERE events_rtree.start_minute < :end_minute AND events_rtree.end_minute > :start_minute
+                      AND {self.encodedId("events_rtree.id", id_offset)} != :exclude_event_id
+                ''')}
+                ORDER BY start_minute
+            """, {"start_minute": start_minute, "end_minute": end_minute, "exclude_event_id": -1 if exclude_event_id is None else exclude_event_id}, fetch=True):
+                conflicts.append({
+                    'id': row[0],
+                    'event_date': self.parseDate(row[1]),
+                    'title': row[2],
+                    'event_time': self.parseTime(row[3]),
+                    'event_color': row[4],
+                    'duration_minutes': row[5]
+                })
+        except sqlite3.Error as error:
+            logger.error("Error finding conflicting events: %s", error)
+
+        day = self.parseDate(self.isoDate(eventDate))
+        for occurrence in self.getSeriesOccurrences(day - datetime.timedelta(days=1), day):
+            occurrence_interval = self.eventInterval(occurrence['event_date'], occurrence['event_time'], occurrence['duration_minutes'])
+            if occurrence_interval and occurrence_interval[0] < end_minute and occurrence_interval[1] > start_minute:
+                conflicts.append({
+                    'id': None,
+                    'series_id': occurrence['series_id'],
+                    'event_date': self.parseDate(occurrence['event_date']),
+                    'title': occurrence['title'],
+                    'event_time': self.parseTime(occurrence['event_time']),
+                    'event_color': occurrence['event_color'],
+                    'duration_minutes': occurrence['duration_minutes']
+                })
+        return conflicts
+
+    def getBusyIntervals(self, start_minute, end_minute):
+        # (start_minute, end_minute) pairs, sorted by start, for every stored event and recurring
+        # occurrence overlapping [start_minute, end_minute). Stored events come from an R*Tree
+        # range query; occurrences are expanded for the days the range covers.
+        if not self.isConnected(): return []
+        try:
+            busy_intervals = self.execQuery(f"""
+                {self.unionAll(lambda schema, id_offset: f'''
+                    SELECT start_minute, end_minute FROM {schema}.events_rtree
+                    WHERE start_minute < :end_minute AND end_minute > :start_minute
+                ''')}
+                ORDER BY start_minute
+            """, {"start_minute": start_minute, "end_minute": end_minute}, fetch=True)
+        except sqlite3.Error as error:
+            logger.error("Error getting busy intervals: %s", error)
+            return []
+
+        first_day = (UNIX_EPOCH + datetime.timedelta(minutes=start_minute)).date() - datetime.timedelta(days=1)
+        last_day = (UNIX_EPOCH + datetime.timedelta(minutes=end_minute)).date()
+        occurrence_intervals = []
+        for occurrence in self.getSeriesOccurrences(first_day, last_day):
+            interval = self.eventInterval(occurrence['event_date'], occurrence['event_time'], occurrence['duration_minutes'])
+            if interval and interval[0] < end_minute and interval[1] > start_minute:
+                occurrence_intervals.append(interval)
+        if occurrence_intervals:
+            busy_intervals = sorted(busy_intervals + occurrence_intervals)
+        return busy_intervals
+
+    def getTimelineEvents(self, start_date, end_date):
+        # Everything a day/week timeline shows for [start_date, end_date]: timed events (with
+        # start_minute/end_minute since the Unix epoch) from an R*Tree range query, including ones
+        # running into the range from the day before, and untimed events (start_minute None)
+        # from the date index, plus recurring occurrences of both
+        if not self.isConnected(): return []
+        range_start = self.eventInterval(start_date, datetime.time(0, 0), 0)[0]
+        range_end = self.eventInterval(end_date, datetime.time(0, 0), 24 * 60)[1]
+        timeline_events = []
+        try:
+            for row in self.execQuery(self.unionAll(lambda schema, id_offset: f"""
+                SELECT {self.shardColumns(id_offset, ("id", "event_date", "title", "event_color"))}, events_rtree.start_minute, events_rtree.end_minute
+                FROM {schema}.events_rtree AS events_rtree
+                JOIN {schema}.events AS events ON events.id = events_rtree.id
+                WHERE events_rtree.start_minute < :range_end AND events_rtree.end_minute > :range_start
+            """), {"range_start": range_start, "range_end": range_end}, fetch=True):
+                timeline_events.append({'id': row[0], 'series_id': None, 'event_date': row[1], 'title': row[2], 'event_color': row[3], 'start_minute': row[4], 'end_minute': row[5]})
+            for row in self.execQuery(self.unionAll(lambda schema, id_offset: f"""
+                SELECT {self.shardColumns(id_offset, ("id", "event_date", "title", "event_color"))} FROM {schema}.events AS events
+                WHERE event_date BETWEEN :start_date AND :end_date AND (event_time IS NULL OR event_time = '')
+            """), {"start_date": self.isoDate(start_date), "end_date": self.isoDate(end_date)}, fetch=True):
+                timeline_events.append({'id': row[0], 'series_id': None, 'event_date': row[1], 'title': row[2], 'event_color': row[3], 'start_minute': None, 'end_minute': None})
+        except sqlite3.Error as error:
+            logger.error("Error getting timeline events: %s", error)
+            return []
+
+        first_day = self.parseDate(self.isoDate(start_date)) - datetime.timedelta(days=1)
+        for occurrence in self.getSeriesOccurrences(first_day, end_date):
+            interval = self.eventInterval(occurrence['event_date'], occurrence['event_time'], occurrence['duration_minutes'])
+            if interval is None:
+                if occurrence['event_date'] < self.isoDate(start_date):
+                    continue
+                interval = (None, None)
+            elif interval[1] <= range_start:
+                continue
+            timeline_events.append({'id': None, 'series_id': occurrence['series_id'], 'event_date': occurrence['event_date'], 'title': occurrence['title'], 'event_color': occurrence['event_color'], 'start_minute': interval[0], 'end_minute': interval[1]})
+        return timeline_events
+
+    def getEventReminders(self, start_minute, end_minute, event_ids=None):
+        # Stored events whose reminder is due in [start_minute, end_minute), as minutes since the
+        # Unix epoch, ordered by due minute; one range scan of idx_event_reminders_minute.
+        # event_ids narrows the result to those events.
+        if not self.isConnected(): return []
+        parameters = {"start_minute": start_minute, "end_minute": end_minute}
+        if event_ids is not None:
+            parameters["event_ids"] = json.dumps([int(event_id) for event_id in event_ids])
+
+        def shard_select(schema, id_offset):
+            ids_clause = f"AND event_reminders.id IN ({self.idsInShard(id_offset)})" if event_ids is not None else ""
+            return f'''
+                SELECT {self.shardColumns(id_offset, ("id", "event_date", "event_time", "title", "reminder_minutes"))}, event_reminders.remind_minute
+                FROM {schema}.event_reminders AS event_reminders
+                JOIN {schema}.events AS events ON events.id = event_reminders.id
+                WHERE event_reminders.remind_minute >= :start_minute AND event_reminders.remind_minute < :end_minute {ids_clause}
+            '''
+        try:
+            rows = self.execQuery(f"{self.unionAll(shard_select)} ORDER BY remind_minute", parameters, fetch=True)
+        except sqlite3.Error as error:
+            logger.error("Error getting event reminders: %s", error)
+            return []
+        return [
+            {'id': row[0], 'series_id': None, 'event_date': row[1], 'event_time': row[2], 'title': row[3], 'reminder_minutes': row[4], 'remind_minute': row[5]}
+            for row in rows
+        ]
+
+    def getSeriesReminders(self, start_minute, end_minute):
+        # Recurring occurrences whose reminder is due in [start_minute, end_minute). Occurrences
+        # are expanded up to the longest series reminder offset past the window's end.
+        if not self.isConnected(): return []
+        try:
+            max_offset = self.execQuery(f"""
+                SELECT MAX(max_offset) FROM ({self.unionAll(lambda schema, id_offset: f"SELECT MAX(reminder_minutes) AS max_offset FROM {schema}.event_series")})
+            """, fetch=True)[0][0]
+        except sqlite3.Error as error:
+            logger.error("Error getting series reminders: %s", error)
+            return []
+        if max_offset is None:
+            return []
+        first_day = (UNIX_EPOCH + datetime.timedelta(minutes=start_minute)).date() - datetime.timedelta(days=1)
+        last_day = (UNIX_EPOCH + datetime.timedelta(minutes=end_minute + max(max_offset, 0))).date()
+        reminders = []
+        for occurrence in self.getSeriesOccurrences(first_day, last_day):
+            if occurrence['reminder_minutes'] is None:
+                continue
+            interval = self.eventInterval(occurrence['event_date'], occurrence['event_time'] or "00:00:00", 0)
+            if interval is None:
+                continue
+            remind_minute = interval[0] - occurrence['reminder_minutes']
+            if start_minute <= remind_minute < end_minute:
+                reminders.append({
+                    'id': None,
+                    'series_id': occurrence['series_id'],
+                    'event_date': occurrence['event_date'],
+                    'event_time': occurrence['event_time'],
+                    'title': occurrence['title'],
+                    'reminder_minutes': occurrence['reminder_minutes'],
+                    'remind_minute': remind_minute
+                })
+        reminders.sort(key=lambda reminder: reminder['remind_minute'])
+        return reminders
+
+    # Name/value state kept in the main database; values are stored as text
+    def getSetting(self, name, default=None):
+        if not self.isConnected(): return default
+        try:
+            rows = self.execQuery("SELECT value FROM main.settings WHERE name = ?", (name,), fetch=True)
+        except sqlite3.Error as error:
+            logger.error("Error reading setting %s: %s", name, error)
+            return default
+        return rows[0][0] if rows else default
+
+    def setSetting(self, name, value):
+        try:
+            self.execQuery("INSERT OR REPLACE INTO main.settings (name, value) VALUES (?, ?)", (name, None if value is None else str(value)))
+        except sqlite3.Error as error:
+            logger.error("Error saving setting %s: %s", name, error)
+            return False
+        return True
+
+    # Records use datetime.date/datetime.time; the database stores ISO strings. Strings passed
+    # in are assumed to already be ISO formatted.
+    @staticmethod
+    def isoDate(date):
+        if isinstance(date, datetime.date):
+            return date.isoformat()[:10]
+        return date
+
+    @staticmethod
+    def isoTime(time_value):
+        if isinstance(time_value, datetime.time):
+            return time_value.isoformat(timespec="seconds")
+        return time_value
+
+    @staticmethod
+    def parseDate(date_text):
+        try:
+            return datetime.date.fromisoformat(date_text)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def parseTime(time_text):
+        try:
+            return datetime.time.fromisoformat(time_text)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def ftsMatchExpression(search_text):
+        # Turns free text into an FTS5 query: every word must match, each as a prefix. Words are
+        # quoted so user input can never be parsed as FTS5 syntax.
+        words = re.findall(r"\w+", search_text)
+        if not words:
+            return None
+        return " ".join(f'"{word}"*' for word in words)
+
+    @classmethod
+    def dateFilter(cls, comparison, date):
+        # (filter_clause, filter_values) for getEventPage keeping the events dated `comparison` date
+        if comparison not in DATE_FILTER_COMPARISONS:
+            raise ValueError(f"Unknown date comparison {comparison!r}")
+        return f"events.event_date {comparison} :filter_date", {"filter_date": cls.isoDate(date)}
+
+    def getEventPage(self, sort_column, descending, after_key, limit, filter_clause="", filter_values=None, match_expression=None, event_ids=None):
+        # Keyset pagination: returns up to `limit` rows ordered by (sort key, id) that come after
+        # after_key, a (sort key, id) pair taken from the last row of the previous page.
+        # With match_expression, rows are limited to full-text matches and RELEVANCE_SORT_COLUMN
+        # orders them by bm25 rank. filter_values maps the named parameters in filter_clause to values.
+        # event_ids restricts the rows to those events, e.g. to place changed events in a sorted view.
+        # Each calendar's arm reads its own first `limit` rows in its stored ids (the offset only
+        # shifts ids, so its order is unchanged); the merged arms are cut back to `limit`.
+        if not self.isConnected(): return None
+        if sort_column == RELEVANCE_SORT_COLUMN:
+            sort_expression = "bm25(events_fts)" if match_expression else "events.id"
+        else:
+            sort_expression = EVENT_SORT_EXPRESSIONS[sort_column]
+        sorted_by_id = sort_expression == "events.id"
+        direction = "DESC" if descending else "ASC"
+
+        conditions = []
+        parameters = {name.lstrip(":"): value for name, value in (filter_values or {}).items()}
+        parameters["limit"] = limit
+        if match_expression:
+            conditions.append("events_fts MATCH :match_expression")
+            parameters["match_expression"] = match_expression
+        if filter_clause:
+            conditions.append(f"({filter_clause})")
+        if event_ids is not None:
+            parameters["event_ids"] = json.dumps([int(event_id) for event_id in event_ids])
+        if after_key is not None:
+            parameters["after_value"], parameters["after_id"] = after_key
+
+        def shard_select(schema, id_offset):
+            source = f"{schema}.events AS events"
+            if match_expression:
+                source += f" JOIN {schema}.events_fts AS events_fts ON events_fts.rowid = events.id"
+            shard_conditions = list(conditions)
+            if event_ids is not None:
+                shard_conditions.append(f"events.id IN ({self.idsInShard(id_offset)})")
+            if after_key is not None:
+                after_id = f"(:after_id - {id_offset})" if id_offset else ":after_id"
+                after_value = after_id.replace("after_id", "after_value") if sorted_by_id else ":after_value"
+                shard_conditions.append(f"({sort_expression}, events.id) {'<' if descending else '>'} ({after_value}, {after_id})")
+            where = f"WHERE {' AND '.join(shard_conditions)}" if shard_conditions else ""
+            return f'''
+                SELECT {self.shardColumns(id_offset, EVENT_COLUMNS)}, {self.encodedId(sort_expression, id_offset) if sorted_by_id else sort_expression} AS sort_key
+                FROM {source}
+                {where}
+                ORDER BY {sort_expression} {direction}, events.id {direction}
+                LIMIT :limit
+            '''
+
+        shards = self.visibleShards()
+        try:
+            if len(shards) == 1:
+                return self.execQuery(self.unionAll(shard_select, shards), parameters, fetch=True)
+            return self.execQuery(f"SELECT * FROM ({self.unionAll(shard_select, shards)}) ORDER BY sort_key {direction}, id {direction} LIMIT :limit", parameters, fetch=True)
+        except sqlite3.Error as error:
+            logger.error("Error getting event page: %s", error)
+            return None
+
+    def getEventDetailsbyId(self, id):
+        if not self.isConnected(): return []
+        try:
+            shard = self.shardOfId(id)
+            if shard is None:
+                return []
+            rows = self.execQuery(f"SELECT {self.shardColumns(self.idOffsetOf(id))} FROM {shard[0]}.events AS events WHERE events.id = ?", (shard[1],), fetch=True)
+        except sqlite3.Error as error:
+            logger.error("Error getting event %s: %s", id, error)
+            return []
+        return [self.eventRecord(row) for row in rows]
+    
+    def deleteEvent(self, eventId):
+        if not self.isConnected(): return []
+        shard = self.shardOfId(eventId)
+        if shard is None:
+            logger.error("Event %s is not in a visible calendar.", eventId)
+            return False
+        try:
+            deleted_rows = self.execQuery(f"DELETE FROM {shard[0]}.events WHERE id = ? RETURNING {self.encodedId('id', self.idOffsetOf(eventId))}, event_date", (shard[1],), fetch=True)
+        except sqlite3.Error as error:
+            logger.error("Error deleting event with ID %s: %s", eventId, error)
+            return False
+        else:
+            logger.debug("Event with ID %s deleted.", eventId)
+            self.notifyChanges([EventChange(EventChange.DELETED, event_id, old_date) for event_id, old_date in deleted_rows])
+            return True
+
+    def execBatchInTransaction(self, sql, bound_columns, change_kind=None):
+        # Runs one prepared statement over parallel lists of bound values (one list per
+        # placeholder) with executemany, committing once at the end. The last column holds event
+        # ids: each row runs against its event's calendar, which sql names as {schema}, with the
+        # id as stored there. With change_kind (UPDATED or DELETED) listeners hear about each
+        # existing event.
+        if not self.isConnected(): return False
+        if not bound_columns or not bound_columns[0]: return True
+        if max(bound_columns[-1]) >> CALENDAR_ID_SHIFT == 0 and self.calendars[DEFAULT_CALENDAR_ID]['visible']:
+            shard_rows = {"main": zip(*bound_columns)}
+        else:
+            shard_rows = {}
+            for row in zip(*bound_columns):
+                shard = self.shardOfId(row[-1])
+                if shard is None:
+                    logger.warning("Event %s is not in a visible calendar; skipped.", row[-1])
+                    continue
+                shard_rows.setdefault(shard[0], []).append(row[:-1] + (shard[1],))
+        if not self.beginWriteTransaction():
+            return False
+        old_dates, new_dates = {}, {}
+        try:
+            if change_kind:
+                old_dates = self.getEventDates(bound_columns[-1])
+            for schema, rows in shard_rows.items():
+                self.execQuery(sql.format(schema=schema), rows, batch=True)
+            if change_kind == EventChange.UPDATED:
+                new_dates = self.getEventDates(old_dates)
+        except sqlite3.Error as error:
+            logger.error("Error running batch: %s", error)
+            self.rollbackTransaction()
+            return False
+        if not self.commitTransaction():
+            return False
+        self.notifyChanges([EventChange(change_kind, event_id, old_date, new_dates.get(event_id)) for event_id, old_date in old_dates.items()])
+        return True
+
+    def addEvents(self, new_events, calendar_id=None):
+        # new_events: dicts with event_date, title and optionally the other EVENT_ROW_FIELDS
+        event_rows = (tuple(event.get(field) for field in EVENT_ROW_FIELDS) for event in new_events)
+        imported_count = self.importEventRows(event_rows, calendar_id=calendar_id)
+        if imported_count is not None:
+            logger.debug("%s events added.", imported_count)
+        return imported_count is not None
+
+    def updateEvents(self, edited_events):
+        # edited_events: dicts shaped like updateEvent's argument, holding only the fields to
+        # change; a field that is present is written even when it is None, so nullable fields can
+        # be cleared. Each row flags its fields, so one statement covers full edits and bulk
+        # recolors alike.
+        edited_events = list(edited_events)
+        bound_columns = []
+        for field in UPDATABLE_EVENT_FIELDS:
+            stored_value = self.isoDate if field == "event_date" else self.isoTime if field == "event_time" else lambda value: value
+            bound_columns.append([field in event for event in edited_events])
+            bound_columns.append([stored_value(event.get(field)) for event in edited_events])
+        bound_columns.append([event["event_id"] for event in edited_events])
+        if self.execBatchInTransaction(f'''
+            UPDATE {{schema}}.events
+            SET {", ".join(f"{field} = CASE WHEN ? THEN ? ELSE {field} END" for field in UPDATABLE_EVENT_FIELDS)}
+            WHERE id = ?
+        ''', bound_columns, EventChange.UPDATED):
+            logger.debug("%s events updated.", len(edited_events))
+            return True
+        return False
+
+    def rescheduleEvents(self, event_ids, day_offset):
+        event_ids = list(event_ids)
+        if self.execBatchInTransaction(
+            "UPDATE {schema}.events SET event_date = date(event_date, ?) WHERE id = ?",
+            [[f"{day_offset:+d} days"] * len(event_ids), event_ids],
+            EventChange.UPDATED
+        ):
+            logger.debug("%s events moved by %s days.", len(event_ids), day_offset)
+            return True
+        return False
+
+    def deleteEvents(self, event_ids):
+        event_ids = list(event_ids)
+        if self.execBatchInTransaction("DELETE FROM {schema}.events WHERE id = ?", [event_ids], EventChange.DELETED):
+            logger.debug("%s events deleted.", len(event_ids))
+            return True
+        return False
+
+    def importEventRows(self, event_rows, batch_size=5000, progress_callback=None, calendar_id=None, series_rows=()):
+        # Inserts EVENT_ROW_FIELDS tuples from any iterable using one prepared statement and
+        # executemany, all inside a single transaction, followed by the SERIES_ROW_FIELDS tuples
+        # of series_rows (read only once event_rows is exhausted). progress_callback(imported_count)
+        # is called after each batch; returning False cancels the import and rolls back
+        # everything it inserted. Returns the number of events and series imported, or None if
+        # the import was cancelled or failed. Rows go to calendar_id (default_calendar_id when None).
+        if not self.isConnected(): return None
+        shard = self.writableShard(calendar_id)
+        if shard is None:
+            return None
+        schema, id_offset = shard
+        if not self.beginWriteTransaction():
+            return None
+
+        # Ids only grow (AUTOINCREMENT) and the write lock is held, so the new rows are exactly
+        # the ones above the current maximum
+        try:
+            previous_max_id = self.execQuery(f"SELECT COALESCE(MAX(id), 0) FROM {schema}.events", fetch=True)[0][0]
+        except sqlite3.Error as error:
+            logger.error("Error importing events: %s", error)
+            self.rollbackTransaction()
+            return None
+        imported_count = 0
+        event_rows = iter(event_rows)
+        while True:
+            batch = list(itertools.islice(event_rows, batch_size))
+            if not batch:
+                break
+            try:
+                self.execQuery(f"INSERT INTO {schema}.events ({', '.join(EVENT_ROW_FIELDS)}) VALUES ({', '.join('?' * len(EVENT_ROW_FIELDS))})", batch, batch=True)
+            except sqlite3.Error as error:
+                logger.error("Error importing events: %s", error)
+                self.rollbackTransaction()
+                return None
+            imported_count += len(batch)
+            if progress_callback and progress_callback(imported_count) is False:
+                logger.info("Import cancelled, rolling back.")
+                self.rollbackTransaction()
+                return None
+
+        series_count = 0
+        try:
+            for *fields, rrule_text, exception_dates in series_rows:
+                cursor = self.execQuery(self.insertSeriesSql(schema), self.seriesParameters(*fields[:5], rrule_text, *fields[5:]))
+                self.execQuery(
+                    f"INSERT OR IGNORE INTO {schema}.event_series_exceptions (series_id, occurrence_date) VALUES (?, ?)",
+                    [(cursor.lastrowid, self.isoDate(occurrence_date)) for occurrence_date in exception_dates], batch=True
+                )
+                series_count += 1
+        except (sqlite3.Error, ValueError) as error:
+            logger.error("Error importing event series: %s", error)
+            self.rollbackTransaction()
+            return None
+
+        changes = [EventChange(EventChange.RELOADED)]
+        if imported_count <= self.bulk_change_limit:
+            try:
+                changes = [
+                    EventChange(EventChange.ADDED, event_id, new_date=event_date)
+                    for event_id, event_date in self.execQuery(f"SELECT {self.encodedId('id', id_offset)}, event_date FROM {schema}.events WHERE id > ?", (previous_max_id,), fetch=True)
+                ]
+            except sqlite3.Error as error:
+                logger.error("Error importing events: %s", error)
+                self.rollbackTransaction()
+                return None
+        if not self.commitTransaction():
+            return None
+        logger.info("Imported %s events and %s recurring events.", imported_count, series_count)
+        if series_count:
+            self.clearOccurrenceCache()
+            changes.append(EventChange(EventChange.SERIES_CHANGED))
+        self.notifyChanges(changes)
+        return imported_count + series_count
+
+    # Imports built up over several calls (the event service's import sessions): rows are kept
+    # in a temporary table of the calling thread's connection until importStagedRows moves
+    # them in with importEventRows, so staging and importing must happen on the same thread.
+    def createStagingTable(self):
+        self.execQuery("CREATE TEMP TABLE IF NOT EXISTS staged_import_rows (import_id INTEGER NOT NULL, series INTEGER NOT NULL, row TEXT NOT NULL)")
+        self.execQuery("CREATE INDEX IF NOT EXISTS temp.idx_staged_import_rows ON staged_import_rows (import_id, series)")
+
+    def stageImportRows(self, import_id, event_rows, series_rows=()):
+        # Returns the number of rows staged, or None on failure
+        rows = [(import_id, 0, json.dumps(list(row))) for row in event_rows] + [(import_id, 1, json.dumps(list(row))) for row in series_rows]
+        try:
+            self.createStagingTable()
+            self.execQuery("INSERT INTO temp.staged_import_rows (import_id, series, row) VALUES (?, ?, ?)", rows, batch=True)
+        except sqlite3.Error as error:
+            logger.error("Error staging import rows: %s", error)
+            return None
+        return len(rows)
+
+    def importStagedRows(self, import_id, calendar_id=None, batch_size=5000):
+        # Imports and discards what stageImportRows staged under import_id; returns what importEventRows does
+        def staged_rows(series):
+            for rows in self.iterRows("SELECT row FROM temp.staged_import_rows WHERE import_id = ? AND series = ? ORDER BY rowid", (import_id, series)):
+                for (row,) in rows:
+                    yield tuple(json.loads(row))
+        try:
+            self.createStagingTable()
+        except sqlite3.Error as error:
+            logger.error("Error importing staged rows: %s", error)
+            return None
+        imported_count = self.importEventRows(staged_rows(0), batch_size, calendar_id=calendar_id, series_rows=list(staged_rows(1)))
+        self.discardStagedRows(import_id)
+        return imported_count
+
+    def discardStagedRows(self, import_id):
+        try:
+            self.createStagingTable()
+            self.execQuery("DELETE FROM temp.staged_import_rows WHERE import_id = ?", (import_id,))
+        except sqlite3.Error as error:
+            logger.error("Error discarding staged rows: %s", error)
+            return False
+        return True
+
+    def exportEventRows(self, after=None):
+        # Generator over (id, *EVENT_ROW_FIELDS) of every visible calendar in (event_date, id)
+        # order, read straight from the cursor, so exports never hold the table in memory. after,
+        # an (event_date, id) pair, resumes past that row.
+        def shard_select(schema, id_offset):
+            where = f"WHERE (events.event_date, {self.encodedId('events.id', id_offset)}) > (:after_date, :after_id)" if after else ""
+            return f"SELECT {self.shardColumns(id_offset, ('id',) + EVENT_ROW_FIELDS)} FROM {schema}.events AS events {where}"
+        parameters = {"after_date": after[0], "after_id": after[1]} if after else {}
+        for rows in self.iterRows(f"{self.unionAll(shard_select)} ORDER BY event_date, id", parameters):
+            yield from rows
+
+    def exportSeriesRows(self):
+        # (id, *SERIES_ROW_FIELDS) of every series of the visible calendars
+        for series in self.getEventSeries():
+            yield (series['id'], series['start_date'], *(series[field] for field in SERIES_ROW_FIELDS[1:]))
+
+    def iterRows(self, sql, parameters=(), chunk_size=1000, cancel_event=None):
+        # Generator over lists of up to chunk_size result rows, fetched from the cursor as the
+        # caller asks for them, so memory stays constant however many rows match. Stops early
+        # once cancel_event (anything with is_set(), e.g. a threading.Event set from another
+        # thread) is set. The statement is released when the generator finishes, is closed or
+        # is garbage collected, so callers can simply stop iterating. Like every read it must be
+        # consumed on the thread that started it, which owns the connection.
+        if not self.isConnected(): return
+        try:
+            cursor = self.execQuery(sql, parameters)
+        except sqlite3.Error as error:
+            logger.error("Error reading rows: %s", error)
+            return
+        try:
+            while cancel_event is None or not cancel_event.is_set():
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        except sqlite3.Error as error:
+            logger.error("Error reading rows: %s", error)
+        finally:
+            cursor.close()
+
+    def iterEvents(self, start_date=None, end_date=None, filter_clause="", filter_values=None, match_expression=None, batch_size=None, cancel_event=None):
+        # Streams the stored events in [start_date, end_date] (either end open when None) in
+        # (event_date, id) order: one EventRecord at a time, or EventBatch objects of up to
+        # batch_size events. filter_clause, filter_values and match_expression narrow the rows
+        # as in getEventPage. See iterRows for cancellation and early termination.
+        conditions = []
+        parameters = {name.lstrip(":"): value for name, value in (filter_values or {}).items()}
+        if start_date is not None:
+            conditions.append("events.event_date >= :start_date")
+            parameters["start_date"] = self.isoDate(start_date)
+        if end_date is not None:
+            conditions.append("events.event_date <= :end_date")
+            parameters["end_date"] = self.isoDate(end_date)
+        if match_expression:
+            conditions.append("events_fts MATCH :match_expression")
+            parameters["match_expression"] = match_expression
+        if filter_clause:
+            conditions.append(f"({filter_clause})")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        def shard_select(schema, id_offset):
+            source = f"{schema}.events AS events"
+            if match_expression:
+                source += f" JOIN {schema}.events_fts AS events_fts ON events_fts.rowid = events.id"
+            return f"SELECT {self.shardColumns(id_offset)} FROM {source} {where}"
+        chunks = self.iterRows(f"{self.unionAll(shard_select)} ORDER BY event_date, id", parameters, batch_size or 1000, cancel_event)
+        try:
+            for rows in chunks:
+                if batch_size:
+                    yield EventBatch.fromRows(rows)
+                else:
+                    for row in rows:
+                        yield self.eventRecord(row)
+        finally:
+            chunks.close()
+
+    def closeConnection(self):
+        # Closes the calling thread's connection; every thread that used the manager closes its own
+        db = self.thread_connections.pop(threading.get_ident(), None)
+        if db is not None:
+            db.close()
+            logger.info("Database connection closed.")
@@ -0,0 +1,86 @@
+import datetime
+
+from .event_manager import UNIX_EPOCH, EventManager
+
+MINUTES_PER_DAY = 24 * 60
+
+class FreeSlotFinder:
+    # Finds free time on top of EventManager with a single sweep over busy intervals in start
+    # order. Busy intervals are read a few days at a time from an indexed range query, so the
+    # search stops reading as soon as enough slots have been found. Chunks always start and end
+    # at midnight, and slots never cross midnight, so no slot can straddle two chunks.
+    chunk_days = 7
+
+    def __init__(self, event_manager:EventManager):
+        self.event_manager = event_manager
+
+    @staticmethod
+    def toMinute(value):
+        if not isinstance(value, datetime.datetime):
+            value = datetime.datetime.combine(value, datetime.time(0, 0))
+        return int((value - UNIX_EPOCH).total_seconds() // 60)
+
+    @staticmethod
+    def fromMinute(minute):
+        return UNIX_EPOCH + datetime.timedelta(minutes=minute)
+
+    @staticmethod
+    def hoursToMinutes(hours):
+        # (start, end) times -> minutes after midnight; an end of 00:00 means the end of the day
+        if hours is None:
+            return None
+        start_time, end_time = hours
+        start_minute = start_time.hour * 60 + start_time.minute
+        end_minute = end_time.hour * 60 + end_time.minute or MINUTES_PER_DAY
+        return (start_minute, end_minute) if end_minute > start_minute else None
+
+    def findFreeSlots(self, duration_minutes, window_start, window_end, working_hours=(datetime.time(9, 0), datetime.time(17, 0)), weekday_hours=None, count=5, align_minutes=15):
+        # window_start/window_end are datetimes (a date means its midnight) bounding the search.
+        # Slots fall inside working_hours, a (start, end) pair of times, on every day unless
+        # weekday_hours overrides it: a dict from weekday (0 = Monday) to that day's (start, end),
+        # or None to leave the day out. Slot starts are aligned to align_minutes past midnight.
+        # Returns up to `count` non-overlapping (start, end) datetimes, earliest first.
+        search_start = self.toMinute(window_start)
+        search_end = self.toMinute(window_end)
+        default_hours = self.hoursToMinutes(working_hours)
+        hours_by_weekday = [
+            self.hoursToMinutes(weekday_hours[weekday]) if weekday_hours and weekday in weekday_hours else default_hours
+            for weekday in range(7)
+        ]
+        slot_starts = []
+
+        def add_slots_in_gap(gap_start, gap_end):
+            gap_start = max(gap_start, search_start)
+            gap_end = min(gap_end, search_end)
+            day_start = gap_start // MINUTES_PER_DAY * MINUTES_PER_DAY
+            while day_start < gap_end and len(slot_starts) < count:
+                hours = hours_by_weekday[self.fromMinute(day_start).weekday()]
+                if hours:
+                    slot_start = max(gap_start, day_start + hours[0])
+                    free_until = min(gap_end, day_start + hours[1])
+                    while len(slot_starts) < count:
+                        slot_start = day_start + -(-(slot_start - day_start) // align_minutes) * align_minutes
+                        if slot_start + duration_minutes > free_until:
+                            break
+                        slot_starts.append(slot_start)
+                        slot_start += duration_minutes
+                day_start += MINUTES_PER_DAY
+
+        # Everything before free_from is known to be busy or already searched
+        free_from = search_start
+        chunk_start = search_start // MINUTES_PER_DAY * MINUTES_PER_DAY
+        while chunk_start < search_end and len(slot_starts) < count:
+            chunk_end = chunk_start + self.chunk_days * MINUTES_PER_DAY
+            for busy_start, busy_end in self.event_manager.getBusyIntervals(chunk_start, chunk_end):
+                if busy_start > free_from:
+                    add_slots_in_gap(free_from, busy_start)
+                    if len(slot_starts) >= count:
+                        break
+                free_from = max(free_from, busy_end)
+            else:
+                if free_from < chunk_end:
+                    add_slots_in_gap(free_from, chunk_end)
+                free_from = max(free_from, chunk_end)
+            chunk_start = chunk_end
+
+        return [(self.fromMinute(start), self.fromMinute(start + duration_minutes)) for start in slot_starts]
@@ -0,0 +1,151 @@
+from collections import deque
+import bisect
+import functools
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in milliseconds, of the query latency histogram buckets; a final bucket
+# catches everything slower
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+# Statements EXPLAIN QUERY PLAN can describe
+EXPLAINABLE_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+class QueryHistogram:
+    # Latency distribution and row totals for one statement shape
+    def __init__(self):
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.total_rows = 0
+
+    def record(self, elapsed_ms, row_count):
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if row_count is not None and row_count > 0:
+            self.total_rows += row_count
+
+    def merge(self, other):
+        self.bucket_counts = [count + other_count for count, other_count in zip(self.bucket_counts, other.bucket_counts)]
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self.total_rows += other.total_rows
+
+    def percentile(self, fraction):
+        # Upper bound of the bucket holding the given fraction of calls, so an estimate that
+        # errs on the slow side; the slowest bucket reports the observed maximum instead
+        if not self.count:
+            return 0.0
+        threshold = fraction * self.count
+        seen = 0
+        for bucket, bucket_count in enumerate(self.bucket_counts):
+            seen += bucket_count
+            if seen >= threshold:
+                return min(LATENCY_BUCKETS_MS[bucket], self.max_ms) if bucket < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'total_ms': self.total_ms,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'max_ms': self.max_ms,
+            'rows': self.total_rows,
+            'buckets': list(self.bucket_counts)
+        }
+
+class Instrumentation:
+    # Collects query timings, a slow-query log and named counters (paint calls, cache hits and
+    # misses). Safe to record into from any thread. Pass NullInstrumentation() to EventManager
+    # to switch recording off, or a subclass to forward measurements somewhere else.
+    enabled = True
+
+    def __init__(self, slow_query_ms=50.0, slow_query_log_size=50):
+        self.slow_query_ms = slow_query_ms
+        self.query_histograms = {}
+        self.slow_queries = deque(maxlen=slow_query_log_size)
+        self.counters = {}
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def statementKey(sql):
+        return re.sub(r"\s+", " ", sql).strip()
+
+    def isSlow(self, elapsed_ms):
+        return elapsed_ms >= self.slow_query_ms
+
+    def recordQuery(self, sql, elapsed_ms, row_count=None, query_plan=None):
+        key = self.statementKey(sql)
+        with self.lock:
+            histogram = self.query_histograms.get(key)
+            if histogram is None:
+                histogram = self.query_histograms[key] = QueryHistogram()
+            histogram.record(elapsed_ms, row_count)
+            if self.isSlow(elapsed_ms):
+                self.slow_queries.append({
+                    'sql': key,
+                    'elapsed_ms': elapsed_ms,
+                    'rows': row_count,
+                    'plan': query_plan or [],
+                    'time': time.time()
+                })
+        if self.isSlow(elapsed_ms):
+            plan_text = "; ".join(query_plan) if query_plan else "no plan"
+            logger.warning("Slow query (%.1f ms, %s rows): %s [plan: %s]", elapsed_ms, row_count, key, plan_text)
+        else:
+            logger.debug("Query %.2f ms, %s rows: %s", elapsed_ms, row_count, key)
+
+    def increment(self, counter_name, amount=1):
+        with self.lock:
+            self.counters[counter_name] = self.counters.get(counter_name, 0) + amount
+
+    def recordCacheLookup(self, cache_name, hit):
+        self.increment(f"{cache_name}.{'hits' if hit else 'misses'}")
+
+    def cacheHitRate(self, cache_name):
+        with self.lock:
+            hits = self.counters.get(f"{cache_name}.hits", 0)
+            misses = self.counters.get(f"{cache_name}.misses", 0)
+        return hits / (hits + misses) if hits + misses else None
+
+    def snapshot(self):
+        # Plain-data copy of everything recorded so far, for display or export
+        with self.lock:
+            all_queries = QueryHistogram()
+            for histogram in self.query_histograms.values():
+                all_queries.merge(histogram)
+            return {
+                'uptime_s': time.monotonic() - self.started,
+                'queries': {sql: histogram.summary() for sql, histogram in self.query_histograms.items()},
+                'all_queries': all_queries.summary(),
+                'slow_queries': list(self.slow_queries),
+                'counters': dict(self.counters)
+            }
+
+    def reset(self):
+        with self.lock:
+            self.query_histograms.clear()
+            self.slow_queries.clear()
+            self.counters.clear()
+            self.started = time.monotonic()
+
+class NullInstrumentation(Instrumentation):
+    # Records nothing; EventManager skips timing entirely when instrumentation is disabled
+    enabled = False
+
+    def recordQuery(self, sql, elapsed_ms, row_count=None, query_plan=None):
+        pass
+
+    def increment(self, counter_name, amount=1):
+        pass
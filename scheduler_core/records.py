@@ -0,0 +1,177 @@
+from array import array
+import datetime
+
+# Fields of an event record, in the order getEventDetailsbyId and getAllEvents select them
+EVENT_RECORD_FIELDS = ("id", "event_date", "title", "description", "event_time", "event_color", "duration_minutes", "reminder_minutes")
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+def packColor(color_text):
+    # "#rrggbb" -> 0xFFRRGGBB and "#aarrggbb" -> 0xAARRGGBB; None for anything else, so 0 can
+    # stand for "no color" in packed columns
+    if not color_text or color_text[0] != "#" or len(color_text) not in (7, 9):
+        return None
+    try:
+        value = int(color_text[1:], 16)
+    except ValueError:
+        return None
+    return value | 0xFF000000 if len(color_text) == 7 else value
+
+def unpackColor(packed):
+    if not packed:
+        return None
+    if packed >> 24 == 0xFF:
+        return f"#{packed & 0xFFFFFF:06x}"
+    return f"#{packed:08x}"
+
+class EventRecord:
+    # One event, with the same field names wherever it comes from. Dates and times are
+    # datetime.date/datetime.time (None when missing or unparseable). Slotted, so a record
+    # costs a fraction of an equivalent dict; record["title"] still works for dict-style callers.
+    __slots__ = EVENT_RECORD_FIELDS
+
+    def __init__(self, id=None, event_date=None, title=None, description=None, event_time=None, event_color=None, duration_minutes=None, reminder_minutes=None):
+        self.id = id
+        self.event_date = event_date
+        self.title = title
+        self.description = description
+        self.event_time = event_time
+        self.event_color = event_color
+        self.duration_minutes = duration_minutes
+        self.reminder_minutes = reminder_minutes
+
+    def __getitem__(self, field):
+        if field not in EVENT_RECORD_FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def get(self, field, default=None):
+        return getattr(self, field) if field in EVENT_RECORD_FIELDS else default
+
+    def toDict(self):
+        return {field: getattr(self, field) for field in EVENT_RECORD_FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, EventRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in EVENT_RECORD_FIELDS)
+
+    def __repr__(self):
+        return "EventRecord(" + ", ".join(f"{field}={getattr(self, field)!r}" for field in EVENT_RECORD_FIELDS) + ")"
+
+class EventBatch:
+    # Many events stored column by column. Numeric columns are typed arrays, which
+    # numpy.frombuffer can wrap without copying:
+    #   ids               int64
+    #   day_numbers       int32, days since 1970-01-01
+    #   time_seconds      int32, seconds after midnight, -1 for untimed events
+    #   colors            uint32, 0xAARRGGBB, 0 for no color
+    #   durations         int32, -1 for no duration
+    #   reminders         int32, -1 for no reminder
+    # Titles and descriptions are lists of str, with repeated strings shared. Color text that
+    # the packed value does not reproduce exactly (names, upper case) is also kept in
+    # other_colors, by row.
+    # A batch is also a read-only sequence of EventRecord, built only for the rows asked for.
+    def __init__(self):
+        self.ids = array("q")
+        self.day_numbers = array("i")
+        self.time_seconds = array("i")
+        self.colors = array("I")
+        self.durations = array("i")
+        self.reminders = array("i")
+        self.titles = []
+        self.descriptions = []
+        self.other_colors = {}
+
+    @classmethod
+    def fromRows(cls, rows):
+        # rows: (id, event_date, title, description, event_time, event_color, duration_minutes,
+        # reminder_minutes) tuples as stored. Dates, times, colors and strings repeat a lot, so
+        # each distinct value is converted once.
+        batch = cls()
+        day_numbers, time_seconds, colors, strings = {}, {None: -1, "": -1}, {None: 0}, {}
+        # Color texts whose packed value does not unpack back to them
+        inexact_colors = set()
+        append_id, append_day, append_time = batch.ids.append, batch.day_numbers.append, batch.time_seconds.append
+        append_color, append_duration, append_reminder = batch.colors.append, batch.durations.append, batch.reminders.append
+        append_title, append_description = batch.titles.append, batch.descriptions.append
+        for event_id, event_date, title, description, event_time, event_color, duration_minutes, reminder_minutes in rows:
+            append_id(event_id)
+            day_number = day_numbers.get(event_date)
+            if day_number is None:
+                day_number = day_numbers[event_date] = cls.dayNumber(event_date)
+            append_day(day_number)
+            seconds = time_seconds.get(event_time)
+            if seconds is None:
+                seconds = time_seconds[event_time] = cls.timeSeconds(event_time)
+            append_time(seconds)
+            packed = colors.get(event_color)
+            if packed is None:
+                packed = colors[event_color] = packColor(event_color) or 0
+                if unpackColor(packed) != event_color:
+                    inexact_colors.add(event_color)
+            if event_color in inexact_colors:
+                batch.other_colors[len(batch.ids) - 1] = event_color
+            append_color(packed)
+            append_duration(-1 if duration_minutes is None else duration_minutes)
+            append_reminder(-1 if reminder_minutes is None else reminder_minutes)
+            append_title(strings.setdefault(title, title))
+            append_description(strings.setdefault(description, description))
+        return batch
+
+    @staticmethod
+    def dayNumber(date_text):
+        try:
+            return datetime.date.fromisoformat(date_text).toordinal() - EPOCH_ORDINAL
+        except (TypeError, ValueError):
+            return -(2 ** 31)
+
+    @staticmethod
+    def timeSeconds(time_text):
+        try:
+            time_value = datetime.time.fromisoformat(time_text)
+        except (TypeError, ValueError):
+            return -1
+        return time_value.hour * 3600 + time_value.minute * 60 + time_value.second
+
+    def __len__(self):
+        return len(self.ids)
+
+    def eventDate(self, row):
+        day_number = self.day_numbers[row]
+        return None if day_number == -(2 ** 31) else datetime.date.fromordinal(day_number + EPOCH_ORDINAL)
+
+    def eventTime(self, row):
+        seconds = self.time_seconds[row]
+        return None if seconds < 0 else datetime.time(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+    def eventColor(self, row):
+        if row in self.other_colors:
+            return self.other_colors[row]
+        return unpackColor(self.colors[row])
+
+    def record(self, row):
+        duration = self.durations[row]
+        reminder = self.reminders[row]
+        return EventRecord(
+            self.ids[row],
+            self.eventDate(row),
+            self.titles[row],
+            self.descriptions[row],
+            self.eventTime(row),
+            self.eventColor(row),
+            None if duration < 0 else duration,
+            None if reminder < 0 else reminder
+        )
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self.record(index) for index in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("event batch index out of range")
+        return self.record(row)
+
+    def __iter__(self):
+        return (self.record(row) for row in range(len(self)))
@@ -0,0 +1,117 @@
+import calendar
+import datetime
+
+
+class RecurrenceRule:
+    # The subset of RFC 5545 RRULE the scheduler supports: FREQ=DAILY/WEEKLY/MONTHLY, INTERVAL,
+    # BYDAY (weekdays for WEEKLY, optionally with an ordinal such as 2TU or -1FR for MONTHLY),
+    # UNTIL and COUNT. Occurrences are generated period by period, and open-ended rules jump
+    # straight to the first period of the requested window instead of walking from the start.
+    weekday_codes = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+    frequencies = ("DAILY", "WEEKLY", "MONTHLY")
+
+    def __init__(self, frequency, interval=1, by_day=(), until=None, count=None):
+        if frequency not in self.frequencies:
+            raise ValueError(f"Unsupported recurrence frequency: {frequency}")
+        self.frequency = frequency
+        self.interval = max(1, int(interval))
+        self.by_day = tuple(by_day)  # (ordinal or None, weekday number) pairs
+        self.until = until
+        self.count = count
+
+    @classmethod
+    def parse(cls, rrule_text):
+        # Raises ValueError for rules outside the subset, rather than expanding them wrongly
+        parts = dict(part.split("=", 1) for part in rrule_text.upper().split(";") if "=" in part)
+        unsupported_parts = sorted(name for name in parts if name not in ("FREQ", "INTERVAL", "BYDAY", "UNTIL", "COUNT", "WKST"))
+        if unsupported_parts or parts.get("WKST", "MO") != "MO" or (parts.get("FREQ") == "DAILY" and "BYDAY" in parts):
+            raise ValueError(f"Unsupported recurrence rule: {rrule_text}")
+        by_day = []
+        for day in filter(None, parts.get("BYDAY", "").split(",")):
+            ordinal = day[:-2]
+            by_day.append((int(ordinal) if ordinal else None, cls.weekday_codes.index(day[-2:])))
+        until = datetime.date.fromisoformat(parts["UNTIL"][:8]) if "UNTIL" in parts else None
+        count = int(parts["COUNT"]) if "COUNT" in parts else None
+        return cls(parts.get("FREQ"), parts.get("INTERVAL", 1), by_day, until, count)
+
+    def toString(self):
+        parts = [f"FREQ={self.frequency}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.by_day:
+            parts.append("BYDAY=" + ",".join(f"{ordinal or ''}{self.weekday_codes[weekday]}" for ordinal, weekday in self.by_day))
+        if self.until:
+            parts.append(f"UNTIL={self.until.strftime('%Y%m%d')}")
+        if self.count:
+            parts.append(f"COUNT={self.count}")
+        return ";".join(parts)
+
+    @staticmethod
+    def monthNumber(date):
+        return date.year * 12 + date.month - 1
+
+    def periodStart(self, start_date, period):
+        if self.frequency == "DAILY":
+            return start_date + datetime.timedelta(days=period * self.interval)
+        if self.frequency == "WEEKLY":
+            return start_date - datetime.timedelta(days=start_date.weekday()) + datetime.timedelta(weeks=period * self.interval)
+        year, month = divmod(self.monthNumber(start_date) + period * self.interval, 12)
+        return datetime.date(year, month + 1, 1)
+
+    def firstPeriodFor(self, start_date, date):
+        if date <= start_date:
+            return 0
+        if self.frequency == "DAILY":
+            return (date - start_date).days // self.interval
+        if self.frequency == "WEEKLY":
+            return (date - self.periodStart(start_date, 0)).days // 7 // self.interval
+        return (self.monthNumber(date) - self.monthNumber(start_date)) // self.interval
+
+    def periodDates(self, start_date, period):
+        period_start = self.periodStart(start_date, period)
+        if self.frequency == "DAILY":
+            return [period_start]
+        if self.frequency == "WEEKLY":
+            weekdays = sorted(weekday for _, weekday in self.by_day) or [start_date.weekday()]
+            return [period_start + datetime.timedelta(days=weekday) for weekday in weekdays]
+
+        days_in_month = calendar.monthrange(period_start.year, period_start.month)[1]
+        if not self.by_day:
+            return [period_start.replace(day=start_date.day)] if start_date.day <= days_in_month else []
+        dates = set()
+        for ordinal, weekday in self.by_day:
+            first_day = 1 + (weekday - period_start.weekday()) % 7
+            matching_days = list(range(first_day, days_in_month + 1, 7))
+            if ordinal is None:
+                dates.update(matching_days)
+            elif -len(matching_days) <= ordinal <= len(matching_days) and ordinal != 0:
+                dates.add(matching_days[ordinal - 1 if ordinal > 0 else ordinal])
+        return [period_start.replace(day=day) for day in sorted(dates)]
+
+    def occurrences(self, start_date, window_start, window_end, exceptions=()):
+        # COUNT rules must be walked from the start because skipped and excepted occurrences
+        # still count; they are bounded by COUNT anyway.
+        period = 0 if self.count else self.firstPeriodFor(start_date, window_start)
+        seen_count = 0
+        while self.periodStart(start_date, period) <= window_end:
+            for date in self.periodDates(start_date, period):
+                if date < start_date:
+                    continue
+                if self.until and date > self.until:
+                    return
+                seen_count += 1
+                if self.count and seen_count > self.count:
+                    return
+                if date > window_end:
+                    return
+                if date >= window_start and date not in exceptions:
+                    yield date
+            period += 1
+
+    def lastOccurrence(self, start_date):
+        if self.count:
+            last_date = None
+            for last_date in self.occurrences(start_date, start_date, datetime.date.max - datetime.timedelta(days=62)):
+                pass
+            return last_date
+        return self.until
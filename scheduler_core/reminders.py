@@ -0,0 +1,131 @@
+import datetime
+import heapq
+import itertools
+
+from .changes import EventChange
+from .event_manager import UNIX_EPOCH, EventManager
+
+def currentMinute(now=None):
+    # Minutes since the Unix epoch of a naive local datetime, counted like event_reminders
+    now = now or datetime.datetime.now()
+    return int((now - UNIX_EPOCH).total_seconds() // 60)
+
+def secondsUntilMinute(minute, now=None):
+    now = now or datetime.datetime.now()
+    return minute * 60 - (now - UNIX_EPOCH).total_seconds()
+
+class ReminderQueue:
+    # Pending reminders for a rolling horizon, kept in a min-heap on due minute. Only
+    # [fired_until, loaded_until) is ever loaded: reminders before fired_until have been handed
+    # out by popDue, and the horizon moves forward horizon_minutes at a time as it runs out.
+    # Heap items are (remind_minute, sequence, key, reminder); `entries` maps each live key
+    # (("event", id) or ("series", series_id, event_date)) to the sequence of its current item,
+    # so replacing or dropping a reminder just forgets the key and the stale item is skipped
+    # when it reaches the top. The heap is compacted once stale items outnumber live ones.
+    # Changes too broad to apply one by one reload the whole horizon.
+    # fired_until is saved in the database's settings whenever popDue hands reminders out (and
+    # by saveProgress, on exit), and the first rebuild starts from it, at most
+    # catch_up_minutes back, so reminders that fell due while the app was closed are
+    # delivered once by the next popDue rather than skipped.
+    rebuild_change_limit = 500
+    catch_up_minutes = 24 * 60
+    fired_until_setting = "reminders_fired_until"
+
+    def __init__(self, event_manager:EventManager, horizon_minutes=24 * 60):
+        self.event_manager = event_manager
+        self.horizon_minutes = horizon_minutes
+        self.heap = []
+        self.entries = {}
+        self.sequence = itertools.count()
+        self.fired_until = self.loaded_until = None
+
+    def pendingCount(self):
+        return len(self.entries)
+
+    @staticmethod
+    def reminderKey(reminder):
+        if reminder['series_id'] is not None:
+            return ("series", reminder['series_id'], reminder['event_date'])
+        return ("event", reminder['id'])
+
+    def push(self, reminders):
+        items = []
+        for reminder in reminders:
+            sequence = next(self.sequence)
+            key = self.reminderKey(reminder)
+            self.entries[key] = sequence
+            items.append((reminder['remind_minute'], sequence, key, reminder))
+        if len(items) > len(self.heap):
+            self.heap.extend(items)
+            heapq.heapify(self.heap)
+        else:
+            for item in items:
+                heapq.heappush(self.heap, item)
+        self.compact()
+
+    def compact(self):
+        if len(self.heap) > 2 * len(self.entries) + 64:
+            self.heap = [item for item in self.heap if self.entries.get(item[2]) == item[1]]
+            heapq.heapify(self.heap)
+
+    def rebuild(self, now_minute):
+        start_minute = self.fired_until
+        if start_minute is None:
+            saved_minute = self.event_manager.getSetting(self.fired_until_setting)
+            start_minute = now_minute if saved_minute is None else max(int(saved_minute), now_minute - self.catch_up_minutes)
+        self.heap = []
+        self.entries = {}
+        self.fired_until = self.loaded_until = start_minute
+        self.extendHorizon(now_minute)
+
+    def saveProgress(self):
+        if self.fired_until is not None:
+            self.event_manager.setSetting(self.fired_until_setting, self.fired_until)
+
+    def extendHorizon(self, now_minute):
+        horizon_end = now_minute + self.horizon_minutes
+        if horizon_end > self.loaded_until:
+            self.push(self.event_manager.getEventReminders(self.loaded_until, horizon_end) + self.event_manager.getSeriesReminders(self.loaded_until, horizon_end))
+            self.loaded_until = horizon_end
+
+    def nextWakeMinute(self):
+        # Minute of the earliest live reminder, or the end of the horizon when none is loaded
+        while self.heap and self.entries.get(self.heap[0][2]) != self.heap[0][1]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else self.loaded_until
+
+    def popDue(self, now_minute):
+        # Reminders due at or before now_minute, earliest first. The horizon is extended first so
+        # reminders that fell due while the process was suspended are still delivered.
+        self.extendHorizon(now_minute)
+        due = []
+        while self.heap and self.heap[0][0] <= now_minute:
+            remind_minute, sequence, key, reminder = heapq.heappop(self.heap)
+            if self.entries.get(key) == sequence:
+                del self.entries[key]
+                due.append(reminder)
+        self.fired_until = max(self.fired_until, now_minute + 1)
+        if due:
+            self.saveProgress()
+        return due
+
+    def applyChanges(self, changes, now_minute):
+        # Re-reads only the changed events' reminders; series changes re-expand the series part
+        if self.fired_until is None or len(changes) > self.rebuild_change_limit or any(change.kind == EventChange.RELOADED for change in changes):
+            self.rebuild(now_minute)
+            return
+        changed_ids = []
+        series_changed = False
+        for change in changes:
+            if change.kind == EventChange.SERIES_CHANGED:
+                series_changed = True
+            elif change.event_id is not None:
+                self.entries.pop(("event", change.event_id), None)
+                if change.kind != EventChange.DELETED:
+                    changed_ids.append(change.event_id)
+        if series_changed:
+            self.entries = {key: sequence for key, sequence in self.entries.items() if key[0] != "series"}
+            self.push(self.event_manager.getSeriesReminders(self.fired_until, self.loaded_until))
+        if changed_ids:
+            self.push(self.event_manager.getEventReminders(self.fired_until, self.loaded_until, changed_ids))
+        self.compact()
@@ -0,0 +1,306 @@
+# PRAGMA user_version N means the first N steps below have been applied. Only ever append
+# new steps; existing ones have already run against users' events.db files.
+
+
+def _timed_event_interval(row):
+    # (columns, condition) selecting a timed event's (id, start_minute, end_minute) for the
+    # events_rtree index. Minutes are counted from the Unix epoch; a missing duration counts as
+    # 60 minutes (EventManager.DEFAULT_EVENT_DURATION_MINUTES). Untimed events are not indexed.
+    start_minute = f"CAST(strftime('%s', {row}.event_date || ' ' || {row}.event_time) AS INTEGER) / 60"
+    columns = f"{row}.id, {start_minute}, {start_minute} + COALESCE({row}.duration_minutes, 60)"
+    condition = f"{row}.event_time IS NOT NULL AND {row}.event_time != '' AND strftime('%s', {row}.event_date || ' ' || {row}.event_time) IS NOT NULL"
+    return columns, condition
+
+
+def _event_reminder(row):
+    # (columns, condition) selecting an event's (id, remind_minute) for event_reminders: the
+    # event's start in minutes since the Unix epoch, counted like events_rtree, less its
+    # reminder_minutes. Untimed events are reminded about relative to the start of their day.
+    start_text = f"{row}.event_date || ' ' || COALESCE(NULLIF({row}.event_time, ''), '00:00:00')"
+    columns = f"{row}.id, CAST(strftime('%s', {start_text}) AS INTEGER) / 60 - {row}.reminder_minutes"
+    condition = f"{row}.reminder_minutes IS NOT NULL AND strftime('%s', {start_text}) IS NOT NULL"
+    return columns, condition
+
+
+# Colors kept per day in day_summary: the first this many non-null event colors, by id
+DAY_SUMMARY_MAX_COLORS = 12
+
+
+def _refresh_day_summary_colors(event_date, condition="1"):
+    # Recomputes one day_summary row's packed colors from at most DAY_SUMMARY_MAX_COLORS rows of
+    # the day, read through idx_events_date
+    return f'''
+            UPDATE day_summary SET (color_count, colors) = (
+                SELECT COUNT(*), group_concat(event_color, ',') FROM (
+                    SELECT event_color FROM events
+                    WHERE events.event_date = {event_date} AND event_color IS NOT NULL
+                    ORDER BY id LIMIT {DAY_SUMMARY_MAX_COLORS}
+                )
+            )
+            WHERE event_date = {event_date} AND {condition};'''
+
+
+def _refresh_day_summary_conflicts(row):
+    # Statements re-flagging day_summary.conflict for the days a timed event's interval touches:
+    # an overlap begins on a day when one of its events starts there while an event starting no
+    # later is still running. The event's own start day gets a row first (count 0, filled in by
+    # the day_summary triggers), since those may not have run yet; the other days of the range
+    # have no row only if no event starts on them, and then nothing can conflict there.
+    start_minute = f"CAST(strftime('%s', {row}.event_date || ' ' || {row}.event_time) AS INTEGER) / 60"
+    end_minute = f"{start_minute} + COALESCE({row}.duration_minutes, 60)"
+    _, timed = _timed_event_interval(row)
+    return f'''
+            INSERT INTO day_summary (event_date, event_count, color_count, colors, conflict)
+            SELECT {row}.event_date, 0, 0, NULL, 1
+            WHERE {timed} AND NOT EXISTS (SELECT 1 FROM day_summary WHERE event_date = {row}.event_date) AND {_day_has_conflict(f"{row}.event_date")}
+            ON CONFLICT (event_date) DO NOTHING;
+            UPDATE day_summary SET conflict = {_day_has_conflict("day_summary.event_date")}
+            WHERE {timed} AND event_date BETWEEN {row}.event_date AND date((MAX({end_minute}, {start_minute} + 1) - 1) * 60, 'unixepoch');'''
+
+
+def _day_has_conflict(event_date):
+    # Whether two events_rtree entries overlap where the later-starting one starts on event_date.
+    # Both sides are R*Tree lookups: the day's starts, then the intervals covering each start.
+    day_start = f"CAST(strftime('%s', {event_date}) AS INTEGER) / 60"
+    return f'''EXISTS (
+                SELECT 1 FROM events_rtree AS later, events_rtree AS earlier
+                WHERE later.start_minute >= {day_start} AND later.start_minute < {day_start} + 1440
+                  AND earlier.start_minute <= later.start_minute AND earlier.end_minute > later.start_minute
+                  AND earlier.id != later.id
+            )'''
+
+
+def _changed(*columns):
+    # WHEN condition of an update trigger: updates name every column (updateEvent rewrites the
+    # whole row, updateEvents flags columns per row), so each trigger checks its own changed
+    return " OR ".join(f"old.{column} IS NOT new.{column}" for column in columns)
+
+
+SCHEMA_MIGRATIONS = [
+    # 1: original events table (IF NOT EXISTS so pre-versioning databases carry forward)
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_date TEXT NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            event_time TEXT,
+            event_color TEXT
+        )
+        ''',
+    ],
+    # 2: lookup indexes. The (event_date, event_time) index also serves plain event_date lookups
+    [
+        "CREATE INDEX IF NOT EXISTS idx_events_date_time ON events (event_date, event_time)",
+        "CREATE INDEX IF NOT EXISTS idx_events_title ON events (title)",
+    ],
+    # 3: keyset paging in the event list orders by (event_date, id), which the composite index cannot serve
+    [
+        "CREATE INDEX IF NOT EXISTS idx_events_date ON events (event_date)",
+    ],
+    # 4: external-content FTS5 index over title and description, kept in sync by triggers
+    [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(title, description, content='events', content_rowid='id')",
+        '''
+        CREATE TRIGGER IF NOT EXISTS events_fts_after_insert AFTER INSERT ON events BEGIN
+            INSERT INTO events_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS events_fts_after_delete AFTER DELETE ON events BEGIN
+            INSERT INTO events_fts (events_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS events_fts_after_update AFTER UPDATE OF title, description ON events
+        WHEN {_changed("title", "description")} BEGIN
+            INSERT INTO events_fts (events_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO events_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+        ''',
+        "INSERT INTO events_fts (events_fts) VALUES ('rebuild')",
+    ],
+    # 5: recurring events are stored once per series and expanded on demand. last_date is the
+    # final occurrence (NULL for open-ended series) so window queries can skip finished series.
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS event_series (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            start_date TEXT NOT NULL,
+            last_date TEXT,
+            title TEXT NOT NULL,
+            description TEXT,
+            event_time TEXT,
+            event_color TEXT,
+            rrule TEXT NOT NULL
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_event_series_window ON event_series (start_date, last_date)",
+        '''
+        CREATE TABLE IF NOT EXISTS event_series_exceptions (
+            series_id INTEGER NOT NULL REFERENCES event_series (id) ON DELETE CASCADE,
+            occurrence_date TEXT NOT NULL,
+            PRIMARY KEY (series_id, occurrence_date)
+        ) WITHOUT ROWID
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_event_series_exceptions_date ON event_series_exceptions (occurrence_date)",
+    ],
+    # 6: event durations, and a one-dimensional R*Tree over each timed event's [start, end] minutes
+    # so overlap queries cost O(log n + k). rtree_i32 keeps minute coordinates exact, which the
+    # default 32-bit float rtree cannot for present-day epoch minutes.
+    [
+        "ALTER TABLE events ADD COLUMN duration_minutes INTEGER",
+        "ALTER TABLE event_series ADD COLUMN duration_minutes INTEGER",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS events_rtree USING rtree_i32(id, start_minute, end_minute)",
+        '''
+        CREATE TRIGGER IF NOT EXISTS events_rtree_after_insert AFTER INSERT ON events BEGIN
+            INSERT INTO events_rtree (id, start_minute, end_minute) SELECT {} WHERE {};
+        END
+        '''.format(*_timed_event_interval("new")),
+        '''
+        CREATE TRIGGER IF NOT EXISTS events_rtree_after_delete AFTER DELETE ON events BEGIN
+            DELETE FROM events_rtree WHERE id = old.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS events_rtree_after_update AFTER UPDATE OF event_date, event_time, duration_minutes ON events
+        WHEN {} BEGIN
+            DELETE FROM events_rtree WHERE id = old.id;
+            INSERT INTO events_rtree (id, start_minute, end_minute) SELECT {} WHERE {};
+        END
+        '''.format(_changed("event_date", "event_time", "duration_minutes"), *_timed_event_interval("new")),
+        "INSERT INTO events_rtree (id, start_minute, end_minute) SELECT {} FROM events WHERE {}".format(*_timed_event_interval("events")),
+    ],
+    # 7: per-day event count, packed comma-separated colors and conflict flag for the month
+    # calendar, so a refresh reads one small row per day instead of every event. Inserts append
+    # in place; deletes and moves recompute the colors of the days involved. The R*Tree triggers
+    # are recreated to re-flag the days an event's old and new intervals touch after updating
+    # the index, so the overlap outline is read with the counts instead of sweeping the month.
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS day_summary (
+            event_date TEXT PRIMARY KEY,
+            event_count INTEGER NOT NULL,
+            color_count INTEGER NOT NULL,
+            colors TEXT,
+            conflict INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS day_summary_after_insert AFTER INSERT ON events BEGIN
+            INSERT INTO day_summary (event_date, event_count, color_count, colors)
+            VALUES (new.event_date, 1, new.event_color IS NOT NULL, new.event_color)
+            ON CONFLICT (event_date) DO UPDATE SET
+                event_count = event_count + 1,
+                colors = CASE WHEN excluded.color_count AND color_count < {DAY_SUMMARY_MAX_COLORS} THEN COALESCE(colors || ',', '') || excluded.colors ELSE colors END,
+                color_count = color_count + (excluded.color_count AND color_count < {DAY_SUMMARY_MAX_COLORS});
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS day_summary_after_delete AFTER DELETE ON events BEGIN
+            DELETE FROM day_summary WHERE event_date = old.event_date AND event_count <= 1;
+            UPDATE day_summary SET event_count = event_count - 1 WHERE event_date = old.event_date;
+            {_refresh_day_summary_colors("old.event_date", "old.event_color IS NOT NULL")}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS day_summary_after_update AFTER UPDATE OF event_date, event_color ON events
+        WHEN {_changed("event_date", "event_color")} BEGIN
+            INSERT INTO day_summary (event_date, event_count, color_count, colors) VALUES (new.event_date, 1, 0, NULL)
+            ON CONFLICT (event_date) DO UPDATE SET event_count = event_count + 1;
+            DELETE FROM day_summary WHERE event_date = old.event_date AND event_count <= 1;
+            UPDATE day_summary SET event_count = event_count - 1 WHERE event_date = old.event_date;
+            {_refresh_day_summary_colors("new.event_date")}
+            {_refresh_day_summary_colors("old.event_date", "old.event_date != new.event_date")}
+        END
+        ''',
+        "DROP TRIGGER IF EXISTS events_rtree_after_insert",
+        "DROP TRIGGER IF EXISTS events_rtree_after_delete",
+        "DROP TRIGGER IF EXISTS events_rtree_after_update",
+        '''
+        CREATE TRIGGER events_rtree_after_insert AFTER INSERT ON events BEGIN
+            INSERT INTO events_rtree (id, start_minute, end_minute) SELECT {} WHERE {};
+            {}
+        END
+        '''.format(*_timed_event_interval("new"), _refresh_day_summary_conflicts("new")),
+        '''
+        CREATE TRIGGER events_rtree_after_delete AFTER DELETE ON events BEGIN
+            DELETE FROM events_rtree WHERE id = old.id;
+            {}
+        END
+        '''.format(_refresh_day_summary_conflicts("old")),
+        '''
+        CREATE TRIGGER events_rtree_after_update AFTER UPDATE OF event_date, event_time, duration_minutes ON events
+        WHEN {} BEGIN
+            DELETE FROM events_rtree WHERE id = old.id;
+            INSERT INTO events_rtree (id, start_minute, end_minute) SELECT {} WHERE {};
+            {}
+            {}
+        END
+        '''.format(_changed("event_date", "event_time", "duration_minutes"), *_timed_event_interval("new"), _refresh_day_summary_conflicts("old"), _refresh_day_summary_conflicts("new")),
+        "INSERT INTO day_summary (event_date, event_count, color_count, colors) SELECT event_date, COUNT(*), 0, NULL FROM events GROUP BY event_date",
+        _refresh_day_summary_colors("day_summary.event_date"),
+        # One sweep over the whole index by start: an entry overlaps an earlier one exactly when
+        # it starts before the latest end seen so far
+        '''
+        UPDATE day_summary SET conflict = 1 WHERE event_date IN (
+            SELECT date(start_minute * 60, 'unixepoch') FROM (
+                SELECT start_minute,
+                       MAX(end_minute) OVER (ORDER BY start_minute, id ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING) AS previous_end_minute
+                FROM events_rtree
+            )
+            WHERE start_minute < previous_end_minute
+        )
+        ''',
+    ],
+    # 8: per-event reminder offsets, and the minute each stored event's reminder is due, indexed
+    # so the pending reminders of any time window are one range scan. Only events with a
+    # reminder have a row, so the triggers skip every other event. settings holds this file's
+    # own name/value state, such as the last minute reminders were handed out up to.
+    [
+        "ALTER TABLE events ADD COLUMN reminder_minutes INTEGER",
+        "ALTER TABLE event_series ADD COLUMN reminder_minutes INTEGER",
+        '''
+        CREATE TABLE IF NOT EXISTS event_reminders (
+            id INTEGER PRIMARY KEY,
+            remind_minute INTEGER NOT NULL
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_event_reminders_minute ON event_reminders (remind_minute)",
+        '''
+        CREATE TRIGGER IF NOT EXISTS event_reminders_after_insert AFTER INSERT ON events WHEN new.reminder_minutes IS NOT NULL BEGIN
+            INSERT INTO event_reminders (id, remind_minute) SELECT {} WHERE {};
+        END
+        '''.format(*_event_reminder("new")),
+        '''
+        CREATE TRIGGER IF NOT EXISTS event_reminders_after_delete AFTER DELETE ON events WHEN old.reminder_minutes IS NOT NULL BEGIN
+            DELETE FROM event_reminders WHERE id = old.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS event_reminders_after_update AFTER UPDATE OF event_date, event_time, reminder_minutes ON events
+        WHEN (old.reminder_minutes IS NOT NULL OR new.reminder_minutes IS NOT NULL) AND ({}) BEGIN
+            DELETE FROM event_reminders WHERE id = old.id;
+            INSERT INTO event_reminders (id, remind_minute) SELECT {} WHERE {};
+        END
+        '''.format(_changed("event_date", "event_time", "reminder_minutes"), *_event_reminder("new")),
+        "INSERT INTO event_reminders (id, remind_minute) SELECT {} FROM events WHERE {}".format(*_event_reminder("events")),
+        "CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT)",
+    ],
+    # 9: registry of calendars. The default calendar (id 1) is this file's own events; every
+    # other calendar names a database file of its own with this same schema. Only the main
+    # database's registry is read, so in calendar files it only ever holds the default row.
+    # Which calendars are shown is each EventManager's own state, not recorded here.
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS calendars (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            file_name TEXT UNIQUE,
+            color TEXT
+        )
+        ''',
+        "INSERT OR IGNORE INTO calendars (id, name, file_name, color) VALUES (1, 'Default', NULL, NULL)",
+    ],
+]
@@ -0,0 +1,758 @@
+import argparse
+import asyncio
+import collections
+import datetime
+import itertools
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from .changes import EventChange
+from .event_manager import DATE_FILTER_COMPARISONS, EVENT_COLUMNS, EVENT_ROW_FIELDS, RELEVANCE_SORT_COLUMN, SERIES_ROW_FIELDS, EventManager
+from .schema import DAY_SUMMARY_MAX_COLORS
+from .recurrence import RecurrenceRule
+
+logger = logging.getLogger(__name__)
+
+LOOPBACK_HOSTS = ("127.0.0.1", "::1", "localhost")
+DEFAULT_PORT = 8765
+
+# Writable event fields and the JSON types each accepts (None is always accepted, except for
+# event_date and title)
+EVENT_FIELD_TYPES = {
+    "event_date": str,
+    "title": str,
+    "description": str,
+    "event_time": str,
+    "event_color": str,
+    "duration_minutes": int,
+    "reminder_minutes": int,
+}
+
+class ServiceRequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def jsonValue(value):
+    # json.dumps default: dates and times as ISO strings, records as objects
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if hasattr(value, "toDict"):
+        return value.toDict()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+class EventService:
+    # Headless HTTP/JSON front end to one calendar database, so kiosks and scripts can share it
+    # without each opening the file and contending for its write lock. Runs on an asyncio loop:
+    #   - reads run on a pool of read_workers threads; EventManager pools one connection per
+    #     thread, so every reader has its own connection and WAL snapshot
+    #   - writes are queued to a single writer thread, which commits whatever has queued up
+    #     meanwhile (up to max_group_size requests) as one transaction with
+    #     EventManager.runWriteGroup, so concurrent writers share commits instead of lock waits
+    #   - every committed change gets a sequence number in an in-memory feed that GET /changes
+    #     long-polls; the epoch, latest sequence and the databases' data_version form the ETag
+    #     of every read, so a client's If-None-Match is answered 304 until something changes,
+    #     whoever wrote it
+    # Reads take ?calendars=<id>,<id>,... to cover only those calendars, so each client can
+    # hide calendars for itself. There is no authentication: listen on a loopback address
+    # unless the network is trusted. Requests and responses are JSON; dates are ISO strings.
+    # See `routes` for the endpoints.
+    max_body_bytes = 64 * 1024 * 1024
+    change_feed_size = 10000
+    default_page_size = 500
+    max_page_size = 10000
+    max_poll_seconds = 60
+    idle_timeout_seconds = 120
+    # Import sessions untouched for this long are discarded when the next one starts
+    import_timeout_seconds = 600
+
+    def __init__(self, db_filename="events.db", host="127.0.0.1", port=DEFAULT_PORT, read_workers=4, max_group_size=256, event_manager=None):
+        if host not in LOOPBACK_HOSTS:
+            logger.warning("The event service has no authentication; anyone who can reach %s can read and change its calendars.", host)
+        self.event_manager = event_manager if event_manager is not None else EventManager(db_filename)
+        self.host = host
+        self.port = port
+        self.read_pool = ThreadPoolExecutor(read_workers, thread_name_prefix="event-service-read")
+        self.write_thread = ThreadPoolExecutor(1, thread_name_prefix="event-service-write")
+        self.max_group_size = max_group_size
+        # Sequence numbers restart with the process; the epoch tells clients when that happened
+        self.epoch = uuid.uuid4().hex[:12]
+        self.sequence = 0
+        self.feed = collections.deque(maxlen=self.change_feed_size)
+        self.write_count = 0
+        self.commit_count = 0
+        # Created on the service's loop by start()
+        self.write_queue = None
+        self.feed_updated = None
+        self.writer_task = None
+        self.server = None
+        # Tasks serving the open connections, cancelled by stop()
+        self.connection_tasks = set()
+        # Import session id -> {'calendar_id', 'last_used'}; their rows are staged by the writer
+        self.import_sessions = {}
+        self.import_ids = itertools.count(1)
+        self.routes = [
+            ("GET", r"/events", self.listEvents),
+            ("POST", r"/events", self.addEvent),
+            ("PATCH", r"/events", self.updateEvents),
+            ("POST", r"/events/delete", self.deleteEvents),
+            ("POST", r"/events/reschedule", self.rescheduleEvents),
+            ("GET", r"/events/export", self.exportEvents),
+            ("POST", r"/events/import", self.importEvents),
+            ("POST", r"/imports", self.startImport),
+            ("POST", r"/imports/(\d+)/rows", self.stageImport),
+            ("POST", r"/imports/(\d+)/commit", self.commitImport),
+            ("DELETE", r"/imports/(\d+)", self.discardImport),
+            ("GET", r"/events/(\d+)", self.getEvent),
+            ("PUT", r"/events/(\d+)", self.replaceEvent),
+            ("PATCH", r"/events/(\d+)", self.updateEvent),
+            ("DELETE", r"/events/(\d+)", self.deleteEvent),
+            ("GET", r"/series", self.listSeries),
+            ("GET", r"/series/reminders", self.listSeriesReminders),
+            ("POST", r"/series", self.addSeries),
+            ("DELETE", r"/series/(\d+)", self.deleteSeries),
+            ("POST", r"/series/(\d+)/exceptions", self.addSeriesException),
+            ("GET", r"/occurrences", self.listOccurrences),
+            ("GET", r"/summaries", self.listSummaries),
+            ("GET", r"/timeline", self.listTimeline),
+            ("GET", r"/conflicts", self.listConflicts),
+            ("GET", r"/busy", self.listBusyIntervals),
+            ("GET", r"/reminders", self.listReminders),
+            ("GET", r"/calendars", self.listCalendars),
+            ("POST", r"/calendars", self.addCalendar),
+            ("DELETE", r"/calendars/(\d+)", self.removeCalendar),
+            ("GET", r"/settings", self.getSetting),
+            ("PUT", r"/settings", self.putSetting),
+            ("GET", r"/changes", self.listChanges),
+            ("GET", r"/status", self.getStatus),
+        ]
+        self.routes = [(method, re.compile(pattern), handler) for method, pattern, handler in self.routes]
+
+    async def start(self):
+        # Starts listening; with port 0 a free port is picked and stored in self.port
+        self.write_queue = asyncio.Queue()
+        self.feed_updated = asyncio.Event()
+        self.writer_task = asyncio.create_task(self.runWriter())
+        self.server = await asyncio.start_server(self.handleConnection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info("Event service listening on http://%s:%s/ for %s", self.host, self.port, self.event_manager.db_filename)
+
+    async def serveForever(self):
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            # wait_closed waits for every connection, and long polls and idle keep-alive ones
+            # would hold it up for minutes. A connection accepted just before close() only
+            # registers its task a few loop iterations later, and one its client hung up on no
+            # longer holds the server open, so tasks are cancelled in rounds until both the
+            # server and every task are done.
+            closed = asyncio.ensure_future(self.server.wait_closed())
+            while not closed.done() or self.connection_tasks:
+                for task in list(self.connection_tasks):
+                    task.cancel()
+                await asyncio.wait([closed, *self.connection_tasks], timeout=0.05)
+        if self.writer_task is not None:
+            self.writer_task.cancel()
+        self.read_pool.shutdown(wait=False)
+        self.write_thread.shutdown(wait=True)
+
+    def etag(self):
+        # Adding a hidden calendar changes no events, so the calendar registry counts separately.
+        # Writers besides this service (the desktop app, another process) never reach the feed,
+        # so the databases' data_version, always read on the loop thread's connection so that
+        # successive values compare, covers their commits.
+        return f'"{self.epoch}-{self.sequence}-{self.event_manager.calendars_generation}-{self.event_manager.dataVersion()}"'
+
+    # Reading and writing
+    async def read(self, query, function, *args):
+        # Runs function(*args) on a read thread, over the calendars the request's ?calendars= names
+        calendar_ids = self.calendarsParameter(query)
+
+        def run():
+            if calendar_ids is None:
+                return function(*args)
+            with self.event_manager.readingCalendars(calendar_ids):
+                return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.read_pool, run)
+
+    async def write(self, call):
+        # Queues call(event_manager) for the writer and returns its (result, changes) once committed
+        future = asyncio.get_running_loop().create_future()
+        await self.write_queue.put((call, future))
+        return await future
+
+    async def runWriter(self):
+        # While one group commits, new writes queue up and become the next group
+        loop = asyncio.get_running_loop()
+        while True:
+            group = [await self.write_queue.get()]
+            while len(group) < self.max_group_size and not self.write_queue.empty():
+                group.append(self.write_queue.get_nowait())
+            try:
+                outcomes = await loop.run_in_executor(self.write_thread, self.event_manager.runWriteGroup, [call for call, _ in group])
+            except Exception:
+                logger.exception("Write group failed")
+                outcomes = [(None, [])] * len(group)
+            self.write_count += len(group)
+            self.commit_count += 1
+            self.publish([change for _, changes in outcomes for change in changes])
+            for (_, future), outcome in zip(group, outcomes):
+                if not future.done():
+                    future.set_result(outcome)
+
+    def publish(self, changes):
+        if not changes:
+            return
+        for change in changes:
+            self.sequence += 1
+            self.feed.append((self.sequence, change))
+        # Wake every long poll waiting on the current event, and give later ones a fresh one
+        self.feed_updated.set()
+        self.feed_updated = asyncio.Event()
+
+    async def writeOrFail(self, call, message):
+        result, changes = await self.write(call)
+        if result is None or result is False:
+            raise ServiceRequestError(HTTPStatus.UNPROCESSABLE_ENTITY, message)
+        return result, changes
+
+    # HTTP
+    async def handleConnection(self, reader, writer):
+        # HTTP/1.1 with keep-alive; one request at a time per connection
+        task = asyncio.current_task()
+        self.connection_tasks.add(task)
+        try:
+            while True:
+                # readline raises ValueError for a line longer than the stream's limit
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), self.idle_timeout_seconds)
+                    if not request_line:
+                        break
+                    method, target, version = request_line.decode("latin-1").split()
+                    headers = {}
+                    while True:
+                        line = await reader.readline()
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    content_length = int(headers.get("content-length") or 0)
+                    if content_length < 0:
+                        raise ValueError("Content-Length cannot be negative")
+                    if content_length > self.max_body_bytes:
+                        await self.sendResponse(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body too large"}, keep_alive=False)
+                        break
+                    body = await reader.readexactly(content_length) if content_length else b""
+                except asyncio.TimeoutError:
+                    break
+                except ValueError:
+                    await self.sendResponse(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request"}, keep_alive=False)
+                    break
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                status, payload, response_headers = await self.dispatch(method, target, headers, body)
+                await self.sendResponse(writer, status, payload, response_headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connection_tasks.discard(task)
+            writer.close()
+
+    async def sendResponse(self, writer, status, payload, headers=None, keep_alive=True):
+        body = b"" if payload is None else json.dumps(payload, default=jsonValue).encode()
+        lines = [f"HTTP/1.1 {int(status)} {HTTPStatus(status).phrase}", f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if body:
+            lines.append("Content-Type: application/json")
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def dispatch(self, method, target, headers, body):
+        # Returns (status, JSON payload or None, extra headers)
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        handler, path_arguments, path_found = None, (), False
+        for route_method, pattern, route_handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match:
+                path_found = True
+                if route_method == method:
+                    handler, path_arguments = route_handler, tuple(int(argument) for argument in match.groups())
+                    break
+        if handler is None:
+            if path_found:
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} is not allowed on {path}"}, {}
+            return HTTPStatus.NOT_FOUND, {"error": f"No such resource: {path}"}, {}
+
+        # Reads are tagged with the feed position and data version they were answered at, which
+        # only move when a write commits
+        etag = None
+        if method == "GET" and handler not in (self.listChanges, self.getStatus):
+            etag = self.etag()
+            if etag in (tag.strip() for tag in headers.get("if-none-match", "").split(",")):
+                return HTTPStatus.NOT_MODIFIED, None, {"ETag": etag}
+
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            data = json.loads(body) if body else None
+            status, payload = await handler(query, data, *path_arguments)
+        except ServiceRequestError as error:
+            return error.status, {"error": str(error)}, {}
+        except ValueError as error:
+            return HTTPStatus.BAD_REQUEST, {"error": str(error)}, {}
+        except Exception:
+            logger.exception("Error handling %s %s", method, target)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal error"}, {}
+        return status, payload, {"ETag": etag} if etag and status == HTTPStatus.OK else {}
+
+    # Request parsing; ValueError becomes 400 Bad Request
+    @staticmethod
+    def dateParameter(query, name, default=None):
+        if name not in query:
+            return default
+        date = EventManager.parseDate(query[name])
+        if date is None:
+            raise ValueError(f"{name} must be an ISO date (YYYY-MM-DD)")
+        return date
+
+    @staticmethod
+    def intParameter(query, name, default, minimum, maximum):
+        value = int(query.get(name, default))
+        if not minimum <= value <= maximum:
+            raise ValueError(f"{name} must be between {minimum} and {maximum}")
+        return value
+
+    @staticmethod
+    def calendarsParameter(query):
+        if "calendars" not in query:
+            return None
+        return [int(calendar_id) for calendar_id in query["calendars"].split(",")]
+
+    @staticmethod
+    def idsParameter(query):
+        if "ids" not in query:
+            return None
+        return [int(event_id) for event_id in query["ids"].split(",")]
+
+    @staticmethod
+    def minuteParameter(query, name):
+        if name not in query:
+            raise ValueError(f"{name} is required")
+        return int(query[name])
+
+    def requiredRange(self, query):
+        start_date, end_date = self.dateParameter(query, "start"), self.dateParameter(query, "end")
+        if start_date is None or end_date is None:
+            raise ValueError("start and end are required")
+        if (end_date - start_date).days > 3660:
+            raise ValueError("The range may span at most ten years")
+        return start_date, end_date
+
+    @staticmethod
+    def eventFields(data, required=()):
+        # Validated writable fields present in a JSON event object
+        if not isinstance(data, dict):
+            raise ValueError("The request body must be a JSON object")
+        fields = {}
+        for field, field_type in EVENT_FIELD_TYPES.items():
+            if field not in data:
+                if field in required:
+                    raise ValueError(f"{field} is required")
+                continue
+            value = data[field]
+            if value is None and field not in ("event_date", "title"):
+                fields[field] = None
+                continue
+            if not isinstance(value, field_type) or isinstance(value, bool):
+                raise ValueError(f"{field} must be a {field_type.__name__}")
+            fields[field] = value
+        if "event_date" in fields and EventManager.parseDate(fields["event_date"]) is None:
+            raise ValueError("event_date must be an ISO date (YYYY-MM-DD)")
+        if fields.get("event_time") and EventManager.parseTime(fields["event_time"]) is None:
+            raise ValueError("event_time must be an ISO time (HH:MM[:SS])")
+        return fields
+
+    def calendarField(self, data):
+        calendar_id = data.get("calendar_id") if isinstance(data, dict) else None
+        if calendar_id is None:
+            return None
+        calendar = self.event_manager.calendars.get(calendar_id) if isinstance(calendar_id, int) else None
+        if calendar is None or not calendar['visible']:
+            raise ServiceRequestError(HTTPStatus.UNPROCESSABLE_ENTITY, f"Calendar {calendar_id} does not exist or is hidden")
+        return calendar_id
+
+    @staticmethod
+    def idList(data, name="ids"):
+        event_ids = data.get(name) if isinstance(data, dict) else None
+        if not isinstance(event_ids, list) or not all(isinstance(event_id, int) and not isinstance(event_id, bool) for event_id in event_ids):
+            raise ValueError(f"{name} must be a list of integers")
+        return event_ids
+
+    # Events
+    async def listEvents(self, query, data):
+        # ?start=&end= (inclusive dates, either optional), ?date= with ?compare= (=, > or <; = by
+        # default) as in the event list's date filter, ?q= full-text search (or ?match= with an
+        # FTS5 query), ?ids= (comma-separated), ?sort= (a column of EVENT_COLUMNS, or relevance
+        # with a search; event_date by default), ?order=desc, ?limit=, and ?after= with the
+        # previous page's `next`. Each event carries the sort_key its page is ordered by.
+        limit = self.intParameter(query, "limit", self.default_page_size, 1, self.max_page_size)
+        conditions, filter_values = [], {}
+        for name, comparison in (("start", ">="), ("end", "<="), ("date", query.get("compare", "="))):
+            date = self.dateParameter(query, name)
+            if date is not None:
+                if comparison not in (">=", "<=", *DATE_FILTER_COMPARISONS):
+                    raise ValueError(f"compare must be one of {', '.join(DATE_FILTER_COMPARISONS)}")
+                conditions.append(f"events.event_date {comparison} :{name}_date")
+                filter_values[f"{name}_date"] = date.isoformat()
+        match_expression = query.get("match") or None
+        if query.get("q"):
+            match_expression = EventManager.ftsMatchExpression(query["q"])
+            if match_expression is None:
+                return HTTPStatus.OK, {"events": [], "next": None}
+        sort = query.get("sort", "event_date")
+        if sort == "relevance":
+            sort_column = RELEVANCE_SORT_COLUMN if match_expression else EVENT_COLUMNS.index("event_date")
+        elif sort in EVENT_COLUMNS:
+            sort_column = EVENT_COLUMNS.index(sort)
+        else:
+            raise ValueError(f"sort must be relevance or one of {', '.join(EVENT_COLUMNS)}")
+        after_key = None
+        if "after" in query:
+            after_key = json.loads(query["after"])
+            if not isinstance(after_key, list) or len(after_key) != 2:
+                raise ValueError("after must be the `next` value of a previous page")
+        rows = await self.read(
+            query, self.event_manager.getEventPage, sort_column, query.get("order") == "desc", after_key, limit,
+            " AND ".join(conditions), filter_values, match_expression, self.idsParameter(query)
+        )
+        if rows is None:
+            raise ServiceRequestError(HTTPStatus.INTERNAL_SERVER_ERROR, "The events could not be read")
+        next_page = json.dumps([rows[-1][-1], rows[-1][0]]) if len(rows) == limit else None
+        return HTTPStatus.OK, {"events": [{**dict(zip(EVENT_COLUMNS, row)), "sort_key": row[-1]} for row in rows], "next": next_page}
+
+    async def getEvent(self, query, data, event_id):
+        records = await self.read(query, self.event_manager.getEventDetailsbyId, event_id)
+        if not records:
+            raise ServiceRequestError(HTTPStatus.NOT_FOUND, f"No event {event_id}")
+        return HTTPStatus.OK, records[0]
+
+    async def addEvent(self, query, data):
+        fields = self.eventFields(data, required=("event_date", "title"))
+        calendar_id = self.calendarField(data)
+        _, changes = await self.writeOrFail(lambda manager: manager.addEvent(
+            fields["event_date"], fields["title"], fields.get("description"), fields.get("event_time"),
+            fields.get("event_color"), fields.get("duration_minutes"), fields.get("reminder_minutes"), calendar_id
+        ), "The event could not be added")
+        return HTTPStatus.CREATED, {"id": changes[0].event_id, "sequence": self.sequence}
+
+    async def replaceEvent(self, query, data, event_id):
+        # Every field is replaced; optional fields left out are cleared
+        fields = self.eventFields(data, required=("event_date", "title"))
+        edited_event = {field: fields.get(field) for field in EVENT_FIELD_TYPES}
+        edited_event["event_id"] = event_id
+        _, changes = await self.writeOrFail(lambda manager: manager.updateEvent(edited_event), "The event could not be updated")
+        if not changes:
+            raise ServiceRequestError(HTTPStatus.NOT_FOUND, f"No event {event_id}")
+        return HTTPStatus.OK, {"id": event_id, "sequence": self.sequence}
+
+    async def updateEvent(self, query, data, event_id):
+        # Only the fields given change; as with EventManager.updateEvents, null clears a value
+        fields = self.eventFields(data)
+        _, changes = await self.writeOrFail(lambda manager: manager.updateEvents([{**fields, "event_id": event_id}]), "The event could not be updated")
+        if not changes:
+            raise ServiceRequestError(HTTPStatus.NOT_FOUND, f"No event {event_id}")
+        return HTTPStatus.OK, {"id": event_id, "sequence": self.sequence}
+
+    async def updateEvents(self, query, data):
+        # Body: a list of partial events, each with its event_id
+        if not isinstance(data, list):
+            raise ValueError("The request body must be a JSON list of events")
+        edited_events = [{**self.eventFields(event), "event_id": self.idList({"ids": [event.get("event_id")]})[0]} for event in data]
+        _, changes = await self.writeOrFail(lambda manager: manager.updateEvents(edited_events), "The events could not be updated")
+        return HTTPStatus.OK, {"updated": [change.event_id for change in changes], "sequence": self.sequence}
+
+    async def deleteEvent(self, query, data, event_id):
+        _, changes = await self.writeOrFail(lambda manager: manager.deleteEvent(event_id), "The event could not be deleted")
+        if not changes:
+            raise ServiceRequestError(HTTPStatus.NOT_FOUND, f"No event {event_id}")
+        return HTTPStatus.OK, {"deleted": [event_id], "sequence": self.sequence}
+
+    async def deleteEvents(self, query, data):
+        event_ids = self.idList(data)
+        _, changes = await self.writeOrFail(lambda manager: manager.deleteEvents(event_ids), "The events could not be deleted")
+        return HTTPStatus.OK, {"deleted": [change.event_id for change in changes], "sequence": self.sequence}
+
+    async def rescheduleEvents(self, query, data):
+        event_ids = self.idList(data)
+        day_offset = data.get("days")
+        if not isinstance(day_offset, int) or isinstance(day_offset, bool):
+            raise ValueError("days must be an integer")
+        _, changes = await self.writeOrFail(lambda manager: manager.rescheduleEvents(event_ids, day_offset), "The events could not be rescheduled")
+        return HTTPStatus.OK, {"updated": [change.event_id for change in changes], "sequence": self.sequence}
+
+    async def exportEvents(self, query, data):
+        # Every event as a list of id and EVENT_ROW_FIELDS, in (event_date, id) order; ?limit=,
+        # and ?after= with the previous page's `next`
+        limit = self.intParameter(query, "limit", self.default_page_size, 1, self.max_page_size)
+        after = None
+        if "after" in query:
+            after = json.loads(query["after"])
+            if not isinstance(after, list) or len(after) != 2:
+                raise ValueError("after must be the `next` value of a previous page")
+        rows = await self.read(query, lambda: list(itertools.islice(self.event_manager.exportEventRows(after), limit)))
+        next_page = json.dumps([rows[-1][1], rows[-1][0]]) if len(rows) == limit else None
+        return HTTPStatus.OK, {"rows": rows, "next": next_page}
+
+    def importRows(self, data, name, row_fields):
+        # Validated rows of a JSON import body: lists of row_fields values
+        rows = data.get(name, []) if isinstance(data, dict) else None
+        if not isinstance(rows, list) or not all(isinstance(row, list) and len(row) == len(row_fields) for row in rows):
+            raise ValueError(f"{name} must be a list of [{', '.join(row_fields)}] lists")
+        for row in rows:
+            self.eventFields(dict(zip(EVENT_ROW_FIELDS, row)), ("event_date", "title"))
+            if row_fields is SERIES_ROW_FIELDS:
+                *_, rrule_text, exception_dates = row
+                try:
+                    RecurrenceRule.parse(rrule_text)
+                except (AttributeError, ValueError, IndexError) as error:
+                    raise ValueError(f"Invalid rrule: {error}")
+                if not isinstance(exception_dates, list) or any(EventManager.parseDate(date) is None for date in exception_dates):
+                    raise ValueError("exception_dates must be a list of ISO dates")
+        return rows
+
+    async def importEvents(self, query, data):
+        # Body: {"rows": [[*EVENT_ROW_FIELDS], ...], "series": [[*SERIES_ROW_FIELDS], ...]}, with
+        # series optional and optionally a calendar_id; imported in one transaction like importEventRows
+        event_rows = self.importRows(data, "rows", EVENT_ROW_FIELDS)
+        series_rows = self.importRows(data, "series", SERIES_ROW_FIELDS)
+        calendar_id = self.calendarField(data)
+        imported_count, _ = await self.writeOrFail(lambda manager: manager.importEventRows(event_rows, calendar_id=calendar_id, series_rows=series_rows), "The events could not be imported")
+        return HTTPStatus.OK, {"imported": imported_count, "sequence": self.sequence}
+
+    # Import sessions, for imports too large for one request that must still be all-or-nothing:
+    # POST /imports starts one (optionally with calendar_id), each POST /imports/<id>/rows
+    # stages a body shaped like /events/import's, and POST /imports/<id>/commit imports
+    # everything staged in one transaction. DELETE /imports/<id> discards it instead.
+    async def startImport(self, query, data):
+        calendar_id = self.calendarField(data)
+        now = time.monotonic()
+        for import_id, session in list(self.import_sessions.items()):
+            if now - session['last_used'] > self.import_timeout_seconds:
+                logger.info("Import session %s timed out.", import_id)
+                await self.discardImport(query, None, import_id)
+        import_id = next(self.import_ids)
+        self.import_sessions[import_id] = {'calendar_id': calendar_id, 'last_used': now}
+        return HTTPStatus.CREATED, {"id": import_id}
+
+    def importSession(self, import_id):
+        session = self.import_sessions.get(import_id)
+        if session is None:
+            raise ServiceRequestError(HTTPStatus.NOT_FOUND, f"No import session {import_id}")
+        session['last_used'] = time.monotonic()
+        return session
+
+    async def stageImport(self, query, data, import_id):
+        self.importSession(import_id)
+        event_rows = self.importRows(data, "rows", EVENT_ROW_FIELDS)
+        series_rows = self.importRows(data, "series", SERIES_ROW_FIELDS)
+        staged_count, _ = await self.writeOrFail(lambda manager: manager.stageImportRows(import_id, event_rows, series_rows), "The rows could not be staged")
+        return HTTPStatus.OK, {"staged": staged_count}
+
+    async def commitImport(self, query, data, import_id):
+        session = self.importSession(import_id)
+        del self.import_sessions[import_id]
+        imported_count, _ = await self.write(lambda manager: manager.importStagedRows(import_id, session['calendar_id']))
+        if imported_count is None:
+            await self.write(lambda manager: manager.discardStagedRows(import_id))
+            raise ServiceRequestError(HTTPStatus.UNPROCESSABLE_ENTITY, "The events could not be imported")
+        return HTTPStatus.OK, {"imported": imported_count, "sequence": self.sequence}
+
+    async def discardImport(self, query, data, import_id):
+        self.importSession(import_id)
+        del self.import_sessions[import_id]
+        await self.write(lambda manager: manager.discardStagedRows(import_id))
+        return HTTPStatus.OK, {"discarded": import_id}
+
+    # Recurring events
+    async def listSeries(self, query, data):
+        return HTTPStatus.OK, {"series": await self.read(query, self.event_manager.getEventSeries)}
+
+    async def listSeriesReminders(self, query, data):
+        # Recurring occurrences whose reminder is due in [?start_minute, ?end_minute), in minutes since the Unix epoch
+        reminders = await self.read(query, self.event_manager.getSeriesReminders, self.minuteParameter(query, "start_minute"), self.minuteParameter(query, "end_minute"))
+        return HTTPStatus.OK, {"reminders": reminders}
+
+    async def addSeries(self, query, data):
+        # Body: an event with start_date instead of event_date, plus an rrule
+        if not isinstance(data, dict):
+            raise ValueError("The request body must be a JSON object")
+        fields = self.eventFields({**data, "event_date": data.get("start_date")}, required=("event_date", "title"))
+        if not isinstance(data.get("rrule"), str):
+            raise ValueError("rrule is required")
+        try:
+            rule = RecurrenceRule.parse(data["rrule"])
+        except (ValueError, IndexError) as error:
+            raise ValueError(f"Invalid rrule: {error}")
+        calendar_id = self.calendarField(data)
+        await self.writeOrFail(lambda manager: manager.addEventSeries(
+            fields["event_date"], fields["title"], fields.get("description"), fields.get("event_time"), fields.get("event_color"),
+            rule.toString(), fields.get("duration_minutes"), fields.get("reminder_minutes"), calendar_id
+        ), "The recurring event could not be added")
+        return HTTPStatus.CREATED, {"sequence": self.sequence}
+
+    async def deleteSeries(self, query, data, series_id):
+        await self.writeOrFail(lambda manager: manager.deleteEventSeries(series_id), "The recurring event could not be deleted")
+        return HTTPStatus.OK, {"deleted": [series_id], "sequence": self.sequence}
+
+    async def addSeriesException(self, query, data, series_id):
+        # Body: {"date": "YYYY-MM-DD"}, the occurrence to skip
+        occurrence_date = self.dateParameter(data if isinstance(data, dict) else {}, "date")
+        if occurrence_date is None:
+            raise ValueError("date is required")
+        await self.writeOrFail(lambda manager: manager.addSeriesException(series_id, occurrence_date), "The occurrence could not be removed")
+        return HTTPStatus.OK, {"sequence": self.sequence}
+
+    async def listOccurrences(self, query, data):
+        start_date, end_date = self.requiredRange(query)
+        return HTTPStatus.OK, {"occurrences": await self.read(query, self.event_manager.getSeriesOccurrences, start_date, end_date)}
+
+    async def listSummaries(self, query, data):
+        # Per-day counts and the first ?max_colors= colors for a month view, recurring occurrences included
+        start_date, end_date = self.requiredRange(query)
+        max_colors = self.intParameter(query, "max_colors", DAY_SUMMARY_MAX_COLORS, 0, DAY_SUMMARY_MAX_COLORS)
+        return HTTPStatus.OK, {"days": await self.read(query, self.event_manager.getEventDateSummaries, start_date, end_date, max_colors)}
+
+    async def listTimeline(self, query, data):
+        # What a day/week timeline shows for ?start= to ?end=, as EventManager.getTimelineEvents
+        start_date, end_date = self.requiredRange(query)
+        return HTTPStatus.OK, {"events": await self.read(query, self.event_manager.getTimelineEvents, start_date, end_date)}
+
+    async def listConflicts(self, query, data):
+        # Events and occurrences overlapping ?date= at ?time= for ?duration= minutes, leaving out ?exclude=
+        event_date = self.dateParameter(query, "date")
+        event_time = EventManager.parseTime(query.get("time", ""))
+        if event_date is None or event_time is None:
+            raise ValueError("date and time are required")
+        duration = self.intParameter(query, "duration", EventManager.DEFAULT_EVENT_DURATION_MINUTES, 0, 366 * 24 * 60)
+        exclude_event_id = int(query["exclude"]) if "exclude" in query else None
+        conflicts = await self.read(query, self.event_manager.findConflicts, event_date, event_time, duration, exclude_event_id)
+        return HTTPStatus.OK, {"conflicts": conflicts}
+
+    async def listBusyIntervals(self, query, data):
+        # [start_minute, end_minute] of everything overlapping [?start_minute, ?end_minute)
+        intervals = await self.read(query, self.event_manager.getBusyIntervals, self.minuteParameter(query, "start_minute"), self.minuteParameter(query, "end_minute"))
+        return HTTPStatus.OK, {"intervals": intervals}
+
+    async def listReminders(self, query, data):
+        # Stored events whose reminder is due in [?start_minute, ?end_minute), optionally only ?ids=
+        reminders = await self.read(
+            query, self.event_manager.getEventReminders,
+            self.minuteParameter(query, "start_minute"), self.minuteParameter(query, "end_minute"), self.idsParameter(query)
+        )
+        return HTTPStatus.OK, {"reminders": reminders}
+
+    # Calendars
+    async def listCalendars(self, query, data):
+        return HTTPStatus.OK, {"calendars": self.event_manager.getCalendars()}
+
+    async def addCalendar(self, query, data):
+        if not isinstance(data, dict) or not isinstance(data.get("name"), str) or not data["name"].strip():
+            raise ValueError("name is required")
+        calendar_id, _ = await self.writeOrFail(
+            lambda manager: manager.addCalendar(data["name"].strip(), data.get("file_name"), data.get("color")),
+            "The calendar could not be added"
+        )
+        return HTTPStatus.CREATED, {"id": calendar_id, "sequence": self.sequence}
+
+    async def removeCalendar(self, query, data, calendar_id):
+        if calendar_id not in self.event_manager.calendars:
+            raise ServiceRequestError(HTTPStatus.NOT_FOUND, f"No calendar {calendar_id}")
+        await self.writeOrFail(lambda manager: manager.removeCalendar(calendar_id), "The calendar could not be removed")
+        return HTTPStatus.OK, {"deleted": [calendar_id], "sequence": self.sequence}
+
+    # Settings
+    async def getSetting(self, query, data):
+        if "name" not in query:
+            raise ValueError("name is required")
+        return HTTPStatus.OK, {"name": query["name"], "value": await self.read(query, self.event_manager.getSetting, query["name"])}
+
+    async def putSetting(self, query, data):
+        # Body: {"name", "value"}; values are stored as text, and null clears one
+        if not isinstance(data, dict) or not isinstance(data.get("name"), str):
+            raise ValueError("name is required")
+        value = data.get("value")
+        if value is not None and not isinstance(value, str):
+            raise ValueError("value must be a string")
+        await self.writeOrFail(lambda manager: manager.setSetting(data["name"], value), "The setting could not be saved")
+        return HTTPStatus.OK, {"name": data["name"], "value": value, "sequence": self.sequence}
+
+    # Changes feed
+    async def listChanges(self, query, data):
+        # ?since=<sequence> returns the changes after it, waiting up to ?timeout= seconds for
+        # one if there are none yet; without since, just the current position. "reset" means the
+        # changes since then are unknown (the service restarted, per ?epoch=, or they dropped out
+        # of the feed), so the client should reload and continue from the returned sequence.
+        position = {"epoch": self.epoch, "sequence": self.sequence, "changes": [], "reset": False}
+        if "since" not in query:
+            return HTTPStatus.OK, position
+        since = int(query["since"])
+        timeout = min(float(query.get("timeout", 0)), self.max_poll_seconds)
+        oldest_known = self.feed[0][0] - 1 if self.feed else self.sequence
+        if query.get("epoch", self.epoch) != self.epoch or not oldest_known <= since <= self.sequence:
+            position["reset"] = True
+            return HTTPStatus.OK, position
+        if since == self.sequence and timeout > 0:
+            try:
+                await asyncio.wait_for(self.feed_updated.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        position["sequence"] = self.sequence
+        position["changes"] = [{"sequence": sequence, **change.toDict()} for sequence, change in self.feed if sequence > since]
+        return HTTPStatus.OK, position
+
+    async def getStatus(self, query, data):
+        return HTTPStatus.OK, {
+            "epoch": self.epoch,
+            "sequence": self.sequence,
+            "database": os.path.abspath(self.event_manager.db_filename),
+            "writes": self.write_count,
+            "commits": self.commit_count,
+            "queued_writes": self.write_queue.qsize(),
+        }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a scheduler calendar database over HTTP/JSON.")
+    parser.add_argument("--db", default="events.db", help="calendar database file (default: events.db)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1; the service has no authentication)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--read-workers", type=int, default=4, help="threads (and connections) serving reads")
+    arguments = parser.parse_args(argv)
+    # SCHEDULER_LOG_LEVEL=DEBUG logs every query with its timing, as in the desktop app
+    logging.basicConfig(
+        level=os.environ.get("SCHEDULER_LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    service = EventService(arguments.db, arguments.host, arguments.port, arguments.read_workers)
+    try:
+        asyncio.run(service.serveForever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
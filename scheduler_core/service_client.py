@@ -0,0 +1,551 @@
+import http.client
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode, urlsplit
+
+from .changes import EventChange
+from .event_manager import DATE_FILTER_COMPARISONS, DEFAULT_CALENDAR_ID, EVENT_COLUMNS, RELEVANCE_SORT_COLUMN, SERIES_ROW_FIELDS, EventManager
+from .instrumentation import Instrumentation
+from .records import EventRecord
+from .schema import DAY_SUMMARY_MAX_COLORS
+
+logger = logging.getLogger(__name__)
+
+class EventServiceClient:
+    # Blocking JSON client for an EventService, usable from any thread: each thread keeps its
+    # own keep-alive connection. GET responses are cached with their ETag and revalidated with
+    # If-None-Match, so re-reading an unchanged calendar costs a 304 and no database work.
+    # The service drops connections idle for longer than this
+    max_idle_seconds = 60
+
+    def __init__(self, base_url="http://127.0.0.1:8765", timeout=30, cache_size=256):
+        url = urlsplit(base_url)
+        if url.scheme != "http" or not url.hostname:
+            raise ValueError(f"Not an http:// service URL: {base_url!r}")
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.base_path = url.path.rstrip("/")
+        self.timeout = timeout
+        self.local = threading.local()
+        # "path?query" -> (etag, body) of the latest 200 response to a GET. The body is decoded
+        # afresh for every hit, so callers may modify what they get.
+        self.response_cache = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_lock = threading.Lock()
+
+    def connection(self, timeout):
+        connection = getattr(self.local, "connection", None)
+        if connection is not None and time.monotonic() - self.local.last_used > self.max_idle_seconds:
+            connection.close()
+            connection = None
+        if connection is None:
+            connection = self.local.connection = http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection
+
+    def close(self):
+        # Closes the calling thread's connection
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+    def request(self, method, path, body=None, query=None, timeout=None):
+        # Returns (status, decoded JSON or None). Raises OSError or http.client.HTTPException
+        # if the service cannot be reached.
+        target = self.base_path + path + ("?" + urlencode(query) if query else "")
+        headers = {"Accept": "application/json"}
+        cached = None
+        if method == "GET":
+            with self.cache_lock:
+                cached = self.response_cache.get(target)
+            if cached is not None:
+                headers["If-None-Match"] = cached[0]
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        # A request is sent again, once, only when the service cannot have seen it: sending it
+        # failed, or the service had closed the idle keep-alive connection (it then closes
+        # without reading or answering). A timeout or reset after sending may come after the
+        # service committed, so repeating it could apply a write twice or fail a delete that
+        # succeeded; those are raised.
+        for attempt in range(2):
+            connection = self.connection(timeout or self.timeout)
+            reused = connection.sock is not None
+            try:
+                connection.request(method, target, payload, headers)
+            except (OSError, http.client.HTTPException):
+                self.close()
+                if attempt:
+                    raise
+                continue
+            try:
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except http.client.RemoteDisconnected:
+                self.close()
+                if attempt or not reused:
+                    raise
+            except (OSError, http.client.HTTPException):
+                self.close()
+                raise
+        self.local.last_used = time.monotonic()
+        if response.status == 304 and cached is not None:
+            return 200, json.loads(cached[1])
+        result = json.loads(data) if data else None
+        etag = response.getheader("ETag")
+        if method == "GET" and response.status == 200 and etag:
+            with self.cache_lock:
+                self.response_cache[target] = (etag, data)
+                self.response_cache.move_to_end(target)
+                while len(self.response_cache) > self.cache_size:
+                    self.response_cache.popitem(last=False)
+        return response.status, result
+
+    def status(self):
+        return self.request("GET", "/status")[1]
+
+    def events(self, start_date=None, end_date=None, search_text=None, limit=None):
+        # Every matching event, following the service's pages
+        query = {name: value for name, value in (("start", start_date), ("end", end_date), ("q", search_text), ("limit", limit)) if value is not None}
+        events = []
+        while True:
+            status, page = self.request("GET", "/events", query=query)
+            if status != 200:
+                raise ValueError(page.get("error") if page else f"HTTP {status}")
+            events.extend(page["events"])
+            if page["next"] is None:
+                return events
+            query["after"] = page["next"]
+
+    def changes(self, since, epoch=None, timeout=0):
+        query = {"since": since, "timeout": timeout}
+        if epoch is not None:
+            query["epoch"] = epoch
+        return self.request("GET", "/changes", query=query, timeout=self.timeout + timeout)[1]
+
+class RemoteEventManager:
+    # The calendar of an EventService behind the EventManager methods the desktop app uses, for
+    # an app sharing its calendar with kiosks and scripts, on this machine or another. It opens
+    # no database: every read and write is a request to the service (a read of something
+    # unchanged is answered 304 from the client's cache), and change listeners are fed from the
+    # service's changes feed, so they also hear about other clients' writes. Which calendars
+    # are shown is this client's own choice; reads ask the service for just those.
+    DEFAULT_EVENT_DURATION_MINUTES = EventManager.DEFAULT_EVENT_DURATION_MINUTES
+    isoDate = staticmethod(EventManager.isoDate)
+    isoTime = staticmethod(EventManager.isoTime)
+    parseDate = staticmethod(EventManager.parseDate)
+    parseTime = staticmethod(EventManager.parseTime)
+    ftsMatchExpression = staticmethod(EventManager.ftsMatchExpression)
+    poll_timeout_seconds = 30
+    retry_seconds = 2
+    # Rows per request when paging through events (the service's largest page)
+    page_size = 10000
+
+    def __init__(self, service_url="http://127.0.0.1:8765", instrumentation=None):
+        self.client = EventServiceClient(service_url)
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        # Raises OSError if the service is not running
+        status = self.client.status()
+        self.epoch = status["epoch"]
+        self.sequence = status["sequence"]
+        self.feed_lock = threading.Lock()
+        self.stop_following = threading.Event()
+        self.change_listeners = []
+        # As EventManager.calendars, from the service's registry; replaced, never mutated
+        self.calendars = {}
+        self.hidden_calendar_ids = set()
+        self.default_calendar_id = DEFAULT_CALENDAR_ID
+        self.loadCalendars()
+        self.follower = threading.Thread(target=self.followChanges, name="event-service-changes", daemon=True)
+        self.follower.start()
+
+    def isConnected(self):
+        status, _ = self.callService("GET", "/status")
+        return status == 200
+
+    def closeConnection(self):
+        # Closes the calling thread's connection to the service
+        self.client.close()
+
+    def close(self):
+        self.stop_following.set()
+        self.client.close()
+
+    # Requests
+    def callService(self, method, path, body=None, query=None):
+        # (status, payload), or (None, None) if the service could not be reached. Requests are
+        # timed into instrumentation by method and path, as EventManager times its statements.
+        started = time.perf_counter()
+        try:
+            status, payload = self.client.request(method, path, body, query)
+        except (OSError, http.client.HTTPException, ValueError) as error:
+            logger.error("Event service request %s %s failed: %s", method, path, error)
+            return None, None
+        resource = re.sub(r"/\d+", "/<id>", path)
+        self.instrumentation.recordQuery(f"{method} {resource}", (time.perf_counter() - started) * 1000)
+        if status >= 400:
+            logger.error("Event service refused %s %s: %s", method, path, payload.get("error") if payload else status)
+        elif method != "GET" and payload:
+            self.catchUp(payload.get("sequence"))
+        return status, payload
+
+    def read(self, path, query=None):
+        # Payload of a GET over the calendars shown here, or None if it failed or none are shown
+        calendar_ids = [str(calendar_id) for calendar_id, calendar in sorted(self.calendars.items()) if calendar['visible']]
+        if not calendar_ids:
+            return None
+        status, payload = self.callService("GET", path, query={**(query or {}), "calendars": ",".join(calendar_ids)})
+        return payload if status == 200 else None
+
+    # Change listeners
+    def addChangeListener(self, listener):
+        self.change_listeners.append(listener)
+
+    def removeChangeListener(self, listener):
+        if listener in self.change_listeners:
+            self.change_listeners.remove(listener)
+
+    def notifyChanges(self, changes):
+        if not changes:
+            return
+        for listener in list(self.change_listeners):
+            try:
+                listener(changes)
+            except Exception:
+                logger.exception("Event change listener %r failed", listener)
+
+    # Changes feed
+    def followChanges(self):
+        while not self.stop_following.is_set():
+            try:
+                position = self.client.changes(self.sequence, self.epoch, self.poll_timeout_seconds)
+            except (OSError, http.client.HTTPException, ValueError) as error:
+                logger.warning("Lost the event service's changes feed (%s); retrying.", error)
+                self.client.close()
+                self.stop_following.wait(self.retry_seconds)
+                continue
+            self.applyChanges(position)
+
+    def catchUp(self, sequence):
+        # After a write, delivers its changes (and any before them) before returning to the caller
+        if sequence is None or sequence <= self.sequence:
+            return
+        try:
+            self.applyChanges(self.client.changes(self.sequence, self.epoch))
+        except (OSError, http.client.HTTPException, ValueError) as error:
+            logger.warning("Could not read the event service's changes: %s", error)
+
+    def applyChanges(self, position):
+        # Both the follower thread and writers apply feed positions; the sequence check keeps
+        # each change from being delivered twice
+        if not position:
+            return
+        with self.feed_lock:
+            if position["reset"] or position["epoch"] != self.epoch:
+                # Missed changes (the service restarted or we fell too far behind): reload everything
+                self.epoch, self.sequence = position["epoch"], position["sequence"]
+                changes = [EventChange(EventChange.RELOADED)]
+            else:
+                changes = [EventChange.fromDict(change) for change in position["changes"] if change["sequence"] > self.sequence]
+                self.sequence = max(self.sequence, position["sequence"])
+            if any(change.kind == EventChange.RELOADED for change in changes):
+                # Calendars may have been added, hidden or removed
+                self.loadCalendars()
+            self.notifyChanges(changes)
+
+    # Reads, returning what the EventManager methods of the same name do
+    @classmethod
+    def dateFilter(cls, comparison, date):
+        # The service builds the SQL itself, so the filter clause is just the comparison
+        if comparison not in DATE_FILTER_COMPARISONS:
+            raise ValueError(f"Unknown date comparison {comparison!r}")
+        return comparison, {"filter_date": cls.isoDate(date)}
+
+    @staticmethod
+    def idsText(event_ids):
+        return ",".join(str(int(event_id)) for event_id in event_ids)
+
+    def getEventPage(self, sort_column, descending, after_key, limit, filter_clause="", filter_values=None, match_expression=None, event_ids=None):
+        # filter_clause must come from dateFilter
+        if sort_column == RELEVANCE_SORT_COLUMN:
+            sort = "relevance" if match_expression else "id"
+        else:
+            sort = EVENT_COLUMNS[sort_column]
+        query = {"sort": sort, "order": "desc" if descending else "asc"}
+        if filter_clause:
+            query["compare"], query["date"] = filter_clause, filter_values["filter_date"]
+        if match_expression:
+            query["match"] = match_expression
+        if event_ids is not None:
+            if not event_ids:
+                return []
+            query["ids"] = self.idsText(event_ids)
+        if after_key is not None:
+            query["after"] = json.dumps(list(after_key))
+        rows = []
+        while len(rows) < limit:
+            query["limit"] = min(limit - len(rows), self.page_size)
+            page = self.read("/events", query)
+            if page is None:
+                return None
+            rows.extend(tuple(event[column] for column in EVENT_COLUMNS) + (event["sort_key"],) for event in page["events"])
+            if page["next"] is None:
+                break
+            query["after"] = page["next"]
+        return rows
+
+    def exportEventRows(self):
+        # Generator over (id, *EVENT_ROW_FIELDS), a page at a time
+        query = {"limit": self.page_size}
+        while True:
+            page = self.read("/events/export", query)
+            if page is None:
+                return
+            yield from (tuple(row) for row in page["rows"])
+            if page["next"] is None:
+                return
+            query["after"] = page["next"]
+
+    def exportSeriesRows(self):
+        for series in self.getEventSeries():
+            yield (series['id'], series['start_date'], *(series[field] for field in SERIES_ROW_FIELDS[1:]))
+
+    def getEventDetailsbyId(self, id):
+        event = self.read(f"/events/{int(id)}")
+        if event is None:
+            return []
+        return [EventRecord(
+            event["id"], self.parseDate(event["event_date"]), event["title"], event["description"], self.parseTime(event["event_time"]),
+            event["event_color"], event["duration_minutes"], event["reminder_minutes"]
+        )]
+
+    def getEventDateSummaries(self, start_date, end_date, max_colors=12):
+        payload = self.read("/summaries", {"start": self.isoDate(start_date), "end": self.isoDate(end_date), "max_colors": min(max_colors, DAY_SUMMARY_MAX_COLORS)})
+        return payload["days"] if payload else {}
+
+    def getTimelineEvents(self, start_date, end_date):
+        payload = self.read("/timeline", {"start": self.isoDate(start_date), "end": self.isoDate(end_date)})
+        return payload["events"] if payload else []
+
+    def findConflicts(self, eventDate, eventTime, eventDuration=None, exclude_event_id=None):
+        if eventTime is None:
+            return []
+        query = {"date": self.isoDate(eventDate), "time": self.isoTime(eventTime)}
+        if eventDuration is not None:
+            query["duration"] = eventDuration
+        if exclude_event_id is not None:
+            query["exclude"] = exclude_event_id
+        payload = self.read("/conflicts", query)
+        if not payload:
+            return []
+        return [
+            {**conflict, 'event_date': self.parseDate(conflict['event_date']), 'event_time': self.parseTime(conflict['event_time'])}
+            for conflict in payload["conflicts"]
+        ]
+
+    def getBusyIntervals(self, start_minute, end_minute):
+        payload = self.read("/busy", {"start_minute": start_minute, "end_minute": end_minute})
+        return [tuple(interval) for interval in payload["intervals"]] if payload else []
+
+    def getEventReminders(self, start_minute, end_minute, event_ids=None):
+        query = {"start_minute": start_minute, "end_minute": end_minute}
+        if event_ids is not None:
+            if not event_ids:
+                return []
+            query["ids"] = self.idsText(event_ids)
+        payload = self.read("/reminders", query)
+        return payload["reminders"] if payload else []
+
+    def getSeriesReminders(self, start_minute, end_minute):
+        payload = self.read("/series/reminders", {"start_minute": start_minute, "end_minute": end_minute})
+        return payload["reminders"] if payload else []
+
+    def getEventSeries(self):
+        payload = self.read("/series")
+        return payload["series"] if payload else []
+
+    def getSeriesOccurrences(self, start_date, end_date):
+        payload = self.read("/occurrences", {"start": self.isoDate(start_date), "end": self.isoDate(end_date)})
+        return payload["occurrences"] if payload else []
+
+    # Writes
+    @classmethod
+    def eventFields(cls, event):
+        fields = {}
+        for field in ("event_date", "title", "description", "event_time", "event_color", "duration_minutes", "reminder_minutes"):
+            if field in event:
+                fields[field] = event[field]
+        if "event_date" in fields:
+            fields["event_date"] = cls.isoDate(fields["event_date"])
+        if "event_time" in fields:
+            fields["event_time"] = cls.isoTime(fields["event_time"])
+        return fields
+
+    def calendarFor(self, calendar_id):
+        return self.default_calendar_id if calendar_id is None else calendar_id
+
+    def addEvent(self, eventDate, eventTitle, eventDescription, eventTime, eventColor, eventDuration=None, eventReminder=None, calendar_id=None):
+        status, _ = self.callService("POST", "/events", {
+            **self.eventFields({
+                "event_date": eventDate,
+                "title": eventTitle,
+                "description": eventDescription,
+                "event_time": eventTime,
+                "event_color": eventColor,
+                "duration_minutes": eventDuration,
+                "reminder_minutes": eventReminder
+            }),
+            "calendar_id": self.calendarFor(calendar_id)
+        })
+        return status == 201
+
+    def updateEvent(self, edited_event_data):
+        status, _ = self.callService("PUT", f"/events/{int(edited_event_data['event_id'])}", self.eventFields(edited_event_data))
+        return status == 200
+
+    def updateEvents(self, edited_events):
+        edited_events = [{**self.eventFields(event), "event_id": int(event["event_id"])} for event in edited_events]
+        status, _ = self.callService("PATCH", "/events", edited_events)
+        return status == 200
+
+    def deleteEvent(self, eventId):
+        status, _ = self.callService("DELETE", f"/events/{int(eventId)}")
+        return status == 200
+
+    def deleteEvents(self, event_ids):
+        status, _ = self.callService("POST", "/events/delete", {"ids": [int(event_id) for event_id in event_ids]})
+        return status == 200
+
+    def rescheduleEvents(self, event_ids, day_offset):
+        status, _ = self.callService("POST", "/events/reschedule", {"ids": [int(event_id) for event_id in event_ids], "days": int(day_offset)})
+        return status == 200
+
+    def importEventRows(self, event_rows, batch_size=5000, progress_callback=None, calendar_id=None, series_rows=()):
+        # Streams batch_size rows per request into an import session on the service, which
+        # imports them all in one transaction at the end, so the import is all-or-nothing as
+        # EventManager's is. progress_callback(imported_count) is called after each batch;
+        # returning False cancels the session, and nothing is imported.
+        status, session = self.callService("POST", "/imports", {"calendar_id": self.calendarFor(calendar_id)})
+        if status != 201:
+            return None
+        session_path = f"/imports/{session['id']}"
+
+        def stage(batch):
+            status, _ = self.callService("POST", session_path + "/rows", batch)
+            return status == 200
+
+        staged_count = 0
+        event_rows = iter(event_rows)
+        while True:
+            batch = [[self.isoDate(event_date), *fields[:2], self.isoTime(fields[2]), *fields[3:]] for event_date, *fields in itertools.islice(event_rows, batch_size)]
+            if not batch:
+                break
+            if not stage({"rows": batch}):
+                self.callService("DELETE", session_path)
+                return None
+            staged_count += len(batch)
+            if progress_callback and progress_callback(staged_count) is False:
+                logger.info("Import cancelled, discarding it.")
+                self.callService("DELETE", session_path)
+                return None
+        # Series rows are read once the events are exhausted, as EventManager reads them
+        series_rows = [
+            [self.isoDate(start_date), *fields[:2], self.isoTime(fields[2]), *fields[3:-1], [self.isoDate(date) for date in fields[-1]]]
+            for start_date, *fields in series_rows
+        ]
+        if series_rows and not stage({"series": series_rows}):
+            self.callService("DELETE", session_path)
+            return None
+        status, payload = self.callService("POST", session_path + "/commit")
+        return payload["imported"] if status == 200 else None
+
+    def addEventSeries(self, startDate, eventTitle, eventDescription, eventTime, eventColor, rrule_text, eventDuration=None, eventReminder=None, calendar_id=None):
+        fields = self.eventFields({
+            "event_date": startDate,
+            "title": eventTitle,
+            "description": eventDescription,
+            "event_time": eventTime,
+            "event_color": eventColor,
+            "duration_minutes": eventDuration,
+            "reminder_minutes": eventReminder
+        })
+        fields["start_date"] = fields.pop("event_date")
+        status, _ = self.callService("POST", "/series", {**fields, "rrule": rrule_text, "calendar_id": self.calendarFor(calendar_id)})
+        return status == 201
+
+    def addSeriesException(self, series_id, occurrence_date):
+        status, _ = self.callService("POST", f"/series/{int(series_id)}/exceptions", {"date": self.isoDate(occurrence_date)})
+        return status == 200
+
+    def deleteEventSeries(self, series_id):
+        status, _ = self.callService("DELETE", f"/series/{int(series_id)}")
+        return status == 200
+
+    # Calendars: the registry lives in the service's database; our copy is reloaded once it
+    # changed. Hiding one is this client's own choice and never reaches the service.
+    def loadCalendars(self):
+        status, payload = self.callService("GET", "/calendars")
+        if status != 200:
+            return False
+        calendars = {}
+        for calendar in payload["calendars"]:
+            # Shown when the service can read it and it is not hidden here
+            calendar['visible'] = calendar['visible'] and calendar['id'] not in self.hidden_calendar_ids
+            calendars[calendar['id']] = calendar
+        self.calendars = calendars
+        return True
+
+    def getCalendars(self):
+        return [dict(calendar) for _, calendar in sorted(self.calendars.items())]
+
+    def setCalendarVisible(self, calendar_id, visible):
+        calendar = self.calendars.get(calendar_id)
+        if calendar is None:
+            return False
+        if calendar['visible'] == bool(visible):
+            return True
+        if visible:
+            self.hidden_calendar_ids.discard(calendar_id)
+        else:
+            self.hidden_calendar_ids.add(calendar_id)
+        self.loadCalendars()
+        if visible and not self.calendars.get(calendar_id, {}).get('visible'):
+            logger.warning("The event service cannot show calendar %s.", calendar['name'])
+            return False
+        self.notifyChanges([EventChange(EventChange.RELOADED)])
+        return True
+
+    def addCalendar(self, name, file_name=None, color=None):
+        status, payload = self.callService("POST", "/calendars", {"name": name, "file_name": file_name, "color": color})
+        self.loadCalendars()
+        return payload["id"] if status == 201 else None
+
+    def removeCalendar(self, calendar_id):
+        status, _ = self.callService("DELETE", f"/calendars/{int(calendar_id)}")
+        if status == 200:
+            self.hidden_calendar_ids.discard(calendar_id)
+            if self.default_calendar_id == calendar_id:
+                self.default_calendar_id = DEFAULT_CALENDAR_ID
+        self.loadCalendars()
+        return status == 200
+
+    # Settings, kept in the service's database
+    def getSetting(self, name, default=None):
+        status, payload = self.callService("GET", "/settings", query={"name": name})
+        if status != 200 or payload["value"] is None:
+            return default
+        return payload["value"]
+
+    def setSetting(self, name, value):
+        status, _ = self.callService("PUT", "/settings", {"name": name, "value": None if value is None else str(value)})
+        return status == 200
@@ -0,0 +1,50 @@
+import bisect
+import heapq
+
+MINUTES_PER_DAY = 24 * 60
+
+class DayTimelineLayout:
+    # Side-by-side column layout for one day's timed events. Events that overlap, directly or
+    # through a chain of overlaps, form a cluster that shares its width equally between as many
+    # columns as the cluster needs; each event takes the lowest column free when it starts.
+    # Built once per day in O(k log k) and then only queried, so views cache one per day.
+    def __init__(self, events):
+        # events: dicts with 'start_minute' and 'end_minute' counted from the day's midnight.
+        # Items are copies with 'column' and 'column_count' added, ordered by start.
+        self.items = sorted((dict(event) for event in events), key=lambda item: (item['start_minute'], item['end_minute']))
+        self.item_starts = [item['start_minute'] for item in self.items]
+        self.longest_duration = max((item['end_minute'] - item['start_minute'] for item in self.items), default=0)
+        self.layoutColumns()
+
+    def layoutColumns(self):
+        running = []  # (end_minute, column) of events still in progress
+        free_columns = []
+        cluster = []
+        cluster_column_count = 0
+        for item in self.items:
+            while running and running[0][0] <= item['start_minute']:
+                heapq.heappush(free_columns, heapq.heappop(running)[1])
+            if not running:
+                # Nothing in progress, so the previous cluster is complete
+                for cluster_item in cluster:
+                    cluster_item['column_count'] = cluster_column_count
+                cluster = []
+                cluster_column_count = 0
+                free_columns = []
+            if free_columns:
+                column = heapq.heappop(free_columns)
+            else:
+                column = cluster_column_count
+                cluster_column_count += 1
+            item['column'] = column
+            heapq.heappush(running, (max(item['end_minute'], item['start_minute'] + 1), column))
+            cluster.append(item)
+        for cluster_item in cluster:
+            cluster_item['column_count'] = cluster_column_count
+
+    def visibleItems(self, start_minute, end_minute):
+        # Items overlapping [start_minute, end_minute), found by bisecting the sorted starts: only
+        # items starting within the longest duration before the range can reach into it
+        first = bisect.bisect_left(self.item_starts, start_minute - self.longest_duration)
+        last = bisect.bisect_left(self.item_starts, end_minute)
+        return [item for item in self.items[first:last] if item['end_minute'] > start_minute or item['end_minute'] == item['start_minute'] >= start_minute]
@@ -0,0 +1,308 @@
+import csv
+import datetime
+import itertools
+import logging
+import os
+import re
+import zoneinfo
+
+from .event_manager import SERIES_ROW_FIELDS
+from .recurrence import RecurrenceRule
+
+logger = logging.getLogger(__name__)
+
+
+class EventFileTransfer:
+    # Streams events between the database and ICS/CSV files. Files are read and written a line
+    # at a time so neither side is ever loaded into memory whole. Recurring events travel as
+    # one row (CSV, with its rrule and exception_dates columns filled in) or VEVENT (ICS, with
+    # RRULE and EXDATE) per series; there are few enough of them to be collected while the
+    # events stream past.
+    csv_columns = list(SERIES_ROW_FIELDS)
+    ics_color_properties = ("X-SCHEDULER-COLOR", "COLOR")
+
+    def __init__(self, event_manager:"EventManager"):
+        self.event_manager = event_manager
+        self.bytes_read = 0
+        # Recurrence rules and times of the last imported file that were not understood
+        self.unsupported_rule_count = 0
+        self.unknown_time_zone_count = 0
+
+    def importFile(self, file_path, progress_callback=None):
+        # progress_callback(bytes_read, total_bytes) may return False to cancel
+        total_bytes = os.path.getsize(file_path)
+        self.bytes_read = self.unsupported_rule_count = self.unknown_time_zone_count = 0
+        series_rows = []
+        with open(file_path, "rb") as binary_file:
+            lines = self.decodedLines(binary_file)
+            if file_path.lower().endswith(".ics"):
+                event_rows = self.readIcsRows(lines, series_rows)
+            else:
+                event_rows = self.readCsvRows(lines, series_rows)
+
+            def on_batch_imported(imported_count):
+                if progress_callback:
+                    return progress_callback(self.bytes_read, total_bytes)
+
+            imported_count = self.event_manager.importEventRows(event_rows, progress_callback=on_batch_imported, series_rows=series_rows)
+        if self.unsupported_rule_count:
+            logger.warning("Recurring events of %s with rules the scheduler does not support were imported as single events (%s skipped rules).", file_path, self.unsupported_rule_count)
+        if self.unknown_time_zone_count:
+            logger.warning("Times of %s in time zones this system does not know were imported as written (%s times).", file_path, self.unknown_time_zone_count)
+        return imported_count
+
+    def exportFile(self, file_path, progress_callback=None):
+        # progress_callback(exported_count) may return False to stop early
+        with open(file_path, "w", encoding="utf-8", newline="") as text_file:
+            if file_path.lower().endswith(".ics"):
+                return self.writeIcs(text_file, progress_callback)
+            return self.writeCsv(text_file, progress_callback)
+
+    def decodedLines(self, binary_file):
+        for raw_line in binary_file:
+            self.bytes_read += len(raw_line)
+            yield raw_line.decode("utf-8-sig" if self.bytes_read == len(raw_line) else "utf-8", errors="replace")
+
+    def readCsvRows(self, lines, series_rows):
+        # Yields event rows; rows with an rrule are appended to series_rows instead
+        reader = csv.reader(lines)
+        column_positions = dict((name, position) for position, name in enumerate(self.csv_columns))
+        first_row = next(reader, None)
+        if first_row is None:
+            return
+        header = [name.strip().lower() for name in first_row]
+        if "title" in header and "event_date" in header:
+            column_positions = dict((name, header.index(name)) for name in self.csv_columns if name in header)
+            first_row = None
+
+        for row in itertools.chain([first_row] if first_row else [], reader):
+            values = [row[column_positions[name]] if name in column_positions and column_positions[name] < len(row) else "" for name in self.csv_columns]
+            event_date, title, description, event_time, event_color, duration_minutes, reminder_minutes, rrule_text, exception_dates = (value.strip() for value in values)
+            event_date = self.normalizeDate(event_date)
+            if not (event_date and title):
+                continue
+            event_row = (event_date, title, description, self.normalizeTime(event_time), event_color or None, self.normalizeMinutes(duration_minutes), self.normalizeMinutes(reminder_minutes))
+            if not self.addSeriesRow(series_rows, event_row, rrule_text, exception_dates.split()):
+                yield event_row
+
+    def readIcsRows(self, lines, series_rows):
+        # Yields event rows; VEVENTs with an RRULE are appended to series_rows instead. Each
+        # property keeps its first value and parameters, except EXDATE, which may repeat. Times
+        # are converted to local time (see icsLocalDateTime), and DTEND becomes a duration.
+        event = alarm = None
+        for line in self.unfoldedIcsLines(lines):
+            name, parameters, value = self.icsProperty(line)
+            if name == "BEGIN" and value.upper() == "VEVENT":
+                event = {"EXDATE": []}
+            elif event is None:
+                continue
+            elif name == "BEGIN" and value.upper() == "VALARM":
+                alarm = {}
+            elif name == "END" and value.upper() == "VALARM":
+                # The first alarm triggered relative to the start is the event's reminder
+                reminder_minutes = self.icsDurationMinutes(alarm.get("TRIGGER", ""))
+                if reminder_minutes is not None and "reminder_minutes" not in event:
+                    event["reminder_minutes"] = -reminder_minutes
+                alarm = None
+            elif alarm is not None:
+                alarm.setdefault(name, value.strip())
+            elif name == "END" and value.upper() == "VEVENT":
+                start = self.icsLocalDateTime(*event.get("DTSTART", ({}, "")))
+                title = event.get("SUMMARY", "")
+                if start and title:
+                    event_time = start.time().isoformat(timespec="seconds") if isinstance(start, datetime.datetime) else None
+                    event_color = next((event[key] for key in self.ics_color_properties if key in event), None)
+                    duration_minutes = None
+                    if event_time and "DURATION" in event:
+                        duration_minutes = self.icsDurationMinutes(event["DURATION"])
+                    elif event_time and "DTEND" in event:
+                        end = self.icsLocalDateTime(*event["DTEND"])
+                        if isinstance(end, datetime.datetime) and end >= start:
+                            duration_minutes = int((end - start).total_seconds()) // 60
+                    event_row = (start.strftime("%Y-%m-%d"), title, event.get("DESCRIPTION", ""), event_time, event_color, duration_minutes, event.get("reminder_minutes"))
+                    exception_dates = [exception.strftime("%Y-%m-%d") for exception in (self.icsLocalDateTime(*exdate) for exdate in event["EXDATE"]) if exception]
+                    if not self.addSeriesRow(series_rows, event_row, event.get("RRULE", ""), exception_dates):
+                        yield event_row
+                event = None
+            elif name == "EXDATE":
+                event["EXDATE"].extend((parameters, exdate) for exdate in value.strip().split(","))
+            elif name in ("DTSTART", "DTEND"):
+                event.setdefault(name, (parameters, value.strip()))
+            elif name not in event:
+                event[name] = self.unescapeIcsText(value) if name in ("SUMMARY", "DESCRIPTION") else value.strip()
+
+    @staticmethod
+    def icsProperty(line):
+        # (upper-case name, {parameter: value}, value) of a content line; parameter values may
+        # be quoted, and then contain ':' and ';'
+        match = re.match(r'((?:[^:"]|"[^"]*")*):?(.*)', line)
+        name, *parameters = re.findall(r'(?:[^;"]|"[^"]*")+', match.group(1)) or [""]
+        parameters = dict(parameter.partition("=")[::2] for parameter in parameters)
+        return name.upper(), {key.upper(): value.strip('"') for key, value in parameters.items()}, match.group(2)
+
+    def icsLocalDateTime(self, parameters, value):
+        # A DATE value as a datetime.date, or a DATE-TIME as a naive local datetime.datetime:
+        # UTC times (ending in Z) and times with a TZID the system knows are converted to local
+        # time, floating times are taken as written. None if malformed.
+        try:
+            if "T" not in value.upper():
+                return datetime.datetime.strptime(value.strip()[:8], "%Y%m%d").date()
+            moment = datetime.datetime.strptime(value.strip()[:15].upper(), "%Y%m%dT%H%M%S")
+        except ValueError:
+            return None
+        if value.strip().upper().endswith("Z"):
+            moment = moment.replace(tzinfo=datetime.timezone.utc)
+        elif "TZID" in parameters:
+            try:
+                moment = moment.replace(tzinfo=zoneinfo.ZoneInfo(parameters["TZID"]))
+            except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+                self.unknown_time_zone_count += 1
+        if moment.tzinfo is not None:
+            moment = moment.astimezone().replace(tzinfo=None)
+        return moment
+
+    def addSeriesRow(self, series_rows, event_row, rrule_text, exception_dates):
+        # Appends the series row for an event row with a recurrence rule the scheduler supports;
+        # False if there is no such rule, and the event is imported once, on its start date
+        if not rrule_text:
+            return False
+        try:
+            rrule_text = RecurrenceRule.parse(rrule_text).toString()
+        except (ValueError, IndexError):
+            self.unsupported_rule_count += 1
+            return False
+        series_rows.append(event_row + (rrule_text, [date for date in map(self.normalizeDate, exception_dates) if date]))
+        return True
+
+    def unfoldedIcsLines(self, lines):
+        current_line = None
+        for line in lines:
+            line = line.rstrip("\r\n")
+            if line[:1] in (" ", "\t") and current_line is not None:
+                current_line += line[1:]
+                continue
+            if current_line:
+                yield current_line
+            current_line = line
+        if current_line:
+            yield current_line
+
+    def writeCsv(self, text_file, progress_callback):
+        writer = csv.writer(text_file)
+        writer.writerow(self.csv_columns)
+        exported_count = 0
+        for event_row in self.event_manager.exportEventRows():
+            writer.writerow(["" if value is None else value for value in event_row[1:]] + ["", ""])
+            exported_count += 1
+            if progress_callback and exported_count % 5000 == 0 and progress_callback(exported_count) is False:
+                return exported_count
+        for series_row in self.event_manager.exportSeriesRows():
+            writer.writerow(["" if value is None else value for value in series_row[1:-1]] + [" ".join(series_row[-1])])
+            exported_count += 1
+        return exported_count
+
+    def writeIcs(self, text_file, progress_callback):
+        timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        text_file.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Scheduler App//EN\r\n")
+        exported_count = 0
+        for event_row in self.event_manager.exportEventRows():
+            text_file.write(self.icsEvent(f"{event_row[0]}@scheduler-app", timestamp, *event_row[1:]))
+            exported_count += 1
+            if progress_callback and exported_count % 5000 == 0 and progress_callback(exported_count) is False:
+                break
+        else:
+            for series_row in self.event_manager.exportSeriesRows():
+                text_file.write(self.icsEvent(f"series-{series_row[0]}@scheduler-app", timestamp, *series_row[1:]))
+                exported_count += 1
+        text_file.write("END:VCALENDAR\r\n")
+        return exported_count
+
+    def icsEvent(self, uid, timestamp, event_date, title, description, event_time, event_color, duration_minutes, reminder_minutes, rrule_text=None, exception_dates=()):
+        # One VEVENT, as folded CRLF-terminated lines
+        ics_date = event_date.replace("-", "")
+        ics_time = (event_time or "").replace(":", "")[:6]
+        timed = len(ics_time) == 6
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{uid}",
+            f"DTSTAMP:{timestamp}",
+            f"DTSTART:{ics_date}T{ics_time}" if timed else f"DTSTART;VALUE=DATE:{ics_date}",
+            f"SUMMARY:{self.escapeIcsText(title)}",
+        ]
+        if timed and duration_minutes is not None:
+            lines.append(f"DURATION:PT{duration_minutes}M")
+        if description:
+            lines.append(f"DESCRIPTION:{self.escapeIcsText(description)}")
+        if event_color:
+            lines.append(f"X-SCHEDULER-COLOR:{event_color}")
+        if rrule_text:
+            lines.append(f"RRULE:{rrule_text}")
+        if exception_dates:
+            ics_dates = [date.replace("-", "") + (f"T{ics_time}" if timed else "") for date in exception_dates]
+            lines.append(("EXDATE:" if timed else "EXDATE;VALUE=DATE:") + ",".join(ics_dates))
+        if reminder_minutes is not None:
+            lines.extend([
+                "BEGIN:VALARM",
+                "ACTION:DISPLAY",
+                f"DESCRIPTION:{self.escapeIcsText(title)}",
+                f"TRIGGER:{'-' if reminder_minutes > 0 else ''}PT{abs(reminder_minutes)}M",
+                "END:VALARM",
+            ])
+        lines.append("END:VEVENT")
+        return "".join(self.foldIcsLine(line) + "\r\n" for line in lines)
+
+    @staticmethod
+    def foldIcsLine(line):
+        # RFC 5545 limits content lines to 75 octets; continuation lines start with a space
+        if len(line.encode("utf-8")) <= 75:
+            return line
+        folded_parts = []
+        current_part = ""
+        for character in line:
+            if len((current_part + character).encode("utf-8")) > (75 if not folded_parts else 74):
+                folded_parts.append(current_part)
+                current_part = ""
+            current_part += character
+        folded_parts.append(current_part)
+        return "\r\n ".join(folded_parts)
+
+    @staticmethod
+    def escapeIcsText(text):
+        return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+
+    @staticmethod
+    def unescapeIcsText(text):
+        return re.sub(r"\\([\\;,nN])", lambda match: "\n" if match.group(1) in "nN" else match.group(1), text)
+
+    @staticmethod
+    def icsDurationMinutes(duration_text):
+        # Whole minutes in an RFC 5545 duration such as PT1H30M, P1D or -PT15M; None if malformed
+        match = re.fullmatch(r"([+-]?)P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?", duration_text.strip().upper())
+        if not match or not any(match.groups()[1:]):
+            return None
+        sign, *amounts = match.groups()
+        weeks, days, hours, minutes, seconds = (int(amount or 0) for amount in amounts)
+        total_minutes = ((weeks * 7 + days) * 24 + hours) * 60 + minutes + seconds // 60
+        return -total_minutes if sign == "-" else total_minutes
+
+    @staticmethod
+    def normalizeDate(date_text):
+        # Accepts 2025-07-31 and the ICS basic form 20250731
+        try:
+            return datetime.date.fromisoformat(date_text.strip()).isoformat()
+        except ValueError:
+            return None
+
+    @staticmethod
+    def normalizeTime(time_text):
+        try:
+            return datetime.time.fromisoformat((time_text or "").strip()).isoformat(timespec="seconds")
+        except ValueError:
+            return None
+
+    @staticmethod
+    def normalizeMinutes(minutes_text):
+        try:
+            return int(minutes_text)
+        except ValueError:
+            return None
@@ -0,0 +1,46 @@
+import os
+import time
+
+import pytest
+
+from scheduler_core.event_manager import EventManager
+
+
+@pytest.fixture
+def event_manager(tmp_path):
+    # A fresh, fully migrated calendar database per test
+    manager = EventManager(str(tmp_path / "events.db"))
+    yield manager
+    manager.closeConnection()
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    # One QApplication for every GUI test, on the offscreen platform so no display is needed
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def wait_for(qapp):
+    # wait_for(future) runs the Qt event loop until future, resolved on the GUI thread, is done;
+    # wait_for(condition) until condition() is true
+    def wait(future, timeout=5):
+        done = future.done if hasattr(future, "done") else future
+        deadline = time.monotonic() + timeout
+        while not done():
+            assert time.monotonic() < deadline, "timed out waiting for the database worker"
+            qapp.processEvents()
+            time.sleep(0.001)
+        return future
+    return wait
+
+
+@pytest.fixture
+def executor(event_manager, qapp):
+    # The app's database worker thread, over event_manager
+    from scheduler import DatabaseExecutor
+    executor = DatabaseExecutor(event_manager)
+    yield executor
+    executor.shutdown()
@@ -0,0 +1,50 @@
+import datetime
+import os
+import sys
+
+import pytest
+
+from scheduler_core import EventManager
+
+# The benchmark scripts import each other as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from generate_calendar import DAY_COUNT, FIRST_DATE, create_calendar_database, generate_event_rows
+
+
+def test_same_seed_gives_the_same_events():
+    assert list(generate_event_rows(500, seed=3)) == list(generate_event_rows(500, seed=3))
+    assert list(generate_event_rows(500, seed=3)) != list(generate_event_rows(500, seed=4))
+
+
+def test_generated_rows_are_importable_and_in_range():
+    rows = list(generate_event_rows(2000))
+    assert len(rows) == 2000
+    last_date = FIRST_DATE + datetime.timedelta(days=DAY_COUNT - 1)
+    for event_date, title, description, event_time, event_color, duration_minutes, reminder_minutes in rows:
+        assert FIRST_DATE <= datetime.date.fromisoformat(event_date) <= last_date
+        assert title and event_color
+        assert event_time is None or datetime.time(6) <= datetime.time.fromisoformat(event_time) <= datetime.time(22)
+        assert duration_minutes is None and reminder_minutes is None
+    # Some all-day events, some described ones, and weekends quieter than weekdays
+    assert any(row[3] is None for row in rows) and any(row[2] for row in rows)
+    weekdays = [datetime.date.fromisoformat(row[0]).weekday() for row in rows]
+    assert weekdays.count(6) < weekdays.count(0)
+
+
+def test_database_is_replaced_with_exactly_count_events(tmp_path):
+    db_filename = str(tmp_path / "events.db")
+    for count in (300, 120):
+        create_calendar_database(db_filename, count)
+    event_manager = EventManager(db_filename)
+    assert len(event_manager.getAllEvents()) == 120
+    event_manager.closeConnection()
+
+
+def test_regressions_need_both_the_tolerance_and_the_minimum():
+    run_benchmarks = pytest.importorskip("run_benchmarks")
+    baseline = {"sizes": {"10k": {"fast": {"median_ms": 1.0}, "slow": {"median_ms": 100.0}}}}
+    results = {"sizes": {"10k": {"fast": {"median_ms": 3.0}, "slow": {"median_ms": 180.0}, "new": {"median_ms": 50.0}}}}
+    # The fast scenario tripled but by less than MIN_REGRESSION_MS; new scenarios have no baseline
+    assert run_benchmarks.find_regressions(results, baseline, 0.5) == ["10k slow: 180.0 ms vs baseline 100.0 ms"]
+    assert run_benchmarks.find_regressions(results, baseline, 1.0) == []
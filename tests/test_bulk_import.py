@@ -0,0 +1,54 @@
+import datetime
+
+from scheduler_core.transfer import EventFileTransfer
+
+DAY = datetime.date(2026, 3, 2)
+
+
+def event_rows(count):
+    return ((DAY + datetime.timedelta(days=index % 30), f"Event {index}", None, None, None, None, None) for index in range(count))
+
+
+def test_rows_are_inserted_in_batches_in_one_transaction(event_manager):
+    progress = []
+    assert event_manager.importEventRows(event_rows(2500), batch_size=1000, progress_callback=progress.append) == 2500
+    assert progress == [1000, 2000, 2500]
+    assert len(event_manager.getAllEvents()) == 2500
+
+
+def test_cancelling_rolls_back_every_batch(event_manager):
+    event_manager.addEvent(DAY, "Kept", None, None, None)
+    assert event_manager.importEventRows(event_rows(2500), batch_size=1000, progress_callback=lambda count: count < 2000) is None
+    assert [event.title for event in event_manager.getAllEvents()] == ["Kept"]
+
+
+def test_csv_columns_are_found_by_header(event_manager, tmp_path):
+    file_path = tmp_path / "events.csv"
+    file_path.write_bytes("﻿title,event_time,event_date\r\nDentist,09:00,2026-03-02\r\n,10:00,2026-03-02\r\nNo date,,\r\nHoliday,,2026-03-05\r\n".encode("utf-8"))
+    progress = []
+    assert EventFileTransfer(event_manager).importFile(str(file_path), lambda bytes_read, total_bytes: progress.append((bytes_read, total_bytes))) == 2
+    assert [row[1:5] for row in event_manager.exportEventRows()] == [
+        ("2026-03-02", "Dentist", "", "09:00:00"),
+        ("2026-03-05", "Holiday", "", None),
+    ]
+    assert progress == [(file_path.stat().st_size, file_path.stat().st_size)]
+
+
+def test_export_streams_every_row_in_date_order(event_manager, tmp_path):
+    event_manager.importEventRows(event_rows(12000))
+    progress = []
+    file_path = tmp_path / "events.csv"
+    assert EventFileTransfer(event_manager).exportFile(str(file_path), progress.append) == 12000
+    assert progress == [5000, 10000]
+    lines = file_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 12001
+    dates = [line.split(",")[0] for line in lines[1:]]
+    assert dates == sorted(dates)
+
+
+def test_export_can_stop_early(event_manager, tmp_path):
+    event_manager.importEventRows(event_rows(12000))
+    file_path = tmp_path / "events.ics"
+    assert EventFileTransfer(event_manager).exportFile(str(file_path), lambda count: False) == 5000
+    text = file_path.read_bytes().decode("utf-8")
+    assert text.count("BEGIN:VEVENT") == 5000 and text.endswith("END:VCALENDAR\r\n")
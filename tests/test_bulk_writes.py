@@ -0,0 +1,61 @@
+import datetime
+
+from scheduler_core.changes import EventChange
+
+DAY = datetime.date(2026, 3, 2)
+
+
+def add_events(event_manager, count):
+    event_manager.addEvents([
+        {"event_date": DAY.isoformat(), "title": f"Event {index}", "event_time": "09:00:00", "event_color": "#ff0000"}
+        for index in range(count)
+    ])
+    return [event.id for event in event_manager.getAllEvents()]
+
+
+def write_statements(event_manager, verb):
+    queries = event_manager.instrumentation.snapshot()['queries']
+    return sum(summary['count'] for sql, summary in queries.items() if sql.startswith(verb))
+
+
+def test_recolor_is_one_statement_and_one_commit(event_manager):
+    event_ids = add_events(event_manager, 50)
+    updates_before, commits_before = write_statements(event_manager, "UPDATE"), write_statements(event_manager, "COMMIT")
+    assert event_manager.updateEvents([{"event_id": event_id, "event_color": "#00ff00"} for event_id in event_ids])
+    assert write_statements(event_manager, "UPDATE") - updates_before == 1
+    assert write_statements(event_manager, "COMMIT") - commits_before == 1
+    assert {event.event_color for event in event_manager.getAllEvents()} == {"#00ff00"}
+    # Fields not named are left alone
+    assert {event.title for event in event_manager.getAllEvents()} == {f"Event {index}" for index in range(50)}
+
+
+def test_present_fields_are_written_even_when_none(event_manager):
+    event_id = add_events(event_manager, 1)[0]
+    assert event_manager.updateEvents([{"event_id": event_id, "event_time": None, "event_color": None}])
+    event = event_manager.getAllEvents()[0]
+    assert (event.event_time, event.event_color, event.title) == (None, None, "Event 0")
+
+
+def test_reschedule_moves_every_selected_event(event_manager):
+    event_ids = add_events(event_manager, 3)
+    assert event_manager.rescheduleEvents(event_ids[:2], -3)
+    assert [event.event_date for event in event_manager.getAllEvents()] == [DAY - datetime.timedelta(days=3)] * 2 + [DAY]
+
+
+def test_bulk_delete_notifies_once(event_manager):
+    event_ids = add_events(event_manager, 4)
+    notifications = []
+    event_manager.addChangeListener(notifications.append)
+    assert event_manager.deleteEvents(event_ids[1:3])
+    assert [event.id for event in event_manager.getAllEvents()] == [event_ids[0], event_ids[3]]
+    assert len(notifications) == 1
+    assert [(change.kind, change.event_id, change.old_date) for change in notifications[0]] == [
+        (EventChange.DELETED, event_id, "2026-03-02") for event_id in event_ids[1:3]
+    ]
+
+
+def test_missing_ids_are_ignored(event_manager):
+    event_ids = add_events(event_manager, 2)
+    assert event_manager.deleteEvents([event_ids[0], 9999])
+    assert event_manager.updateEvents([{"event_id": 9999, "title": "Nobody"}])
+    assert [event.title for event in event_manager.getAllEvents()] == ["Event 1"]
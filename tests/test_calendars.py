@@ -0,0 +1,98 @@
+import datetime
+import os
+import sqlite3
+
+from scheduler_core.event_manager import CALENDAR_ID_SHIFT, DEFAULT_CALENDAR_ID, EventManager
+
+DAY = datetime.date(2026, 3, 2)
+
+
+def titles(rows):
+    return [row[2] for row in rows]
+
+
+def add_work_calendar(event_manager):
+    work = event_manager.addCalendar("Work")
+    event_manager.addEvent(DAY, "Home chore", None, datetime.time(9, 0), "#00ff00", 60)
+    event_manager.addEvent(DAY, "Work meeting", None, datetime.time(9, 30), "#ff0000", 60, calendar_id=work)
+    return work
+
+
+def test_calendar_file_and_offset_ids(event_manager, tmp_path):
+    work = add_work_calendar(event_manager)
+    assert os.path.exists(tmp_path / "calendar_work.db")
+    rows = event_manager.getEventPage(1, False, None, 10)
+    assert titles(rows) == ["Home chore", "Work meeting"]
+    home_id, work_id = rows[0][0], rows[1][0]
+    assert home_id == 1 and work_id == (work << CALENDAR_ID_SHIFT) + 1
+    assert EventManager.calendarOfId(home_id) == DEFAULT_CALENDAR_ID and EventManager.calendarOfId(work_id) == work
+    # The event is stored in the calendar's own file under its plain id
+    db = sqlite3.connect(str(tmp_path / "calendar_work.db"))
+    assert db.execute("SELECT id, title FROM events").fetchall() == [(1, "Work meeting")]
+    db.close()
+
+
+def test_writes_go_to_the_events_calendar(event_manager):
+    work = add_work_calendar(event_manager)
+    work_id = (work << CALENDAR_ID_SHIFT) + 1
+    event_manager.updateEvents([{"event_id": work_id, "title": "Renamed meeting"}])
+    assert event_manager.getEventDetailsbyId(work_id)[0].title == "Renamed meeting"
+    assert event_manager.getEventDetailsbyId(1)[0].title == "Home chore"
+    event_manager.rescheduleEvents([1, work_id], 1)
+    assert [event.event_date for event in event_manager.getAllEvents()] == [DAY + datetime.timedelta(days=1)] * 2
+    event_manager.deleteEvents([work_id])
+    assert titles(event_manager.getEventPage(1, False, None, 10)) == ["Home chore"]
+
+
+def test_reads_merge_every_calendar(event_manager):
+    add_work_calendar(event_manager)
+    assert [conflict['title'] for conflict in event_manager.findConflicts(DAY, datetime.time(9, 15), 30)] == ["Home chore", "Work meeting"]
+    assert event_manager.getEventDateSummaries(DAY, DAY) == {DAY.isoformat(): {'count': 2, 'colors': ["#00ff00", "#ff0000"]}}
+    search = event_manager.getEventPage(0, False, None, 10, match_expression=event_manager.ftsMatchExpression("meeting"))
+    assert titles(search) == ["Work meeting"]
+
+
+def test_hidden_calendars_are_left_out_for_this_manager_only(event_manager):
+    work = add_work_calendar(event_manager)
+    work_id = (work << CALENDAR_ID_SHIFT) + 1
+    assert event_manager.setCalendarVisible(work, False)
+    assert titles(event_manager.getEventPage(1, False, None, 10)) == ["Home chore"]
+    assert event_manager.getEventDetailsbyId(work_id) == []
+    assert not event_manager.addEvent(DAY, "Nowhere", None, None, None, calendar_id=work)
+    # Visibility is not stored in the shared registry
+    other_manager = EventManager(event_manager.db_filename)
+    assert titles(other_manager.getEventPage(1, False, None, 10)) == ["Home chore", "Work meeting"]
+    other_manager.closeConnection()
+    assert event_manager.setCalendarVisible(work, True)
+    assert titles(event_manager.getEventPage(1, False, None, 10)) == ["Home chore", "Work meeting"]
+
+
+def test_removed_calendar_keeps_its_file(event_manager, tmp_path):
+    work = add_work_calendar(event_manager)
+    assert event_manager.removeCalendar(work)
+    assert not event_manager.removeCalendar(DEFAULT_CALENDAR_ID)
+    assert titles(event_manager.getEventPage(1, False, None, 10)) == ["Home chore"]
+    assert os.path.exists(tmp_path / "calendar_work.db")
+    event_manager.addCalendar("Work again", "calendar_work.db")
+    assert titles(event_manager.getEventPage(1, False, None, 10)) == ["Home chore", "Work meeting"]
+
+
+def test_attach_limit(event_manager, monkeypatch):
+    monkeypatch.setattr(EventManager, "maxAttachedCalendars", lambda self: 2)
+    calendar_ids = [event_manager.addCalendar(f"Calendar {index}") for index in range(3)]
+    assert [calendar['visible'] for calendar in event_manager.getCalendars()] == [True, True, True, False]
+    assert not event_manager.setCalendarVisible(calendar_ids[2], True)
+    assert event_manager.setCalendarVisible(calendar_ids[0], False)
+    assert event_manager.setCalendarVisible(calendar_ids[2], True)
+
+
+def test_reads_narrowed_per_thread(event_manager):
+    work = add_work_calendar(event_manager)
+    event_manager.addEventSeries(DAY, "Work standup", None, datetime.time(8, 0), "#ff0000", "FREQ=DAILY;COUNT=3", calendar_id=work)
+    everything = event_manager.getEventDateSummaries(DAY, DAY)
+    with event_manager.readingCalendars([DEFAULT_CALENDAR_ID]):
+        assert titles(event_manager.getEventPage(1, False, None, 10)) == ["Home chore"]
+        assert event_manager.getEventDetailsbyId((work << CALENDAR_ID_SHIFT) + 1) == []
+        # Occurrences are cached per set of calendars read, not just per window
+        assert event_manager.getEventDateSummaries(DAY, DAY) == {DAY.isoformat(): {'count': 1, 'colors': ["#00ff00"]}}
+    assert event_manager.getEventDateSummaries(DAY, DAY) == everything == {DAY.isoformat(): {'count': 3, 'colors': ["#00ff00", "#ff0000", "#ff0000"]}}
@@ -0,0 +1,110 @@
+import datetime
+
+import pytest
+
+from scheduler_core.changes import EventChange
+
+DAY = datetime.date(2026, 3, 2)
+
+
+@pytest.fixture
+def notifications(event_manager):
+    # Each notification as a list of (kind, event_id, old_date, new_date)
+    received = []
+    event_manager.addChangeListener(lambda changes: received.append([(change.kind, change.event_id, change.old_date, change.new_date) for change in changes]))
+    return received
+
+
+def test_writes_describe_what_they_changed(event_manager, notifications):
+    event_manager.addEvent(DAY, "Dentist", None, None, None)
+    event_id = event_manager.getAllEvents()[0].id
+    event_manager.updateEvent({"event_id": event_id, "event_date": DAY + datetime.timedelta(days=1), "title": "Dentist", "description": None, "event_time": None, "event_color": None})
+    event_manager.deleteEvent(event_id)
+    event_manager.addEventSeries(DAY, "Standup", None, None, None, "FREQ=DAILY")
+    assert notifications == [
+        [(EventChange.ADDED, event_id, None, "2026-03-02")],
+        [(EventChange.UPDATED, event_id, "2026-03-02", "2026-03-03")],
+        [(EventChange.DELETED, event_id, "2026-03-03", None)],
+        [(EventChange.SERIES_CHANGED, None, None, None)],
+    ]
+
+
+def test_large_imports_ask_for_a_reload(event_manager, notifications):
+    rows = [(DAY.isoformat(), f"Event {index}", None, None, None, None, None) for index in range(event_manager.bulk_change_limit + 1)]
+    event_manager.importEventRows(rows)
+    assert notifications == [[(EventChange.RELOADED, None, None, None)]]
+
+
+def test_a_failing_listener_does_not_stop_the_others(event_manager, notifications):
+    def broken(changes):
+        raise RuntimeError("listener bug")
+    event_manager.change_listeners.insert(0, broken)
+    assert event_manager.addEvent(DAY, "Dentist", None, None, None)
+    assert len(notifications) == 1
+
+
+def test_grouped_writes_notify_once_after_commit(event_manager, notifications):
+    outcomes = event_manager.runWriteGroup([
+        lambda manager: manager.addEvent(DAY, "First", None, None, None),
+        lambda manager: manager.addEvent(DAY, "Second", None, None, None),
+    ])
+    assert [result for result, _ in outcomes] == [True, True]
+    assert len(notifications) == 1 and [change[0] for change in notifications[0]] == [EventChange.ADDED] * 2
+
+
+@pytest.fixture
+def model(event_manager, qapp):
+    scheduler = pytest.importorskip("scheduler")
+    for day, title in ((1, "Alpha"), (3, "Charlie"), (5, "Echo")):
+        event_manager.addEvent(datetime.date(2026, 3, day), title, None, None, None)
+    model = scheduler.EventTableModel(event_manager)
+    model.sort(1)
+    event_manager.addChangeListener(model.applyChanges)
+    return model
+
+
+def titles(model):
+    return [model.index(row, 2).data() for row in range(model.rowCount())]
+
+
+def test_model_patches_single_rows_in_place(event_manager, model):
+    generation = model.generation
+    event_manager.addEvent(datetime.date(2026, 3, 4), "Delta", None, None, None)
+    assert titles(model) == ["Alpha", "Charlie", "Delta", "Echo"]
+    alpha_id = model.index(0, 0).data()
+    event_manager.rescheduleEvents([alpha_id], 5)
+    assert titles(model) == ["Charlie", "Delta", "Echo", "Alpha"]
+    event_manager.deleteEvents([model.index(1, 0).data()])
+    assert titles(model) == ["Charlie", "Echo", "Alpha"]
+    # Patched, never reloaded
+    assert model.generation == generation
+
+
+def test_model_keeps_filtered_out_rows_out(event_manager, model):
+    model.setFilter(*event_manager.dateFilter("<", datetime.date(2026, 3, 4)))
+    model.select()
+    event_manager.addEvent(datetime.date(2026, 3, 2), "Bravo", None, None, None)
+    event_manager.addEvent(datetime.date(2026, 3, 9), "Later", None, None, None)
+    assert titles(model) == ["Alpha", "Bravo", "Charlie"]
+
+
+def test_model_reloads_after_a_large_import(event_manager, model):
+    generation = model.generation
+    event_manager.importEventRows([("2026-03-02", f"Event {index}", None, None, None, None, None) for index in range(event_manager.bulk_change_limit + 1)])
+    assert model.generation > generation
+
+
+def test_calendar_rereads_only_the_changed_days(event_manager, qapp):
+    scheduler = pytest.importorskip("scheduler")
+    event_manager.addEvent(datetime.date(2026, 3, 10), "Dentist", None, None, "#ff0000")
+    calendar = scheduler.MainSchedulingCalendar(event_manager)
+    calendar.setCurrentPage(2026, 3)
+    event_manager.addChangeListener(calendar.apply_changes)
+    summary_loads = event_manager.instrumentation.snapshot()['counters']["calendar.summary_loads"]
+    event_manager.addEvent(datetime.date(2026, 3, 12), "Gym", None, None, "#00ff00")
+    assert calendar.event_summaries_by_date == {
+        "2026-03-10": {'count': 1, 'colors': ["#ff0000"]},
+        "2026-03-12": {'count': 1, 'colors': ["#00ff00"]},
+    }
+    assert event_manager.instrumentation.snapshot()['counters']["calendar.summary_loads"] == summary_loads
+    calendar.deleteLater()
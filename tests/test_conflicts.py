@@ -0,0 +1,65 @@
+import datetime
+
+DAY = datetime.date(2026, 3, 2)
+
+
+def add(event_manager, title, start, duration=None, day=DAY):
+    event_manager.addEvent(day, title, None, start, "#ff0000", duration)
+    return event_manager.getEventPage(0, True, None, 1)[0][0]
+
+
+def conflict_titles(event_manager, start, duration=None, day=DAY, exclude_event_id=None):
+    return [conflict['title'] for conflict in event_manager.findConflicts(day, start, duration, exclude_event_id)]
+
+
+def test_overlaps_but_not_touching(event_manager):
+    add(event_manager, "Standup", datetime.time(9, 0), 30)
+    add(event_manager, "Review", datetime.time(10, 0), 60)
+    assert conflict_titles(event_manager, datetime.time(9, 15), 30) == ["Standup"]
+    assert conflict_titles(event_manager, datetime.time(9, 30), 30) == []
+    assert conflict_titles(event_manager, datetime.time(8, 0), 180) == ["Standup", "Review"]
+
+
+def test_missing_duration_counts_as_default(event_manager):
+    add(event_manager, "Lunch", datetime.time(12, 0))
+    assert conflict_titles(event_manager, datetime.time(12, 59), 10) == ["Lunch"]
+    assert conflict_titles(event_manager, datetime.time(13, 0), 10) == []
+
+
+def test_untimed_events_never_conflict(event_manager):
+    event_manager.addEvent(DAY, "Holiday", None, None, None)
+    assert conflict_titles(event_manager, datetime.time(9, 0), 60) == []
+    assert event_manager.findConflicts(DAY, None) == []
+
+
+def test_event_running_past_midnight(event_manager):
+    add(event_manager, "Night shift", datetime.time(22, 0), 8 * 60, day=DAY - datetime.timedelta(days=1))
+    assert conflict_titles(event_manager, datetime.time(5, 0), 30) == ["Night shift"]
+
+
+def test_excluded_event_and_moves(event_manager):
+    event_id = add(event_manager, "Standup", datetime.time(9, 0), 30)
+    assert conflict_titles(event_manager, datetime.time(9, 0), 30, exclude_event_id=event_id) == []
+    # The R*Tree follows updates and deletes
+    event_manager.updateEvents([{"event_id": event_id, "event_time": "14:00:00"}])
+    assert conflict_titles(event_manager, datetime.time(9, 0), 30) == []
+    assert conflict_titles(event_manager, datetime.time(14, 10), 30) == ["Standup"]
+    event_manager.deleteEvent(event_id)
+    assert conflict_titles(event_manager, datetime.time(14, 10), 30) == []
+
+
+def test_recurring_occurrences_conflict(event_manager):
+    event_manager.addEventSeries(DAY - datetime.timedelta(days=7), "Weekly sync", None, datetime.time(11, 0), None, "FREQ=WEEKLY", 45)
+    conflicts = event_manager.findConflicts(DAY, datetime.time(11, 30), 30)
+    assert [(conflict['id'], conflict['title'], conflict['event_date']) for conflict in conflicts] == [(None, "Weekly sync", DAY)]
+    assert conflict_titles(event_manager, datetime.time(11, 30), 30, day=DAY + datetime.timedelta(days=1)) == []
+
+
+def test_busy_intervals(event_manager):
+    add(event_manager, "B", datetime.time(10, 0), 60)
+    add(event_manager, "A", datetime.time(9, 0), 30)
+    day_start = event_manager.eventInterval(DAY, datetime.time(0, 0), 0)[0]
+    assert event_manager.getBusyIntervals(day_start, day_start + 24 * 60) == [
+        (day_start + 9 * 60, day_start + 9 * 60 + 30), (day_start + 10 * 60, day_start + 11 * 60)
+    ]
+    assert event_manager.getBusyIntervals(day_start + 11 * 60, day_start + 24 * 60) == []
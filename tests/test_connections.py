@@ -0,0 +1,72 @@
+import datetime
+import threading
+import time
+
+from scheduler_core.event_manager import EventManager
+
+DAY = datetime.date(2026, 3, 2)
+
+
+def in_thread(function):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(function()))
+    thread.start()
+    thread.join(10)
+    return results[0]
+
+
+def test_connections_use_wal_and_the_busy_timeout(tmp_path):
+    event_manager = EventManager(str(tmp_path / "events.db"), busy_timeout_ms=1234)
+    assert event_manager.execQuery("PRAGMA journal_mode", fetch=True) == [("wal",)]
+    assert event_manager.execQuery("PRAGMA busy_timeout", fetch=True) == [(1234,)]
+    event_manager.closeConnection()
+
+
+def test_each_thread_gets_its_own_connection(event_manager):
+    main_connection = event_manager.db
+
+    def worker():
+        connection = event_manager.db
+        assert connection is event_manager.db
+        event_manager.addEvent(DAY, "From the worker", None, None, None)
+        event_manager.closeConnection()
+        return connection
+    assert in_thread(worker) is not main_connection
+    assert event_manager.db is main_connection
+    assert [event.title for event in event_manager.getAllEvents()] == ["From the worker"]
+
+
+def test_readers_are_not_blocked_by_an_open_write(event_manager):
+    event_manager.addEvent(DAY, "Committed", None, None, None)
+    assert event_manager.beginWriteTransaction()
+    event_manager.execQuery("INSERT INTO events (event_date, title) VALUES ('2026-03-02', 'Pending')")
+
+    def read():
+        started = time.monotonic()
+        titles = [event.title for event in event_manager.getAllEvents()]
+        event_manager.closeConnection()
+        return titles, time.monotonic() - started
+    titles, elapsed = in_thread(read)
+    assert titles == ["Committed"]
+    assert elapsed < 1
+    assert event_manager.commitTransaction()
+
+
+def test_writers_wait_for_the_lock_instead_of_failing(event_manager):
+    other_manager = EventManager(event_manager.db_filename)
+    assert event_manager.beginWriteTransaction()
+
+    def write():
+        added = other_manager.addEvent(DAY, "Waited", None, None, None)
+        other_manager.closeConnection()
+        return added
+    results = []
+    writer = threading.Thread(target=lambda: results.append(write()))
+    writer.start()
+    time.sleep(0.2)
+    assert writer.is_alive()
+    assert event_manager.commitTransaction()
+    writer.join(10)
+    assert results == [True]
+    assert [event.title for event in event_manager.getAllEvents()] == ["Waited"]
+    other_manager.closeConnection()
@@ -0,0 +1,162 @@
+import datetime
+import threading
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+import scheduler
+from scheduler_core.reminders import ReminderQueue, currentMinute
+from PyQt5.QtCore import QDate, QTime
+from PyQt5.QtWidgets import QDialogButtonBox, QPushButton
+
+DAY = datetime.date(2026, 3, 2)
+
+
+@pytest.fixture
+def message_boxes(monkeypatch):
+    # Titles of the message boxes shown, answered Yes instead of waiting for a click
+    shown = []
+
+    def show(parent, title, *args, **kwargs):
+        shown.append(title)
+        return scheduler.QMessageBox.Yes
+    for kind in ("information", "warning", "critical"):
+        monkeypatch.setattr(scheduler.QMessageBox, kind, show)
+    return shown
+
+
+def test_calls_run_on_the_worker_and_resolve_on_the_gui_thread(event_manager, executor, wait_for):
+    event_manager.addEvent(DAY, "Dentist", None, datetime.time(9, 0), None)
+    threads = []
+    future = executor.submit("getEventPage", 1, False, None, 10)
+    future.add_done_callback(lambda future: threads.append(threading.get_ident()))
+    assert [row[2] for row in wait_for(future).result()] == ["Dentist"]
+    assert threads == [threading.get_ident()]
+    # Any callable runs there too, on the worker's own connection
+    worker_thread = wait_for(executor.submit(threading.get_ident)).result()
+    assert worker_thread != threading.get_ident()
+
+
+def test_actions_disable_their_widgets_until_done(qapp, executor, wait_for):
+    button = QPushButton()
+    results = []
+    future = executor.submit_action([button], results.append, "addEvent", DAY, "Dentist", None, None, None)
+    assert not button.isEnabled()
+    wait_for(future)
+    assert button.isEnabled() and results == [True]
+    # A call that raises is logged and answered with None
+    wait_for(executor.submit_action([button], results.append, "noSuchMethod"))
+    assert button.isEnabled() and results == [True, None]
+
+
+def test_cancelled_calls_never_run(event_manager, executor, wait_for):
+    blocker = threading.Event()
+    executor.submit(blocker.wait, 5)
+    cancelled = executor.submit("addEvent", DAY, "Never", None, None, None)
+    assert cancelled.cancel()
+    blocker.set()
+    wait_for(executor.submit("getAllEvents"))
+    assert event_manager.getEventPage(1, False, None, 10) == []
+
+
+def test_add_event_screen_saves_on_the_worker(event_manager, executor, wait_for, message_boxes):
+    screen = scheduler.AddEventScreen(event_manager, executor)
+    added = []
+    screen.event_added_signal.connect(lambda: added.append(True))
+    screen.eventNameField.setText("Dentist")
+    screen.eventDateField.setDate(QDate(DAY))
+    screen.eventTimeField.setTime(QTime(9, 0))
+    screen.add_event_button.click()
+    assert not screen.add_event_button.isEnabled()
+    wait_for(lambda: added)
+    assert screen.add_event_button.isEnabled()
+    assert [event.title for event in event_manager.getAllEvents()] == ["Dentist"]
+    assert message_boxes == ["Success"]
+    # The conflict check runs first; answering Yes saves the overlapping event anyway
+    screen.eventNameField.setText("Overlap")
+    screen.eventDateField.setDate(QDate(DAY))
+    screen.eventTimeField.setTime(QTime(9, 30))
+    screen.add_event_button.click()
+    wait_for(lambda: len(added) == 2)
+    assert message_boxes == ["Success", "Scheduling Conflict", "Success"]
+
+
+def test_edit_dialog_closes_once_the_update_is_saved(event_manager, executor, wait_for, message_boxes):
+    event_manager.addEvent(DAY, "Dentist", None, datetime.time(9, 0), None, 30)
+    event_id = event_manager.getAllEvents()[0].id
+    details = wait_for(executor.submit("getEventDetailsbyId", event_id)).result()
+    dialog = scheduler.EditEventMessageBox(executor, details)
+    dialog.eventTitle.setText("Dentist (moved)")
+    ok_button = dialog.button_box.button(QDialogButtonBox.StandardButton.Ok)
+    dialog.accept()
+    assert not ok_button.isEnabled()
+    wait_for(lambda: dialog.result() == scheduler.QDialog.DialogCode.Accepted)
+    assert ok_button.isEnabled()
+    assert event_manager.getEventDetailsbyId(event_id)[0].title == "Dentist (moved)"
+
+
+def test_find_time_dialog_searches_on_the_worker(event_manager, executor, wait_for):
+    tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+    event_manager.addEvent(tomorrow, "Busy", None, datetime.time(0, 0), None, 24 * 60 - 1)
+    dialog = scheduler.FindTimeDialog(event_manager, executor, 60, QDate(tomorrow))
+    for check_box in dialog.weekdayCheckBoxes:
+        check_box.setChecked(True)
+    dialog.search()
+    assert not dialog.search_button.isEnabled()
+    wait_for(dialog.search_button.isEnabled)
+    first_slot = dialog.slot_list.item(0).data(scheduler.Qt.UserRole)
+    assert first_slot.date() > tomorrow
+
+
+def test_reminder_scheduler_catches_up_on_the_worker(event_manager, executor, wait_for):
+    now = datetime.datetime.now()
+    soon = now + datetime.timedelta(minutes=5)
+    event_manager.addEvent(soon.date(), "Soon", None, soon.time().replace(second=0, microsecond=0), None, None, 10)
+    event_manager.setSetting(ReminderQueue.fired_until_setting, currentMinute(now) - 60)
+    reminder_scheduler = scheduler.ReminderScheduler(event_manager, executor)
+    delivered = []
+    reminder_scheduler.reminders_due.connect(delivered.extend)
+    wait_for(lambda: delivered)
+    assert [reminder['title'] for reminder in delivered] == ["Soon"]
+    reminder_scheduler.close()
+    wait_for(lambda: int(event_manager.getSetting(ReminderQueue.fired_until_setting)) > currentMinute(now))
+
+
+def test_export_runs_on_the_worker_and_can_be_cancelled(event_manager, executor, wait_for, tmp_path):
+    event_manager.importEventRows((DAY + datetime.timedelta(days=index % 365), f"Event {index}", None, None, None, None, None) for index in range(12000))
+    progress = []
+    executor.worker.export_progress.connect(progress.append)
+    cancel_event = threading.Event()
+    assert wait_for(executor.submit_export(str(tmp_path / "events.csv"), cancel_event)).result() == 12000
+    assert progress == [5000, 10000]
+    # Cancelling stops the export at its next progress report
+    cancel_event.set()
+    assert wait_for(executor.submit_export(str(tmp_path / "events.ics"), cancel_event)).result() == 5000
+
+
+def test_event_list_pages_load_on_the_worker(event_manager, executor, wait_for):
+    event_manager.addEvents([{"event_date": DAY.isoformat(), "title": f"Event {index:02d}"} for index in range(12)])
+    model = scheduler.EventTableModel(event_manager, executor)
+    model.page_size = 5
+    model.select()
+    # Nothing is read on the GUI thread: rows appear once the worker answers
+    assert model.rowCount() == 0
+    wait_for(lambda: model.rowCount() == 5)
+    while model.rowCount() < 12:
+        model.fetchMore()
+        wait_for(lambda: not model.pending_pages)
+    assert [model.index(row, 2).data() for row in range(12)] == [f"Event {index:02d}" for index in range(12)]
+
+
+def test_pages_requested_before_a_reset_are_dropped(event_manager, executor, wait_for):
+    event_manager.addEvent(DAY, "Dentist", None, None, None)
+    event_manager.addEvent(DAY + datetime.timedelta(days=1), "Gym", None, None, None)
+    model = scheduler.EventTableModel(event_manager, executor)
+    model.select()
+    stale_future = model.pending_pages[0]
+    model.setFilter(*event_manager.dateFilter("=", DAY))
+    model.select()
+    wait_for(stale_future)
+    wait_for(lambda: not model.pending_pages)
+    assert [model.index(row, 2).data() for row in range(model.rowCount())] == ["Dentist"]
@@ -0,0 +1,43 @@
+import datetime
+
+DAY = datetime.date(2026, 3, 2)
+
+
+def test_summaries_count_events_and_keep_colors_in_insertion_order(event_manager):
+    event_manager.addEvent(DAY, "Dentist", None, None, "#ff0000")
+    event_manager.addEvent(DAY, "Call", None, None, None)
+    event_manager.addEvent(DAY, "Gym", None, None, "#00ff00")
+    event_manager.addEvent(DAY + datetime.timedelta(days=1), "Holiday", None, None, "#0000ff")
+    assert event_manager.getEventDateSummaries(DAY, DAY + datetime.timedelta(days=1)) == {
+        "2026-03-02": {'count': 3, 'colors': ["#ff0000", "#00ff00"]},
+        "2026-03-03": {'count': 1, 'colors': ["#0000ff"]},
+    }
+
+
+def test_summaries_cover_only_the_range(event_manager):
+    for day in range(5):
+        event_manager.addEvent(DAY + datetime.timedelta(days=day), f"Day {day}", None, None, None)
+    summaries = event_manager.getEventDateSummaries(DAY + datetime.timedelta(days=1), DAY + datetime.timedelta(days=3))
+    assert sorted(summaries) == ["2026-03-03", "2026-03-04", "2026-03-05"]
+    assert event_manager.getEventDateSummaries(DAY - datetime.timedelta(days=7), DAY - datetime.timedelta(days=1)) == {}
+
+
+def test_colors_are_capped_but_every_event_is_counted(event_manager):
+    event_manager.addEvents([{"event_date": DAY.isoformat(), "title": f"Event {index}", "event_color": f"#0000{index:02x}"} for index in range(8)])
+    summary = event_manager.getEventDateSummaries(DAY, DAY, max_colors=3)["2026-03-02"]
+    assert summary == {'count': 8, 'colors': ["#000000", "#000001", "#000002"]}
+
+
+def test_summaries_follow_updates_and_deletes(event_manager):
+    event_manager.addEvent(DAY, "Dentist", None, None, "#ff0000")
+    event_id = event_manager.getAllEvents()[0].id
+    event_manager.updateEvents([{"event_id": event_id, "event_date": DAY + datetime.timedelta(days=1), "event_color": "#00ff00"}])
+    assert event_manager.getEventDateSummaries(DAY, DAY + datetime.timedelta(days=1)) == {"2026-03-03": {'count': 1, 'colors': ["#00ff00"]}}
+    event_manager.deleteEvent(event_id)
+    assert event_manager.getEventDateSummaries(DAY, DAY + datetime.timedelta(days=1)) == {}
+
+
+def test_distinct_event_dates(event_manager):
+    for day in (3, 1, 3, 2):
+        event_manager.addEvent(datetime.date(2026, 3, day), "Event", None, None, None)
+    assert event_manager.getAllEventDates() == [datetime.date(2026, 3, day) for day in (1, 2, 3)]
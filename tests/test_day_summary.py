@@ -0,0 +1,84 @@
+import datetime
+import random
+
+from scheduler_core.event_manager import UNIX_EPOCH
+from scheduler_core.schema import DAY_SUMMARY_MAX_COLORS
+
+FIRST_DAY = datetime.date(2026, 3, 1)
+DAYS = 6
+COLORS = ["#ff0000", "#00ff00", "#0000ff", None]
+
+
+def expected_summaries(event_manager):
+    # day_summary recomputed from the events themselves: counts, the first colors by id, and
+    # whether an overlap begins on the day (a timed event starting while another is running)
+    events = sorted(event_manager.getAllEvents(), key=lambda event: event.id)
+    summaries = {}
+    for event in events:
+        summary = summaries.setdefault(event.event_date.isoformat(), {'count': 0, 'colors': []})
+        summary['count'] += 1
+        if event.event_color is not None and len(summary['colors']) < DAY_SUMMARY_MAX_COLORS:
+            summary['colors'].append(event.event_color)
+    intervals = [
+        (event.id, *event_manager.eventInterval(event.event_date, event.event_time, event.duration_minutes))
+        for event in events if event.event_time is not None
+    ]
+    for later_id, later_start, _ in intervals:
+        if any(earlier_id != later_id and earlier_start <= later_start < earlier_end for earlier_id, earlier_start, earlier_end in intervals):
+            day = (UNIX_EPOCH + datetime.timedelta(minutes=later_start)).date().isoformat()
+            if day in summaries:
+                summaries[day]['conflict'] = True
+    return summaries
+
+
+def random_event(rng):
+    return {
+        "event_date": (FIRST_DAY + datetime.timedelta(days=rng.randrange(DAYS))).isoformat(),
+        "event_time": rng.choice([None, "08:00:00", "09:30:00", "10:00:00", "23:00:00"]),
+        "event_color": rng.choice(COLORS),
+        "duration_minutes": rng.choice([None, 15, 30, 90, 8 * 60]),
+    }
+
+
+def test_triggers_match_recomputed_summaries(event_manager):
+    rng = random.Random(17)
+    # Wide enough for everything rescheduling can move events to
+    range_start, range_end = FIRST_DAY - datetime.timedelta(days=400), FIRST_DAY + datetime.timedelta(days=400)
+    for step in range(300):
+        event_ids = [event.id for event in event_manager.getAllEvents()]
+        action = rng.random()
+        if action < 0.5 or not event_ids:
+            event = random_event(rng)
+            event_manager.addEvent(event["event_date"], f"Event {step}", None, event["event_time"], event["event_color"], event["duration_minutes"])
+        elif action < 0.8:
+            changes = {field: value for field, value in random_event(rng).items() if rng.random() < 0.5}
+            event_manager.updateEvents([{**changes, "event_id": rng.choice(event_ids)}])
+        elif action < 0.9:
+            event_manager.rescheduleEvents(rng.sample(event_ids, min(3, len(event_ids))), rng.choice([-1, 1]))
+        else:
+            event_manager.deleteEvent(rng.choice(event_ids))
+        if step % 25 == 0:
+            assert event_manager.getEventDateSummaries(range_start, range_end) == expected_summaries(event_manager)
+    assert event_manager.getEventDateSummaries(range_start, range_end) == expected_summaries(event_manager)
+
+
+def test_colors_are_capped_and_refilled(event_manager):
+    for index in range(DAY_SUMMARY_MAX_COLORS + 3):
+        event_manager.addEvent(FIRST_DAY, f"Event {index}", None, None, f"#0000{index:02x}")
+    summary = event_manager.getEventDateSummaries(FIRST_DAY, FIRST_DAY)[FIRST_DAY.isoformat()]
+    assert summary['count'] == DAY_SUMMARY_MAX_COLORS + 3
+    assert summary['colors'] == [f"#0000{index:02x}" for index in range(DAY_SUMMARY_MAX_COLORS)]
+    first_id = min(event.id for event in event_manager.getAllEvents())
+    event_manager.deleteEvent(first_id)
+    summary = event_manager.getEventDateSummaries(FIRST_DAY, FIRST_DAY)[FIRST_DAY.isoformat()]
+    assert summary['colors'] == [f"#0000{index:02x}" for index in range(1, DAY_SUMMARY_MAX_COLORS + 1)]
+    assert event_manager.getEventDateSummaries(FIRST_DAY, FIRST_DAY, max_colors=2)[FIRST_DAY.isoformat()]['colors'] == ["#000001", "#000002"]
+
+
+def test_title_edits_leave_day_summary_alone(event_manager):
+    event_manager.addEvent(FIRST_DAY, "Standup", None, "09:00:00", "#ff0000", 30)
+    event_id = event_manager.getAllEvents()[0].id
+    before = event_manager.execQuery("SELECT * FROM day_summary", fetch=True)
+    event_manager.updateEvents([{"event_id": event_id, "title": "Daily standup"}])
+    assert event_manager.execQuery("SELECT * FROM day_summary", fetch=True) == before
+    assert event_manager.getEventsForDate(FIRST_DAY)[0].title == "Daily standup"
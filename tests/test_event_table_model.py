@@ -0,0 +1,75 @@
+import datetime
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+import scheduler
+from PyQt5.QtCore import Qt
+
+DAY = datetime.date(2026, 3, 2)
+EVENT_COUNT = 23
+
+
+@pytest.fixture
+def model(event_manager, qapp):
+    event_manager.addEvents([
+        {"event_date": (DAY + datetime.timedelta(days=index % 4)).isoformat(), "title": f"Event {index:02d}", "event_color": "#ff0000" if index % 2 else None}
+        for index in range(EVENT_COUNT)
+    ])
+    model = scheduler.EventTableModel(event_manager)
+    model.page_size = 5
+    model.max_cached_pages = 2
+    model.select()
+    return model
+
+
+def fetch_all(model):
+    while model.canFetchMore():
+        model.fetchMore()
+
+
+def column(model, column_number):
+    return [model.index(row, column_number).data() for row in range(model.rowCount())]
+
+
+def test_rows_arrive_a_page_at_a_time(model):
+    assert model.rowCount() == 5
+    model.fetchMore()
+    assert model.rowCount() == 10
+    fetch_all(model)
+    assert model.rowCount() == EVENT_COUNT
+    assert column(model, 2) == [f"Event {index:02d}" for index in range(EVENT_COUNT)]
+
+
+def test_evicted_pages_are_read_again_unchanged(event_manager, model):
+    fetch_all(model)
+    assert len(model.pages) == 2
+    first_pass = column(model, 2)
+    misses_before = event_manager.instrumentation.snapshot()['counters']["event_page_cache.misses"]
+    assert column(model, 2) == first_pass
+    # Every page was evicted before it was read again, so each page is one miss
+    assert event_manager.instrumentation.snapshot()['counters']["event_page_cache.misses"] - misses_before == 5
+
+
+def test_sorting_reorders_by_the_column_then_id(model):
+    model.sort(1, Qt.DescendingOrder)
+    fetch_all(model)
+    dates = column(model, 1)
+    assert dates == sorted(dates, reverse=True)
+    assert column(model, 2)[:3] == ["Event 19", "Event 15", "Event 11"]
+
+
+def test_filter_narrows_the_rows(event_manager, model):
+    model.setFilter(*event_manager.dateFilter("=", DAY))
+    model.select()
+    fetch_all(model)
+    assert column(model, 2) == [f"Event {index:02d}" for index in range(0, EVENT_COUNT, 4)]
+
+
+def test_event_ids_of_rows_in_evicted_pages(event_manager, model):
+    fetch_all(model)
+    event_ids = []
+    model.requestEventIds([0, 12, 22], event_ids.extend)
+    expected = [row[0] for row in event_manager.getEventPage(0, False, None, EVENT_COUNT)]
+    assert event_ids == [expected[0], expected[12], expected[22]]
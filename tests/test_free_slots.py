@@ -0,0 +1,45 @@
+import datetime
+
+from scheduler_core.free_slots import FreeSlotFinder
+
+MONDAY = datetime.date(2026, 3, 2)
+
+
+def at(day, hour, minute=0):
+    return datetime.datetime.combine(day, datetime.time(hour, minute))
+
+
+def test_empty_calendar_fills_working_hours(event_manager):
+    slots = FreeSlotFinder(event_manager).findFreeSlots(60, MONDAY, MONDAY + datetime.timedelta(days=7), count=3)
+    assert slots == [(at(MONDAY, 9), at(MONDAY, 10)), (at(MONDAY, 10), at(MONDAY, 11)), (at(MONDAY, 11), at(MONDAY, 12))]
+
+
+def test_skips_busy_time_and_aligns(event_manager):
+    event_manager.addEvent(MONDAY, "Standup", None, datetime.time(9, 0), None, 20)
+    event_manager.addEvent(MONDAY, "Long meeting", None, datetime.time(10, 0), None, 6 * 60)
+    slots = FreeSlotFinder(event_manager).findFreeSlots(30, MONDAY, MONDAY + datetime.timedelta(days=7), count=3)
+    # 09:20 is rounded up to 09:30; 09:30-10:00 fits once; the rest of Monday is taken
+    assert slots == [(at(MONDAY, 9, 30), at(MONDAY, 10)), (at(MONDAY, 16), at(MONDAY, 16, 30)), (at(MONDAY, 16, 30), at(MONDAY, 17))]
+
+
+def test_weekday_hours_and_window_start(event_manager):
+    weekday_hours = {5: None, 6: None, 0: (datetime.time(13, 0), datetime.time(14, 0))}
+    saturday = MONDAY + datetime.timedelta(days=5)
+    slots = FreeSlotFinder(event_manager).findFreeSlots(60, at(saturday, 0), saturday + datetime.timedelta(days=14), weekday_hours=weekday_hours, count=2)
+    next_monday, next_tuesday = MONDAY + datetime.timedelta(days=7), MONDAY + datetime.timedelta(days=8)
+    assert slots == [(at(next_monday, 13), at(next_monday, 14)), (at(next_tuesday, 9), at(next_tuesday, 10))]
+
+
+def test_recurring_occurrences_are_busy(event_manager):
+    event_manager.addEventSeries(MONDAY, "Focus", None, datetime.time(9, 0), None, "FREQ=DAILY", 3 * 60)
+    slots = FreeSlotFinder(event_manager).findFreeSlots(60, MONDAY, MONDAY + datetime.timedelta(days=1), count=1)
+    assert slots == [(at(MONDAY, 12), at(MONDAY, 13))]
+
+
+def test_search_spans_chunks(event_manager):
+    # Every working day of the first three weeks is full, so the search reads several chunks
+    for day in range(21):
+        event_manager.addEvent(MONDAY + datetime.timedelta(days=day), "Busy", None, datetime.time(9, 0), None, 8 * 60)
+    slots = FreeSlotFinder(event_manager).findFreeSlots(60, MONDAY, MONDAY + datetime.timedelta(days=60), count=1)
+    assert slots == [(at(MONDAY + datetime.timedelta(days=21), 9), at(MONDAY + datetime.timedelta(days=21), 10))]
+    assert FreeSlotFinder(event_manager).findFreeSlots(60, MONDAY, MONDAY + datetime.timedelta(days=21)) == []
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import scheduler_core
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules(statement):
+    # Names of the modules loaded once statement has run in a fresh interpreter
+    script = f"import sys\n{statement}\nprint(*sorted(sys.modules))"
+    output = subprocess.run([sys.executable, "-c", script], cwd=REPOSITORY_ROOT, capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+
+def test_importing_the_core_loads_neither_qt_nor_the_store():
+    modules = loaded_modules("import scheduler_core")
+    assert not any(module.split(".")[0] == "PyQt5" for module in modules)
+    assert "scheduler_core.event_manager" not in modules and "scheduler_core.transfer" not in modules
+
+
+def test_the_store_works_without_qt():
+    modules = loaded_modules(
+        "from scheduler_core import EventManager, EventFileTransfer\n"
+        "import datetime\n"
+        "manager = EventManager(':memory:')\n"
+        "assert manager.addEvent(datetime.date(2026, 3, 2), 'Dentist', None, None, None)"
+    )
+    assert "scheduler_core.event_manager" in modules
+    assert not any(module.split(".")[0] == "PyQt5" for module in modules)
+
+
+def test_lazy_exports_resolve_to_their_modules():
+    from scheduler_core.event_manager import EventManager
+    from scheduler_core.transfer import EventFileTransfer
+    assert scheduler_core.EventManager is EventManager
+    assert scheduler_core.EventFileTransfer is EventFileTransfer
+    assert set(scheduler_core.__all__) >= {"EventManager", "EventFileTransfer", "RecurrenceRule", "SCHEMA_MIGRATIONS"}
+    with pytest.raises(AttributeError):
+        scheduler_core.NoSuchThing
@@ -0,0 +1,30 @@
+import datetime
+
+import pytest
+
+from scheduler_core.event_manager import EVENT_SORT_EXPRESSIONS
+
+
+def plan_text(event_manager, sql, parameters=()):
+    return "\n".join(event_manager.explainQueryPlan(sql, parameters))
+
+
+def test_event_indexes_exist(event_manager):
+    indexes = {name for (name,) in event_manager.execQuery("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'events'", fetch=True)}
+    assert {"idx_events_date", "idx_events_date_time", "idx_events_title"} <= indexes
+
+
+def test_date_lookups_use_an_index(event_manager):
+    event_manager.addEvent(datetime.date(2026, 3, 2), "Dentist", None, None, None)
+    plan = plan_text(event_manager, "SELECT id FROM events WHERE event_date = ?", ("2026-03-02",))
+    assert "USING" in plan and "idx_events_date" in plan
+    plan = plan_text(event_manager, "SELECT id FROM events WHERE event_date BETWEEN ? AND ?", ("2026-03-01", "2026-03-31"))
+    assert "SCAN events" not in plan
+
+
+@pytest.mark.parametrize("sort_column", [1, 2])
+def test_sorted_pages_are_read_in_index_order(event_manager, sort_column):
+    # Date and title pages walk an index instead of sorting the whole table
+    sort_expression = EVENT_SORT_EXPRESSIONS[sort_column]
+    plan = plan_text(event_manager, f"SELECT events.id FROM events ORDER BY {sort_expression}, events.id LIMIT 10")
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
@@ -0,0 +1,52 @@
+import datetime
+import logging
+
+from scheduler_core.event_manager import EventManager
+from scheduler_core.instrumentation import Instrumentation, NullInstrumentation
+
+DAY = datetime.date(2026, 3, 2)
+
+
+def test_statements_of_the_same_shape_share_a_histogram():
+    instrumentation = Instrumentation()
+    instrumentation.recordQuery("SELECT 1\n    FROM events", 0.2, 3)
+    instrumentation.recordQuery("SELECT 1 FROM   events", 3.0, 4)
+    instrumentation.recordQuery("SELECT 2", 0.05)
+    snapshot = instrumentation.snapshot()
+    summary = snapshot['queries']["SELECT 1 FROM events"]
+    assert (summary['count'], summary['rows'], summary['max_ms']) == (2, 7, 3.0)
+    assert summary['p50_ms'] == 0.25 and summary['p95_ms'] == 3.0
+    assert snapshot['all_queries']['count'] == 3
+
+
+def test_slow_queries_are_logged_with_their_plan(tmp_path, caplog):
+    event_manager = EventManager(str(tmp_path / "events.db"), instrumentation=Instrumentation(slow_query_ms=0))
+    event_manager.addEvent(DAY, "Dentist", None, None, None)
+    with caplog.at_level(logging.WARNING, logger="scheduler_core.instrumentation"):
+        event_manager.getEventsForDate(DAY)
+    slow_query = event_manager.instrumentation.snapshot()['slow_queries'][-1]
+    assert "WHERE events.event_date = :date" in slow_query['sql'] and slow_query['rows'] == 1
+    assert any("idx_events_date" in line for line in slow_query['plan'])
+    assert "Slow query" in caplog.text
+    event_manager.closeConnection()
+
+
+def test_counters_and_cache_hit_rates():
+    instrumentation = Instrumentation()
+    assert instrumentation.cacheHitRate("page_cache") is None
+    for hit in (True, True, True, False):
+        instrumentation.recordCacheLookup("page_cache", hit)
+    instrumentation.increment("paint", 5)
+    assert instrumentation.cacheHitRate("page_cache") == 0.75
+    assert instrumentation.snapshot()['counters'] == {"page_cache.hits": 3, "page_cache.misses": 1, "paint": 5}
+    instrumentation.reset()
+    assert instrumentation.snapshot()['counters'] == {}
+
+
+def test_null_instrumentation_records_nothing(tmp_path):
+    event_manager = EventManager(str(tmp_path / "events.db"), instrumentation=NullInstrumentation())
+    event_manager.addEvent(DAY, "Dentist", None, None, None)
+    assert [event.title for event in event_manager.getEventsForDate(DAY)] == ["Dentist"]
+    snapshot = event_manager.instrumentation.snapshot()
+    assert snapshot['queries'] == {} and snapshot['counters'] == {}
+    event_manager.closeConnection()
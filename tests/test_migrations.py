@@ -0,0 +1,67 @@
+import datetime
+import sqlite3
+
+from scheduler_core.event_manager import EventManager
+from scheduler_core.schema import SCHEMA_MIGRATIONS
+
+
+def test_new_database_is_at_latest_version(event_manager):
+    assert event_manager.schemaVersion() == len(SCHEMA_MIGRATIONS)
+    tables = {name for (name,) in event_manager.execQuery("SELECT name FROM sqlite_master WHERE type = 'table'", fetch=True)}
+    assert {"events", "events_fts", "event_series", "events_rtree", "day_summary", "event_reminders", "calendars"} <= tables
+
+
+def test_reopening_runs_nothing(tmp_path):
+    path = str(tmp_path / "events.db")
+    EventManager(path).closeConnection()
+    event_manager = EventManager(path)
+    assert event_manager.migrateSchema()
+    assert event_manager.schemaVersion() == len(SCHEMA_MIGRATIONS)
+    event_manager.closeConnection()
+
+
+def test_pre_versioning_database_is_upgraded_and_backfilled(tmp_path):
+    # The original app's table, unversioned, with events already in it
+    path = str(tmp_path / "events.db")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE events (id INTEGER PRIMARY KEY AUTOINCREMENT, event_date TEXT NOT NULL, title TEXT NOT NULL, description TEXT, event_time TEXT, event_color TEXT)")
+    db.executemany("INSERT INTO events (event_date, title, description, event_time, event_color) VALUES (?, ?, ?, ?, ?)", [
+        ("2026-03-02", "Dentist", "Bring forms", "09:00:00", "#ff0000"),
+        ("2026-03-02", "Call", None, "09:30:00", None),
+        ("2026-03-03", "Holiday", None, None, "#00ff00"),
+    ])
+    db.commit()
+    db.close()
+
+    event_manager = EventManager(path)
+    assert event_manager.schemaVersion() == len(SCHEMA_MIGRATIONS)
+    assert [event.title for event in event_manager.getAllEvents()] == ["Dentist", "Call", "Holiday"]
+    # Every derived index covers the existing rows
+    assert [row[2] for row in event_manager.getEventPage(0, False, None, 10, match_expression=event_manager.ftsMatchExpression("forms"))] == ["Dentist"]
+    assert event_manager.getEventDateSummaries(datetime.date(2026, 3, 1), datetime.date(2026, 3, 31)) == {
+        "2026-03-02": {'count': 2, 'colors': ["#ff0000"], 'conflict': True},
+        "2026-03-03": {'count': 1, 'colors': ["#00ff00"]},
+    }
+    assert [conflict['title'] for conflict in event_manager.findConflicts(datetime.date(2026, 3, 2), datetime.time(9, 45), 30)] == ["Dentist", "Call"]
+    event_manager.closeConnection()
+
+
+def test_newer_database_is_left_alone(tmp_path):
+    path = str(tmp_path / "events.db")
+    db = sqlite3.connect(path)
+    db.execute(f"PRAGMA user_version = {len(SCHEMA_MIGRATIONS) + 1}")
+    db.close()
+    event_manager = EventManager(path)
+    assert not event_manager.migrateSchema()
+    assert event_manager.schemaVersion() == len(SCHEMA_MIGRATIONS) + 1
+    event_manager.closeConnection()
+
+
+def test_failed_step_keeps_last_good_version(tmp_path, monkeypatch):
+    path = str(tmp_path / "events.db")
+    broken = list(SCHEMA_MIGRATIONS) + [["CREATE TABLE extra (id INTEGER)", "THIS IS NOT SQL"]]
+    monkeypatch.setattr("scheduler_core.event_manager.SCHEMA_MIGRATIONS", broken)
+    event_manager = EventManager(path)
+    assert event_manager.schemaVersion() == len(SCHEMA_MIGRATIONS)
+    assert not event_manager.execQuery("SELECT name FROM sqlite_master WHERE name = 'extra'", fetch=True)
+    event_manager.closeConnection()
@@ -0,0 +1,45 @@
+import datetime
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+import scheduler
+
+
+def query_count(event_manager):
+    return event_manager.instrumentation.snapshot()['all_queries']['count']
+
+
+@pytest.fixture
+def calendar(event_manager, qapp):
+    for month in (1, 2, 3, 4, 5):
+        event_manager.addEvent(datetime.date(2026, month, 10), f"Month {month}", None, None, "#ff0000")
+    calendar = scheduler.MainSchedulingCalendar(event_manager)
+    calendar.setCurrentPage(2026, 3)
+    yield calendar
+    calendar.deleteLater()
+
+
+def test_cache_covers_the_visible_month_and_its_neighbours(calendar):
+    assert sorted(calendar.event_summaries_by_date) == ["2026-02-10", "2026-03-10", "2026-04-10"]
+    calendar.setCurrentPage(2026, 4)
+    assert sorted(calendar.event_summaries_by_date) == ["2026-03-10", "2026-04-10", "2026-05-10"]
+
+
+def test_painting_reads_nothing_from_the_database(event_manager, calendar):
+    queries_before = query_count(event_manager)
+    paint_calls_before = event_manager.instrumentation.snapshot()['counters'].get("calendar.paint_cell", 0)
+    calendar.resize(400, 300)
+    calendar.grab()
+    assert event_manager.instrumentation.snapshot()['counters']["calendar.paint_cell"] > paint_calls_before
+    assert query_count(event_manager) == queries_before
+
+
+def test_month_loads_on_the_worker(event_manager, executor, wait_for):
+    event_manager.addEvent(datetime.date(2026, 3, 10), "Dentist", None, None, "#ff0000")
+    calendar = scheduler.MainSchedulingCalendar(event_manager, executor)
+    calendar.setCurrentPage(2026, 3)
+    wait_for(lambda: calendar.pending_summaries_future is None)
+    assert calendar.event_summaries_by_date == {"2026-03-10": {'count': 1, 'colors': ["#ff0000"]}}
+    calendar.deleteLater()
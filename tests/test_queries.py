@@ -0,0 +1,71 @@
+import datetime
+
+import pytest
+
+from scheduler_core.event_manager import EVENT_COLUMNS, RELEVANCE_SORT_COLUMN
+
+TRICKY_TEXT = ["O'Brien", "'); DROP TABLE events; --", 'say "hi"', "100% _done_", "NEAR(a b) OR c*", "émigré"]
+
+
+def test_values_round_trip_unchanged(event_manager):
+    for index, text in enumerate(TRICKY_TEXT):
+        event_manager.addEvent(datetime.date(2026, 3, 1 + index), text, text, None, None)
+    assert [(event.title, event.description) for event in event_manager.getAllEvents()] == [(text, text) for text in TRICKY_TEXT]
+
+
+@pytest.mark.parametrize("search_text", TRICKY_TEXT + ["", "***", "-"])
+def test_search_text_is_never_fts_syntax(event_manager, search_text):
+    for index, text in enumerate(TRICKY_TEXT):
+        event_manager.addEvent(datetime.date(2026, 3, 1 + index), text, None, None, None)
+    match_expression = event_manager.ftsMatchExpression(search_text)
+    rows = event_manager.getEventPage(RELEVANCE_SORT_COLUMN, False, None, 50, match_expression=match_expression)
+    assert rows is not None
+    if match_expression is None:
+        assert len(rows) == len(TRICKY_TEXT)
+    else:
+        assert search_text in [row[2] for row in rows]
+
+
+def test_statements_are_reused_across_values(event_manager):
+    # Values are bound, so the same query with other values is the same statement
+    for day in range(1, 6):
+        event_manager.getEventsForDate(datetime.date(2026, 3, day))
+    statements = [sql for sql in event_manager.instrumentation.snapshot()['queries'] if "WHERE events.event_date = :date" in sql]
+    assert len(statements) == 1
+
+
+def test_date_filter(event_manager):
+    for day in (1, 2, 3):
+        event_manager.addEvent(datetime.date(2026, 3, day), f"Day {day}", None, None, None)
+    for comparison, expected in (("=", ["Day 2"]), (">", ["Day 3"]), ("<", ["Day 1"])):
+        filter_clause, filter_values = event_manager.dateFilter(comparison, datetime.date(2026, 3, 2))
+        assert [row[2] for row in event_manager.getEventPage(1, False, None, 10, filter_clause, filter_values)] == expected
+    with pytest.raises(ValueError):
+        event_manager.dateFilter("; DELETE", datetime.date(2026, 3, 2))
+
+
+@pytest.mark.parametrize("sort_column", range(len(EVENT_COLUMNS)))
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_pages_cover_every_row_once(event_manager, sort_column, descending):
+    # Many rows share sort keys (and nullable ones are NULL), so pages resume on (sort key, id)
+    event_manager.addEvents([
+        {
+            "event_date": f"2026-03-{1 + index % 3:02d}",
+            "title": f"Event {index % 4}",
+            "description": None if index % 2 else "notes",
+            "event_time": None if index % 3 else "09:00:00",
+            "event_color": None if index % 5 else "#ff0000",
+            "duration_minutes": None if index % 2 else 30,
+        }
+        for index in range(37)
+    ])
+    everything = event_manager.getEventPage(sort_column, descending, None, 100)
+    pages, after_key = [], None
+    while True:
+        page = event_manager.getEventPage(sort_column, descending, after_key, 5)
+        pages.extend(page)
+        if len(page) < 5:
+            break
+        after_key = (page[-1][-1], page[-1][0])
+    assert pages == everything
+    assert len({row[0] for row in pages}) == 37
@@ -0,0 +1,76 @@
+import datetime
+
+import pytest
+
+from scheduler_core.records import EVENT_RECORD_FIELDS, EventBatch, EventRecord, packColor, unpackColor
+
+ROWS = [
+    (1, "2026-03-02", "Standup", "Daily", "09:00:00", "#ff8800", 15, 10),
+    (2, "2026-03-02", "Holiday", None, None, None, None, None),
+    (3, "not a date", "Broken", None, "25:99", "red", 0, 0),
+    (4, "1969-12-31", "Old", "Daily", "23:59:59", "#FF8800", 30, None),
+    (5, "2026-03-03", "Translucent", None, "", "#80ff8800", None, 5),
+]
+
+
+def record_from_row(row):
+    event_id, event_date, title, description, event_time, event_color, duration_minutes, reminder_minutes = row
+    try:
+        event_date = datetime.date.fromisoformat(event_date)
+    except ValueError:
+        event_date = None
+    try:
+        event_time = datetime.time.fromisoformat(event_time) if event_time else None
+    except ValueError:
+        event_time = None
+    return EventRecord(event_id, event_date, title, description, event_time, event_color, duration_minutes, reminder_minutes)
+
+
+def test_color_packing():
+    assert unpackColor(packColor("#ff8800")) == "#ff8800"
+    assert unpackColor(packColor("#80ff8800")) == "#80ff8800"
+    assert packColor("#ff8800") == 0xFFFF8800
+    for not_a_color in (None, "", "red", "#fff", "#gg0000"):
+        assert packColor(not_a_color) is None
+    assert unpackColor(0) is None
+
+
+def test_batch_rows_match_records():
+    batch = EventBatch.fromRows(ROWS)
+    assert len(batch) == len(ROWS)
+    assert list(batch) == [record_from_row(row) for row in ROWS]
+    # Colors the packed form would change are kept as written
+    assert batch[2].event_color == "red"
+    assert batch[3].event_color == "#FF8800"
+    assert batch[-1] == batch[4]
+    assert batch[1:3] == [batch[1], batch[2]]
+    with pytest.raises(IndexError):
+        batch[len(ROWS)]
+
+
+def test_batch_shares_repeated_strings():
+    batch = EventBatch.fromRows([(index, "2026-03-02", "Same title", "Same notes", None, None, None, None) for index in range(3)])
+    assert batch.titles[0] is batch.titles[2]
+    assert batch.ids.typecode == "q" and list(batch.ids) == [0, 1, 2]
+
+
+def test_record_access():
+    record = record_from_row(ROWS[0])
+    assert record["title"] == record.title == "Standup"
+    assert record.get("missing", "default") == "default"
+    assert list(record.toDict()) == list(EVENT_RECORD_FIELDS)
+    with pytest.raises(KeyError):
+        record["missing"]
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+
+def test_manager_reads_return_records(event_manager):
+    event_manager.addEvent(datetime.date(2026, 3, 2), "Standup", "Daily", datetime.time(9, 0), "#ff8800", 15, 10)
+    event_manager.addEvent(datetime.date(2026, 3, 2), "Holiday", None, None, None)
+    records = event_manager.getEventsForDate(datetime.date(2026, 3, 2))
+    assert all(isinstance(record, EventRecord) for record in records)
+    assert list(event_manager.getAllEvents()) == records
+    assert event_manager.getEventDetailsbyId(records[0].id) == [records[0]]
+    assert records[0].event_time == datetime.time(9, 0) and records[1].event_time is None
+    assert [batch_records for batch in event_manager.iterEvents(batch_size=1) for batch_records in batch] == records
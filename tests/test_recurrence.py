@@ -0,0 +1,85 @@
+import datetime
+
+import pytest
+
+from scheduler_core.recurrence import RecurrenceRule
+
+START = datetime.date(2026, 1, 5)  # a Monday
+
+
+def occurrences(rrule_text, window_start, window_end, start_date=START, exceptions=()):
+    return list(RecurrenceRule.parse(rrule_text).occurrences(start_date, window_start, window_end, exceptions))
+
+
+def test_parse_round_trip():
+    text = "FREQ=MONTHLY;INTERVAL=2;BYDAY=2TU,-1FR;UNTIL=20261231"
+    rule = RecurrenceRule.parse(text)
+    assert rule.by_day == ((2, 1), (-1, 4))
+    assert rule.until == datetime.date(2026, 12, 31)
+    assert RecurrenceRule.parse(rule.toString()).toString() == text
+
+
+def test_unsupported_frequency():
+    with pytest.raises(ValueError):
+        RecurrenceRule.parse("FREQ=YEARLY")
+
+
+def test_daily_interval():
+    assert occurrences("FREQ=DAILY;INTERVAL=3", START, START + datetime.timedelta(days=10)) == [
+        START, START + datetime.timedelta(days=3), START + datetime.timedelta(days=6), START + datetime.timedelta(days=9)
+    ]
+
+
+def test_weekly_by_day():
+    assert occurrences("FREQ=WEEKLY;BYDAY=MO,WE", START, datetime.date(2026, 1, 18)) == [
+        datetime.date(2026, 1, 5), datetime.date(2026, 1, 7), datetime.date(2026, 1, 12), datetime.date(2026, 1, 14)
+    ]
+
+
+def test_monthly_ordinal_weekdays():
+    assert occurrences("FREQ=MONTHLY;BYDAY=-1FR", START, datetime.date(2026, 3, 31)) == [
+        datetime.date(2026, 1, 30), datetime.date(2026, 2, 27), datetime.date(2026, 3, 27)
+    ]
+
+
+def test_monthly_day_skips_short_months():
+    start_date = datetime.date(2026, 1, 31)
+    assert occurrences("FREQ=MONTHLY", start_date, datetime.date(2026, 5, 31), start_date) == [
+        datetime.date(2026, 1, 31), datetime.date(2026, 3, 31), datetime.date(2026, 5, 31)
+    ]
+
+
+def test_window_far_from_start():
+    # Open-ended rules start at the window's period instead of walking from the start
+    window_start = datetime.date(2126, 1, 1)
+    dates = occurrences("FREQ=DAILY", window_start, window_start + datetime.timedelta(days=2))
+    assert dates == [window_start + datetime.timedelta(days=day) for day in range(3)]
+
+
+def test_count_includes_exceptions_and_earlier_occurrences():
+    # COUNT=5 is five occurrences from the start, wherever the window and exceptions fall
+    window_start = START + datetime.timedelta(days=2)
+    dates = occurrences("FREQ=DAILY;COUNT=5", window_start, START + datetime.timedelta(days=30), exceptions={START + datetime.timedelta(days=3)})
+    assert dates == [START + datetime.timedelta(days=2), START + datetime.timedelta(days=4)]
+
+
+def test_until_is_inclusive():
+    dates = occurrences("FREQ=WEEKLY;UNTIL=20260119", START, datetime.date(2026, 3, 1))
+    assert dates == [datetime.date(2026, 1, 5), datetime.date(2026, 1, 12), datetime.date(2026, 1, 19)]
+
+
+def test_last_occurrence():
+    assert RecurrenceRule.parse("FREQ=WEEKLY;BYDAY=MO,FR;COUNT=3").lastOccurrence(START) == datetime.date(2026, 1, 12)
+    assert RecurrenceRule.parse("FREQ=DAILY").lastOccurrence(START) is None
+
+
+def test_series_occurrences_in_window(event_manager):
+    event_manager.addEventSeries(START, "Standup", None, datetime.time(9, 0), "#00ff00", "FREQ=WEEKLY;BYDAY=MO,TH")
+    series_id = event_manager.getEventSeries()[0]['id']
+    event_manager.addSeriesException(series_id, datetime.date(2026, 1, 8))
+    dates = [occurrence['event_date'] for occurrence in event_manager.getSeriesOccurrences(datetime.date(2026, 1, 1), datetime.date(2026, 1, 15))]
+    assert dates == ["2026-01-05", "2026-01-12", "2026-01-15"]
+    # Summaries and the calendar count expanded occurrences too
+    assert event_manager.getEventDateSummaries(datetime.date(2026, 1, 12), datetime.date(2026, 1, 12)) == {"2026-01-12": {'count': 1, 'colors': ["#00ff00"]}}
+    event_manager.deleteEventSeries(series_id)
+    assert event_manager.getSeriesOccurrences(datetime.date(2026, 1, 1), datetime.date(2026, 1, 15)) == []
@@ -0,0 +1,114 @@
+import datetime
+
+from scheduler_core.changes import EventChange
+from scheduler_core.reminders import ReminderQueue, currentMinute
+
+DAY = datetime.date(2026, 3, 2)
+MIDNIGHT = currentMinute(datetime.datetime.combine(DAY, datetime.time(0, 0)))
+
+
+def minute(hour, minute=0, day=DAY):
+    return currentMinute(datetime.datetime.combine(day, datetime.time(hour, minute)))
+
+
+def recording_queue(event_manager, **kwargs):
+    # A queue kept up to date by the manager's change notifications, as in the app
+    queue = ReminderQueue(event_manager, **kwargs)
+    queue.rebuild(MIDNIGHT)
+    event_manager.addChangeListener(lambda changes: queue.applyChanges(changes, MIDNIGHT))
+    return queue
+
+
+def titles(reminders):
+    return [reminder['title'] for reminder in reminders]
+
+
+def test_due_reminders_come_out_in_order(event_manager):
+    event_manager.addEvent(DAY, "Lunch", None, datetime.time(12, 0), None, None, 30)
+    event_manager.addEvent(DAY, "Standup", None, datetime.time(9, 0), None, None, 10)
+    event_manager.addEvent(DAY, "No reminder", None, datetime.time(8, 0), None)
+    queue = ReminderQueue(event_manager)
+    queue.rebuild(MIDNIGHT)
+    assert queue.pendingCount() == 2
+    assert queue.nextWakeMinute() == minute(8, 50)
+    assert queue.popDue(minute(8, 49)) == []
+    assert titles(queue.popDue(minute(11, 30))) == ["Standup", "Lunch"]
+    # Nothing is handed out twice
+    assert queue.popDue(minute(23, 0)) == []
+
+
+def test_untimed_events_remind_before_their_day(event_manager):
+    event_manager.addEvent(DAY, "Birthday", None, None, None, None, 60)
+    queue = ReminderQueue(event_manager)
+    queue.rebuild(MIDNIGHT - 120)
+    assert queue.popDue(MIDNIGHT - 60)[0]['remind_minute'] == MIDNIGHT - 60
+
+
+def test_changes_update_the_heap(event_manager):
+    event_manager.addEvent(DAY, "Standup", None, datetime.time(9, 0), None, None, 10)
+    queue = recording_queue(event_manager)
+    event_id = event_manager.getAllEvents()[0].id
+    event_manager.updateEvents([{"event_id": event_id, "event_time": "15:00:00"}])
+    event_manager.addEvent(DAY, "Review", None, datetime.time(10, 0), None, None, 5)
+    assert queue.nextWakeMinute() == minute(9, 55)
+    assert titles(queue.popDue(minute(14, 0))) == ["Review"]
+    event_manager.deleteEvent(event_id)
+    assert queue.popDue(minute(23, 59)) == []
+    assert queue.pendingCount() == 0
+
+
+def test_series_reminders(event_manager):
+    event_manager.addEventSeries(DAY, "Pills", None, datetime.time(8, 0), None, "FREQ=DAILY", None, 15)
+    queue = recording_queue(event_manager, horizon_minutes=3 * 24 * 60)
+    assert [reminder['event_date'] for reminder in queue.popDue(minute(8, 0, DAY + datetime.timedelta(days=1)))] == ["2026-03-02", "2026-03-03"]
+    series_id = event_manager.getEventSeries()[0]['id']
+    event_manager.addSeriesException(series_id, DAY + datetime.timedelta(days=2))
+    assert queue.popDue(minute(8, 0, DAY + datetime.timedelta(days=2))) == []
+    assert [reminder['event_date'] for reminder in queue.popDue(minute(8, 0, DAY + datetime.timedelta(days=3)))] == ["2026-03-05"]
+    event_manager.deleteEventSeries(series_id)
+    assert queue.pendingCount() == 0
+
+
+def test_horizon_extends_after_a_suspend(event_manager):
+    event_manager.addEvent(DAY + datetime.timedelta(days=3), "Later", None, datetime.time(9, 0), None, None, 0)
+    queue = ReminderQueue(event_manager, horizon_minutes=60)
+    queue.rebuild(MIDNIGHT)
+    assert queue.pendingCount() == 0
+    # Waking up days later still delivers what fell due meanwhile
+    assert titles(queue.popDue(minute(10, 0, DAY + datetime.timedelta(days=3)))) == ["Later"]
+
+
+def test_stale_heap_items_are_compacted(event_manager):
+    event_manager.addEvent(DAY, "Standup", None, datetime.time(9, 0), None, None, 10)
+    queue = recording_queue(event_manager)
+    event_id = event_manager.getAllEvents()[0].id
+    for offset in range(300):
+        event_manager.updateEvents([{"event_id": event_id, "reminder_minutes": offset % 60}])
+    assert queue.pendingCount() == 1
+    assert len(queue.heap) <= 2 * queue.pendingCount() + 64 + 1
+
+
+def test_reload_rebuilds(event_manager):
+    queue = ReminderQueue(event_manager)
+    queue.rebuild(MIDNIGHT)
+    event_manager.addEvent(DAY, "Imported", None, datetime.time(9, 0), None, None, 10)
+    queue.applyChanges([EventChange(EventChange.RELOADED)], MIDNIGHT)
+    assert titles(queue.popDue(minute(9, 0))) == ["Imported"]
+
+
+def test_reminders_missed_while_closed_are_delivered_once(event_manager):
+    event_manager.addEvent(DAY, "Standup", None, datetime.time(9, 0), None, None, 10)
+    event_manager.addEvent(DAY, "Lunch", None, datetime.time(12, 0), None, None, 0)
+    event_manager.addEvent(DAY - datetime.timedelta(days=3), "Long ago", None, datetime.time(9, 0), None, None, 0)
+    queue = ReminderQueue(event_manager)
+    queue.rebuild(minute(8, 0, DAY - datetime.timedelta(days=4)))
+    assert queue.popDue(minute(8, 0, DAY - datetime.timedelta(days=4))) == []
+    queue.saveProgress()
+    # Started again on the day: what fell due in the last catch_up_minutes comes out once
+    queue = ReminderQueue(event_manager)
+    queue.rebuild(minute(13, 0))
+    assert titles(queue.popDue(minute(13, 0))) == ["Standup", "Lunch"]
+    queue = ReminderQueue(event_manager)
+    queue.rebuild(minute(14, 0))
+    assert queue.popDue(minute(14, 0)) == []
+
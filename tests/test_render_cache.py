@@ -0,0 +1,50 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from scheduler import RenderCache
+
+
+@pytest.fixture
+def cache(qapp):
+    return RenderCache()
+
+
+def test_repeated_lookups_return_the_cached_pixmap(cache):
+    swatch = cache.swatch("#ff0000", 16, 1.0)
+    assert cache.swatch("#ff0000", 16, 1.0) is swatch
+    assert cache.stats() == {'entries': 1, 'bytes': 16 * 16 * 4, 'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+    assert swatch.toImage().pixelColor(8, 8).name() == "#ff0000"
+
+
+def test_scaled_screens_get_their_own_device_resolution_pixmaps(cache):
+    swatch = cache.swatch("#ff0000", 16, 2.0)
+    assert (swatch.width(), swatch.height(), swatch.devicePixelRatio()) == (32, 32, 2.0)
+    assert cache.swatch("#ff0000", 16, 1.0) is not swatch
+    assert cache.stats()['entries'] == 2
+
+
+def test_least_recently_used_pixmaps_are_evicted_first(qapp):
+    cache = RenderCache(max_bytes=3 * 10 * 10 * 4)
+    red = cache.swatch("#ff0000", 10, 1.0)
+    cache.swatch("#00ff00", 10, 1.0)
+    cache.swatch("#0000ff", 10, 1.0)
+    assert cache.swatch("#ff0000", 10, 1.0) is red
+    cache.swatch("#ffffff", 10, 1.0)
+    # Green was the least recently used, so it made room for white
+    assert cache.stats()['bytes'] <= cache.max_bytes
+    assert [key[1] for key in cache.pixmaps] == ["#0000ff", "#ff0000", "#ffffff"]
+
+
+def test_invalid_colors_and_empty_cells_draw_nothing(cache):
+    assert cache.swatch("not a color", 16, 1.0) is None
+    assert cache.swatch("#ff0000", 0, 1.0) is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_dot_strips_make_room_for_the_overflow_badge(cache):
+    plain = cache.dotStrip(("#ff0000", "#00ff00"), 0, 1.0)
+    badged = cache.dotStrip(("#ff0000", "#00ff00"), 5, 1.0)
+    assert plain.width() == 2 * RenderCache.dot_spacing
+    assert badged.width() == plain.width() + RenderCache.overflow_badge_width
+    assert cache.dotStrip(("#ff0000", "#00ff00"), 5, 1.0) is badged
@@ -0,0 +1,62 @@
+import datetime
+
+import pytest
+
+from scheduler_core.event_manager import RELEVANCE_SORT_COLUMN
+
+DAY = datetime.date(2026, 3, 2)
+
+
+def search(event_manager, search_text, sort_column=RELEVANCE_SORT_COLUMN):
+    rows = event_manager.getEventPage(sort_column, False, None, 50, match_expression=event_manager.ftsMatchExpression(search_text))
+    return [row[2] for row in rows]
+
+
+@pytest.fixture
+def searchable(event_manager):
+    event_manager.addEvent(DAY, "Dentist appointment", "Bring insurance card", None, None)
+    event_manager.addEvent(DAY, "Team sync", "Discuss the dentist's invoice", None, None)
+    event_manager.addEvent(DAY, "Gym", None, None, None)
+    return event_manager
+
+
+def test_every_word_matches_as_a_prefix(searchable):
+    # What has been typed so far already matches, so results can follow each keystroke
+    assert search(searchable, "den", 2) == ["Dentist appointment", "Team sync"]
+    assert search(searchable, "dentist app") == ["Dentist appointment"]
+    assert search(searchable, "insur") == ["Dentist appointment"]
+    assert search(searchable, "swimming") == []
+
+
+def test_relevance_order_puts_the_closer_match_first(searchable):
+    # bm25 favours the short title over a passing mention in a longer description
+    assert search(searchable, "dentist") == ["Dentist appointment", "Team sync"]
+
+
+def test_index_follows_edits_and_deletes(searchable):
+    gym_id = next(event.id for event in searchable.getAllEvents() if event.title == "Gym")
+    searchable.updateEvents([{"event_id": gym_id, "title": "Swimming"}])
+    assert search(searchable, "gym") == []
+    assert search(searchable, "swim") == ["Swimming"]
+    searchable.deleteEvent(gym_id)
+    assert search(searchable, "swim") == []
+
+
+def test_search_combines_with_the_date_filter(searchable):
+    searchable.addEvent(DAY + datetime.timedelta(days=1), "Dentist follow-up", None, None, None)
+    filter_clause, filter_values = searchable.dateFilter(">", DAY)
+    rows = searchable.getEventPage(RELEVANCE_SORT_COLUMN, False, None, 50, filter_clause, filter_values, searchable.ftsMatchExpression("dentist"))
+    assert [row[2] for row in rows] == ["Dentist follow-up"]
+
+
+def test_search_box_filters_once_typing_pauses(event_manager, executor, wait_for):
+    scheduler = pytest.importorskip("scheduler")
+    event_manager.addEvent(DAY, "Dentist", None, None, None)
+    event_manager.addEvent(DAY, "Gym", None, None, None)
+    page = scheduler.EventViewerPage(event_manager, executor)
+    wait_for(lambda: page.model.rowCount() == 2)
+    page.title_filter_box.setText("dent")
+    page.title_filter_box.textEdited.emit("dent")
+    assert page.search_debounce_timer.isActive()
+    wait_for(lambda: page.model.rowCount() == 1)
+    assert page.model.index(0, 2).data() == "Dentist"
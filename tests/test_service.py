@@ -0,0 +1,272 @@
+import asyncio
+import datetime
+import http.client
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from scheduler_core.event_manager import CALENDAR_ID_SHIFT, EventManager
+from scheduler_core.reminders import ReminderQueue, currentMinute
+from scheduler_core.service import EventService
+from scheduler_core.service_client import EventServiceClient, RemoteEventManager
+
+DAY = datetime.date(2026, 3, 2)
+
+
+@pytest.fixture
+def service(event_manager):
+    # The service on a free loopback port, its loop on a thread of its own
+    service = EventService(port=0, event_manager=event_manager)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(service.start())
+        started.set()
+        loop.run_forever()
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(10)
+    yield service
+    asyncio.run_coroutine_threadsafe(service.stop(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(10)
+    loop.close()
+
+
+@pytest.fixture
+def client(service):
+    client = EventServiceClient(f"http://127.0.0.1:{service.port}")
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def remote(service):
+    remote = RemoteEventManager(f"http://127.0.0.1:{service.port}")
+    yield remote
+    remote.close()
+
+
+def raw_request(service, data):
+    # Status line of the service's answer to raw bytes
+    with socket.create_connection(("127.0.0.1", service.port), timeout=5) as connection:
+        connection.sendall(data)
+        return connection.recv(65536).split(b"\r\n")[0]
+
+
+def test_event_crud(client):
+    status, created = client.request("POST", "/events", {"event_date": "2026-03-02", "title": "Dentist", "event_time": "09:00", "duration_minutes": 30})
+    assert status == 201
+    event_id = created["id"]
+    status, event = client.request("GET", f"/events/{event_id}")
+    assert status == 200 and event["title"] == "Dentist" and event["event_time"] == "09:00:00"
+    assert client.request("PATCH", f"/events/{event_id}", {"title": "Dentist (moved)", "event_time": "10:00"})[0] == 200
+    assert client.request("GET", f"/events/{event_id}")[1]["title"] == "Dentist (moved)"
+    # PUT replaces every field, clearing the ones left out
+    assert client.request("PUT", f"/events/{event_id}", {"event_date": "2026-03-03", "title": "Replaced"})[0] == 200
+    event = client.request("GET", f"/events/{event_id}")[1]
+    assert (event["event_date"], event["event_time"], event["duration_minutes"]) == ("2026-03-03", None, None)
+    assert client.request("DELETE", f"/events/{event_id}")[0] == 200
+    assert client.request("GET", f"/events/{event_id}")[0] == 404
+    assert client.request("DELETE", f"/events/{event_id}")[0] == 404
+
+
+def test_bad_requests(client):
+    assert client.request("POST", "/events", {"title": "No date"})[0] == 400
+    assert client.request("POST", "/events", {"event_date": "tomorrow", "title": "Bad date"})[0] == 400
+    assert client.request("POST", "/events", {"event_date": "2026-03-02", "title": "Bad", "duration_minutes": "long"})[0] == 400
+    assert client.request("GET", "/events", query={"sort": "secret_column"})[0] == 400
+    assert client.request("GET", "/events", query={"date": "2026-03-02", "compare": "!="})[0] == 400
+    assert client.request("GET", "/nowhere")[0] == 404
+    assert client.request("POST", "/status")[0] == 405
+
+
+def test_malformed_http_gets_400(service):
+    assert raw_request(service, b"GET /status HTTP/1.1\r\nContent-Length: -5\r\n\r\n") == b"HTTP/1.1 400 Bad Request"
+    assert raw_request(service, b"GET /" + b"a" * 100000 + b" HTTP/1.1\r\n\r\n") == b"HTTP/1.1 400 Bad Request"
+    assert raw_request(service, b"NONSENSE\r\n\r\n") == b"HTTP/1.1 400 Bad Request"
+    assert raw_request(service, b"GET /status HTTP/1.1\r\n\r\n") == b"HTTP/1.1 200 OK"
+
+
+def test_listing_search_and_paging(client):
+    client.request("POST", "/events/import", {"rows": [[f"2026-03-{day:02d}", f"Event {day}", "notes" if day % 2 else None, None, None, None, None] for day in range(1, 21)]})
+    events = client.events(limit=7)
+    assert [event["title"] for event in events] == [f"Event {day}" for day in range(1, 21)]
+    assert [event["title"] for event in client.events("2026-03-05", "2026-03-07")] == ["Event 5", "Event 6", "Event 7"]
+    assert len(client.events(search_text="notes")) == 10
+    page = client.request("GET", "/events", query={"sort": "title", "order": "desc", "limit": 2, "date": "2026-03-10", "compare": "<"})[1]
+    assert [event["title"] for event in page["events"]] == ["Event 9", "Event 8"] and page["next"]
+
+
+def test_etag_revalidation(service, client):
+    client.request("POST", "/events", {"event_date": "2026-03-02", "title": "Dentist"})
+    connection = http.client.HTTPConnection("127.0.0.1", service.port, timeout=5)
+    connection.request("GET", "/events")
+    response = connection.getresponse()
+    response.read()
+    etag = response.getheader("ETag")
+    connection.request("GET", "/events", headers={"If-None-Match": etag})
+    response = connection.getresponse()
+    assert response.status == 304 and response.read() == b""
+    client.request("POST", "/events", {"event_date": "2026-03-03", "title": "Haircut"})
+    connection.request("GET", "/events", headers={"If-None-Match": etag})
+    response = connection.getresponse()
+    assert response.status == 200 and len(json.loads(response.read())["events"]) == 2
+    etag = response.getheader("ETag")
+    # Writes that bypass the service (another process on the same file) change the tag too
+    other = EventManager(service.event_manager.db_filename)
+    other.addEvent(datetime.date(2026, 3, 4), "Walk-in", None, None, None)
+    other.closeConnection()
+    connection.request("GET", "/events", headers={"If-None-Match": etag})
+    response = connection.getresponse()
+    assert response.status == 200 and len(json.loads(response.read())["events"]) == 3
+    connection.close()
+
+
+def test_changes_feed(client):
+    position = client.changes(0)
+    assert position["changes"] == [] and not position["reset"]
+    waiter = threading.Thread(target=lambda: time.sleep(0.2) or client.request("POST", "/events", {"event_date": "2026-03-02", "title": "Dentist"}))
+    waiter.start()
+    # The long poll returns as soon as the write commits
+    started = time.monotonic()
+    position = EventServiceClient(f"http://127.0.0.1:{client.port}").changes(position["sequence"], position["epoch"], timeout=10)
+    waiter.join()
+    assert time.monotonic() - started < 5
+    assert [(change["kind"], change["new_date"]) for change in position["changes"]] == [("added", "2026-03-02")]
+    assert client.changes(position["sequence"], "another-epoch")["reset"]
+
+
+def test_concurrent_writes_share_commits(service, client):
+    def add(index):
+        local_client = EventServiceClient(f"http://127.0.0.1:{service.port}")
+        for offset in range(10):
+            assert local_client.request("POST", "/events", {"event_date": "2026-03-02", "title": f"Event {index}-{offset}"})[0] == 201
+        local_client.close()
+    threads = [threading.Thread(target=add, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(client.events()) == 80
+    assert service.write_count == 80 and service.commit_count <= 80
+
+
+def test_calendars_parameter_narrows_reads(event_manager, client):
+    work = event_manager.addCalendar("Work")
+    client.request("POST", "/events", {"event_date": "2026-03-02", "title": "Home"})
+    client.request("POST", "/events", {"event_date": "2026-03-02", "title": "Work", "calendar_id": work})
+    assert [event["title"] for event in client.request("GET", "/events", query={"calendars": "1"})[1]["events"]] == ["Home"]
+    assert client.request("GET", "/summaries", query={"start": "2026-03-01", "end": "2026-03-31", "calendars": str(work)})[1]["days"] == {"2026-03-02": {"count": 1, "colors": []}}
+    assert client.request("GET", f"/events/{(work << CALENDAR_ID_SHIFT) + 1}", query={"calendars": "1"})[0] == 404
+
+
+def test_no_resend_once_the_request_was_sent():
+    # A service that reads the request and never answers: the client times out and raises
+    # instead of sending the DELETE again
+    received = []
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def serve():
+        connection, _ = listener.accept()
+        received.append(connection.recv(65536))
+        time.sleep(2)
+        connection.close()
+    threading.Thread(target=serve, daemon=True).start()
+    client = EventServiceClient(f"http://127.0.0.1:{listener.getsockname()[1]}", timeout=0.5)
+    with pytest.raises(OSError):
+        client.request("DELETE", "/events/5")
+    time.sleep(0.2)
+    assert len(received) == 1
+    listener.close()
+
+
+def test_remote_event_manager_matches_local_reads(event_manager, service, remote):
+    work = event_manager.addCalendar("Work")
+    remote.loadCalendars()
+    for index in range(12):
+        remote.addEvent(DAY + datetime.timedelta(days=index % 4), f"Meeting {index}", None, datetime.time(9 + index % 3, 0), "#ff0000", 45, 10, calendar_id=work if index % 3 == 0 else None)
+    remote.addEventSeries(DAY, "Standup", None, datetime.time(9, 15), "#00ff00", "FREQ=DAILY;COUNT=5", 15, 5)
+    local = EventManager(event_manager.db_filename)
+    start_minute = local.eventInterval(DAY, datetime.time(0, 0), 0)[0]
+    for method, arguments in (
+        ("getEventPage", (1, False, None, 5)),
+        ("getEventPage", (2, True, None, 50)),
+        ("getEventPage", (-1, False, None, 50, "", None, local.ftsMatchExpression("meeting 1"))),
+        ("getEventDetailsbyId", (2,)),
+        ("getEventDateSummaries", (DAY, DAY + datetime.timedelta(days=30))),
+        ("getTimelineEvents", (DAY, DAY + datetime.timedelta(days=6))),
+        ("findConflicts", (DAY, datetime.time(9, 30), 60)),
+        ("getBusyIntervals", (start_minute, start_minute + 3 * 24 * 60)),
+        ("getEventReminders", (start_minute, start_minute + 7 * 24 * 60)),
+        ("getSeriesReminders", (start_minute, start_minute + 7 * 24 * 60)),
+        ("getEventSeries", ()),
+        ("getSeriesOccurrences", (DAY, DAY + datetime.timedelta(days=30))),
+    ):
+        assert getattr(remote, method)(*arguments) == getattr(local, method)(*arguments), method
+    assert list(remote.exportEventRows()) == list(local.exportEventRows())
+    assert list(remote.exportSeriesRows()) == list(local.exportSeriesRows())
+    filter_clause, filter_values = remote.dateFilter(">", DAY)
+    local_clause, local_values = local.dateFilter(">", DAY)
+    assert remote.getEventPage(1, False, None, 50, filter_clause, filter_values) == local.getEventPage(1, False, None, 50, local_clause, local_values)
+    local.closeConnection()
+
+
+def test_remote_import_is_batched_and_all_or_nothing(event_manager, service, remote):
+    rows = [(DAY + datetime.timedelta(days=index % 5), f"Imported {index}", None, datetime.time(9, 0), None, 30, None) for index in range(25)]
+    series = [(DAY, "Standup", None, datetime.time(9, 15), None, 15, 5, "FREQ=DAILY;COUNT=3", [DAY + datetime.timedelta(days=1)])]
+    progress = []
+    # Cancelling after the second batch leaves nothing behind
+    assert remote.importEventRows(iter(rows), batch_size=10, progress_callback=lambda count: progress.append(count) or count < 20, series_rows=series) is None
+    assert progress == [10, 20]
+    assert list(event_manager.exportEventRows()) == [] and event_manager.getEventSeries() == []
+    assert service.import_sessions == {}
+    progress.clear()
+    assert remote.importEventRows(iter(rows), batch_size=10, progress_callback=progress.append, series_rows=series) == 26
+    assert progress == [10, 20, 25]
+    assert [row[2] for row in event_manager.exportEventRows()] == [row[1] for row in sorted(rows, key=lambda row: row[0])]
+    assert [occurrence['event_date'] for occurrence in event_manager.getSeriesOccurrences(DAY, DAY + datetime.timedelta(days=7))] == ["2026-03-02", "2026-03-04"]
+    assert service.import_sessions == {}
+
+
+def test_remote_event_manager_hides_calendars_for_itself(event_manager, service, remote):
+    work = event_manager.addCalendar("Work")
+    remote.loadCalendars()
+    remote.addEvent(DAY, "Home", None, None, None)
+    remote.addEvent(DAY, "Work", None, None, None, calendar_id=work)
+    assert remote.setCalendarVisible(work, False)
+    assert [row[2] for row in remote.getEventPage(1, False, None, 10)] == ["Home"]
+    assert [calendar['visible'] for calendar in event_manager.getCalendars()] == [True, True]
+    assert remote.setCalendarVisible(work, True)
+    assert [row[2] for row in remote.getEventPage(1, False, None, 10)] == ["Home", "Work"]
+
+
+def test_remote_event_manager_hears_other_clients(service, client, remote):
+    heard = []
+    remote.addChangeListener(heard.extend)
+    client.request("POST", "/events", {"event_date": "2026-03-02", "title": "From a kiosk"})
+    deadline = time.monotonic() + 10
+    while not heard and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert [(change.kind, change.new_date) for change in heard] == [("added", "2026-03-02")]
+    # A write of its own is delivered before the call returns
+    heard.clear()
+    assert remote.deleteEvents([1])
+    assert [change.kind for change in heard] == ["deleted"]
+
+
+def test_remote_settings_carry_reminder_progress(event_manager, service, remote):
+    remote.addEvent(DAY, "Standup", None, datetime.time(9, 0), None, None, 10)
+    eight, ten = (currentMinute(datetime.datetime.combine(DAY, datetime.time(hour, 0))) for hour in (8, 10))
+    assert remote.setSetting(ReminderQueue.fired_until_setting, eight)
+    assert event_manager.getSetting(ReminderQueue.fired_until_setting) == str(eight)
+    queue = ReminderQueue(remote)
+    queue.rebuild(ten)
+    assert [reminder['title'] for reminder in queue.popDue(ten)] == ["Standup"]
+    assert remote.getSetting(ReminderQueue.fired_until_setting) == str(ten + 1)
+    assert remote.getSetting("missing", "default") == "default"
@@ -0,0 +1,54 @@
+import datetime
+import sqlite3
+import threading
+
+from scheduler_core.records import EventBatch, EventRecord
+
+DAY = datetime.date(2026, 3, 2)
+
+
+def add_events(event_manager, count):
+    event_manager.importEventRows((DAY + datetime.timedelta(days=index % 10), f"Event {index}", None, None, None, None, None) for index in range(count))
+
+
+def test_rows_come_in_chunks_as_they_are_asked_for(event_manager):
+    add_events(event_manager, 25)
+    chunks = event_manager.iterRows("SELECT id FROM events ORDER BY id", chunk_size=10)
+    assert len(next(chunks)) == 10
+    assert [len(chunk) for chunk in chunks] == [10, 5]
+
+
+def test_cancelling_stops_at_the_next_chunk(event_manager):
+    add_events(event_manager, 25)
+    cancel_event = threading.Event()
+    chunk_sizes = []
+    for chunk in event_manager.iterRows("SELECT id FROM events", chunk_size=10, cancel_event=cancel_event):
+        chunk_sizes.append(len(chunk))
+        cancel_event.set()
+    assert chunk_sizes == [10]
+
+
+def test_stopping_early_releases_the_statement(event_manager):
+    add_events(event_manager, 25)
+    other_connection = sqlite3.connect(event_manager.db_filename, timeout=0)
+    chunks = event_manager.iterRows("SELECT id FROM events", chunk_size=10)
+    next(chunks)
+    # An unfinished read holds its snapshot, so the WAL cannot be checkpointed past it
+    assert other_connection.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0] == 1
+    chunks.close()
+    assert other_connection.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0] == 0
+    other_connection.close()
+
+
+def test_events_stream_in_date_order_within_the_range(event_manager):
+    add_events(event_manager, 40)
+    events = list(event_manager.iterEvents(DAY + datetime.timedelta(days=2), DAY + datetime.timedelta(days=3)))
+    assert all(isinstance(event, EventRecord) for event in events)
+    assert [event.title for event in events] == [f"Event {index}" for index in (2, 12, 22, 32, 3, 13, 23, 33)]
+
+
+def test_events_stream_as_batches(event_manager):
+    add_events(event_manager, 25)
+    batches = list(event_manager.iterEvents(batch_size=10, match_expression=event_manager.ftsMatchExpression("event")))
+    assert all(isinstance(batch, EventBatch) for batch in batches)
+    assert [len(batch) for batch in batches] == [10, 10, 5]
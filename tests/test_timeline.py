@@ -0,0 +1,74 @@
+import datetime
+
+import pytest
+
+from scheduler_core.changes import EventChange
+from scheduler_core.timeline import DayTimelineLayout
+
+DAY = datetime.date(2026, 3, 2)
+
+
+def layout_of(*intervals):
+    return DayTimelineLayout([{'title': f"{start}-{end}", 'start_minute': start, 'end_minute': end} for start, end in intervals])
+
+
+def columns(layout):
+    return {item['title']: (item['column'], item['column_count']) for item in layout.items}
+
+
+def test_overlapping_events_share_their_cluster_width():
+    layout = layout_of((540, 600), (570, 630), (600, 660), (720, 780))
+    # 9:00 and 9:30 overlap; 10:00 takes the column 9:00 freed; noon stands alone
+    assert columns(layout) == {"540-600": (0, 2), "570-630": (1, 2), "600-660": (0, 2), "720-780": (0, 1)}
+
+
+def test_visible_items_include_long_events_started_earlier():
+    layout = layout_of((0, 24 * 60), (540, 600), (900, 960))
+    assert [item['title'] for item in layout.visibleItems(600, 840)] == ["0-1440"]
+    assert [item['title'] for item in layout.visibleItems(560, 900)] == ["0-1440", "540-600"]
+
+
+def test_zero_length_events_are_still_placed():
+    layout = layout_of((540, 540), (540, 600))
+    assert columns(layout) == {"540-540": (0, 2), "540-600": (1, 2)}
+    assert len(layout.visibleItems(540, 541)) == 2
+
+
+@pytest.fixture
+def timeline(event_manager, qapp):
+    scheduler = pytest.importorskip("scheduler")
+    from PyQt5.QtCore import QDate
+    event_manager.addEvent(DAY, "Standup", None, datetime.time(9, 0), "#ff0000", 15)
+    event_manager.addEvent(DAY, "Late shift", None, datetime.time(22, 0), None, 4 * 60)
+    event_manager.addEvent(DAY, "Holiday", None, None, None)
+    timeline = scheduler.TimelineView(event_manager)
+    timeline.set_range(QDate(DAY), 7)
+    yield timeline
+    timeline.deleteLater()
+
+
+def test_week_view_splits_events_at_midnight(timeline):
+    monday, tuesday = timeline.day_layouts["2026-03-02"], timeline.day_layouts["2026-03-03"]
+    assert [(item['title'], item['start_minute'], item['end_minute']) for item in monday.items] == [("Standup", 540, 555), ("Late shift", 1320, 1440)]
+    assert [(item['title'], item['start_minute'], item['end_minute']) for item in tuesday.items] == [("Late shift", 0, 120)]
+    assert [event['title'] for event in timeline.all_day_events_by_date["2026-03-02"]] == ["Holiday"]
+
+
+def test_changes_only_reload_the_days_they_touch(event_manager, timeline):
+    layouts_before = dict(timeline.day_layouts)
+    event_manager.addEvent(DAY + datetime.timedelta(days=4), "Review", None, datetime.time(14, 0), None, 60)
+    timeline.apply_changes([EventChange(EventChange.ADDED, 99, new_date="2026-03-06")])
+    reloaded = {iso_date for iso_date, layout in timeline.day_layouts.items() if layout is not layouts_before.get(iso_date)}
+    assert reloaded == {"2026-03-06", "2026-03-07"}
+    assert [item['title'] for item in timeline.day_layouts["2026-03-06"].items] == ["Review"]
+
+
+def test_painting_renders_only_the_visible_tiles(event_manager, timeline):
+    timeline.resize(800, 400)
+    timeline.grab()
+    counters = event_manager.instrumentation.snapshot()['counters']
+    tiles_rendered = counters["timeline.tiles_rendered"]
+    assert len(timeline.tile_pixmaps) == tiles_rendered < 7 * 24 // timeline.tile_hours
+    # A repaint of the same hours blits the cached tiles
+    timeline.grab()
+    assert event_manager.instrumentation.snapshot()['counters']["timeline.tiles_rendered"] == tiles_rendered
@@ -0,0 +1,83 @@
+import datetime
+import logging
+import time
+
+import pytest
+
+from scheduler_core.event_manager import EventManager
+from scheduler_core.transfer import EventFileTransfer
+
+DAY = datetime.date(2026, 3, 2)
+
+
+@pytest.mark.parametrize("file_name", ["events.csv", "events.ics"])
+def test_export_and_import_round_trip(event_manager, tmp_path, file_name):
+    event_manager.addEvent(DAY, "Dentist", "Bring forms, and the card", datetime.time(9, 0), "#ff0000", 45, 30)
+    event_manager.addEvent(DAY, "Holiday", None, None, "#00ff00")
+    event_manager.addEvent(DAY + datetime.timedelta(days=1), "Call", "Line one\nline two", datetime.time(14, 30), None, 15, 0)
+    event_manager.addEventSeries(DAY, "Standup", None, datetime.time(9, 15), "#0000ff", "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=6", 15, 5)
+    series_id = event_manager.getEventSeries()[0]['id']
+    event_manager.addSeriesException(series_id, DAY + datetime.timedelta(days=2))
+    event_manager.addEventSeries(DAY, "Gym", None, None, None, "FREQ=DAILY;INTERVAL=2")
+    file_path = str(tmp_path / file_name)
+    assert EventFileTransfer(event_manager).exportFile(file_path) == 5
+
+    imported = EventManager(str(tmp_path / "imported.db"))
+    assert EventFileTransfer(imported).importFile(file_path) == 5
+    # Descriptions come back empty rather than missing
+    assert [row[1:] for row in imported.exportEventRows()] == [
+        ("2026-03-02", "Dentist", "Bring forms, and the card", "09:00:00", "#ff0000", 45, 30),
+        ("2026-03-02", "Holiday", "", None, "#00ff00", None, None),
+        ("2026-03-03", "Call", "Line one\nline two", "14:30:00", None, 15, 0),
+    ]
+    assert [row[1:] for row in imported.exportSeriesRows()] == [row[1:3] + ("",) + row[4:] for row in event_manager.exportSeriesRows()]
+    occurrences = [(occurrence['event_date'], occurrence['title']) for occurrence in imported.getSeriesOccurrences(DAY, DAY + datetime.timedelta(days=7))]
+    assert occurrences == [(occurrence['event_date'], occurrence['title']) for occurrence in event_manager.getSeriesOccurrences(DAY, DAY + datetime.timedelta(days=7))]
+    assert ("2026-03-04", "Standup") not in occurrences
+    imported.closeConnection()
+
+
+@pytest.fixture
+def tokyo_time(monkeypatch):
+    # Local time is Tokyo's (UTC+9, no daylight saving) for the test
+    if not hasattr(time, "tzset"):
+        pytest.skip("needs time.tzset")
+    monkeypatch.setenv("TZ", "Asia/Tokyo")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_ics_times_are_converted_to_local_time(event_manager, tmp_path, tokyo_time, caplog):
+    file_path = tmp_path / "events.ics"
+    file_path.write_text("\r\n".join([
+        "BEGIN:VCALENDAR",
+        "BEGIN:VEVENT", "DTSTART:20260302T230000Z", "DTEND:20260303T000000Z", "SUMMARY:Late call", "END:VEVENT",
+        "BEGIN:VEVENT", "DTSTART;TZID=Europe/Berlin:20260302T090000", "DTEND;TZID=Europe/Berlin:20260302T103000", "SUMMARY:Review", "END:VEVENT",
+        "BEGIN:VEVENT", 'DTSTART;TZID="Nowhere: Special":20260302T090000', "SUMMARY:Mystery", "END:VEVENT",
+        "BEGIN:VEVENT", "DTSTART;VALUE=DATE:20260305", "DTEND;VALUE=DATE:20260306", "SUMMARY:Holiday", "END:VEVENT",
+        "END:VCALENDAR",
+    ]) + "\r\n")
+    with caplog.at_level(logging.WARNING):
+        assert EventFileTransfer(event_manager).importFile(str(file_path)) == 4
+    assert [row[1:] for row in event_manager.exportEventRows()] == [
+        ("2026-03-02", "Review", "", "17:00:00", None, 90, None),
+        ("2026-03-02", "Mystery", "", "09:00:00", None, None, None),
+        ("2026-03-03", "Late call", "", "08:00:00", None, 60, None),
+        ("2026-03-05", "Holiday", "", None, None, None, None),
+    ]
+    assert "(1 times)" in caplog.text
+
+
+def test_unsupported_recurrence_imports_first_occurrence(event_manager, tmp_path, caplog):
+    file_path = tmp_path / "events.ics"
+    file_path.write_text(
+        "BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nDTSTART:20260302T090000\r\nSUMMARY:Birthday\r\n"
+        "RRULE:FREQ=YEARLY\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n"
+    )
+    with caplog.at_level(logging.WARNING):
+        assert EventFileTransfer(event_manager).importFile(str(file_path)) == 1
+    assert [row[1:3] for row in event_manager.exportEventRows()] == [("2026-03-02", "Birthday")]
+    assert event_manager.getEventSeries() == []
+    assert "(1 skipped rules)" in caplog.text